@@ -0,0 +1,112 @@
+"""
+Benchmark: guardado y carga de la red de monitoreo con pickle y con el codec binario.
+
+Arma una red de zonas con sensores de las cuatro clases (valores, estados y un
+usuario por zona) y mide, para cada formato, el tiempo de escritura, el de
+lectura y el tamaño del archivo. Verifica que la red cargada con el codec
+tenga los mismos sensores, valores y alertas que la original.
+
+Uso:
+    python benchmarks/bench_codec_red.py [cantidad_zonas] [sensores_por_zona]
+
+Por defecto 10.000 zonas × 100 sensores (1 millón de sensores).
+"""
+import gc
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from python_iotmonitor.entidades.sensores.sensor_co2 import SensorCO2
+from python_iotmonitor.entidades.sensores.sensor_humedad import SensorHumedad
+from python_iotmonitor.entidades.sensores.sensor_luz import SensorLuz
+from python_iotmonitor.entidades.sensores.sensor_temperatura import SensorTemperatura
+from python_iotmonitor.entidades.usuarios.usuario import Usuario
+from python_iotmonitor.entidades.zonas.red_monitoreo import RedMonitoreo
+from python_iotmonitor.entidades.zonas.zona import Zona
+from python_iotmonitor.persistencia.codec_binario import codificar_red, decodificar_red
+
+CLASES = (
+    lambda: SensorTemperatura("DHT22"),
+    lambda: SensorHumedad("DHT22"),
+    lambda: SensorCO2("MH-Z19"),
+    lambda: SensorLuz(),
+)
+
+
+def armar_red(cantidad_zonas: int, sensores_por_zona: int) -> RedMonitoreo:
+    """Arma una red con zonas de sensores de las cuatro clases."""
+    red = RedMonitoreo(1, "Campus Central", "Red de benchmark")
+    tecnicos = [Usuario(i, f"Técnico {i}", "tecnico", []) for i in range(10)]
+    for id_zona in range(cantidad_zonas):
+        zona = Zona(id_zona, f"Zona {id_zona}", red, "interior")
+        for i in range(sensores_por_zona):
+            sensor = CLASES[i % len(CLASES)]()
+            sensor.set_valor_actual(20.0 + (id_zona + i) % 17)
+            if i % 10 == 0:
+                sensor.calibrar()
+            zona.agregar_sensor(sensor)
+        zona.set_usuarios([tecnicos[id_zona % len(tecnicos)]])
+        red.agregar_zona(zona)
+    return red
+
+
+def resumen(red: RedMonitoreo) -> tuple:
+    """Resume la red para comparar la original con la cargada."""
+    sensores = valores = 0
+    alertas = []
+    for zona in red.get_zonas():
+        for sensor in zona.get_sensores_internal():
+            sensores += 1
+            valores += sensor.get_valor_actual() or 0.0
+        alertas.append(zona.evaluar_condiciones())
+    return sensores, round(valores, 3), alertas
+
+
+def medir(nombre: str, escribir, leer, ruta: str, red: RedMonitoreo, esperado: tuple) -> None:
+    """Guarda y carga la red con un formato y muestra tiempos y tamaño."""
+    t0 = time.perf_counter()
+    with open(ruta, "wb") as f:
+        escribir(red, f)
+    escritura = time.perf_counter() - t0
+    gc.collect()
+
+    t0 = time.perf_counter()
+    with open(ruta, "rb") as f:
+        cargada = leer(f)
+    lectura = time.perf_counter() - t0
+    correcta = resumen(cargada) == esperado
+    print(f"{nombre:<16}{escritura:>12.2f}{lectura:>12.2f}{os.path.getsize(ruta) / 1e6:>13.1f}"
+          f"{'   sí' if correcta else '   NO':>11}")
+    del cargada
+    gc.collect()
+
+
+def main():
+    cantidad_zonas = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    sensores_por_zona = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    directorio = tempfile.mkdtemp(prefix="bench_codec_")
+
+    print("======================================================================")
+    print(f"  CODEC BINARIO vs PICKLE - {cantidad_zonas:,} zonas × {sensores_por_zona} sensores")
+    print("======================================================================")
+    t0 = time.perf_counter()
+    red = armar_red(cantidad_zonas, sensores_por_zona)
+    esperado = resumen(red)
+    print(f"Red armada en {time.perf_counter() - t0:.1f} s ({esperado[0]:,} sensores)")
+    print(f"{'Formato':<16}{'Escritura s':>12}{'Lectura s':>12}{'Tamaño MB':>13}{'Correcta':>11}")
+    try:
+        medir("pickle", lambda r, f: pickle.dump(r, f, protocol=pickle.HIGHEST_PROTOCOL), pickle.load,
+              os.path.join(directorio, "red.dat"), red, esperado)
+        medir("codec binario", codificar_red, decodificar_red,
+              os.path.join(directorio, "red.bin"), red, esperado)
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark: lecturas como objetos (EventoSensorAmbiental) vs. columnas (LoteLecturas).
+
+Para cada tamaño mide construcción, filtrado por tipo, estadísticas por tipo
+y último valor por (zona, tipo).
+
+Uso:
+    python benchmarks/bench_lote_lecturas.py [exponente_maximo] [exponente_maximo_objetos]
+
+Por defecto recorre 10^4 a 10^7 lecturas; la ruta de objetos se limita a 10^6
+porque a 10^7 necesita varios GB de memoria (pasar 7 como segundo argumento para incluirla).
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from python_iotmonitor.entidades.sensores.tipo_sensor import TipoSensor
+from python_iotmonitor.patrones.observer.eventos.evento_sensor_ambiental import EventoSensorAmbiental
+from python_iotmonitor.patrones.observer.eventos.lote_lecturas import LoteLecturas
+
+CANTIDAD_ZONAS = 100
+
+
+def generar_columnas(cantidad: int, rng: np.random.Generator):
+    """Genera columnas aleatorias de lecturas."""
+    ids = rng.integers(0, cantidad // 4 + 1, cantidad)
+    codigos = rng.integers(1, 5, cantidad).astype("u1")
+    valores = rng.uniform(0.0, 1000.0, cantidad)
+    timestamps = time.time_ns() + np.arange(cantidad, dtype="<i8")
+    zonas = (ids % CANTIDAD_ZONAS).astype("<i4")
+    return ids, codigos, valores, timestamps, zonas
+
+
+def medir_objetos(columnas) -> dict:
+    """Procesa las lecturas como lista de EventoSensorAmbiental."""
+    ids, codigos, valores, timestamps, zonas = (c.tolist() for c in columnas)
+    t0 = time.perf_counter()
+    tipos = list(TipoSensor)
+    eventos = [
+        EventoSensorAmbiental(tipos[c], v, tipos[c].unidad, i, z, t)
+        for i, c, v, t, z in zip(ids, codigos, valores, timestamps, zonas)
+    ]
+    t1 = time.perf_counter()
+    temperaturas = [e for e in eventos if e.codigo_tipo == TipoSensor.TEMPERATURA]
+    t2 = time.perf_counter()
+    acumulado = {}
+    for e in eventos:
+        total = acumulado.setdefault(e.codigo_tipo, [0, 0.0, float("inf"), float("-inf")])
+        total[0] += 1
+        total[1] += e.valor
+        total[2] = min(total[2], e.valor)
+        total[3] = max(total[3], e.valor)
+    t3 = time.perf_counter()
+    ultimos = {}
+    for e in eventos:
+        ultimos[(e.id_zona, e.codigo_tipo)] = e.valor
+    t4 = time.perf_counter()
+    assert temperaturas is not None
+    return {"construir": t1 - t0, "filtrar": t2 - t1, "estadisticas": t3 - t2, "ultimos": t4 - t3}
+
+
+def medir_columnas(columnas) -> dict:
+    """Procesa las lecturas como LoteLecturas."""
+    t0 = time.perf_counter()
+    lote = LoteLecturas.desde_columnas(*columnas[:4], ids_zona=columnas[4])
+    t1 = time.perf_counter()
+    temperaturas = lote.filtrar_tipo(TipoSensor.TEMPERATURA)
+    t2 = time.perf_counter()
+    lote.estadisticas_por_tipo()
+    t3 = time.perf_counter()
+    lote.ultimos_por_zona_y_tipo()
+    t4 = time.perf_counter()
+    assert len(temperaturas) >= 0
+    return {"construir": t1 - t0, "filtrar": t2 - t1, "estadisticas": t3 - t2, "ultimos": t4 - t3}
+
+
+def main():
+    exponente_maximo = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    exponente_objetos = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+    rng = np.random.default_rng(2025)
+
+    print("======================================================================")
+    print("   BENCHMARK LECTURAS: OBJETOS vs LOTE COLUMNAR")
+    print("======================================================================")
+    for exponente in range(4, exponente_maximo + 1):
+        cantidad = 10 ** exponente
+        columnas = generar_columnas(cantidad, rng)
+        resultados = [("columnas", medir_columnas(columnas))]
+        if exponente <= exponente_objetos:
+            resultados.insert(0, ("objetos", medir_objetos(columnas)))
+
+        print(f"\n--- 10^{exponente} lecturas ---")
+        for nombre, tiempos in resultados:
+            total = sum(tiempos.values())
+            detalle = " | ".join(f"{k}: {v * 1000:8.1f}ms" for k, v in tiempos.items())
+            print(f"[{nombre:>8}] {detalle} | total: {total * 1000:9.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark: sensores con un hilo por sensor vs. sensores asyncio en un único event loop.
+
+Uso:
+    python benchmarks/bench_observer_async.py [cantidad_sensores] [duracion_segundos] [intervalo]
+"""
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from python_iotmonitor.iot_control.sensores.temperatura_reader_task import TemperaturaReaderTask
+from python_iotmonitor.iot_control.sensores.humedad_reader_task import HumedadReaderTask
+from python_iotmonitor.iot_control.sensores.temperatura_reader_async import TemperaturaReaderAsync
+from python_iotmonitor.iot_control.sensores.humedad_reader_async import HumedadReaderAsync
+
+
+class ContadorEventos:
+    """Observador sincrónico mínimo: cuenta los eventos recibidos."""
+
+    def __init__(self):
+        self.cantidad = 0
+        self._lock = threading.Lock()
+
+    def actualizar(self, evento) -> None:
+        with self._lock:
+            self.cantidad += 1
+
+
+def medir_hilos(cantidad: int, duracion: float, intervalo: float) -> dict:
+    """Ejecuta `cantidad` ReaderTask (un hilo cada uno) durante `duracion` segundos."""
+    contador = ContadorEventos()
+    silencio = io.StringIO()
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(silencio):
+        sensores = []
+        for i in range(cantidad):
+            clase = TemperaturaReaderTask if i % 2 == 0 else HumedadReaderTask
+            sensor = clase(i + 1, intervalo=intervalo)
+            sensor.agregar_observer(contador)
+            sensores.append(sensor)
+        for sensor in sensores:
+            sensor.start()
+        tiempo_arranque = time.perf_counter() - inicio
+        hilos = threading.active_count()
+
+        time.sleep(duracion)
+        for sensor in sensores:
+            sensor.parar()
+        for sensor in sensores:
+            sensor.join()
+
+    return {"arranque_s": tiempo_arranque, "eventos": contador.cantidad, "hilos": hilos}
+
+
+def medir_asyncio(cantidad: int, duracion: float, intervalo: float) -> dict:
+    """Ejecuta `cantidad` ReaderAsync en un único event loop durante `duracion` segundos."""
+    contador = ContadorEventos()
+
+    async def simular():
+        inicio = time.perf_counter()
+        sensores = []
+        for i in range(cantidad):
+            clase = TemperaturaReaderAsync if i % 2 == 0 else HumedadReaderAsync
+            sensor = clase(i + 1, intervalo=intervalo)
+            sensor.agregar_observer(contador)  # adaptado vía ObserverSyncAdapter
+            sensores.append(sensor)
+        tareas = [asyncio.create_task(sensor.ejecutar()) for sensor in sensores]
+        tiempo_arranque = time.perf_counter() - inicio
+        hilos = threading.active_count()
+
+        await asyncio.sleep(duracion)
+        for sensor in sensores:
+            sensor.parar()
+        await asyncio.gather(*tareas)
+        return tiempo_arranque, hilos
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        tiempo_arranque, hilos = asyncio.run(simular())
+
+    return {"arranque_s": tiempo_arranque, "eventos": contador.cantidad, "hilos": hilos}
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    duracion = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    intervalo = float(sys.argv[3]) if len(sys.argv) > 3 else 0.1
+
+    print("======================================================================")
+    print("   BENCHMARK OBSERVER: HILOS vs ASYNCIO")
+    print("======================================================================")
+    print(f"Sensores: {cantidad} | Duración: {duracion}s | Intervalo: {intervalo}s\n")
+
+    for nombre, medir in (("hilos", medir_hilos), ("asyncio", medir_asyncio)):
+        resultado = medir(cantidad, duracion, intervalo)
+        print(
+            f"[{nombre:>7}] arranque: {resultado['arranque_s']:.3f}s | "
+            f"eventos: {resultado['eventos']} ({resultado['eventos'] / duracion:.0f}/s) | "
+            f"hilos activos: {resultado['hilos']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: carga diferida de zonas (RedDiferida) contra la carga completa del codec binario.
+
+Guarda la misma red en un archivo del codec y en el formato de un registro
+por zona, y compara el tiempo hasta tener la red disponible, el acceso a
+una zona puntual y un recorrido completo con un LRU acotado (midiendo las
+filas del SensorStore que quedan ocupadas).
+
+Uso:
+    python benchmarks/bench_red_diferida.py [cantidad_zonas] [sensores_por_zona] [capacidad_lru]
+
+Por defecto 10.000 zonas × 100 sensores y un LRU de 256 zonas.
+"""
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bench_codec_red import armar_red, resumen
+from python_iotmonitor.entidades.sensores.sensor_store import SensorStore
+from python_iotmonitor.persistencia.codec_binario import codificar_red, decodificar_red
+from python_iotmonitor.persistencia.red_diferida import RedDiferida
+
+
+def main():
+    cantidad_zonas = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    sensores_por_zona = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    capacidad = int(sys.argv[3]) if len(sys.argv) > 3 else 256
+    directorio = tempfile.mkdtemp(prefix="bench_diferida_")
+    store = SensorStore.get_instance()
+
+    print("======================================================================")
+    print(f"  CARGA DIFERIDA DE ZONAS - {cantidad_zonas:,} zonas × {sensores_por_zona} sensores, LRU {capacidad}")
+    print("======================================================================")
+    try:
+        red = armar_red(cantidad_zonas, sensores_por_zona)
+        esperado = resumen(red)
+        ruta_codec = os.path.join(directorio, "red.bin")
+        with open(ruta_codec, "wb") as f:
+            codificar_red(red, f)
+        t0 = time.perf_counter()
+        RedDiferida.escribir(red, os.path.join(directorio, "zonas")).cerrar()
+        print(f"Escritura de un registro por zona: {time.perf_counter() - t0:.2f} s")
+        del red
+        gc.collect()
+
+        t0 = time.perf_counter()
+        with open(ruta_codec, "rb") as f:
+            completa = decodificar_red(f)
+        carga = time.perf_counter() - t0
+        print(f"Codec (red completa):   disponible en {carga * 1e3:>10.1f} ms, "
+              f"{len(store):,} filas del SensorStore")
+        del completa
+        gc.collect()
+
+        t0 = time.perf_counter()
+        diferida = RedDiferida(os.path.join(directorio, "zonas"), capacidad)
+        apertura = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        diferida.get_zona(cantidad_zonas // 2).evaluar_condiciones()
+        primera = time.perf_counter() - t0
+        print(f"RedDiferida (índice):   disponible en {apertura * 1e3:>10.1f} ms, "
+              f"primera zona en {primera * 1e3:.2f} ms ({diferida.get_total_sensores():,} sensores en el índice)")
+
+        t0 = time.perf_counter()
+        sensores = sum(zona.get_cantidad_sensores() for zona in diferida.iterar_zonas())
+        recorrido = time.perf_counter() - t0
+        gc.collect()
+        print(f"Recorrido completo:     {recorrido:.2f} s ({sensores:,} sensores), "
+              f"{diferida.get_zonas_en_memoria()} zonas y {len(store):,} filas del SensorStore retenidas")
+        print(f"Resumen igual al original: {'sí' if resumen(diferida) == esperado else 'NO'}")
+        diferida.cerrar()
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark: ingesta y consulta del almacén de series de tiempo (AlmacenSeries).
+
+Simula sensores que leen cada INTERVALO_S segundos (con jitter de pocos ms)
+valores redondeados a un decimal, como los de los sensores reales. Mide la
+ingesta por lotes columnares (actualizar_lecturas) y por eventos
+(actualizar_lote), los bytes por lectura en disco, la consulta de un sensor
+y el análisis por zona sobre el archivo exportado y mapeado en memoria (ArchivoLecturas).
+
+Uso:
+    python benchmarks/bench_series_tiempo.py [cantidad_sensores] [lecturas_por_sensor]
+
+Por defecto 10.000 sensores × 200 lecturas (2 millones de lecturas).
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from python_iotmonitor.patrones.observer.eventos.lote_lecturas import LoteLecturas
+from python_iotmonitor.patrones.observer.eventos.evento_lote import EventoLote
+from python_iotmonitor.persistencia.almacen_series import AlmacenSeries
+
+INTERVALO_S = 2.0
+CANTIDAD_ZONAS = 100
+
+
+def generar_ciclos(cantidad_sensores: int, ciclos: int, rng: np.random.Generator):
+    """Genera un LoteLecturas por ciclo de lectura (todos los sensores leen una vez)."""
+    ids = np.arange(cantidad_sensores, dtype="<i8")
+    codigos = (ids % 4 + 1).astype("u1")
+    zonas = (ids % CANTIDAD_ZONAS).astype("<i4")
+    valores = np.round(rng.uniform(15.0, 30.0, cantidad_sensores), 1)
+    inicio = time.time_ns()
+    lotes = []
+    for ciclo in range(ciclos):
+        valores = np.round(valores + rng.choice([-0.1, 0.0, 0.0, 0.1], cantidad_sensores), 1)
+        jitter = rng.integers(-3_000_000, 3_000_000, cantidad_sensores)
+        ts = inicio + int(ciclo * INTERVALO_S * 1e9) + jitter
+        lotes.append(LoteLecturas.desde_columnas(ids, codigos, valores, ts, zonas))
+    return lotes
+
+
+def medir(nombre: str, almacen: AlmacenSeries, ingerir, cantidad: int) -> None:
+    """Mide una ingesta completa (incluido el sellado final) y muestra su resultado."""
+    t0 = time.perf_counter()
+    ingerir()
+    almacen.sellar()
+    duracion = time.perf_counter() - t0
+    estadisticas = almacen.get_estadisticas()
+    print(f"{nombre:<28}{cantidad:>12,}{cantidad / duracion * 60 / 1e6:>16.1f}"
+          f"{estadisticas['bytes_por_punto']:>14.2f}{estadisticas['segmentos']:>11}")
+
+
+def main():
+    cantidad_sensores = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    ciclos = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    cantidad = cantidad_sensores * ciclos
+    lotes = generar_ciclos(cantidad_sensores, ciclos, np.random.default_rng(7))
+    directorio = tempfile.mkdtemp(prefix="bench_series_")
+
+    print("======================================================================")
+    print(f"  ALMACÉN DE SERIES DE TIEMPO - {cantidad_sensores:,} sensores × {ciclos} lecturas")
+    print("======================================================================")
+    print(f"{'Ingesta':<28}{'Lecturas':>12}{'M lect./min':>16}{'Bytes/lect.':>14}{'Segmentos':>11}")
+    try:
+        columnar = AlmacenSeries(os.path.join(directorio, "columnar"))
+        medir("Lotes columnares", columnar,
+              lambda: [columnar.actualizar_lecturas(lote) for lote in lotes], cantidad)
+
+        # La ruta de eventos convierte cada lectura en objeto: se mide sobre una parte
+        parte = lotes[:max(1, len(lotes) // 10)]
+        eventos = [EventoLote(lote.a_eventos()) for lote in parte]
+        por_eventos = AlmacenSeries(os.path.join(directorio, "eventos"))
+        medir("Eventos (actualizar_lote)", por_eventos,
+              lambda: [por_eventos.actualizar_lote(lote) for lote in eventos],
+              sum(len(lote) for lote in parte))
+
+        print("----------------------------------------------------------------------")
+        id_sensor = cantidad_sensores // 2
+        t0 = time.perf_counter()
+        historial = columnar.consultar(id_sensor)
+        duracion = time.perf_counter() - t0
+        esperado = np.array([lote.valores[id_sensor] for lote in lotes])
+        correcto = np.array_equal(historial.valores, esperado)
+        print(f"Consulta del sensor {id_sensor}: {len(historial)} lecturas en {duracion * 1e3:.2f} ms "
+              f"(valores {'correctos' if correcto else 'DISTINTOS'})")
+        print(f"Tamaño sin comprimir: {lotes[0].get_datos().itemsize} bytes por lectura")
+
+        print("----------------------------------------------------------------------")
+        t0 = time.perf_counter()
+        historial = columnar.exportar_archivo(os.path.join(directorio, "historial.lec"))
+        duracion = time.perf_counter() - t0
+        print(f"Exportación a archivo mapeado: {len(historial):,} lecturas en {duracion:.2f} s")
+        t0 = time.perf_counter()
+        for id_zona in historial.get_ids_zona().tolist():
+            historial.zona(id_zona).estadisticas_por_tipo()
+        duracion = time.perf_counter() - t0
+        print(f"Estadísticas de {CANTIDAD_ZONAS} zonas sobre vistas (sin copias): {duracion * 1e3:.1f} ms")
+        del historial
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
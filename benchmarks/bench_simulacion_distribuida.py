@@ -0,0 +1,43 @@
+"""
+Benchmark: escalado de la simulación distribuida según la cantidad de procesos.
+
+Simula el mismo despliegue (trabajo fijo) con 1, 2, 4, ... procesos hasta la
+cantidad de núcleos y muestra lecturas por segundo y aceleración respecto de
+un proceso. Cada proceso crea sus sensores antes de medir sus ticks, así que
+la aceleración de los ticks se informa aparte del tiempo total de pared.
+
+Uso:
+    python benchmarks/bench_simulacion_distribuida.py [zonas] [sensores_por_zona] [ticks] [procesos_maximos]
+"""
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from python_iotmonitor.simulacion.simulacion_distribuida import SimulacionDistribuida
+
+
+def main():
+    zonas = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    por_zona = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    ticks = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    procesos_maximos = int(sys.argv[4]) if len(sys.argv) > 4 else (os.cpu_count() or 1)
+
+    print("======================================================================")
+    print("   BENCHMARK SIMULACIÓN DISTRIBUIDA: ESCALADO POR PROCESOS")
+    print("======================================================================")
+    print(f"Despliegue: {zonas} zonas × {por_zona} sensores, {ticks} ticks, {os.cpu_count()} núcleos\n")
+
+    procesos = 1
+    base = None
+    while procesos <= procesos_maximos:
+        resumen = SimulacionDistribuida(zonas, por_zona, procesos, semilla=2025).ejecutar(ticks)
+        rendimiento = resumen.get_lecturas_por_segundo()
+        base = base or rendimiento
+        print(f"[{procesos:>3} proc] {rendimiento / 1e6:8.2f} M lecturas/s | aceleración: {rendimiento / base:5.2f}x "
+              f"| pared: {resumen.segundos:6.2f}s")
+        procesos *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark: simulación de un tick de lecturas, sensor por sensor vs. modo masivo.
+
+La ruta por sensor sortea y asigna cada valor con set_valor_actual (y notifica a
+la zona en cada escritura); el modo masivo usa ZonaService.simular_lecturas_zonas:
+un sorteo por tipo, una escritura en el SensorStore y un recálculo de alertas.
+
+Uso:
+    python benchmarks/bench_simulacion_masiva.py [cantidad_sensores] [sensores_por_zona] [ticks]
+
+Por defecto simula 10^6 sensores en zonas de 100; la ruta por sensor se mide
+sobre una muestra de 10^5 sensores y se extrapola.
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from python_iotmonitor.entidades.zonas.zona import Zona
+from python_iotmonitor.entidades.sensores.sensor_temperatura import SensorTemperatura
+from python_iotmonitor.entidades.sensores.sensor_humedad import SensorHumedad
+from python_iotmonitor.entidades.sensores.sensor_co2 import SensorCO2
+from python_iotmonitor.entidades.sensores.sensor_luz import SensorLuz
+from python_iotmonitor.servicios.zonas.zona_service import ZonaService
+from python_iotmonitor.simulacion.generador_simulacion import GeneradorSimulacion
+
+CREADORES_SENSOR = (
+    lambda: SensorTemperatura("Bench"),
+    lambda: SensorHumedad("Bench"),
+    lambda: SensorCO2("Bench"),
+    lambda: SensorLuz(),
+)
+MUESTRA_POR_SENSOR = 100_000
+
+
+def crear_despliegue(cantidad: int, por_zona: int):
+    """Crea las zonas con sensores de los cuatro tipos repartidos en partes iguales."""
+    zonas = []
+    for id_zona in range(1, cantidad // por_zona + 1):
+        zona = Zona(id_zona, f"Zona {id_zona}", None, "Interior")
+        for posicion in range(por_zona):
+            zona.agregar_sensor(CREADORES_SENSOR[posicion % len(CREADORES_SENSOR)]())
+        zonas.append(zona)
+    return zonas
+
+
+def medir_por_sensor(zonas, limite: int) -> tuple:
+    """Ruta clásica: un sorteo y un set_valor_actual por sensor. Devuelve (segundos, sensores)."""
+    sensores = [sensor for zona in zonas for sensor in zona.get_sensores_internal()][:limite]
+    t0 = time.perf_counter()
+    for sensor in sensores:
+        sensor.set_valor_actual(random.uniform(*sensor.get_rango()))
+    for zona in zonas:
+        zona.evaluar_condiciones()
+    return time.perf_counter() - t0, len(sensores)
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    por_zona = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    ticks = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+    print("======================================================================")
+    print("   BENCHMARK SIMULACIÓN: SENSOR POR SENSOR vs MODO MASIVO")
+    print("======================================================================")
+    t0 = time.perf_counter()
+    zonas = crear_despliegue(cantidad, por_zona)
+    print(f"Despliegue: {len(zonas)} zonas, {cantidad} sensores (creado en {time.perf_counter() - t0:.1f}s)")
+
+    servicio = ZonaService()
+    generador = GeneradorSimulacion(2025)
+    tiempos = []
+    for _ in range(ticks):
+        t0 = time.perf_counter()
+        servicio.simular_lecturas_zonas(zonas, generador)
+        tiempos.append(time.perf_counter() - t0)
+    print(f"[  masivo] mejor tick: {min(tiempos) * 1000:8.1f}ms | medio: {sum(tiempos) / ticks * 1000:8.1f}ms")
+
+    muestra = zonas[:max(1, MUESTRA_POR_SENSOR // por_zona)]
+    segundos, medidos = medir_por_sensor(muestra, MUESTRA_POR_SENSOR)
+    estimado = segundos / medidos * cantidad
+    print(f"[ sensor ] {medidos} sensores en {segundos * 1000:8.1f}ms → estimado por tick: {estimado * 1000:9.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
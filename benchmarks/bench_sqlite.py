@@ -0,0 +1,132 @@
+"""
+Benchmark: backend SQLite contra la persistencia con pickle.
+
+Compara, para la misma red, el guardado y la carga completos; la ingesta de
+lecturas con un commit por ciclo de control (SQLite con `executemany` en modo
+WAL contra un pickle por ciclo agregado a un archivo con fsync) y la consulta
+del historial de un sensor (índice (id_sensor, ts) contra leer todos los
+lotes y filtrar).
+
+Uso:
+    python benchmarks/bench_sqlite.py [cantidad_zonas] [sensores_por_zona] [ciclos]
+
+Por defecto 1.000 zonas × 100 sensores y 20 ciclos (una lectura por sensor y ciclo).
+"""
+import gc
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bench_codec_red import armar_red, resumen
+from python_iotmonitor.entidades.sensores.sensor_store import SensorStore
+from python_iotmonitor.patrones.observer.eventos.lote_lecturas import LoteLecturas
+from python_iotmonitor.persistencia.repositorio_sqlite import RepositorioSQLite
+
+
+def lotes_por_ciclo(red, ciclos: int):
+    """Arma un lote con una lectura por sensor para cada ciclo."""
+    zonas = red.get_zonas()
+    indices = np.concatenate([zona.get_indices_store() for zona in zonas])
+    ids_zona = np.repeat([zona.get_id_zona() for zona in zonas], [zona.get_cantidad_sensores() for zona in zonas])
+    store = SensorStore.get_instance()
+    ids, codigos = store.columna("id_sensor", indices), store.columna("codigo_tipo", indices)
+    generador = np.random.default_rng(7)
+    return [
+        LoteLecturas.desde_columnas(ids, codigos, generador.uniform(0, 100, len(ids)), ciclo * 1_000_000_000, ids_zona)
+        for ciclo in range(ciclos)
+    ]
+
+
+def main():
+    cantidad_zonas = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+    sensores_por_zona = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    ciclos = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    directorio = tempfile.mkdtemp(prefix="bench_sqlite_")
+
+    print("======================================================================")
+    print(f"  SQLITE vs PICKLE - {cantidad_zonas:,} zonas × {sensores_por_zona} sensores, {ciclos} ciclos")
+    print("======================================================================")
+    try:
+        red = armar_red(cantidad_zonas, sensores_por_zona)
+        esperado = resumen(red)
+        lotes = lotes_por_ciclo(red, ciclos)
+        lecturas = sum(len(lote) for lote in lotes)
+        id_consulta = int(lotes[0].get_datos()["id_sensor"][len(lotes[0]) // 2])
+
+        # --- Red completa ---
+        print(f"{'Red completa':<16}{'Guardado s':>12}{'Carga s':>12}{'Correcta':>11}")
+        ruta_pickle = os.path.join(directorio, "red.dat")
+        t0 = time.perf_counter()
+        with open(ruta_pickle, "wb") as f:
+            pickle.dump(red, f, protocol=pickle.HIGHEST_PROTOCOL)
+        guardado = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        with open(ruta_pickle, "rb") as f:
+            cargada = pickle.load(f)
+        carga = time.perf_counter() - t0
+        print(f"{'pickle':<16}{guardado:>12.2f}{carga:>12.2f}{'sí' if resumen(cargada) == esperado else 'NO':>11}")
+        del cargada
+        gc.collect()
+
+        repositorio = RepositorioSQLite(os.path.join(directorio, "red.sqlite"))
+        t0 = time.perf_counter()
+        repositorio.guardar_red(red)
+        guardado = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        cargada = repositorio.cargar_red(red.get_id())
+        carga = time.perf_counter() - t0
+        print(f"{'sqlite':<16}{guardado:>12.2f}{carga:>12.2f}{'sí' if resumen(cargada) == esperado else 'NO':>11}")
+        del cargada
+        gc.collect()
+
+        # --- Ingesta: un commit (o fsync) por ciclo ---
+        print(f"\nIngesta de {lecturas:,} lecturas ({len(lotes[0]):,} por ciclo, commit por ciclo)")
+        ruta_lecturas = os.path.join(directorio, "lecturas.dat")
+        t0 = time.perf_counter()
+        with open(ruta_lecturas, "ab") as f:
+            for lote in lotes:
+                pickle.dump(lote, f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.flush()
+                os.fsync(f.fileno())
+        ingesta = time.perf_counter() - t0
+        print(f"{'pickle':<16}{ingesta:>8.2f} s{lecturas / ingesta:>14,.0f} lecturas/s")
+
+        t0 = time.perf_counter()
+        for lote in lotes:
+            repositorio.registrar_lecturas(lote)
+            repositorio.confirmar()
+        ingesta = time.perf_counter() - t0
+        print(f"{'sqlite':<16}{ingesta:>8.2f} s{lecturas / ingesta:>14,.0f} lecturas/s")
+
+        # --- Historial de un sensor ---
+        print(f"\nHistorial del sensor {id_consulta}")
+        t0 = time.perf_counter()
+        encontradas = 0
+        with open(ruta_lecturas, "rb") as f:
+            while True:
+                try:
+                    datos = pickle.load(f).get_datos()
+                except EOFError:
+                    break
+                encontradas += int(np.count_nonzero(datos["id_sensor"] == id_consulta))
+        consulta = time.perf_counter() - t0
+        print(f"{'pickle':<16}{consulta * 1e3:>10.2f} ms ({encontradas} lecturas)")
+
+        t0 = time.perf_counter()
+        historial = repositorio.consultar_lecturas(id_consulta)
+        consulta = time.perf_counter() - t0
+        print(f"{'sqlite':<16}{consulta * 1e3:>10.2f} ms ({len(historial)} lecturas)")
+        repositorio.cerrar()
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@ from python_iotmonitor.patrones.singleton.sensor_registry import SensorRegistry
 from python_iotmonitor.iot_control.control.iot_control import ControlAmbientalTask
 from python_iotmonitor.constantes import CONTROL_AMBIENTAL_CICLO_SEGUNDOS as CICLO_CONTROL
 from python_iotmonitor.entidades.zonas.zona import Zona
+from python_iotmonitor.entidades.zonas.red_monitoreo import RedMonitoreo
 from python_iotmonitor.servicios.zonas.red_service import RedMonitoreoService
 
 def setup_sistema():
@@ -31,22 +32,37 @@ def setup_sistema():
     registry.registrar_sensor(sensor_temp.id_sensor, sensor_temp)
     registry.registrar_sensor(sensor_hum.id_sensor, sensor_hum)
 
-    # 3️⃣ Crear la zona ambiental y el controlador central
-    zona_lab = Zona(
-        id_zona=1,
-        nombre="Laboratorio Central",
-        ubicada_en="Edificio Principal",
-        tipo="Interior"
-    )
-
+    # 3️⃣ Crear (o recuperar) la red, la zona ambiental y el controlador central
+    # La red se persiste de forma incremental (checkpoint + bitácora): si ya hay un
+    # checkpoint se recupera junto con la bitácora en lugar de sobrescribirlo
+    red_service = RedMonitoreoService()
+    if red_service.existe_red_persistente():
+        red_persistente = red_service.recuperar_red()
+        red = red_persistente.get_red()
+    else:
+        red = RedMonitoreo(1, "Edificio Principal", "Red de monitoreo ambiental")
+        red_persistente = red_service.abrir_red_persistente(red)
+    almacen_series = red_service.abrir_almacen_series()
+    zona_lab = red.get_zona(1)
+    if zona_lab is None:
+        zona_lab = Zona(
+            id_zona=1,
+            nombre="Laboratorio Central",
+            ubicada_en=red,
+            tipo="Interior"
+        )
+        red_persistente.agregar_zona(zona_lab)
+    red_persistente.confirmar()
 
     control_ambiental = ControlAmbientalTask(zona_lab, registry)
 
-    # 4️⃣ Enlazar sensores con el controlador (Observer)
-    sensor_temp.agregar_observer(control_ambiental)
-    sensor_hum.agregar_observer(control_ambiental)
+    # 4️⃣ Enlazar sensores con el controlador, la bitácora y el historial (Observer)
+    for sensor in (sensor_temp, sensor_hum):
+        sensor.agregar_observer(control_ambiental)
+        sensor.agregar_observer(red_persistente)
+        sensor.agregar_observer(almacen_series)
 
-    return sensor_temp, sensor_hum, control_ambiental
+    return sensor_temp, sensor_hum, control_ambiental, red_persistente, almacen_series
 
 
 # =========================================================================
@@ -82,7 +98,7 @@ def main_simulacion():
     # ----------------------------------------------------------------------
     # 2. CREACIÓN DE SENSORES (FACTORY METHOD)
     # ----------------------------------------------------------------------
-    sensor_temp, sensor_hum, control_ambiental = setup_sistema()
+    sensor_temp, sensor_hum, control_ambiental, red_persistente, almacen_series = setup_sistema()
 
     print("----------------------------------------------------------------------")
     print("   CREACIÓN DE SENSORES Y CONTROLADOR (FACTORY + OBSERVER)")
@@ -119,8 +135,10 @@ def main_simulacion():
     # === Persistencia ===
     print("\n[Sistema] Guardando estado de la red de monitoreo...")
     try:
-        red_service = RedMonitoreoService()
-        red_service.guardar_red(red_service)  
+        red_persistente.confirmar()
+        red_persistente.checkpoint()
+        red_persistente.cerrar()
+        almacen_series.cerrar()
     except Exception as e:
         print(f"[ERROR] No se pudo guardar la red: {e}")
 
@@ -5,6 +5,13 @@ import os
 # ===============================================
 RUTA_PERSISTENCIA = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
 NOMBRE_ARCHIVO_PERSISTENCIA = "red_monitoreo_test.dat"
+WAL_CHECKPOINT_BYTES = 64 * 1024 * 1024  # Tamaño de la bitácora (WAL) que dispara un checkpoint automático
+SNAPSHOT_GENERACIONES = 3  # Versiones de cada snapshot que se conservan (la actual + respaldos)
+SERIES_PUNTOS_POR_SEGMENTO = 1_000_000  # Lecturas acumuladas que se sellan en un segmento de series de tiempo
+SERIES_RESOLUCION_NS = 1_000_000  # Resolución de los timestamps guardados en los segmentos (1 ms)
+CODEC_ZONAS_POR_BLOQUE = 1024  # Zonas por grupo de bloques en el formato binario de la red
+RED_DIFERIDA_ZONAS_EN_MEMORIA = 1024  # Zonas leídas bajo demanda que se retienen en memoria (LRU)
+SQLITE_SINCRONIZACION = "NORMAL"  # PRAGMA synchronous del backend SQLite (WAL: NORMAL no corrompe; FULL hace durable cada commit)
 
 # ===============================================
 # === Constantes de Excepciones y Mensajes ===
@@ -36,6 +43,27 @@ CO2_MAX_LECTURA = 2000.0
 LUZ_MIN_LECTURA = 100.0     # lux
 LUZ_MAX_LECTURA = 10000.0
 
+# Almacén columnar de sensores (SensorStore)
+SENSOR_STORE_CAPACIDAD_INICIAL = 1024   # Filas reservadas al crear el almacén
+SENSOR_STORE_FRANJAS_LOCK = 64          # Locks compartidos por franjas de filas
+
+# Tabla de últimos valores en memoria compartida (lectura entre procesos)
+TABLA_ULTIMOS_VALORES_CAPACIDAD = 1 << 20  # Casilleros (IDs de sensor 0..capacidad-1)
+
+# ===============================================
+# === Planificador de Lecturas (Scheduler) ===
+# ===============================================
+
+PLANIFICADOR_CANTIDAD_WORKERS = 4   # Hilos fijos que ejecutan las lecturas programadas
+PLANIFICADOR_TAMANO_TANDA = 256     # Lecturas vencidas que toma cada worker por vez
+
+# ===============================================
+# === Bus de Eventos (Observer desacoplado) ===
+# ===============================================
+
+BUS_CAPACIDAD_BUFFER = 4096         # Eventos máximos en espera por suscriptor
+BUS_TAMANO_TANDA_ENTREGA = 256      # Eventos entregados por llamada al suscriptor
+
 # ===============================================
 # === Constantes del Control Ambiental (Strategy) ===
 # ===============================================
@@ -44,16 +72,40 @@ LUZ_MAX_LECTURA = 10000.0
 TEMP_CRITICA_ALTA = 30.0     # Activar enfriamiento
 TEMP_CRITICA_BAJA = 10.0     # Activar calentamiento (opcional)
 HUMEDAD_CRITICA_BAJA = 35.0  # Activar humidificación
+HUMEDAD_MAX_RIEGO = 40.0     # Humidificación moderada por debajo de este valor
 CO2_CRITICO_ALTO = 1200.0    # Activar ventilación
 LUZ_CRITICA_BAJA = 300.0     # Activar iluminación
 LUZ_CRITICA_ALTA = 9000.0    # Reducir intensidad
 
+# Umbrales de acción del controlador ambiental (Motor de Reglas)
+CONTROL_TEMP_CALEFACCION = 8.0            # °C: por debajo se activa la calefacción
+CONTROL_TEMP_ENFRIAMIENTO = 28.0          # °C: por encima se activa ventilación y enfriamiento
+CONTROL_HUMEDAD_HUMIDIFICAR = 40.0        # %: por debajo se activa el humidificador
+CONTROL_HUMEDAD_DESHUMIDIFICAR = 80.0     # %: por encima se deshumidifica
+CONTROL_CO2_VENTILACION_MODERADA = 600.0  # ppm: ventilación moderada
+CONTROL_CO2_VENTILACION_FORZADA = 900.0   # ppm: ventilación forzada
+CONTROL_LUZ_ENCENDER = 200.0              # lux: por debajo se encienden las luces
+CONTROL_LUZ_REDUCIR = 700.0               # lux: por encima se reduce la luz artificial
+CONTROL_PRESION_BAJA = 950.0              # hPa: por debajo, presión baja (posible tormenta)
+CONTROL_PRESION_ALTA = 1030.0             # hPa: por encima, presión alta (clima estable)
+
+# Umbrales de los servicios de sensores (procesar_lectura), independientes del controlador
+SERVICIO_TEMP_CALEFACCION = 10.0   # °C: por debajo se activa la calefacción
+SERVICIO_TEMP_VENTILACION = 30.0   # °C: por encima se activa la ventilación
+SERVICIO_HUMEDAD_CRITICA = 20.0    # %: humidificador (nivel crítico); moderada hasta HUMEDAD_MAX_RIEGO
+SERVICIO_CO2_ALTO = 700.0          # ppm: aumentar ventilación
+SERVICIO_CO2_CRITICO = 1000.0      # ppm: ventilación forzada
+SERVICIO_LUZ_OSCURO = 200.0        # lux: intensificar iluminación
+SERVICIO_LUZ_SOBREILUMINADO = 500.0  # lux: desde este valor se reduce la luz artificial
+
 # ===============================================
 # === Ciclo de Control (Observer + Strategy) ===
 # ===============================================
 
 CONTROL_AMBIENTAL_CICLO_SEGUNDOS = 2.5  # Frecuencia de monitoreo del controlador central
 DURACION_SIMULACION_SEGUNDOS = 30        # Tiempo total de simulación del sistema (tests)
+CONTROL_MAX_ZONAS_DETALLE = 20           # Por encima, el ciclo informa un resumen por acción
+CONTROL_CICLOS_VIGENCIA_VALOR = 4        # Ciclos sin lecturas tras los que se olvida el último valor de (zona, tipo)
 
 # ===============================================
 # === Usuarios y Roles ===
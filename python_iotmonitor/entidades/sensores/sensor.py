@@ -1,37 +1,164 @@
+import copy
 from abc import ABC, abstractmethod
-from typing import Protocol
+from typing import Dict, Optional, Protocol, Tuple, Union, TYPE_CHECKING
+from python_iotmonitor.entidades.sensores.sensor_store import SensorStore
+from python_iotmonitor.entidades.sensores.tipo_sensor import TipoSensor
+
+if TYPE_CHECKING:
+    from python_iotmonitor.entidades.zonas.zona import Zona
 
 # Contador simple para IDs únicos de Sensor
 _SENSOR_ID_COUNTER = 0
 
 
+def nuevo_id_sensor() -> int:
+    """Devuelve un ID de sensor no utilizado."""
+    global _SENSOR_ID_COUNTER
+    _SENSOR_ID_COUNTER += 1
+    return _SENSOR_ID_COUNTER
+
+
+def reservar_id_sensor(id_sensor: int) -> None:
+    """Evita que el contador reasigne un ID ya usado (p. ej. por un sensor cargado desde archivo)."""
+    global _SENSOR_ID_COUNTER
+    _SENSOR_ID_COUNTER = max(_SENSOR_ID_COUNTER, id_sensor)
+
+
 class Serializable(Protocol):
     """Protocolo para indicar que una clase es serializable (Pickle)."""
     pass
 
 
+def _campo_store(columna: str, doc: str) -> property:
+    """Crea una propiedad que lee y escribe un campo de la fila del sensor en el SensorStore."""
+    def leer(self):
+        return self._store.leer(columna, self._indice)
+
+    def escribir(self, valor):
+        self._store.escribir(columna, self._indice, valor)
+
+    return property(leer, escribir, doc=doc)
+
+
+def _nan_a_none(valor: float) -> Optional[float]:
+    """Convierte el NaN con que el SensorStore marca "sin lectura" en None."""
+    return None if valor != valor else valor
+
+
+# Atributos guardados en el SensorStore que se serializan junto al sensor
+_CAMPOS_STORE = ("_valor_actual", "_rango_min", "_rango_max", "_activo", "_calibrado", "_version_valor")
+
+
 class Sensor(ABC, Serializable):
     """
     Clase abstracta base para todos los sensores del sistema IoTMonitor.
     Actúa como interfaz común y garantiza compatibilidad con serialización.
+
+    El valor, el rango y el estado del sensor se guardan en una fila del
+    SensorStore global; el objeto es una vista que conserva solo su índice
+    y los datos descriptivos (id, tipo, unidad, zona).
     """
 
-    def __init__(self, tipo: str):
+    # True: set_valor_actual limita el valor a [rango_min, rango_max]; False: solo a valores >= 0
+    _LIMITA_RANGO = True
+
+    _valor_actual = property(
+        lambda self: _nan_a_none(self._store.leer("valor", self._indice)),
+        lambda self, valor: self._store.escribir("valor", self._indice, float("nan") if valor is None else valor),
+        doc="Último valor leído (None si todavía no hay lectura).",
+    )
+    _rango_min = _campo_store("rango_min", "Valor mínimo de medición.")
+    _rango_max = _campo_store("rango_max", "Valor máximo de medición.")
+    _activo = _campo_store("activo", "Indica si el sensor está activo.")
+    _calibrado = _campo_store("calibrado", "Indica si el sensor está calibrado.")
+    _version_valor = _campo_store("version", "Versión del valor (crece con cada escritura).")
+
+    def __init__(self, tipo: Union[TipoSensor, str]):
         """
         Inicializa la clase base de Sensor.
 
         Args:
-            tipo: Tipo de sensor (e.g., "Temperatura", "Humedad", "CO2", "Luz").
+            tipo: Código TipoSensor (también se acepta el nombre: "Temperatura", "Humedad", "CO2", "Luz").
         """
-        global _SENSOR_ID_COUNTER
-        _SENSOR_ID_COUNTER += 1
-
-        self._id = _SENSOR_ID_COUNTER
-        self._tipo = tipo
-        self._valor_actual = None
+        self._id = nuevo_id_sensor()
+        self._codigo_tipo = tipo if isinstance(tipo, TipoSensor) else TipoSensor.desde_nombre(tipo)
+        self._store = SensorStore.get_instance()
+        self._indice = self._store.asignar(self._id, self._codigo_tipo, self._LIMITA_RANGO)
         self._unidad = ""
-        self._activo = True
-        self._calibrado = False
+        self._zona: Optional["Zona"] = None  # zona notificada en cada cambio de valor
+
+    def __del__(self):
+        """Libera la fila del sensor en el SensorStore."""
+        store = self.__dict__.get("_store")
+        if store is not None:
+            store.liberar(self._indice)
+
+    # --- Copias ---
+    def __copy__(self) -> "Sensor":
+        """Copia el sensor en una fila propia del SensorStore (compartir la fila haría que
+        el __del__ de una copia la liberara mientras la otra la sigue usando)."""
+        copia = type(self).__new__(type(self))
+        copia.__setstate__(self.__getstate__())
+        return copia
+
+    def __deepcopy__(self, memo: Dict[int, object]) -> "Sensor":
+        """Como __copy__, copiando además en profundidad los atributos propios del sensor."""
+        copia = type(self).__new__(type(self))
+        memo[id(self)] = copia
+        copia.__setstate__(copy.deepcopy(self.__getstate__(), memo))
+        return copia
+
+    # --- Métodos de persistencia ---
+    def __getstate__(self):
+        """Devuelve el estado serializable del sensor, incluyendo los campos guardados en el SensorStore."""
+        state = self.__dict__.copy()
+        del state["_store"]
+        del state["_indice"]
+        state["_zona"] = None  # la zona vuelve a vincular sus sensores al cargarse
+        for campo in _CAMPOS_STORE:
+            state[campo] = getattr(self, campo)
+        return state
+
+    def __setstate__(self, state):
+        """Restaura el sensor en una fila nueva del SensorStore (admite archivos con lock propio por sensor)."""
+        state = dict(state)
+        campos = {campo: state.pop(campo) for campo in _CAMPOS_STORE if campo in state}
+        for derivado in ("_lock", "_store", "_indice", "_zona"):
+            state.pop(derivado, None)
+        id_sensor = state.pop("_id")
+        if "_tipo" in state:
+            # Archivos anteriores guardaban el tipo como nombre
+            codigo_tipo = TipoSensor.desde_nombre(state.pop("_tipo"))
+        else:
+            codigo_tipo = state.pop("_codigo_tipo")
+        store = SensorStore.get_instance()
+        indice = store.asignar(id_sensor, codigo_tipo, self._LIMITA_RANGO)
+        self._restaurar(id_sensor, codigo_tipo, state.pop("_unidad", ""), state, store, indice)
+        for campo, valor in campos.items():
+            setattr(self, campo, valor)
+        reservar_id_sensor(self._id)
+
+    def _restaurar(self, id_sensor: int, codigo_tipo: TipoSensor, unidad: str, atributos: Dict[str, object],
+                   store: SensorStore, indice: int) -> None:
+        """
+        Arma el estado de un sensor creado sin __init__, ya con su fila del SensorStore
+        reservada. Lo usan __setstate__ y la carga masiva (codec_binario.crear_sensores).
+
+        Args:
+            id_sensor: ID del sensor.
+            codigo_tipo: Código TipoSensor.
+            unidad: Unidad de medida.
+            atributos: Atributos propios de la subclase (se usan tal cual, sin copiarse).
+            store: SensorStore que guarda el estado del sensor.
+            indice: Fila del sensor en el SensorStore.
+        """
+        atributos["_id"] = id_sensor
+        atributos["_codigo_tipo"] = codigo_tipo
+        atributos["_store"] = store
+        atributos["_indice"] = indice
+        atributos["_unidad"] = unidad
+        atributos["_zona"] = None
+        self.__dict__ = atributos
 
     # --- Métodos abstractos para implementación concreta ---
     @abstractmethod
@@ -50,8 +177,12 @@ class Sensor(ABC, Serializable):
         return self._id
 
     def get_tipo(self) -> str:
-        """Devuelve el tipo del sensor."""
-        return self._tipo
+        """Devuelve el nombre del tipo del sensor (para mostrar)."""
+        return self._codigo_tipo.nombre
+
+    def get_codigo_tipo(self) -> TipoSensor:
+        """Devuelve el código TipoSensor del sensor (para comparar y despachar)."""
+        return self._codigo_tipo
 
     def get_unidad(self) -> str:
         """Devuelve la unidad de medida del sensor."""
@@ -68,10 +199,12 @@ class Sensor(ABC, Serializable):
     def activar(self) -> None:
         """Activa el sensor."""
         self._activo = True
+        self._notificar_estado_zona()
 
     def desactivar(self) -> None:
         """Desactiva el sensor."""
         self._activo = False
+        self._notificar_estado_zona()
 
     def esta_calibrado(self) -> bool:
         """Devuelve True si el sensor fue calibrado correctamente."""
@@ -80,3 +213,46 @@ class Sensor(ABC, Serializable):
     def calibrar(self) -> None:
         """Marca el sensor como calibrado."""
         self._calibrado = True
+        self._notificar_estado_zona()
+
+    # --- Vínculo con la zona (alertas incrementales) ---
+    def get_zona(self) -> Optional["Zona"]:
+        """Devuelve la zona a la que está vinculado el sensor (None si no tiene)."""
+        return self._zona
+
+    def set_zona(self, zona: Optional["Zona"]) -> None:
+        """Vincula el sensor a la zona que se notifica en cada cambio de valor."""
+        self._zona = zona
+
+    def get_valor_versionado(self) -> Tuple[Optional[float], int]:
+        """Devuelve el valor actual junto con su versión, leídos de forma consistente."""
+        return self._store.leer_valor_versionado(self._indice)
+
+    def get_timestamp_valor(self) -> int:
+        """Devuelve el momento (ns desde epoch) de la última escritura del valor; 0 si se desconoce."""
+        return self._store.leer("timestamp_ns", self._indice)
+
+    def get_store(self) -> SensorStore:
+        """Devuelve el SensorStore que guarda el estado del sensor."""
+        return self._store
+
+    def get_indice_store(self) -> int:
+        """Devuelve la fila del sensor en el SensorStore."""
+        return self._indice
+
+    def _reasignar_id(self) -> None:
+        """Asigna un ID nuevo al sensor (solo para reparar IDs repetidos de archivos anteriores)."""
+        self._id = nuevo_id_sensor()
+        self._store.escribir("id_sensor", self._indice, self._id)
+
+    def _notificar_zona(self, valor: Optional[float], version: int) -> None:
+        """Informa el nuevo valor a la zona vinculada (se llama fuera del lock del sensor)."""
+        zona = self._zona
+        if zona is not None:
+            zona.actualizar_alerta_sensor(self, valor, version)
+
+    def _notificar_estado_zona(self) -> None:
+        """Informa a la zona vinculada un cambio de estado activo / calibrado."""
+        zona = self._zona
+        if zona is not None:
+            zona.actualizar_estado_sensor(self)
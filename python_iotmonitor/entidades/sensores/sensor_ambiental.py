@@ -1,6 +1,7 @@
 from abc import ABC
-import threading
+from typing import Union
 from python_iotmonitor.entidades.sensores.sensor import Sensor
+from python_iotmonitor.entidades.sensores.tipo_sensor import TipoSensor
 
 
 class SensorAmbiental(Sensor, ABC):
@@ -9,12 +10,14 @@ class SensorAmbiental(Sensor, ABC):
     Provee control thread-safe sobre los valores leídos y define si requieren calibración ambiental.
     """
 
-    def __init__(self, tipo: str, unidad: str, requiere_calibracion: bool = True):
+    _LIMITA_RANGO = False  # solo se descartan valores negativos
+
+    def __init__(self, tipo: Union[TipoSensor, str], unidad: str, requiere_calibracion: bool = True):
         """
         Inicializa un sensor ambiental.
 
         Args:
-            tipo: Tipo de sensor (Temperatura, Humedad, CO2, Luz, etc.).
+            tipo: Código TipoSensor (o su nombre: Temperatura, Humedad, CO2, Luz, etc.).
             unidad: Unidad de medida del sensor.
             requiere_calibracion: Indica si el sensor necesita calibración inicial.
         """
@@ -22,33 +25,23 @@ class SensorAmbiental(Sensor, ABC):
         self._unidad = unidad
         self._requiere_calibracion = requiere_calibracion
         self._valor_actual = 0.0
-        self._lock = threading.Lock()
 
     # --- Métodos thread-safe ---
     def get_valor_actual(self) -> float:
         """Devuelve el valor actual leído por el sensor (Thread-safe)."""
-        with self._lock:
-            return self._valor_actual
+        return self._valor_actual
 
     def set_valor_actual(self, valor: float) -> None:
         """
         Actualiza el valor del sensor (Thread-safe).
         Asegura que no se asignen valores negativos o nulos inesperados.
         """
-        with self._lock:
-            self._valor_actual = max(0.0, valor)
-
-    # --- Métodos de persistencia ---
-    def __getstate__(self):
-        """Devuelve el estado del sensor a serializar, excluyendo el lock."""
-        state = self.__dict__.copy()
-        del state["_lock"]
-        return state
-
-    def __setstate__(self, state):
-        """Restaura el estado del sensor al deserializar e inicializa un nuevo lock."""
-        self.__dict__.update(state)
-        self._lock = threading.Lock()
+        valor_actual, version = self._store.escribir_valor(self._indice, valor)
+        self._notificar_zona(valor_actual, version)
+
+    def get_rango(self) -> tuple:
+        """Devuelve el rango de medición del sensor (definido por cada subclase)."""
+        return self._rango_min, self._rango_max
 
     # --- Métodos adicionales ---
     def requiere_calibracion(self) -> bool:
@@ -1,4 +1,5 @@
 from python_iotmonitor.entidades.sensores.sensor_base import SensorBase
+from python_iotmonitor.entidades.sensores.tipo_sensor import TipoSensor
 from python_iotmonitor.constantes import CO2_MIN_LECTURA, CO2_MAX_LECTURA
 
 
@@ -16,7 +17,7 @@ class SensorCO2(SensorBase):
             modelo: Modelo o nombre comercial del sensor.
             nivel_alarma: Nivel de concentración en ppm a partir del cual se activa una alerta.
         """
-        super().__init__(tipo="CO2", unidad="ppm", rango_min=CO2_MIN_LECTURA, rango_max=CO2_MAX_LECTURA)
+        super().__init__(tipo=TipoSensor.CO2, unidad=TipoSensor.CO2.unidad, rango_min=CO2_MIN_LECTURA, rango_max=CO2_MAX_LECTURA)
         self._modelo = modelo
         self._nivel_alarma = nivel_alarma
         self._alertas_activadas = 0
@@ -1,4 +1,5 @@
 from python_iotmonitor.entidades.sensores.sensor_ambiental import SensorAmbiental
+from python_iotmonitor.entidades.sensores.tipo_sensor import TipoSensor
 from python_iotmonitor.constantes import HUMEDAD_MIN_LECTURA, HUMEDAD_MAX_LECTURA
 
 
@@ -16,7 +17,7 @@ class SensorHumedad(SensorAmbiental):
             modelo: Modelo o nombre comercial del sensor.
             requiere_calibracion: Indica si el sensor necesita calibración.
         """
-        super().__init__(tipo="Humedad", unidad="%", requiere_calibracion=requiere_calibracion)
+        super().__init__(tipo=TipoSensor.HUMEDAD, unidad=TipoSensor.HUMEDAD.unidad, requiere_calibracion=requiere_calibracion)
         self._modelo = modelo
         self._rango_min = HUMEDAD_MIN_LECTURA
         self._rango_max = HUMEDAD_MAX_LECTURA
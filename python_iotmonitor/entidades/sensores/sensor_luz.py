@@ -1,4 +1,5 @@
 from python_iotmonitor.entidades.sensores.sensor_ambiental import SensorAmbiental
+from python_iotmonitor.entidades.sensores.tipo_sensor import TipoSensor
 from python_iotmonitor.constantes import LUZ_MIN_LECTURA, LUZ_MAX_LECTURA
 
 
@@ -15,7 +16,7 @@ class SensorLuz(SensorAmbiental):
         Args:
             es_interior: True si el sensor está instalado en interior, False si está al aire libre.
         """
-        super().__init__(tipo="Luz", unidad="lux", requiere_calibracion=False)
+        super().__init__(tipo=TipoSensor.LUZ, unidad=TipoSensor.LUZ.unidad, requiere_calibracion=False)
         self._es_interior = es_interior
         self._rango_min = LUZ_MIN_LECTURA
         self._rango_max = LUZ_MAX_LECTURA
@@ -0,0 +1,338 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from python_iotmonitor.constantes import SENSOR_STORE_CAPACIDAD_INICIAL, SENSOR_STORE_FRANJAS_LOCK
+
+SIN_ZONA = -1
+SIN_ALERTA = -1
+
+# Columnas del almacén: nombre → (dtype, valor inicial de una fila libre)
+COLUMNAS_SENSOR: Dict[str, Tuple[str, object]] = {
+    "id_sensor": ("<i8", 0),
+    "codigo_tipo": ("u1", 0),
+    "valor": ("<f8", np.nan),          # NaN = sin lectura (None)
+    "rango_min": ("<f8", np.nan),
+    "rango_max": ("<f8", np.nan),
+    "limita_rango": ("?", False),      # True: se limita a [rango_min, rango_max]; False: solo valores >= 0
+    "activo": ("?", True),
+    "calibrado": ("?", False),
+    "id_zona": ("<i4", SIN_ZONA),      # zona en la que el sensor está contabilizado
+    "version": ("<i8", 0),             # se incrementa con cada escritura del valor
+    "timestamp_ns": ("<i8", 0),        # momento de la última escritura del valor (0 = desconocido)
+    "alerta": ("i1", SIN_ALERTA),      # alerta contabilizada por la zona
+    "version_alerta": ("<i8", -1),     # versión del valor con la que se calculó la alerta
+}
+
+
+class SensorStore:
+    """
+    Almacén columnar (struct-of-arrays) con el estado de todos los sensores.
+
+    Cada sensor es una vista liviana que guarda solo su índice de fila; el
+    valor, el rango, el estado y la zona viven en arreglos contiguos de NumPy.
+    Así se evita un lock y varios atributos por sensor, y las operaciones
+    masivas (limitar al rango, escribir lecturas, evaluar zonas) se aplican
+    sobre columnas completas.
+
+    Concurrencia: las escrituras de una fila toman uno de SENSOR_STORE_FRANJAS_LOCK
+    locks (lock por franjas, según el índice); las operaciones masivas y el
+    crecimiento de los arreglos toman todas las franjas. Las lecturas de un
+    único elemento no toman lock.
+    """
+
+    _instance = None
+    _lock_instancia = threading.Lock()
+
+    def __init__(self, capacidad_inicial: int = SENSOR_STORE_CAPACIDAD_INICIAL):
+        """
+        Inicializa un almacén vacío.
+
+        Args:
+            capacidad_inicial: Filas reservadas inicialmente (el almacén crece al doble al llenarse).
+        """
+        self._columnas: Dict[str, np.ndarray] = {
+            nombre: np.empty(0, dtype=dtype) for nombre, (dtype, _) in COLUMNAS_SENSOR.items()
+        }
+        self._capacidad = 0
+        self._cantidad = 0                 # filas usadas alguna vez (las libres se reutilizan)
+        self._libres: List[int] = []
+        self._liberadas: deque = deque()   # filas liberadas sin lock (desde __del__), pendientes de reciclar
+        self._lock_asignacion = threading.Lock()
+        self._franjas = [threading.Lock() for _ in range(SENSOR_STORE_FRANJAS_LOCK)]
+        self._crecer(max(1, capacidad_inicial))
+
+    @classmethod
+    def get_instance(cls) -> "SensorStore":
+        """Devuelve el almacén global de sensores."""
+        if cls._instance is None:
+            with cls._lock_instancia:
+                if cls._instance is None:  # doble chequeo
+                    cls._instance = cls()
+        return cls._instance
+
+    # -----------------------------------------------------------------------
+    # Filas
+    # -----------------------------------------------------------------------
+    def asignar(self, id_sensor: int, codigo_tipo: int, limita_rango: bool) -> int:
+        """
+        Reserva una fila para un sensor nuevo.
+
+        Args:
+            id_sensor: ID del sensor.
+            codigo_tipo: Código del tipo de sensor (0 si no tiene código).
+            limita_rango: True si los valores se limitan al rango del sensor.
+
+        Returns:
+            Índice de la fila asignada.
+        """
+        with self._lock_asignacion:
+            while self._liberadas:
+                self._libres.append(self._liberadas.popleft())
+            if self._libres:
+                indice = self._libres.pop()
+            else:
+                if self._cantidad == self._capacidad:
+                    with self.bloqueo_total():
+                        self._crecer(self._capacidad * 2)
+                indice = self._cantidad
+                self._cantidad += 1
+            with self.franja(indice):
+                for nombre, (_, inicial) in COLUMNAS_SENSOR.items():
+                    self._columnas[nombre][indice] = inicial
+                self._columnas["id_sensor"][indice] = id_sensor
+                self._columnas["codigo_tipo"][indice] = codigo_tipo
+                self._columnas["limita_rango"][indice] = limita_rango
+        return indice
+
+    def asignar_lote(self, ids_sensor: np.ndarray, codigos_tipo: np.ndarray, limita_rango,
+                     columnas: Optional[Dict[str, np.ndarray]] = None) -> np.ndarray:
+        """
+        Reserva de una vez las filas de muchos sensores nuevos (carga masiva).
+
+        Args:
+            ids_sensor: ID de cada sensor.
+            codigos_tipo: Código del tipo de cada sensor.
+            limita_rango: True si los valores se limitan al rango (uno para todos o uno por sensor).
+            columnas: Valores iniciales de otras columnas (nombre → valor por sensor);
+                las no indicadas quedan con su valor inicial.
+
+        Returns:
+            Índices de las filas asignadas, en el orden de `ids_sensor`.
+        """
+        ids_sensor = np.asarray(ids_sensor)
+        cantidad = len(ids_sensor)
+        with self._lock_asignacion:
+            while self._liberadas:
+                self._libres.append(self._liberadas.popleft())
+            reutilizadas = self._libres[len(self._libres) - min(cantidad, len(self._libres)):]
+            del self._libres[len(self._libres) - len(reutilizadas):]
+            nuevas = cantidad - len(reutilizadas)
+            with self.bloqueo_total():
+                if self._cantidad + nuevas > self._capacidad:
+                    capacidad = self._capacidad
+                    while capacidad < self._cantidad + nuevas:
+                        capacidad *= 2
+                    self._crecer(capacidad)
+                indices = np.concatenate((
+                    np.array(reutilizadas, dtype=np.intp),
+                    np.arange(self._cantidad, self._cantidad + nuevas, dtype=np.intp),
+                ))
+                self._cantidad += nuevas
+                for nombre, (_, inicial) in COLUMNAS_SENSOR.items():
+                    self._columnas[nombre][indices] = inicial
+                self._columnas["id_sensor"][indices] = ids_sensor
+                self._columnas["codigo_tipo"][indices] = codigos_tipo
+                self._columnas["limita_rango"][indices] = limita_rango
+                for nombre, valores in (columnas or {}).items():
+                    self._columnas[nombre][indices] = valores
+        return indices
+
+    def liberar(self, indice: int) -> None:
+        """
+        Devuelve la fila de un sensor eliminado para reutilizarla.
+        No toma locks: puede invocarse desde el recolector de basura en cualquier hilo;
+        la fila se recicla (y se reinicia) en la próxima asignación.
+        """
+        self._liberadas.append(indice)
+
+    def __len__(self) -> int:
+        """Devuelve la cantidad de sensores con fila asignada."""
+        return self._cantidad - len(self._libres) - len(self._liberadas)
+
+    def _crecer(self, capacidad: int) -> None:
+        """Reubica las columnas con mayor capacidad (requiere todas las franjas)."""
+        for nombre, arreglo in self._columnas.items():
+            nuevo = np.empty(capacidad, dtype=arreglo.dtype)
+            nuevo[:self._capacidad] = arreglo
+            self._columnas[nombre] = nuevo
+        self._capacidad = capacidad
+
+    # -----------------------------------------------------------------------
+    # Locks
+    # -----------------------------------------------------------------------
+    def franja(self, indice: int) -> threading.Lock:
+        """Devuelve el lock de la franja a la que pertenece una fila."""
+        return self._franjas[indice % SENSOR_STORE_FRANJAS_LOCK]
+
+    @contextmanager
+    def bloqueo_total(self) -> Iterator[None]:
+        """Toma todas las franjas, siempre en el mismo orden (operaciones masivas)."""
+        for lock in self._franjas:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(self._franjas):
+                lock.release()
+
+    # -----------------------------------------------------------------------
+    # Acceso por fila (vistas de sensor)
+    # -----------------------------------------------------------------------
+    def leer(self, columna: str, indice: int):
+        """Lee un campo de una fila (sin lock) como escalar de Python."""
+        return self._columnas[columna][indice].item()
+
+    def escribir(self, columna: str, indice: int, valor) -> None:
+        """Escribe un campo de una fila."""
+        with self.franja(indice):
+            self._columnas[columna][indice] = valor
+
+    def escribir_valor(self, indice: int, valor: float) -> Tuple[float, int]:
+        """
+        Escribe el valor de un sensor limitándolo a su rango válido.
+
+        Returns:
+            Tupla (valor guardado, nueva versión del valor).
+        """
+        columnas = self._columnas
+        with self.franja(indice):
+            if columnas["limita_rango"][indice]:
+                valor = max(columnas["rango_min"][indice].item(), min(valor, columnas["rango_max"][indice].item()))
+            else:
+                valor = max(0.0, valor)
+            columnas["valor"][indice] = valor
+            columnas["version"][indice] += 1
+            columnas["timestamp_ns"][indice] = time.time_ns()
+            return valor, columnas["version"][indice].item()
+
+    def leer_valor_versionado(self, indice: int) -> Tuple[Optional[float], int]:
+        """Devuelve (valor, versión) de una fila de forma consistente (None si no hay lectura)."""
+        with self.franja(indice):
+            valor = self._columnas["valor"][indice].item()
+            version = self._columnas["version"][indice].item()
+        return (None if valor != valor else valor), version
+
+    # -----------------------------------------------------------------------
+    # Operaciones masivas
+    # -----------------------------------------------------------------------
+    def columna(self, nombre: str, indices: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Devuelve una copia de una columna, completa o de las filas indicadas.
+
+        Args:
+            nombre: Nombre de la columna (ver COLUMNAS_SENSOR).
+            indices: Filas a leer (None = todas las filas usadas).
+        """
+        arreglo = self._columnas[nombre]
+        if indices is None:
+            return arreglo[:self._cantidad].copy()
+        return arreglo[indices]
+
+    def escribir_lote(self, indices: np.ndarray, valores: np.ndarray) -> np.ndarray:
+        """
+        Escribe los valores de muchos sensores en una pasada, limitando cada uno a su rango.
+
+        Args:
+            indices: Filas a escribir.
+            valores: Valor de cada fila.
+
+        Returns:
+            Los valores efectivamente guardados.
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        valores = np.asarray(valores, dtype=np.float64)
+        with self.bloqueo_total():
+            columnas = self._columnas
+            limita = columnas["limita_rango"][indices]
+            inferior = np.where(limita, columnas["rango_min"][indices], 0.0)
+            superior = np.where(limita, columnas["rango_max"][indices], np.inf)
+            guardados = np.minimum(np.maximum(valores, inferior), superior)
+            columnas["valor"][indices] = guardados
+            columnas["version"][indices] += 1
+            columnas["timestamp_ns"][indices] = time.time_ns()
+        return guardados
+
+    # -----------------------------------------------------------------------
+    # Alertas contabilizadas por zona
+    # -----------------------------------------------------------------------
+    def vincular_zona(self, indice: int, id_zona: int) -> bool:
+        """
+        Marca el sensor como contabilizado en una zona, todavía sin alerta registrada.
+
+        Returns:
+            False si ya estaba contabilizado en esa zona.
+        """
+        columnas = self._columnas
+        with self.franja(indice):
+            if columnas["id_zona"][indice] == id_zona:
+                return False
+            columnas["id_zona"][indice] = id_zona
+            columnas["alerta"][indice] = SIN_ALERTA
+            columnas["version_alerta"][indice] = -1
+            return True
+
+    def vincular_zonas(self, indices: np.ndarray, ids_zona: np.ndarray) -> None:
+        """Versión masiva de vincular_zona: marca cada fila en su zona, sin alerta registrada."""
+        with self.bloqueo_total():
+            columnas = self._columnas
+            columnas["id_zona"][indices] = ids_zona
+            columnas["alerta"][indices] = SIN_ALERTA
+            columnas["version_alerta"][indices] = -1
+
+    def desvincular_zona(self, indice: int, id_zona: int) -> Optional[int]:
+        """
+        Quita el sensor de la zona indicada.
+
+        Returns:
+            La alerta que tenía contabilizada, o None si no pertenecía a esa zona.
+        """
+        columnas = self._columnas
+        with self.franja(indice):
+            if columnas["id_zona"][indice] != id_zona:
+                return None
+            columnas["id_zona"][indice] = SIN_ZONA
+            alerta = columnas["alerta"][indice].item()
+            columnas["alerta"][indice] = SIN_ALERTA
+            return alerta
+
+    def actualizar_alerta(self, indice: int, id_zona: int, version: int, alerta: int) -> Optional[int]:
+        """
+        Registra la alerta calculada con la versión `version` del valor.
+
+        Returns:
+            La alerta anterior, o None si el sensor no pertenece a la zona o la
+            versión es anterior a la ya registrada.
+        """
+        columnas = self._columnas
+        with self.franja(indice):
+            if columnas["id_zona"][indice] != id_zona or version <= columnas["version_alerta"][indice]:
+                return None
+            anterior = columnas["alerta"][indice].item()
+            columnas["alerta"][indice] = alerta
+            columnas["version_alerta"][indice] = version
+            return anterior
+
+    def leer_para_alertas(self, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Devuelve (códigos de tipo, valores, versiones) de las filas indicadas de forma consistente."""
+        with self.bloqueo_total():
+            columnas = self._columnas
+            return columnas["codigo_tipo"][indices], columnas["valor"][indices], columnas["version"][indices]
+
+    def fijar_alertas(self, indices: np.ndarray, alertas: np.ndarray, versiones: np.ndarray) -> None:
+        """Registra de una vez las alertas recalculadas de las filas indicadas."""
+        with self.bloqueo_total():
+            self._columnas["alerta"][indices] = alertas
+            self._columnas["version_alerta"][indices] = versiones
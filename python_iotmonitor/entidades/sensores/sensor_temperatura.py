@@ -1,4 +1,5 @@
 from python_iotmonitor.entidades.sensores.sensor_base import SensorBase
+from python_iotmonitor.entidades.sensores.tipo_sensor import TipoSensor
 from python_iotmonitor.constantes import TEMP_MIN_LECTURA, TEMP_MAX_LECTURA
 
 
@@ -15,7 +16,7 @@ class SensorTemperatura(SensorBase):
         Args:
             modelo: Modelo o tipo de sensor (ej. DHT11, LM35, DS18B20).
         """
-        super().__init__(tipo="Temperatura", unidad="°C", rango_min=TEMP_MIN_LECTURA, rango_max=TEMP_MAX_LECTURA)
+        super().__init__(tipo=TipoSensor.TEMPERATURA, unidad=TipoSensor.TEMPERATURA.unidad, rango_min=TEMP_MIN_LECTURA, rango_max=TEMP_MAX_LECTURA)
         self._modelo = modelo
         self._lecturas_acumuladas = 0.0
         self._cantidad_lecturas = 0
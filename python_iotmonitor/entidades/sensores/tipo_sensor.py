@@ -1,12 +1,60 @@
-from enum import Enum
+from enum import IntEnum
+from typing import Dict, Union
 
-class TipoSensor(Enum):
+
+class TipoSensor(IntEnum):
     """
     Define los tipos de sensores disponibles en el sistema IoTMonitor.
-    Este enum se utiliza por la fábrica de sensores (Factory Method).
+
+    Cada tipo es un código entero compacto que viaja en sensores, eventos,
+    columnas de NumPy y registros binarios; el despacho por tipo se hace con
+    listas indexadas por código. Los nombres ("Temperatura", "CO2", ...) solo
+    se usan en los bordes de entrada / salida (consola, archivos, parámetros).
     """
 
-    TEMPERATURA = "Temperatura"
-    HUMEDAD = "Humedad"
-    CO2 = "CO2"
-    LUZ = "Luz"
+    DESCONOCIDO = 0
+    TEMPERATURA = 1
+    HUMEDAD = 2
+    CO2 = 3
+    LUZ = 4
+    PRESION = 5
+
+    @property
+    def nombre(self) -> str:
+        """Devuelve el nombre visible del tipo ("Temperatura", "Humedad", ...)."""
+        return NOMBRES_TIPO[self]
+
+    @property
+    def unidad(self) -> str:
+        """Devuelve la unidad de medida del tipo (°C, %, ppm, lux, hPa)."""
+        return UNIDADES_TIPO[self]
+
+    @classmethod
+    def desde_nombre(cls, tipo: Union[str, int]) -> "TipoSensor":
+        """
+        Convierte un nombre de tipo (sin distinguir mayúsculas ni espacios) o un código.
+
+        Args:
+            tipo: Nombre ("Temperatura", "co2", "Luminosidad", ...) o código entero.
+
+        Returns:
+            El TipoSensor correspondiente, o DESCONOCIDO si no existe.
+        """
+        if isinstance(tipo, int):
+            return cls(tipo) if 0 <= tipo < len(NOMBRES_TIPO) else cls.DESCONOCIDO
+        return _TIPOS_POR_NOMBRE.get(tipo.strip().lower(), cls.DESCONOCIDO)
+
+
+# Nombres y unidades indexados por código
+NOMBRES_TIPO = ("Desconocido", "Temperatura", "Humedad", "CO2", "Luz", "Presion")
+UNIDADES_TIPO = ("", "°C", "%", "ppm", "lux", "hPa")
+
+# Nombres aceptados en la entrada (en minúsculas), incluidos sinónimos
+_TIPOS_POR_NOMBRE: Dict[str, TipoSensor] = {
+    **{nombre.lower(): TipoSensor(codigo) for codigo, nombre in enumerate(NOMBRES_TIPO) if codigo},
+    "co₂": TipoSensor.CO2,
+    "dioxido de carbono": TipoSensor.CO2,
+    "dióxido de carbono": TipoSensor.CO2,
+    "luminosidad": TipoSensor.LUZ,
+    "presión": TipoSensor.PRESION,
+}
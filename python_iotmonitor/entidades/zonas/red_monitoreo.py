@@ -1,4 +1,4 @@
-from typing import Optional, TYPE_CHECKING
+from typing import Dict, List, Optional, TYPE_CHECKING
 from python_iotmonitor.entidades.sensores.sensor import Serializable
 
 if TYPE_CHECKING:
@@ -24,9 +24,17 @@ class RedMonitoreo(Serializable):
         self._ubicacion = ubicacion
         self._descripcion = descripcion
         self._zona_principal: Optional['Zona'] = None  # Relación 0..1 con Zona
+        self._zonas: Dict[int, 'Zona'] = {}  # Zonas de la red por id (en orden de alta)
         self._total_sensores = 0
         self._total_zonas = 0
 
+    def __setstate__(self, state):
+        """Restaura la red; los archivos anteriores no guardaban la colección de zonas."""
+        self.__dict__.update(state)
+        if '_zonas' not in state:
+            principal = self._zona_principal
+            self._zonas = {principal.get_id_zona(): principal} if principal is not None else {}
+
     # --- Getters básicos ---
     def get_id(self) -> int:
         """Devuelve el ID único de la red de monitoreo."""
@@ -48,6 +56,39 @@ class RedMonitoreo(Serializable):
         """Asigna una zona principal a la red."""
         self._zona_principal = zona
 
+    # --- Zonas de la red ---
+    def agregar_zona(self, zona: 'Zona') -> None:
+        """
+        Registra una zona en la red y actualiza los totales de zonas y sensores.
+
+        Raises:
+            ValueError: Si ya existe una zona con el mismo ID.
+        """
+        id_zona = zona.get_id_zona()
+        if id_zona in self._zonas:
+            raise ValueError(f"La zona {id_zona} ya pertenece a la red.")
+        self._zonas[id_zona] = zona
+        self.incrementar_zonas()
+        self.incrementar_sensores(zona.get_cantidad_sensores())
+
+    def remover_zona(self, id_zona: int) -> Optional['Zona']:
+        """Quita una zona de la red (si existe) y la devuelve."""
+        zona = self._zonas.pop(id_zona, None)
+        if zona is not None:
+            self.decrementar_zonas()
+            self.decrementar_sensores(zona.get_cantidad_sensores())
+            if zona is self._zona_principal:
+                self._zona_principal = None
+        return zona
+
+    def get_zona(self, id_zona: int) -> Optional['Zona']:
+        """Devuelve la zona con el ID indicado, o None si no pertenece a la red."""
+        return self._zonas.get(id_zona)
+
+    def get_zonas(self) -> List['Zona']:
+        """Devuelve las zonas de la red en orden de alta."""
+        return list(self._zonas.values())
+
     # --- Estadísticas de monitoreo ---
     def get_total_sensores(self) -> int:
         """Devuelve el número total de sensores registrados en la red."""
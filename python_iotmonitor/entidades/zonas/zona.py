@@ -1,17 +1,68 @@
 import threading
-from typing import List, TYPE_CHECKING
+from typing import Dict, List, Optional, Sequence, Tuple, Union, TYPE_CHECKING
+import numpy as np
 from python_iotmonitor.entidades.sensores.sensor import Sensor, Serializable
-from python_iotmonitor.constantes import CO2_CRITICO_ALTO, HUMEDAD_CRITICA_BAJA, TEMP_CRITICA_ALTA
+from python_iotmonitor.entidades.sensores.sensor_store import SensorStore, SIN_ALERTA
+from python_iotmonitor.entidades.sensores.tipo_sensor import TipoSensor
+from python_iotmonitor.patrones.observer.observable import Observable
+from python_iotmonitor.patrones.observer.eventos.evento_zona import EventoZona
+from python_iotmonitor.iot_control.control.motor_reglas import MotorReglas, REGLAS_ALERTA_ZONA
 
 if TYPE_CHECKING:
     from python_iotmonitor.entidades.zonas.red_monitoreo import RedMonitoreo
     from python_iotmonitor.entidades.usuarios.usuario import Usuario
 
+# Alertas de zona, en el orden en que se informan. Los umbrales son reglas del motor
+# (REGLAS_ALERTA_ZONA): la alerta de una lectura es el índice de la regla que dispara.
+ALERTAS_ZONA: Tuple[str, ...] = tuple(regla.nombre for regla in REGLAS_ALERTA_ZONA)
+_MOTOR_ALERTAS = MotorReglas(REGLAS_ALERTA_ZONA)
 
-class Zona(Serializable):
+# Serializa los cambios de zona de los sensores: la verificación de pertenencia y
+# la asignación ocurren juntas aunque dos zonas agreguen el mismo sensor a la vez.
+# Orden de locks: _lock_pertenencia antes que el _lock_zona de cualquier zona.
+_lock_pertenencia = threading.Lock()
+
+
+def clasificar_alerta(codigo_tipo: int, valor: Optional[float]) -> int:
+    """
+    Devuelve el índice en ALERTAS_ZONA de la alerta que genera una lectura (SIN_ALERTA si no genera).
+
+    Args:
+        codigo_tipo: Código TipoSensor del sensor.
+        valor: Valor leído (None si todavía no hay lectura).
+    """
+    return _MOTOR_ALERTAS.clasificar_lectura(codigo_tipo, valor)
+
+
+def clasificar_alertas(codigos_tipo: np.ndarray, valores: np.ndarray) -> np.ndarray:
+    """
+    Versión vectorizada de clasificar_alerta sobre columnas del SensorStore
+    (un valor NaN, sin lectura, no genera alerta).
+    """
+    return _MOTOR_ALERTAS.clasificar_lecturas(codigos_tipo, valores).astype(np.int8)
+
+
+def _agrupar(claves: np.ndarray, ids: List[int], sensores: List[Sensor]) -> List[Tuple[int, Dict[int, Sensor]]]:
+    """Agrupa sensores por clave entera; cada grupo es id → sensor en el orden original."""
+    orden = np.argsort(claves, kind="stable")
+    ordenadas = claves[orden]
+    cortes = [0, *(np.flatnonzero(ordenadas[1:] != ordenadas[:-1]) + 1).tolist(), len(orden)]
+    orden = orden.tolist()
+    return [
+        (int(ordenadas[desde]), {ids[i]: sensores[i] for i in orden[desde:hasta]})
+        for desde, hasta in zip(cortes, cortes[1:])
+    ]
+
+
+class Zona(Observable[EventoZona], Serializable):
     """
     Representa una zona ambiental dentro de una red de monitoreo IoT.
     Cada zona contiene múltiples sensores y puede tener usuarios asignados.
+
+    Mantiene el estado de alertas al día a medida que cambian los valores de
+    sus sensores (cada sensor notifica a su zona en set_valor_actual), por lo
+    que evaluar_condiciones no recorre los sensores. Los observadores reciben
+    un EventoZona solo cuando una alerta se activa o se desactiva.
     """
 
     def __init__(self, id_zona: int, nombre: str, ubicada_en: 'RedMonitoreo', tipo: str):
@@ -23,26 +74,48 @@ class Zona(Serializable):
             nombre: Nombre identificador de la zona (ej. “Laboratorio A”).
             ubicada_en: Referencia a la red de monitoreo a la que pertenece.
         """
+        Observable.__init__(self)
         self._id = id_zona
         self._nombre = nombre
         self._ubicada_en = ubicada_en
-        self._sensores: List[Sensor] = []
+        # Sensores por id (en orden de alta) e índices secundarios
+        self._sensores: Dict[int, Sensor] = {}
+        self._por_tipo: Dict[TipoSensor, Dict[int, Sensor]] = {}
+        self._por_clase: Dict[type, Dict[int, Sensor]] = {}
+        self._por_estado: Dict[Tuple[bool, bool], Dict[int, Sensor]] = {}
+        self._estado_por_sensor: Dict[int, Tuple[bool, bool]] = {}
         self._usuarios: List['Usuario'] = []
-        self._lock = threading.Lock()
+        self._lock_zona = threading.Lock()  # sensores, índices y conteos (Observable._lock protege a los observadores)
         self._alertas_activas = 0
         self._tipo = tipo 
 
+        # Conteo incremental por alerta (la alerta de cada sensor se guarda en el SensorStore)
+        self._conteo_alertas: List[int] = [0] * len(ALERTAS_ZONA)
+        self._estado_cache: Optional[str] = None
+        self._indices_store: Optional[np.ndarray] = None  # filas de los sensores en el SensorStore
+
     # --- Métodos de Persistencia (Serialización Thread-Safe) ---
     def __getstate__(self):
-        """Devuelve el estado serializable de la zona (excluye el lock)."""
+        """
+        Devuelve el estado serializable de la zona. Excluye los locks, los observadores
+        y el estado derivado (índices y conteos), que se reconstruye al cargar.
+        """
         state = self.__dict__.copy()
-        del state['_lock']
+        for derivado in ('_lock', '_lock_zona', '_observers', '_por_tipo', '_por_clase', '_por_estado',
+                         '_estado_por_sensor', '_conteo_alertas', '_estado_cache', '_indices_store',
+                         '_alerta_por_sensor'):
+            state.pop(derivado, None)
+        state['_sensores'] = list(self._sensores.values())
         return state
 
     def __setstate__(self, state):
-        """Restaura el estado al deserializar e inicializa un nuevo lock."""
+        """Restaura el estado al deserializar, inicializa nuevos locks y reconstruye índices y alertas."""
         self.__dict__.update(state)
-        self._lock = threading.Lock()
+        self.__dict__.pop('_alerta_por_sensor', None)
+        Observable.__init__(self)
+        self._lock_zona = threading.Lock()
+        sensores = self._sensores
+        self._reconstruir_indices(sensores if isinstance(sensores, list) else list(sensores.values()))
 
     # --- Métodos básicos ---
     def get_id_zona(self) -> int:
@@ -56,18 +129,75 @@ class Zona(Serializable):
     def get_tipo(self) -> str:
         return self._tipo
 
+    def get_red(self) -> Optional['RedMonitoreo']:
+        """Devuelve la red de monitoreo a la que pertenece la zona (None si no tiene)."""
+        return self._ubicada_en
+
     def get_sensores_internal(self) -> List[Sensor]:
-        """Acceso interno a la lista mutable de sensores (uso en servicios)."""
-        return self._sensores
+        """
+        Devuelve los sensores en orden de alta (uso en servicios).
+        La lista es nueva: para modificar la zona usar agregar_sensor / remover_sensor.
+        """
+        return list(self._sensores.values())
 
     def set_sensores_internal(self, nuevos_sensores: List[Sensor]) -> None:
-        """Reemplaza completamente la lista de sensores (thread-safe)."""
-        with self._lock:
-            self._sensores = nuevos_sensores
+        """Reemplaza completamente los sensores de la zona (thread-safe)."""
+        with self._lock_zona:
+            anteriores = list(self._sensores.values())
+        for sensor in anteriores:
+            self.remover_sensor(sensor)
+        for sensor in nuevos_sensores:
+            self.agregar_sensor(sensor)
 
     def get_sensores(self) -> List[Sensor]:
         """Devuelve una copia inmutable de los sensores registrados."""
-        return list(self._sensores)
+        return list(self._sensores.values())
+
+    def get_cantidad_sensores(self) -> int:
+        """Devuelve la cantidad de sensores de la zona."""
+        return len(self._sensores)
+
+    def get_sensor(self, id_sensor: int) -> Optional[Sensor]:
+        """Devuelve el sensor con el ID indicado, o None si no pertenece a la zona."""
+        return self._sensores.get(id_sensor)
+
+    def get_tipos_sensores(self) -> List[str]:
+        """Devuelve los nombres de los tipos de sensor presentes en la zona."""
+        with self._lock_zona:
+            return [tipo.nombre for tipo, sensores in self._por_tipo.items() if sensores]
+
+    def get_sensores_por_tipo(self, tipo: Union[TipoSensor, str]) -> List[Sensor]:
+        """Devuelve los sensores de un tipo (código TipoSensor o nombre) sin recorrer el resto."""
+        if not isinstance(tipo, TipoSensor):
+            tipo = TipoSensor.desde_nombre(tipo)
+        with self._lock_zona:
+            return list(self._por_tipo.get(tipo, {}).values())
+
+    def get_sensores_por_clase(self, clase: type) -> List[Sensor]:
+        """Devuelve los sensores que son instancia de `clase` (incluye subclases)."""
+        with self._lock_zona:
+            return [
+                sensor
+                for clase_sensor, sensores in self._por_clase.items() if issubclass(clase_sensor, clase)
+                for sensor in sensores.values()
+            ]
+
+    def get_sensores_por_estado(self, activo: Optional[bool] = None,
+                                calibrado: Optional[bool] = None) -> List[Sensor]:
+        """
+        Devuelve los sensores según su estado (None = no filtrar por ese criterio).
+
+        Args:
+            activo: Filtra por sensores activos / inactivos.
+            calibrado: Filtra por sensores calibrados / sin calibrar.
+        """
+        with self._lock_zona:
+            return [
+                sensor
+                for (es_activo, es_calibrado), sensores in self._por_estado.items()
+                if (activo is None or es_activo == activo) and (calibrado is None or es_calibrado == calibrado)
+                for sensor in sensores.values()
+            ]
 
     def get_usuarios(self) -> List['Usuario']:
         """Devuelve una copia inmutable de los usuarios asignados."""
@@ -75,25 +205,108 @@ class Zona(Serializable):
 
     def set_usuarios(self, usuarios: List['Usuario']) -> None:
         """Reemplaza la lista de usuarios asignados (thread-safe)."""
-        with self._lock:
+        with self._lock_zona:
             self._usuarios = usuarios
 
     # --- Operaciones sobre sensores ---
     def agregar_sensor(self, sensor: Sensor) -> None:
-        """Agrega un sensor a la zona (thread-safe)."""
-        with self._lock:
-            self._sensores.append(sensor)
+        """
+        Agrega un sensor a la zona (thread-safe). Un sensor ya registrado se ignora.
+
+        Raises:
+            ValueError: Si el sensor pertenece a otra zona (el SensorStore guarda una
+                sola zona por sensor; hay que removerlo de aquella primero).
+        """
+        with _lock_pertenencia:
+            otra = sensor.get_zona()
+            if otra is not None and otra is not self:
+                raise ValueError(
+                    f"El sensor #{sensor.get_id()} ya pertenece a la zona '{otra.get_nombre()}'."
+                )
+            with self._lock_zona:
+                if sensor.get_id() in self._sensores:
+                    return
+                self._indexar(sensor)
+            sensor.set_zona(self)
+        self._vincular_sensor(sensor)
 
     def remover_sensor(self, sensor: Sensor) -> None:
-        """Remueve un sensor de la zona si existe."""
-        with self._lock:
-            if sensor in self._sensores:
-                self._sensores.remove(sensor)
+        """Remueve un sensor de la zona si existe (O(1))."""
+        with self._lock_zona:
+            if self._sensores.get(sensor.get_id()) is not sensor:
+                return
+            self._desindexar(sensor)
+        self._desvincular_sensor(sensor)
+
+    def actualizar_estado_sensor(self, sensor: Sensor) -> None:
+        """Reubica el sensor en el índice de estado (lo invoca el sensor al activarse, desactivarse o calibrarse)."""
+        id_sensor = sensor.get_id()
+        with self._lock_zona:
+            anterior = self._estado_por_sensor.get(id_sensor)
+            if anterior is None:
+                return
+            nuevo = (sensor.esta_activo(), sensor.esta_calibrado())
+            if nuevo != anterior:
+                del self._por_estado[anterior][id_sensor]
+                self._por_estado.setdefault(nuevo, {})[id_sensor] = sensor
+                self._estado_por_sensor[id_sensor] = nuevo
+
+    # --- Índices (requieren el lock de la zona) ---
+    def _indexar(self, sensor: Sensor) -> None:
+        """Registra el sensor en la colección principal y en los índices secundarios."""
+        id_sensor = sensor.get_id()
+        estado = (sensor.esta_activo(), sensor.esta_calibrado())
+        self._sensores[id_sensor] = sensor
+        self._por_tipo.setdefault(sensor.get_codigo_tipo(), {})[id_sensor] = sensor
+        self._por_clase.setdefault(type(sensor), {})[id_sensor] = sensor
+        self._por_estado.setdefault(estado, {})[id_sensor] = sensor
+        self._estado_por_sensor[id_sensor] = estado
+        self._indices_store = None
+
+    def _desindexar(self, sensor: Sensor) -> None:
+        """Quita el sensor de la colección principal y de los índices secundarios."""
+        id_sensor = sensor.get_id()
+        del self._sensores[id_sensor]
+        del self._por_tipo[sensor.get_codigo_tipo()][id_sensor]
+        del self._por_clase[type(sensor)][id_sensor]
+        del self._por_estado[self._estado_por_sensor.pop(id_sensor)][id_sensor]
+        self._indices_store = None
+
+    def _reconstruir_indices(self, sensores: List[Sensor]) -> None:
+        """Reconstruye índices y conteos de alertas a partir de una lista de sensores."""
+        self._sensores, self._por_tipo, self._por_clase, self._por_estado = {}, {}, {}, {}
+        self._estado_por_sensor = {}
+        self._conteo_alertas = [0] * len(ALERTAS_ZONA)
+        self._estado_cache = None
+        self._indices_store = None
+        for sensor in sensores:
+            existente = self._sensores.get(sensor.get_id())
+            if existente is sensor:
+                continue
+            if existente is not None:
+                # IDs repetidos de versiones anteriores (SensorBase tenía su propio contador)
+                sensor._reasignar_id()
+            self._indexar(sensor)
+            self._vincular_sensor(sensor)
+
+    def get_indices_store(self) -> np.ndarray:
+        """Devuelve las filas de los sensores de la zona en el SensorStore (para operaciones masivas)."""
+        with self._lock_zona:
+            return self._indices_store_locked()
+
+    def _indices_store_locked(self) -> np.ndarray:
+        """Devuelve (y cachea) las filas de los sensores; requiere el lock de la zona."""
+        if self._indices_store is None:
+            self._indices_store = np.fromiter(
+                (sensor.get_indice_store() for sensor in self._sensores.values()),
+                dtype=np.intp, count=len(self._sensores),
+            )
+        return self._indices_store
 
     # --- Gestión de alertas ---
     def registrar_alerta(self) -> None:
         """Incrementa el contador de alertas activas en la zona."""
-        with self._lock:
+        with self._lock_zona:
             self._alertas_activas += 1
 
     def get_alertas_activas(self) -> int:
@@ -103,17 +316,215 @@ class Zona(Serializable):
     def evaluar_condiciones(self) -> str:
         """
         Evalúa las condiciones generales de la zona según los sensores registrados.
+        Usa los conteos de alertas mantenidos al día, sin recorrer los sensores.
 
         Returns:
             Una descripción textual del estado ambiental de la zona.
         """
-        alertas = []
-        for s in self._sensores:
-            if s.get_tipo() == "Temperatura" and s.get_valor_actual() > TEMP_CRITICA_ALTA:
-                alertas.append("Alta temperatura")
-            elif s.get_tipo() == "Humedad" and s.get_valor_actual() < HUMEDAD_CRITICA_BAJA:
-                alertas.append("Baja humedad")
-            elif s.get_tipo() == "CO2" and s.get_valor_actual() > CO2_CRITICO_ALTO:
-                alertas.append("CO₂ elevado")
+        estado = self._estado_cache
+        if estado is None:
+            with self._lock_zona:
+                alertas = [
+                    mensaje
+                    for mensaje, cantidad in zip(ALERTAS_ZONA, self._conteo_alertas)
+                    for _ in range(cantidad)
+                ]
+                estado = ", ".join(alertas) if alertas else "Condiciones normales"
+                self._estado_cache = estado
+        return estado
+
+    def get_conteo_alertas(self) -> Dict[str, int]:
+        """Devuelve cuántos sensores superan cada umbral crítico."""
+        with self._lock_zona:
+            return dict(zip(ALERTAS_ZONA, self._conteo_alertas))
+
+    # --- Estado incremental de alertas (sensor → zona) ---
+    def actualizar_alerta_sensor(self, sensor: Sensor, valor: Optional[float], version: int) -> None:
+        """
+        Actualiza los conteos de alertas con el nuevo valor de un sensor de la zona.
+        Lo invoca el sensor en cada set_valor_actual. Las notificaciones con una
+        versión anterior a la ya aplicada (hilos concurrentes) se descartan.
+
+        Args:
+            sensor: Sensor que cambió de valor.
+            valor: Nuevo valor del sensor.
+            version: Versión del valor (creciente por sensor).
+        """
+        nueva = clasificar_alerta(sensor.get_codigo_tipo(), valor)
+        store = sensor.get_store()
+        with self._lock_zona:
+            anterior = store.actualizar_alerta(sensor.get_indice_store(), self._id, version, nueva)
+            if anterior is None:
+                return  # sensor ya removido o notificación desactualizada
+            cambios = self._aplicar_cambio_alerta(anterior, nueva)
+        self._notificar_cambios(cambios, f"Sensor {sensor.get_tipo()} #{sensor.get_id()}")
+
+    def recalcular_alertas(self) -> None:
+        """
+        Recalcula de una vez las alertas de todos los sensores de la zona desde las
+        columnas del SensorStore. Se usa tras escrituras masivas (SensorStore.escribir_lote),
+        que no notifican sensor por sensor.
+        """
+        Zona.recalcular_alertas_zonas([self])
+
+    @staticmethod
+    def recalcular_alertas_zonas(zonas: Sequence["Zona"]) -> np.ndarray:
+        """
+        Versión de recalcular_alertas para muchas zonas: una sola lectura, clasificación
+        y escritura sobre el SensorStore para todas ellas.
+
+        Toma los locks de todas las zonas (siempre en el mismo orden) para que ninguna
+        notificación individual se intercale entre el recálculo y el nuevo conteo.
+
+        Args:
+            zonas: Zonas a recalcular.
+
+        Returns:
+            Matriz (zonas × ALERTAS_ZONA) con la cantidad de sensores en cada alerta.
+        """
+        zonas = list({id(zona): zona for zona in zonas}.values())
+        bloqueadas = sorted(zonas, key=id)
+        for zona in bloqueadas:
+            zona._lock_zona.acquire()
+        try:
+            indices_por_zona = [zona._indices_store_locked() for zona in zonas]
+            tamanos = np.fromiter(map(len, indices_por_zona), dtype=np.intp, count=len(zonas))
+            indices = np.concatenate(indices_por_zona) if zonas else np.empty(0, dtype=np.intp)
+            store = SensorStore.get_instance()
+            codigos, valores, versiones = store.leer_para_alertas(indices)
+            alertas = clasificar_alertas(codigos, valores)
+            store.fijar_alertas(indices, alertas, versiones)
+
+            # Conteo por (zona, alerta) con un único bincount
+            posiciones = np.repeat(np.arange(len(zonas)), tamanos)
+            con_alerta = alertas >= 0
+            conteos = np.bincount(
+                posiciones[con_alerta] * len(ALERTAS_ZONA) + alertas[con_alerta],
+                minlength=len(zonas) * len(ALERTAS_ZONA),
+            ).reshape(len(zonas), len(ALERTAS_ZONA))
+            cambios = [zona._fijar_conteo_alertas(conteo) for zona, conteo in zip(zonas, conteos.tolist())]
+        finally:
+            for zona in reversed(bloqueadas):
+                zona._lock_zona.release()
+
+        for zona, cambios_zona in zip(zonas, cambios):
+            zona._notificar_cambios(cambios_zona, f"Zona {zona._nombre}")
+        return conteos
+
+    @staticmethod
+    def cargar_sensores_zonas(zonas: Sequence["Zona"], sensores_por_zona: Sequence[Sequence[Sensor]]) -> None:
+        """
+        Carga masiva (p. ej. al deserializar la red): agrega a cada zona sus sensores
+        recién creados. A diferencia de agregar_sensor, no vincula ni contabiliza
+        sensor por sensor: indexa todos, vincula sus filas del SensorStore en una
+        sola operación y calcula las alertas con recalcular_alertas_zonas.
+
+        Args:
+            zonas: Zonas a completar.
+            sensores_por_zona: Sensores de cada zona, en orden de alta.
+        """
+        indices, ids_zona = [], []
+        for zona, sensores in zip(zonas, sensores_por_zona):
+            with zona._lock_zona:
+                zona._indexar_lote(sensores)
+                indices.append(zona._indices_store_locked())
+            ids_zona.append(np.full(len(indices[-1]), zona._id, dtype=np.int32))
+        if indices:
+            SensorStore.get_instance().vincular_zonas(np.concatenate(indices), np.concatenate(ids_zona))
+        Zona.recalcular_alertas_zonas(zonas)
+
+    def _indexar_lote(self, sensores: Sequence[Sensor]) -> None:
+        """
+        Versión de _indexar para muchos sensores nuevos: lee tipo y estado del
+        SensorStore por columnas y arma cada índice secundario por grupos.
+        """
+        sensores = [sensor for sensor in sensores if sensor.get_id() not in self._sensores]
+        if not sensores:
+            return
+        ids = [sensor.get_id() for sensor in sensores]
+        filas = np.fromiter((sensor.get_indice_store() for sensor in sensores), dtype=np.intp, count=len(sensores))
+        store = SensorStore.get_instance()
+        activos, calibrados = store.columna("activo", filas), store.columna("calibrado", filas)
+        numeros_clase: Dict[type, int] = {}
+        clases = np.fromiter((numeros_clase.setdefault(type(sensor), len(numeros_clase)) for sensor in sensores),
+                             dtype=np.intp, count=len(sensores))
+        tipos_clase = list(numeros_clase)
+
+        self._sensores.update(zip(ids, sensores))
+        self._estado_por_sensor.update(zip(ids, zip(activos.tolist(), calibrados.tolist())))
+        for codigo, grupo in _agrupar(store.columna("codigo_tipo", filas), ids, sensores):
+            self._por_tipo.setdefault(TipoSensor.desde_nombre(codigo), {}).update(grupo)
+        for numero, grupo in _agrupar(clases, ids, sensores):
+            self._por_clase.setdefault(tipos_clase[numero], {}).update(grupo)
+        for estado, grupo in _agrupar(activos * 2 + calibrados, ids, sensores):
+            self._por_estado.setdefault((estado >= 2, estado % 2 == 1), {}).update(grupo)
+        for sensor in sensores:
+            sensor.set_zona(self)
+        # Si la zona estaba vacía, las filas ya están en orden de alta
+        self._indices_store = filas if len(self._sensores) == len(sensores) else None
+
+    def _fijar_conteo_alertas(self, conteos: List[int]) -> List[Tuple[int, bool]]:
+        """Reemplaza los conteos (con el lock tomado) y devuelve las alertas que cambiaron de estado."""
+        cambios = [
+            (indice, conteos[indice] > 0)
+            for indice in range(len(ALERTAS_ZONA))
+            if (conteos[indice] > 0) != (self._conteo_alertas[indice] > 0)
+        ]
+        if conteos != self._conteo_alertas:
+            self._conteo_alertas = conteos
+            self._estado_cache = None
+        return cambios
+
+    def _vincular_sensor(self, sensor: Sensor) -> None:
+        """Vincula el sensor a la zona y contabiliza su valor actual."""
+        sensor.set_zona(self)
+        store, indice = sensor.get_store(), sensor.get_indice_store()
+        with self._lock_zona:
+            if not store.vincular_zona(indice, self._id):
+                return
+            valor, version = store.leer_valor_versionado(indice)
+            nueva = clasificar_alerta(sensor.get_codigo_tipo(), valor)
+            anterior = store.actualizar_alerta(indice, self._id, version, nueva)
+            cambios = self._aplicar_cambio_alerta(anterior, nueva)
+        self._notificar_cambios(cambios, f"Sensor {sensor.get_tipo()} #{sensor.get_id()}")
+
+    def _desvincular_sensor(self, sensor: Sensor) -> None:
+        """Desvincula el sensor y descuenta su alerta, si tenía."""
+        with _lock_pertenencia:
+            if sensor.get_zona() is self:
+                sensor.set_zona(None)
+        with self._lock_zona:
+            anterior = sensor.get_store().desvincular_zona(sensor.get_indice_store(), self._id)
+            if anterior is None:
+                return
+            cambios = self._aplicar_cambio_alerta(anterior, SIN_ALERTA)
+        self._notificar_cambios(cambios, f"Sensor {sensor.get_tipo()} #{sensor.get_id()}")
+
+    def _aplicar_cambio_alerta(self, anterior: int, nueva: int) -> List[Tuple[int, bool]]:
+        """
+        Ajusta los conteos (con el lock tomado) y devuelve las alertas que cambiaron
+        de estado como (índice de alerta, activada).
+        """
+        if anterior == nueva:
+            return []
+        cambios = []
+        if anterior != SIN_ALERTA:
+            self._conteo_alertas[anterior] -= 1
+            if self._conteo_alertas[anterior] == 0:
+                cambios.append((anterior, False))
+        if nueva != SIN_ALERTA:
+            self._conteo_alertas[nueva] += 1
+            if self._conteo_alertas[nueva] == 1:
+                cambios.append((nueva, True))
+        self._estado_cache = None
+        return cambios
 
-        return ", ".join(alertas) if alertas else "Condiciones normales"
+    def _notificar_cambios(self, cambios: List[Tuple[int, bool]], origen: str) -> None:
+        """Emite un EventoZona por cada alerta que se activó o desactivó (fuera del lock)."""
+        for indice, activada in cambios:
+            evento = EventoZona(
+                "ALERTA_ACTIVADA" if activada else "ALERTA_DESACTIVADA",
+                origen,
+                {"zona": self._id, "alerta": ALERTAS_ZONA[indice]},
+            )
+            self.notificar_observers(evento)
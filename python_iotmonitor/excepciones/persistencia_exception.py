@@ -9,6 +9,10 @@ class TipoOperacion(Enum):
     ESCRITURA = "ESCRITURA"
 
 
+class ErrorFormatoBinario(ValueError):
+    """Archivo que no tiene el formato binario esperado o cuyo contenido está dañado."""
+
+
 class PersistenciaException(IoTMonitorException):
     """
     Excepción lanzada durante operaciones de persistencia del sistema (serialización / deserialización).
@@ -0,0 +1,35 @@
+from enum import IntFlag
+
+
+class AccionControl(IntFlag):
+    """
+    Acciones automáticas del control ambiental (US-008, US-010).
+    Son banderas: el código de acción de una zona combina todas las que aplican.
+    """
+
+    NINGUNA = 0
+    CALEFACCION = 1
+    ENFRIAMIENTO = 2
+    HUMIDIFICAR = 4
+    DESHUMIDIFICAR = 8
+    VENTILACION_FORZADA = 16
+    VENTILACION_MODERADA = 32
+    ENCENDER_LUCES = 64
+    REDUCIR_LUZ = 128
+
+    def get_mensaje(self) -> str:
+        """Devuelve el mensaje que informa la acción en el ciclo de control."""
+        return MENSAJES_ACCION.get(self, self.name)
+
+
+# Mensajes por acción, en el orden en que se informan
+MENSAJES_ACCION = {
+    AccionControl.CALEFACCION: " Activando calefacción ambiental...",
+    AccionControl.ENFRIAMIENTO: " Activando ventilación y enfriamiento...",
+    AccionControl.HUMIDIFICAR: " Activando humidificador...",
+    AccionControl.DESHUMIDIFICAR: " Deshumidificando ambiente...",
+    AccionControl.VENTILACION_FORZADA: " Nivel crítico de CO₂ — ventilación forzada activada.",
+    AccionControl.VENTILACION_MODERADA: " Nivel alto de CO₂ — ventilación moderada.",
+    AccionControl.ENCENDER_LUCES: " Encendiendo luces automáticas.",
+    AccionControl.REDUCIR_LUZ: " Ambiente sobreiluminado — reduciendo luz artificial.",
+}
@@ -0,0 +1,141 @@
+from itertools import compress, count
+from operator import itemgetter
+from typing import Dict, Hashable, List, Sequence, Tuple
+import numpy as np
+from python_iotmonitor.entidades.sensores.tipo_sensor import NOMBRES_TIPO
+from python_iotmonitor.constantes import CONTROL_CICLOS_VIGENCIA_VALOR
+
+# Clave de un casillero: (id de zona, código TipoSensor)
+ClaveCasillero = Tuple[Hashable, int]
+
+
+class BuzonUltimosValores:
+    """
+    Buzón de últimos valores con coalescencia por (zona, código de tipo de sensor).
+
+    Los productores (sensores, a través del controlador) sobrescriben su
+    casillero con una única asignación sobre el buffer de escritura, sin
+    tomar locks: bajo el GIL la asignación de un ítem de dict es atómica.
+    El ciclo de control intercambia el buffer de escritura por uno vacío
+    una vez por ciclo (doble buffer) y consolida los valores vigentes.
+
+    Un productor que tomó la referencia al buffer justo antes del intercambio
+    escribe en el buffer retirado; por eso el buffer retirado se vuelve a
+    consolidar en el ciclo siguiente, antes que el más reciente, y ninguna
+    escritura se pierde.
+
+    Un casillero que no recibe valores durante `ciclos_vigencia` ciclos se
+    descarta: las zonas eliminadas y los sensores que dejaron de reportar no
+    siguen alimentando al motor de reglas con su último valor.
+    """
+
+    def __init__(self, ciclos_vigencia: int = CONTROL_CICLOS_VIGENCIA_VALOR):
+        """
+        Args:
+            ciclos_vigencia: Ciclos sin valores nuevos tras los que se olvida un casillero (> 0).
+
+        Raises:
+            ValueError: Si ciclos_vigencia no es positivo.
+        """
+        if ciclos_vigencia <= 0:
+            raise ValueError(f"Los ciclos de vigencia deben ser positivos: {ciclos_vigencia}")
+        self._ciclos_vigencia = ciclos_vigencia
+        self._ciclo = 0
+        self._escritura: Dict[ClaveCasillero, float] = {}
+        self._retirado: Dict[ClaveCasillero, float] = {}
+        self._vigentes: Dict[ClaveCasillero, float] = {}
+        self._ultimo_ciclo: Dict[ClaveCasillero, int] = {}  # ciclo del último valor de cada casillero
+
+    # -----------------------------------------------------------------------
+    # Productores
+    # -----------------------------------------------------------------------
+    def publicar(self, id_zona: Hashable, codigo_tipo: int, valor: float) -> None:
+        """
+        Sobrescribe el último valor de un casillero (sin locks).
+
+        Args:
+            id_zona: Identificador de la zona.
+            codigo_tipo: Código TipoSensor de la lectura.
+            valor: Último valor leído.
+        """
+        self._escritura[(id_zona, codigo_tipo)] = valor
+
+    # -----------------------------------------------------------------------
+    # Consumidor (ciclo de control)
+    # -----------------------------------------------------------------------
+    def intercambiar(self) -> Dict[ClaveCasillero, float]:
+        """
+        Retira el buffer de escritura, consolida los últimos valores y descarta
+        los casilleros vencidos. Debe llamarse desde un único consumidor (el ciclo de control).
+
+        Returns:
+            Diccionario (zona, tipo) → último valor vigente. Es propiedad del
+            buzón: el consumidor no debe modificarlo.
+        """
+        retirado, self._escritura = self._escritura, {}
+        self._ciclo += 1
+        ciclo = self._ciclo
+        self._vigentes.update(self._retirado)  # escrituras tardías del ciclo anterior
+        self._ultimo_ciclo.update(dict.fromkeys(self._retirado, ciclo - 1))
+        self._vigentes.update(retirado)
+        self._ultimo_ciclo.update(dict.fromkeys(retirado, ciclo))
+        self._retirado = retirado
+
+        limite = ciclo - self._ciclos_vigencia
+        vencidos = [clave for clave, visto in self._ultimo_ciclo.items() if visto <= limite]
+        for clave in vencidos:
+            del self._ultimo_ciclo[clave]
+            del self._vigentes[clave]
+        return self._vigentes
+
+    def valores_por_zona(self) -> Dict[Hashable, Dict[int, float]]:
+        """
+        Intercambia el buffer y agrupa los valores vigentes por zona.
+
+        Returns:
+            Diccionario id_zona → {código TipoSensor: último valor}.
+        """
+        por_zona: Dict[Hashable, Dict[int, float]] = {}
+        for (id_zona, codigo_tipo), valor in self.intercambiar().items():
+            por_zona.setdefault(id_zona, {})[codigo_tipo] = valor
+        return por_zona
+
+    def matriz_por_zona(self, tipos: Sequence[int], por_defecto: Sequence[float]) -> Tuple[List[Hashable], np.ndarray]:
+        """
+        Intercambia el buffer y arma una matriz (zonas × tipos) con los valores vigentes,
+        lista para evaluarse de forma vectorizada (ver MotorReglas).
+
+        Args:
+            tipos: Código TipoSensor de cada columna.
+            por_defecto: Valor de cada columna para zonas sin lecturas de ese tipo.
+
+        Returns:
+            Tupla (ids de zona de cada fila, matriz de valores).
+        """
+        columna_por_codigo = np.full(len(NOMBRES_TIPO), -1, dtype=np.intp)
+        columna_por_codigo[np.asarray(tipos, dtype=np.intp)] = np.arange(len(tipos))
+        vigentes = self.intercambiar()
+        cantidad = len(vigentes)
+        # Los códigos fuera de rango (tipos desconocidos) no ocupan columna
+        codigos = np.fromiter(map(itemgetter(1), vigentes), dtype=np.intp, count=cantidad)
+        en_rango = (codigos >= 0) & (codigos < len(columna_por_codigo))
+        columnas = np.full(cantidad, -1, dtype=np.intp)
+        columnas[en_rango] = columna_por_codigo[codigos[en_rango]]
+        valores = np.fromiter(vigentes.values(), dtype=np.float64, count=cantidad)
+        validas = columnas >= 0
+
+        # Una fila por zona: con ids enteros (lo habitual) se factorizan con np.unique;
+        # cualquier otro hashable, por orden de aparición
+        try:
+            ids_zona = np.fromiter(map(itemgetter(0), vigentes), dtype=np.int64, count=cantidad)[validas]
+            filas_zona, filas = np.unique(ids_zona, return_inverse=True)
+            filas_zona = filas_zona.tolist()
+        except (TypeError, ValueError, OverflowError):
+            ids_validos = list(compress(map(itemgetter(0), vigentes), validas.tolist()))
+            fila_por_zona = dict(zip(dict.fromkeys(ids_validos), count()))
+            filas = np.fromiter(map(fila_por_zona.__getitem__, ids_validos), dtype=np.intp, count=len(ids_validos))
+            filas_zona = list(fila_por_zona)
+
+        matriz = np.tile(np.asarray(por_defecto, dtype=np.float64), (len(filas_zona), 1))
+        matriz[filas, columnas[validas]] = valores[validas]
+        return filas_zona, matriz
@@ -1,15 +1,27 @@
+import asyncio
 import threading
 import time
-from typing import TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING
+import numpy as np
 from python_iotmonitor.patrones.observer.observer import Observer
+from python_iotmonitor.entidades.sensores.tipo_sensor import TipoSensor, NOMBRES_TIPO
 from python_iotmonitor.patrones.observer.eventos.evento_sensor_ambiental import EventoSensorAmbiental
-from python_iotmonitor.constantes import (CONTROL_AMBIENTAL_CICLO_SEGUNDOS)
+from python_iotmonitor.patrones.observer.eventos.evento_lote import EventoLote
+from python_iotmonitor.iot_control.control.buzon_ultimos_valores import BuzonUltimosValores
+from python_iotmonitor.iot_control.control.accion_control import AccionControl
+from python_iotmonitor.iot_control.control.motor_reglas import MotorReglas, VARIABLES_CONTROL
+from python_iotmonitor.constantes import (CONTROL_AMBIENTAL_CICLO_SEGUNDOS, CONTROL_MAX_ZONAS_DETALLE)
 
 if TYPE_CHECKING:
+    from python_iotmonitor.patrones.observer.eventos.lote_lecturas import LoteLecturas
     from python_iotmonitor.servicios.sensores.sensor_service_registry import SensorServiceRegistry
     from python_iotmonitor.entidades.zonas.zona import Zona
 
 
+# Valores asumidos mientras una zona no reporta lecturas de un tipo
+VALORES_INICIALES = {TipoSensor.TEMPERATURA: 0.0, TipoSensor.HUMEDAD: 50.0, TipoSensor.CO2: 400.0, TipoSensor.LUZ: 250.0}
+
+
 class ControlAmbientalTask(threading.Thread, Observer[EventoSensorAmbiental]):
     """
     Controlador Ambiental principal del sistema IoTMonitor.
@@ -19,19 +31,32 @@ class ControlAmbientalTask(threading.Thread, Observer[EventoSensorAmbiental]):
     a los cambios en temperatura, humedad, CO₂ y luz.
     """
 
-    def __init__(self, zona: "Zona", sensor_registry: "SensorServiceRegistry"):
+    def __init__(self, zona: "Zona", sensor_registry: "SensorServiceRegistry",
+                 buzon: Optional[BuzonUltimosValores] = None,
+                 motor_reglas: Optional[MotorReglas] = None):
+        """
+        Args:
+            zona: Zona principal que controla esta tarea.
+            sensor_registry: Registro de servicios de sensores.
+            buzon: Buzón de últimos valores. Puede compartirse con otros productores
+                para que un mismo controlador atienda varias zonas.
+            motor_reglas: Motor de reglas con los umbrales de control (por defecto,
+                los de constantes.py).
+        """
         super().__init__()
         self.zona = zona
         self.sensor_registry = sensor_registry
         self._parar = threading.Event()
-        self.name = f"ControlAmbientalThread-{zona.get_id_zona()}"
-        self._lock = threading.Lock()
+        self._id_zona = zona.get_id_zona()
+        self.name = f"ControlAmbientalThread-{self._id_zona}"
+        self._buzon = buzon if buzon is not None else BuzonUltimosValores()
+        self._motor_reglas = motor_reglas if motor_reglas is not None else MotorReglas()
 
-        # Últimos valores registrados
-        self._ultima_temperatura = 0.0
-        self._ultima_humedad = 50.0
-        self._ultimo_co2 = 400.0
-        self._ultima_luz = 250.0
+        # Últimos valores registrados (zona principal, consolidados en cada ciclo)
+        self._ultima_temperatura = VALORES_INICIALES[TipoSensor.TEMPERATURA]
+        self._ultima_humedad = VALORES_INICIALES[TipoSensor.HUMEDAD]
+        self._ultimo_co2 = VALORES_INICIALES[TipoSensor.CO2]
+        self._ultima_luz = VALORES_INICIALES[TipoSensor.LUZ]
 
     # -----------------------------------------------------------------------
     # Ciclo principal
@@ -49,62 +74,103 @@ class ControlAmbientalTask(threading.Thread, Observer[EventoSensorAmbiental]):
 
         print(f"[{self.name}] Control ambiental detenido.")
 
+    async def ejecutar_async(self):
+        """
+        Variante asyncio del ciclo principal.
+        Permite compartir un único event loop con los sensores asíncronos
+        (TemperaturaReaderAsync, HumedadReaderAsync) sin ocupar un hilo propio.
+        """
+        print(f"[{self.name}] Control ambiental iniciado (asyncio).")
+        while not self._parar.is_set():
+            try:
+                self._aplicar_control_ambiental()
+            except Exception as e:
+                print(f"[{self.name}]  Error en control ambiental: {e}")
+
+            await asyncio.sleep(CONTROL_AMBIENTAL_CICLO_SEGUNDOS)
+
+        print(f"[{self.name}] Control ambiental detenido.")
+
     # -----------------------------------------------------------------------
     # Observador de sensores
     # -----------------------------------------------------------------------
     def actualizar(self, evento: EventoSensorAmbiental) -> None:
-        """Recibe notificaciones de los sensores y actualiza sus últimas lecturas."""
-        with self._lock:
-            if evento.tipo_sensor == "Temperatura":
-                self._ultima_temperatura = evento.valor
-            elif evento.tipo_sensor == "Humedad":
-                self._ultima_humedad = evento.valor
-            elif evento.tipo_sensor == "CO2":
-                self._ultimo_co2 = evento.valor
-            elif evento.tipo_sensor == "Luz":
-                self._ultima_luz = evento.valor
+        """Recibe notificaciones de los sensores y sobrescribe su casillero en el buzón."""
+        id_zona = evento.id_zona if evento.id_zona is not None else self._id_zona
+        self._buzon.publicar(id_zona, evento.codigo_tipo, evento.valor)
+
+    def actualizar_lote(self, lote: EventoLote) -> None:
+        """Recibe un lote de lecturas y sobrescribe los casilleros sin tomar locks."""
+        publicar = self._buzon.publicar
+        id_zona_principal = self._id_zona
+        for evento in lote.eventos:
+            id_zona = evento.id_zona if evento.id_zona is not None else id_zona_principal
+            publicar(id_zona, evento.codigo_tipo, evento.valor)
+
+    def actualizar_lecturas(self, lote: "LoteLecturas") -> None:
+        """
+        Recibe un lote columnar de lecturas: reduce el lote al último valor por
+        (zona, tipo) con operaciones vectorizadas y publica solo esos casilleros.
+        """
+        for (id_zona, codigo), valor in lote.ultimos_por_zona_y_tipo().items():
+            if 0 < codigo < len(NOMBRES_TIPO):
+                self._buzon.publicar(self._id_zona if id_zona < 0 else id_zona, codigo, valor)
+
+    def get_buzon(self) -> BuzonUltimosValores:
+        """Devuelve el buzón de últimos valores del controlador."""
+        return self._buzon
+
+    def get_motor_reglas(self) -> MotorReglas:
+        """Devuelve el motor de reglas del controlador."""
+        return self._motor_reglas
 
     # -----------------------------------------------------------------------
     # Lógica de control ambiental
     # -----------------------------------------------------------------------
     def _aplicar_control_ambiental(self):
         """
-        Evalúa las condiciones actuales y ejecuta acciones automáticas.
+        Intercambia el buzón una vez por ciclo y evalúa todas las zonas con lecturas
+        en una única pasada vectorizada del motor de reglas.
         Aplica estrategias de enfriamiento, ventilación, humidificación y ajuste de luz.
         """
-        with self._lock:
-            T = self._ultima_temperatura
-            H = self._ultima_humedad
-            C = self._ultimo_co2
-            L = self._ultima_luz
-
+        por_defecto = [VALORES_INICIALES[variable] for variable in VARIABLES_CONTROL]
+        ids_zona, valores = self._buzon.matriz_por_zona(VARIABLES_CONTROL, por_defecto)
+        if self._id_zona not in ids_zona:
+            ids_zona.append(self._id_zona)
+            valores = np.vstack([valores, por_defecto])
+
+        codigos = self._motor_reglas.evaluar(valores, np.asarray(ids_zona))
+
+        fila_principal = ids_zona.index(self._id_zona)
+        (self._ultima_temperatura, self._ultima_humedad,
+         self._ultimo_co2, self._ultima_luz) = valores[fila_principal].tolist()
+        self._informar_zona(f"[{self.name}]", valores[fila_principal], int(codigos[fila_principal]))
+
+        if len(ids_zona) <= CONTROL_MAX_ZONAS_DETALLE:
+            for fila, id_zona in enumerate(ids_zona):
+                if fila != fila_principal:
+                    self._informar_zona(f"[{self.name}] Zona {id_zona}", valores[fila], int(codigos[fila]))
+        else:
+            self._informar_resumen(codigos)
+
+    def _informar_zona(self, prefijo: str, valores: np.ndarray, codigo: int) -> None:
+        """Informa los últimos valores de una zona y las acciones automáticas que le corresponden."""
+        T, H, C, L = valores.tolist()
         print(
-            f"[{self.name}] Estado actual → T:{T}°C | H:{H}% | CO₂:{C}ppm | L:{L}lux"
+            f"{prefijo} Estado actual → T:{T}°C | H:{H}% | CO₂:{C}ppm | L:{L}lux"
         )
-
-        # --- Temperatura (Strategy Enfriar / Calentar) ---
-        if T < 8:
-            print(" Activando calefacción ambiental...")
-        elif T > 28:
-            print(" Activando ventilación y enfriamiento...")
-
-        # --- Humedad (Strategy Humidificar) ---
-        if H < 40:
-            print(" Activando humidificador...")
-        elif H > 80:
-            print(" Deshumidificando ambiente...")
-
-        # --- CO₂ (Strategy Ventilar) ---
-        if C > 900:
-            print(" Nivel crítico de CO₂ — ventilación forzada activada.")
-        elif C > 600:
-            print(" Nivel alto de CO₂ — ventilación moderada.")
-
-        # --- Luz (Strategy AjustarLuz) ---
-        if L < 200:
-            print(" Encendiendo luces automáticas.")
-        elif L > 700:
-            print(" Ambiente sobreiluminado — reduciendo luz artificial.")
+        for mensaje in MotorReglas.describir(codigo):
+            print(mensaje)
+
+    def _informar_resumen(self, codigos: np.ndarray) -> None:
+        """Informa cuántas zonas requieren cada acción (despliegues con muchas zonas)."""
+        print(f"[{self.name}] {len(codigos)} zonas evaluadas.")
+        for accion in AccionControl:
+            if accion is AccionControl.NINGUNA:
+                continue
+            cantidad = int(np.count_nonzero(codigos & accion))
+            if cantidad:
+                print(f"  - {accion.name}: {cantidad} zonas")
 
     def parar(self):
         """Detiene el hilo de control ambiental de forma segura."""
@@ -0,0 +1,283 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+import numpy as np
+from python_iotmonitor.entidades.sensores.tipo_sensor import TipoSensor
+from python_iotmonitor.iot_control.control.accion_control import AccionControl, MENSAJES_ACCION
+from python_iotmonitor.constantes import (
+    CONTROL_TEMP_CALEFACCION, CONTROL_TEMP_ENFRIAMIENTO,
+    CONTROL_HUMEDAD_HUMIDIFICAR, CONTROL_HUMEDAD_DESHUMIDIFICAR,
+    CONTROL_CO2_VENTILACION_MODERADA, CONTROL_CO2_VENTILACION_FORZADA,
+    CONTROL_LUZ_ENCENDER, CONTROL_LUZ_REDUCIR, CONTROL_PRESION_BAJA, CONTROL_PRESION_ALTA,
+    TEMP_CRITICA_ALTA, HUMEDAD_CRITICA_BAJA, CO2_CRITICO_ALTO, HUMEDAD_MAX_RIEGO,
+    SERVICIO_TEMP_CALEFACCION, SERVICIO_TEMP_VENTILACION, SERVICIO_HUMEDAD_CRITICA,
+    SERVICIO_CO2_ALTO, SERVICIO_CO2_CRITICO, SERVICIO_LUZ_OSCURO, SERVICIO_LUZ_SOBREILUMINADO,
+)
+
+# Variables evaluadas, en el orden de las columnas de la matriz de valores
+VARIABLES_CONTROL: Tuple[TipoSensor, ...] = (TipoSensor.TEMPERATURA, TipoSensor.HUMEDAD, TipoSensor.CO2, TipoSensor.LUZ)
+
+
+class ReglaControl(NamedTuple):
+    """Regla de umbral: si `variable` `operador` `umbral`, se aplica `accion`."""
+    nombre: str
+    variable: Union[TipoSensor, str]  # los nombres se convierten a TipoSensor al compilar
+    operador: str  # "<" o ">"
+    umbral: float
+    accion: AccionControl = AccionControl.NINGUNA
+    suprime: AccionControl = AccionControl.NINGUNA  # acciones que esta regla anula
+
+
+# Reglas del control ambiental (US-008, US-010)
+REGLAS_CONTROL_AMBIENTAL: Tuple[ReglaControl, ...] = (
+    ReglaControl("temperatura_calefaccion", TipoSensor.TEMPERATURA, "<", CONTROL_TEMP_CALEFACCION,
+                 AccionControl.CALEFACCION),
+    ReglaControl("temperatura_enfriamiento", TipoSensor.TEMPERATURA, ">", CONTROL_TEMP_ENFRIAMIENTO,
+                 AccionControl.ENFRIAMIENTO),
+    ReglaControl("humedad_humidificar", TipoSensor.HUMEDAD, "<", CONTROL_HUMEDAD_HUMIDIFICAR,
+                 AccionControl.HUMIDIFICAR),
+    ReglaControl("humedad_deshumidificar", TipoSensor.HUMEDAD, ">", CONTROL_HUMEDAD_DESHUMIDIFICAR,
+                 AccionControl.DESHUMIDIFICAR),
+    ReglaControl("co2_ventilacion_forzada", TipoSensor.CO2, ">", CONTROL_CO2_VENTILACION_FORZADA,
+                 AccionControl.VENTILACION_FORZADA, suprime=AccionControl.VENTILACION_MODERADA),
+    ReglaControl("co2_ventilacion_moderada", TipoSensor.CO2, ">", CONTROL_CO2_VENTILACION_MODERADA,
+                 AccionControl.VENTILACION_MODERADA),
+    ReglaControl("luz_encender", TipoSensor.LUZ, "<", CONTROL_LUZ_ENCENDER, AccionControl.ENCENDER_LUCES),
+    ReglaControl("luz_reducir", TipoSensor.LUZ, ">", CONTROL_LUZ_REDUCIR, AccionControl.REDUCIR_LUZ),
+)
+
+# Estados informativos de presión (la presión no es una variable de control:
+# estas reglas solo clasifican lecturas, ver MotorReglas.clasificar_lectura)
+REGLAS_ESTADO_PRESION: Tuple[ReglaControl, ...] = (
+    ReglaControl("Presión baja — posible tormenta", TipoSensor.PRESION, "<", CONTROL_PRESION_BAJA),
+    ReglaControl("Presión alta — clima estable", TipoSensor.PRESION, ">", CONTROL_PRESION_ALTA),
+)
+
+# Reglas del procesar_lectura de cada servicio de sensores: el nombre es el mensaje
+# informado (primera regla que dispara). Son independientes de los umbrales del controlador.
+REGLAS_SERVICIO_TEMPERATURA: Tuple[ReglaControl, ...] = (
+    ReglaControl("Activando calefacción", TipoSensor.TEMPERATURA, "<", SERVICIO_TEMP_CALEFACCION),
+    ReglaControl("Activando ventilación", TipoSensor.TEMPERATURA, ">", SERVICIO_TEMP_VENTILACION),
+)
+REGLAS_SERVICIO_HUMEDAD: Tuple[ReglaControl, ...] = (
+    ReglaControl("Activando humidificador (nivel crítico)", TipoSensor.HUMEDAD, "<", SERVICIO_HUMEDAD_CRITICA),
+    ReglaControl("Activando humidificación moderada", TipoSensor.HUMEDAD, "<", HUMEDAD_MAX_RIEGO),
+)
+REGLAS_SERVICIO_CO2: Tuple[ReglaControl, ...] = (
+    ReglaControl("Nivel crítico — activando ventilación forzada", TipoSensor.CO2, ">", SERVICIO_CO2_CRITICO),
+    ReglaControl("Nivel alto — aumentando ventilación", TipoSensor.CO2, ">", SERVICIO_CO2_ALTO),
+)
+# Sin regla que dispare (>= SERVICIO_LUZ_SOBREILUMINADO) el ambiente está sobreiluminado (ver LuzService)
+REGLAS_SERVICIO_LUZ: Tuple[ReglaControl, ...] = (
+    ReglaControl("Intensificando iluminación (ambiente oscuro)", TipoSensor.LUZ, "<", SERVICIO_LUZ_OSCURO),
+    ReglaControl("Iluminación adecuada", TipoSensor.LUZ, "<", SERVICIO_LUZ_SOBREILUMINADO),
+)
+
+# Alertas de zona: el nombre de cada regla es el mensaje de la alerta (ver Zona.evaluar_condiciones)
+REGLAS_ALERTA_ZONA: Tuple[ReglaControl, ...] = (
+    ReglaControl("Alta temperatura", TipoSensor.TEMPERATURA, ">", TEMP_CRITICA_ALTA),
+    ReglaControl("Baja humedad", TipoSensor.HUMEDAD, "<", HUMEDAD_CRITICA_BAJA),
+    ReglaControl("CO₂ elevado", TipoSensor.CO2, ">", CO2_CRITICO_ALTO),
+)
+
+
+class MotorReglas:
+    """
+    Motor de reglas del control ambiental (US-008, US-010).
+
+    Compila las reglas de umbral en arreglos (columna evaluada, operador,
+    umbral y bandera de acción) y evalúa todas las zonas a la vez con
+    comparaciones de NumPy sobre una matriz (zonas × variables). Cada zona
+    puede redefinir umbrales puntuales; el resto usa los de `constantes.py`.
+
+    Las mismas reglas clasifican lecturas sueltas o columnas de lecturas
+    (`clasificar_lectura` / `clasificar_lecturas`: primera regla que dispara),
+    que usan las alertas de zona y los servicios de sensores. Las reglas sobre
+    variables que no forman parte de la matriz de control (p. ej. presión)
+    solo participan de esa clasificación.
+    """
+
+    def __init__(self, reglas: Iterable[ReglaControl] = REGLAS_CONTROL_AMBIENTAL,
+                 umbrales_por_zona: Optional[Dict[int, Dict[str, float]]] = None):
+        """
+        Inicializa el motor compilando las reglas.
+
+        Args:
+            reglas: Reglas a aplicar (por defecto, las del control ambiental).
+            umbrales_por_zona: Umbrales redefinidos por zona: id_zona → {nombre de regla: umbral}.
+
+        Raises:
+            ValueError: Si una regla tiene una variable u operador desconocido.
+        """
+        compiladas: List[ReglaControl] = []
+        for regla in reglas:
+            variable = regla.variable
+            if not isinstance(variable, TipoSensor):
+                variable = TipoSensor.desde_nombre(variable)
+            if variable is TipoSensor.DESCONOCIDO:
+                raise ValueError(f"Variable desconocida en la regla '{regla.nombre}': {regla.variable}")
+            if regla.operador not in ("<", ">"):
+                raise ValueError(f"Operador desconocido en la regla '{regla.nombre}': {regla.operador}")
+            compiladas.append(regla._replace(variable=variable))
+        self._reglas: Tuple[ReglaControl, ...] = tuple(compiladas)
+
+        self._indice_regla: Dict[str, int] = {regla.nombre: i for i, regla in enumerate(self._reglas)}
+        # Columna de la matriz de control de cada regla (-1: la variable no se controla)
+        self._columnas = np.array([VARIABLES_CONTROL.index(r.variable) if r.variable in VARIABLES_CONTROL else -1
+                                   for r in self._reglas], dtype=np.intp)
+        self._codigos = np.array([r.variable for r in self._reglas], dtype=np.uint8)
+        self._es_menor = np.array([r.operador == "<" for r in self._reglas], dtype=bool)
+        self._umbrales_base = np.array([r.umbral for r in self._reglas], dtype=np.float64)
+        # Reglas de cada código de tipo, en orden: (índice, es_menor, umbral)
+        self._reglas_por_codigo: Dict[int, List[Tuple[int, bool, float]]] = {}
+        for indice, regla in enumerate(self._reglas):
+            self._reglas_por_codigo.setdefault(int(regla.variable), []).append(
+                (indice, regla.operador == "<", float(regla.umbral)))
+
+        # Umbrales redefinidos: ids ordenados + una fila completa de umbrales por zona
+        self._ids_redefinidos = np.empty(0, dtype=np.int64)
+        self._umbrales_redefinidos = np.empty((0, len(self._reglas)), dtype=np.float64)
+        for id_zona, umbrales in (umbrales_por_zona or {}).items():
+            self.definir_umbrales_zona(id_zona, umbrales)
+
+    # -----------------------------------------------------------------------
+    # Umbrales por zona
+    # -----------------------------------------------------------------------
+    def definir_umbrales_zona(self, id_zona: int, umbrales: Dict[str, float]) -> None:
+        """
+        Redefine umbrales de una zona (las reglas no indicadas conservan su valor actual).
+
+        Args:
+            id_zona: Identificador de la zona.
+            umbrales: Nombre de regla → nuevo umbral.
+
+        Raises:
+            ValueError: Si algún nombre de regla no existe.
+        """
+        desconocidas = set(umbrales) - set(self._indice_regla)
+        if desconocidas:
+            raise ValueError(f"Reglas desconocidas: {', '.join(sorted(desconocidas))}")
+
+        posicion = int(np.searchsorted(self._ids_redefinidos, id_zona))
+        existe = posicion < len(self._ids_redefinidos) and self._ids_redefinidos[posicion] == id_zona
+        fila = self._umbrales_redefinidos[posicion].copy() if existe else self._umbrales_base.copy()
+        for nombre, umbral in umbrales.items():
+            fila[self._indice_regla[nombre]] = umbral
+
+        if existe:
+            self._umbrales_redefinidos[posicion] = fila
+        else:
+            self._ids_redefinidos = np.insert(self._ids_redefinidos, posicion, id_zona)
+            self._umbrales_redefinidos = np.insert(self._umbrales_redefinidos, posicion, fila, axis=0)
+
+    def quitar_umbrales_zona(self, id_zona: int) -> None:
+        """Vuelve a aplicar los umbrales generales en una zona."""
+        posicion = int(np.searchsorted(self._ids_redefinidos, id_zona))
+        if posicion < len(self._ids_redefinidos) and self._ids_redefinidos[posicion] == id_zona:
+            self._ids_redefinidos = np.delete(self._ids_redefinidos, posicion)
+            self._umbrales_redefinidos = np.delete(self._umbrales_redefinidos, posicion, axis=0)
+
+    def get_umbrales(self, id_zona: Optional[int] = None) -> Dict[str, float]:
+        """Devuelve los umbrales vigentes (generales o de una zona) por nombre de regla."""
+        fila = self._umbrales_base
+        if id_zona is not None:
+            posicion = int(np.searchsorted(self._ids_redefinidos, id_zona))
+            if posicion < len(self._ids_redefinidos) and self._ids_redefinidos[posicion] == id_zona:
+                fila = self._umbrales_redefinidos[posicion]
+        return {regla.nombre: float(umbral) for regla, umbral in zip(self._reglas, fila.tolist())}
+
+    def get_reglas(self) -> Tuple[ReglaControl, ...]:
+        """Devuelve las reglas compiladas."""
+        return self._reglas
+
+    # -----------------------------------------------------------------------
+    # Evaluación
+    # -----------------------------------------------------------------------
+    def evaluar(self, valores: np.ndarray, ids_zona: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Evalúa todas las reglas para todas las zonas.
+
+        Args:
+            valores: Matriz (zonas × 4) con columnas en el orden de VARIABLES_CONTROL.
+                Un valor NaN (sin lectura) no dispara ninguna regla.
+            ids_zona: Identificadores de las zonas de cada fila (necesarios solo
+                si hay umbrales redefinidos).
+
+        Returns:
+            Arreglo con el código de acción (combinación de AccionControl) de cada zona.
+        """
+        valores = np.asarray(valores, dtype=np.float64)
+        codigos = self._evaluar_con_umbrales(valores, self._umbrales_base)
+
+        # Solo las filas de zonas con umbrales propios se vuelven a evaluar
+        if ids_zona is not None and len(self._ids_redefinidos):
+            ids_zona = np.asarray(ids_zona, dtype=np.int64)
+            posiciones = np.minimum(np.searchsorted(self._ids_redefinidos, ids_zona),
+                                    len(self._ids_redefinidos) - 1)
+            filas = np.flatnonzero(self._ids_redefinidos[posiciones] == ids_zona)
+            if len(filas):
+                codigos[filas] = self._evaluar_con_umbrales(
+                    valores[filas], self._umbrales_redefinidos[posiciones[filas]]
+                )
+        return codigos
+
+    def _evaluar_con_umbrales(self, valores: np.ndarray, umbrales: np.ndarray) -> np.ndarray:
+        """
+        Evalúa las reglas con umbrales comunes (vector por regla) o propios de cada fila (matriz).
+        """
+        codigos = np.zeros(valores.shape[0], dtype=np.int64)
+        supresiones = []
+
+        # Pocas reglas y muchas zonas: una comparación vectorizada por regla
+        for indice, regla in enumerate(self._reglas):
+            if self._columnas[indice] < 0:
+                continue
+            observado = valores[:, self._columnas[indice]]
+            umbral = umbrales[..., indice]
+            dispara = observado < umbral if self._es_menor[indice] else observado > umbral
+            np.bitwise_or(codigos, int(regla.accion), out=codigos, where=dispara)
+            if regla.suprime:
+                supresiones.append((dispara, ~int(regla.suprime)))
+
+        for dispara, mascara in supresiones:
+            np.bitwise_and(codigos, mascara, out=codigos, where=dispara)
+        return codigos
+
+    def clasificar_lectura(self, codigo_tipo: int, valor: Optional[float]) -> int:
+        """
+        Clasifica una lectura con los umbrales generales.
+
+        Args:
+            codigo_tipo: Código TipoSensor de la lectura.
+            valor: Valor leído (None o NaN, sin lectura, no dispara ninguna regla).
+
+        Returns:
+            Índice (en get_reglas) de la primera regla que dispara, o -1 si ninguna.
+        """
+        if valor is None:
+            return -1
+        for indice, es_menor, umbral in self._reglas_por_codigo.get(codigo_tipo, ()):
+            if (valor < umbral) if es_menor else (valor > umbral):
+                return indice
+        return -1
+
+    def clasificar_lecturas(self, codigos_tipo: np.ndarray, valores: np.ndarray) -> np.ndarray:
+        """
+        Versión vectorizada de clasificar_lectura sobre columnas de lecturas.
+
+        Returns:
+            Arreglo int16 con el índice de la primera regla que dispara en cada lectura (-1 si ninguna).
+        """
+        codigos_tipo = np.asarray(codigos_tipo)
+        valores = np.asarray(valores, dtype=np.float64)
+        resultado = np.full(len(valores), -1, dtype=np.int16)
+        # En orden inverso: la primera regla que dispara queda escrita al final
+        for indice in range(len(self._reglas) - 1, -1, -1):
+            umbral = self._umbrales_base[indice]
+            dispara = (valores < umbral) if self._es_menor[indice] else (valores > umbral)
+            dispara &= codigos_tipo == self._codigos[indice]
+            resultado[dispara] = indice
+        return resultado
+
+    @staticmethod
+    def describir(codigo: int) -> List[str]:
+        """Devuelve los mensajes de las acciones contenidas en un código, en orden de informe."""
+        return [mensaje for accion, mensaje in MENSAJES_ACCION.items() if codigo & accion]
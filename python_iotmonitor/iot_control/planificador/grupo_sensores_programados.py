@@ -0,0 +1,88 @@
+import random
+from typing import List, Optional, Union
+import numpy as np
+from python_iotmonitor.entidades.sensores.tipo_sensor import TipoSensor
+from python_iotmonitor.patrones.observer.observable import Observable
+from python_iotmonitor.patrones.observer.eventos.evento_sensor_ambiental import EventoSensorAmbiental
+from python_iotmonitor.patrones.observer.eventos.evento_lote import EventoLote
+from python_iotmonitor.iot_control.planificador.planificador_lecturas import PlanificadorLecturas, TareaProgramada
+from python_iotmonitor.iot_control.planificador.sensor_programado import CONFIGURACION_LECTURA
+
+
+class GrupoSensoresProgramados(Observable[EventoSensorAmbiental]):
+    """
+    Grupo de sensores simulados de un mismo tipo que comparten una única tarea
+    en el PlanificadorLecturas (US-008, US-010).
+
+    En cada tick genera la lectura de todos sus sensores y la entrega como un
+    único EventoLote mediante Observable.notificar_lote.
+    """
+
+    def __init__(self, tipo: Union[TipoSensor, str], ids_sensores: List[int], planificador: PlanificadorLecturas,
+                 rng: Optional[np.random.Generator] = None):
+        """
+        Inicializa un grupo de sensores programados.
+
+        Args:
+            tipo: Código TipoSensor común al grupo (o su nombre: "Temperatura", "Humedad", "CO2", "Luz").
+            ids_sensores: Identificadores de los sensores del grupo.
+            planificador: Planificador que ejecutará las lecturas.
+            rng: Flujo aleatorio del grupo (modo reproducible, ver GeneradorSimulacion).
+                Si es None se usa el generador global de `random`.
+
+        Raises:
+            ValueError: Si el tipo no tiene configuración de lectura.
+        """
+        codigo = tipo if isinstance(tipo, TipoSensor) else TipoSensor.desde_nombre(tipo)
+        if codigo not in CONFIGURACION_LECTURA:
+            raise ValueError(f"Tipo de sensor desconocido: {tipo}")
+
+        super().__init__()
+        self.codigo_tipo: TipoSensor = codigo
+        self.tipo: str = codigo.nombre
+        self.ids_sensores: List[int] = list(ids_sensores)
+        self.name = f"GrupoSensoresProgramados-{self.tipo}-{len(self.ids_sensores)}"
+        self._intervalo, self._minimo, self._maximo, self._unidad = CONFIGURACION_LECTURA[codigo]
+        self._planificador = planificador
+        self._tarea: Optional[TareaProgramada] = None
+        self._rng = rng
+
+    # -----------------------------------------------------------------------
+    # Interfaz compatible con los ReaderTask
+    # -----------------------------------------------------------------------
+    def start(self) -> None:
+        """Registra la lectura periódica del grupo en el planificador."""
+        if self._tarea is None:
+            self._tarea = self._planificador.programar(self._intervalo, self.leer)
+
+    def parar(self) -> None:
+        """Cancela la lectura periódica del grupo."""
+        if self._tarea is not None:
+            self._tarea.cancelar()
+            self._tarea = None
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """No hay hilo que esperar; se mantiene por compatibilidad con threading.Thread."""
+        return None
+
+    def is_alive(self) -> bool:
+        """Indica si el grupo tiene una lectura programada vigente."""
+        return self._tarea is not None
+
+    # -----------------------------------------------------------------------
+    # Lectura
+    # -----------------------------------------------------------------------
+    def leer(self) -> None:
+        """Genera una lectura por sensor y notifica el lote completo."""
+        tipo, unidad, minimo, maximo = self.codigo_tipo, self._unidad, self._minimo, self._maximo
+        if self._rng is not None:
+            # Un único sorteo vectorizado para todo el grupo
+            valores = np.round(self._rng.uniform(minimo, maximo, len(self.ids_sensores)), 1).tolist()
+        else:
+            uniforme = random.uniform
+            valores = [round(uniforme(minimo, maximo), 1) for _ in self.ids_sensores]
+        eventos = [
+            EventoSensorAmbiental(tipo, valor, unidad, id_sensor)
+            for id_sensor, valor in zip(self.ids_sensores, valores)
+        ]
+        self.notificar_lote(EventoLote(eventos))
@@ -0,0 +1,242 @@
+import heapq
+import itertools
+import queue
+import random
+import threading
+import time
+from typing import Callable, List, Optional
+from python_iotmonitor.constantes import PLANIFICADOR_CANTIDAD_WORKERS, PLANIFICADOR_TAMANO_TANDA
+
+
+class TareaProgramada:
+    """
+    Representa una acción periódica registrada en el PlanificadorLecturas.
+    Es un objeto liviano: no posee hilo propio, solo intervalo, acción y estado.
+    """
+
+    __slots__ = ("intervalo", "_accion", "_planificador", "_cancelada", "_en_curso")
+
+    def __init__(self, intervalo: float, accion: Callable[[], None], planificador: "PlanificadorLecturas"):
+        """
+        Inicializa una tarea programada.
+
+        Args:
+            intervalo: Período de ejecución en segundos.
+            accion: Callable sin argumentos que se ejecuta en cada período.
+            planificador: Planificador que administra la tarea.
+        """
+        self.intervalo = intervalo
+        self._accion = accion
+        self._planificador = planificador
+        self._cancelada = False
+        # True desde que el despachador la encola hasta que un worker termina de ejecutarla
+        self._en_curso = False
+
+    def ejecutar(self) -> None:
+        """Ejecuta la acción asociada a la tarea."""
+        self._accion()
+
+    def cancelar(self) -> None:
+        """Cancela la tarea; el planificador la descarta al vencer."""
+        self._planificador.cancelar(self)
+
+    def esta_cancelada(self) -> bool:
+        """Indica si la tarea fue cancelada."""
+        return self._cancelada
+
+
+class PlanificadorLecturas:
+    """
+    Planificador de lecturas periódicas basado en un heap de vencimientos.
+
+    Reemplaza el modelo de un hilo por sensor: un único hilo despachador
+    extrae las tareas vencidas y las reparte en tandas a un conjunto fijo
+    de workers. Permite sostener cientos de miles de sensores simulados
+    con una cantidad constante de hilos del sistema operativo.
+    """
+
+    def __init__(self, cantidad_workers: int = PLANIFICADOR_CANTIDAD_WORKERS,
+                 tamano_tanda: int = PLANIFICADOR_TAMANO_TANDA):
+        """
+        Inicializa el planificador (sin iniciar sus hilos).
+
+        Args:
+            cantidad_workers: Cantidad de hilos que ejecutan las acciones.
+            tamano_tanda: Cantidad máxima de tareas que recibe un worker por vez.
+        """
+        self._cantidad_workers = max(1, cantidad_workers)
+        self._tamano_tanda = max(1, tamano_tanda)
+        self._heap: List[tuple] = []
+        self._secuencia = itertools.count()
+        self._condicion = threading.Condition()
+        self._cola_trabajo: "queue.SimpleQueue[Optional[List[TareaProgramada]]]" = queue.SimpleQueue()
+        self._hilos: List[threading.Thread] = []
+        self._activo = False
+        self._canceladas_pendientes = 0
+        self._omitidas = 0
+
+    # -----------------------------------------------------------------------
+    # Ciclo de vida
+    # -----------------------------------------------------------------------
+    def iniciar(self) -> None:
+        """Inicia el hilo despachador y los workers."""
+        with self._condicion:
+            if self._activo:
+                return
+            self._activo = True
+
+        despachador = threading.Thread(target=self._despachar, name="PlanificadorLecturas-Despachador", daemon=True)
+        self._hilos = [despachador]
+        for i in range(self._cantidad_workers):
+            self._hilos.append(
+                threading.Thread(target=self._trabajar, name=f"PlanificadorLecturas-Worker-{i + 1}", daemon=True)
+            )
+        for hilo in self._hilos:
+            hilo.start()
+        print(f"[PlanificadorLecturas] Iniciado con {self._cantidad_workers} workers.")
+
+    def detener(self, timeout: Optional[float] = None) -> None:
+        """
+        Detiene el despachador y los workers de forma ordenada.
+
+        Args:
+            timeout: Tiempo máximo de espera por cada hilo.
+        """
+        with self._condicion:
+            if not self._activo:
+                return
+            self._activo = False
+            self._condicion.notify_all()
+
+        for _ in range(self._cantidad_workers):
+            self._cola_trabajo.put(None)
+        for hilo in self._hilos:
+            hilo.join(timeout)
+        self._hilos = []
+        print("[PlanificadorLecturas] Detenido correctamente.")
+
+    def esta_activo(self) -> bool:
+        """Indica si el planificador está en ejecución."""
+        return self._activo
+
+    # -----------------------------------------------------------------------
+    # Registro de tareas
+    # -----------------------------------------------------------------------
+    def programar(self, intervalo: float, accion: Callable[[], None],
+                  retraso_inicial: Optional[float] = None) -> TareaProgramada:
+        """
+        Registra una acción periódica.
+
+        Args:
+            intervalo: Período de ejecución en segundos (> 0).
+            accion: Callable sin argumentos a ejecutar en cada período.
+            retraso_inicial: Segundos hasta la primera ejecución. Si es None se toma
+                una fracción aleatoria del intervalo, para que las tareas registradas
+                juntas no venzan todas en el mismo instante.
+
+        Returns:
+            La TareaProgramada creada (permite cancelarla).
+
+        Raises:
+            ValueError: Si el intervalo no es positivo.
+        """
+        if intervalo <= 0:
+            raise ValueError(f"El intervalo debe ser positivo: {intervalo}")
+
+        if retraso_inicial is None:
+            retraso_inicial = random.uniform(0.0, intervalo)
+        tarea = TareaProgramada(intervalo, accion, self)
+        vencimiento = time.monotonic() + max(0.0, retraso_inicial)
+        with self._condicion:
+            heapq.heappush(self._heap, (vencimiento, next(self._secuencia), tarea))
+            if self._heap[0][2] is tarea:
+                self._condicion.notify()
+        return tarea
+
+    def cancelar(self, tarea: TareaProgramada) -> None:
+        """
+        Cancela una tarea programada. La entrada se elimina del heap de forma diferida.
+
+        Args:
+            tarea: Tarea a cancelar.
+        """
+        with self._condicion:
+            if tarea._cancelada:
+                return
+            tarea._cancelada = True
+            self._canceladas_pendientes += 1
+            # Compacta el heap cuando las entradas canceladas superan a las vigentes
+            if self._canceladas_pendientes * 2 > len(self._heap):
+                self._heap = [e for e in self._heap if not e[2].esta_cancelada()]
+                heapq.heapify(self._heap)
+                self._canceladas_pendientes = 0
+
+    def cantidad_tareas(self) -> int:
+        """Devuelve la cantidad de tareas vigentes (no canceladas)."""
+        with self._condicion:
+            return len(self._heap) - self._canceladas_pendientes
+
+    def cantidad_omitidas(self) -> int:
+        """Devuelve cuántos vencimientos se omitieron porque la ejecución anterior seguía en curso."""
+        return self._omitidas
+
+    # -----------------------------------------------------------------------
+    # Hilos internos
+    # -----------------------------------------------------------------------
+    def _despachar(self) -> None:
+        """
+        Extrae las tareas vencidas, las reprograma y las envía a los workers.
+
+        Una tarea cuya ejecución anterior sigue encolada o en curso no se vuelve
+        a encolar: se omite ese vencimiento y se reprograma para el siguiente
+        período. Así una acción nunca corre en dos workers a la vez y la cola de
+        trabajo queda acotada por la cantidad de tareas registradas.
+        """
+        while True:
+            with self._condicion:
+                while self._activo:
+                    if self._heap:
+                        espera = self._heap[0][0] - time.monotonic()
+                        if espera <= 0:
+                            break
+                        self._condicion.wait(espera)
+                    else:
+                        self._condicion.wait()
+                if not self._activo:
+                    return
+
+                ahora = time.monotonic()
+                vencidas: List[TareaProgramada] = []
+                while self._heap and self._heap[0][0] <= ahora:
+                    vencimiento, _, tarea = heapq.heappop(self._heap)
+                    if tarea.esta_cancelada():
+                        self._canceladas_pendientes -= 1
+                        continue
+                    if tarea._en_curso:
+                        self._omitidas += 1
+                    else:
+                        tarea._en_curso = True
+                        vencidas.append(tarea)
+                    # Se mantiene la cadencia; si hubo atraso se saltean los períodos perdidos
+                    siguiente = vencimiento + tarea.intervalo
+                    if siguiente <= ahora:
+                        siguiente = ahora + tarea.intervalo
+                    heapq.heappush(self._heap, (siguiente, next(self._secuencia), tarea))
+
+            for i in range(0, len(vencidas), self._tamano_tanda):
+                self._cola_trabajo.put(vencidas[i:i + self._tamano_tanda])
+
+    def _trabajar(self) -> None:
+        """Ejecuta las tandas de tareas recibidas del despachador."""
+        while True:
+            tanda = self._cola_trabajo.get()
+            if tanda is None:
+                return
+            for tarea in tanda:
+                try:
+                    if not tarea.esta_cancelada():
+                        tarea.ejecutar()
+                except Exception as e:
+                    print(f"[{threading.current_thread().name}] Error en tarea programada: {e}")
+                finally:
+                    tarea._en_curso = False
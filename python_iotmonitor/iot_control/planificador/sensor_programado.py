@@ -0,0 +1,94 @@
+import random
+from typing import Dict, Optional, Tuple, Union
+import numpy as np
+from python_iotmonitor.entidades.sensores.tipo_sensor import TipoSensor
+from python_iotmonitor.patrones.observer.observable import Observable
+from python_iotmonitor.patrones.observer.eventos.evento_sensor_ambiental import EventoSensorAmbiental
+from python_iotmonitor.iot_control.planificador.planificador_lecturas import PlanificadorLecturas, TareaProgramada
+from python_iotmonitor.constantes import (
+    INTERVALO_SENSOR_TEMPERATURA, TEMP_MIN_LECTURA, TEMP_MAX_LECTURA,
+    INTERVALO_SENSOR_HUMEDAD, HUMEDAD_MIN_LECTURA, HUMEDAD_MAX_LECTURA,
+    INTERVALO_SENSOR_CO2, CO2_MIN_LECTURA, CO2_MAX_LECTURA,
+    INTERVALO_SENSOR_LUZ, LUZ_MIN_LECTURA, LUZ_MAX_LECTURA,
+)
+
+# Configuración de lectura por tipo: (intervalo, mínimo, máximo, unidad)
+CONFIGURACION_LECTURA: Dict[TipoSensor, Tuple[float, float, float, str]] = {
+    TipoSensor.TEMPERATURA: (INTERVALO_SENSOR_TEMPERATURA, TEMP_MIN_LECTURA, TEMP_MAX_LECTURA, "°C"),
+    TipoSensor.HUMEDAD: (INTERVALO_SENSOR_HUMEDAD, HUMEDAD_MIN_LECTURA, HUMEDAD_MAX_LECTURA, "%"),
+    TipoSensor.CO2: (INTERVALO_SENSOR_CO2, CO2_MIN_LECTURA, CO2_MAX_LECTURA, "ppm"),
+    TipoSensor.LUZ: (INTERVALO_SENSOR_LUZ, LUZ_MIN_LECTURA, LUZ_MAX_LECTURA, "lux"),
+}
+
+
+class SensorProgramado(Observable[EventoSensorAmbiental]):
+    """
+    Sensor simulado liviano cuyas lecturas periódicas ejecuta un PlanificadorLecturas (US-008, US-010).
+
+    Mantiene la interfaz de los ReaderTask (start / parar / join) y el contrato
+    Observable.notificar_observers, pero no crea un hilo propio.
+    """
+
+    def __init__(self, tipo: Union[TipoSensor, str], id_sensor: int, planificador: PlanificadorLecturas,
+                 rng: Optional[np.random.Generator] = None):
+        """
+        Inicializa un sensor programado.
+
+        Args:
+            tipo: Código TipoSensor (o su nombre: "Temperatura", "Humedad", "CO2", "Luz").
+            id_sensor: Identificador único del sensor.
+            planificador: Planificador que ejecutará las lecturas.
+            rng: Flujo aleatorio propio del sensor (modo reproducible, ver GeneradorSimulacion).
+                Si es None se usa el generador global de `random`.
+
+        Raises:
+            ValueError: Si el tipo no tiene configuración de lectura.
+        """
+        codigo = tipo if isinstance(tipo, TipoSensor) else TipoSensor.desde_nombre(tipo)
+        if codigo not in CONFIGURACION_LECTURA:
+            raise ValueError(f"Tipo de sensor desconocido: {tipo}")
+
+        super().__init__()
+        self.id_sensor: int = id_sensor
+        self.codigo_tipo: TipoSensor = codigo
+        self.tipo: str = codigo.nombre
+        self.name = f"SensorProgramado-{self.tipo}-{id_sensor}"
+        self._intervalo, self._minimo, self._maximo, self._unidad = CONFIGURACION_LECTURA[codigo]
+        self._planificador = planificador
+        self._tarea: Optional[TareaProgramada] = None
+        self._uniforme = rng.uniform if rng is not None else random.uniform
+
+    # -----------------------------------------------------------------------
+    # Interfaz compatible con los ReaderTask
+    # -----------------------------------------------------------------------
+    def start(self) -> None:
+        """Registra la lectura periódica en el planificador."""
+        if self._tarea is None:
+            self._tarea = self._planificador.programar(self._intervalo, self.leer)
+
+    def parar(self) -> None:
+        """Cancela la lectura periódica del sensor."""
+        if self._tarea is not None:
+            self._tarea.cancelar()
+            self._tarea = None
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """No hay hilo que esperar; se mantiene por compatibilidad con threading.Thread."""
+        return None
+
+    def is_alive(self) -> bool:
+        """Indica si el sensor tiene una lectura programada vigente."""
+        return self._tarea is not None
+
+    # -----------------------------------------------------------------------
+    # Lectura
+    # -----------------------------------------------------------------------
+    def get_intervalo(self) -> float:
+        """Devuelve el intervalo de muestreo del sensor en segundos."""
+        return self._intervalo
+
+    def leer(self) -> None:
+        """Genera una lectura simulada y notifica a los observadores."""
+        valor = round(self._uniforme(self._minimo, self._maximo), 1)
+        evento = EventoSensorAmbiental(self.codigo_tipo, valor, self._unidad, self.id_sensor)
+        self.notificar_observers(evento)
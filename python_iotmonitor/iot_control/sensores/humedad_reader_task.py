@@ -1,8 +1,10 @@
 import threading
 import time
 import random
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
+import numpy as np
 from python_iotmonitor.patrones.observer.observable import Observable
+from python_iotmonitor.entidades.sensores.tipo_sensor import TipoSensor
 from python_iotmonitor.patrones.observer.eventos.evento_sensor_ambiental import EventoSensorAmbiental
 from python_iotmonitor.constantes import (
     INTERVALO_SENSOR_TEMPERATURA, TEMP_MIN_LECTURA, TEMP_MAX_LECTURA,
@@ -15,21 +17,24 @@ if TYPE_CHECKING:
 class HumedadReaderTask(Observable[EventoSensorAmbiental], threading.Thread):
     """Simula lecturas periódicas de humedad ambiental (US-008, US-010)."""
 
-    def __init__(self, id_sensor: int):
+    def __init__(self, id_sensor: int, intervalo: float = INTERVALO_SENSOR_HUMEDAD, rng: Optional[np.random.Generator] = None):
         Observable.__init__(self)
         threading.Thread.__init__(self)
         self.id_sensor: int = id_sensor
+        self._intervalo = intervalo
+        # Flujo propio (modo reproducible) o el generador global de random
+        self._uniforme = rng.uniform if rng is not None else random.uniform
         self._parar = threading.Event()
         self.name = f"HumedadReaderTask-{self.id_sensor}"
         self._observers: list["Observer[EventoSensorAmbiental]"] = []
 
     def run(self):
-        print(f"[{self.name}] Sensor iniciado. Lectura cada {INTERVALO_SENSOR_HUMEDAD}s.")
+        print(f"[{self.name}] Sensor iniciado. Lectura cada {self._intervalo}s.")
         while not self._parar.is_set():
-            humedad = round(random.uniform(HUMEDAD_MIN_LECTURA, HUMEDAD_MAX_LECTURA), 1)
-            evento = EventoSensorAmbiental("Humedad", humedad, "%", self.id_sensor)
+            humedad = round(self._uniforme(HUMEDAD_MIN_LECTURA, HUMEDAD_MAX_LECTURA), 1)
+            evento = EventoSensorAmbiental(TipoSensor.HUMEDAD, humedad, "%", self.id_sensor)
             self.notificar_observers(evento)
-            self._parar.wait(INTERVALO_SENSOR_HUMEDAD)
+            self._parar.wait(self._intervalo)
 
     def parar(self):
         self._parar.set()
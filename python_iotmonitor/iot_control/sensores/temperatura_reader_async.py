@@ -0,0 +1,38 @@
+import asyncio
+import random
+from typing import Optional
+import numpy as np
+from python_iotmonitor.patrones.observer.async_observable import AsyncObservable
+from python_iotmonitor.entidades.sensores.tipo_sensor import TipoSensor
+from python_iotmonitor.patrones.observer.eventos.evento_sensor_ambiental import EventoSensorAmbiental
+from python_iotmonitor.constantes import INTERVALO_SENSOR_TEMPERATURA, TEMP_MIN_LECTURA, TEMP_MAX_LECTURA
+
+
+class TemperaturaReaderAsync(AsyncObservable[EventoSensorAmbiental]):
+    """
+    Versión asyncio de TemperaturaReaderTask (US-008, US-010).
+    Simula lecturas periódicas de temperatura como corrutina, sin hilo propio.
+    """
+
+    def __init__(self, id_sensor: int, intervalo: float = INTERVALO_SENSOR_TEMPERATURA, rng: Optional[np.random.Generator] = None):
+        super().__init__()
+        self.id_sensor: int = id_sensor
+        self._intervalo = intervalo
+        # Flujo propio (modo reproducible) o el generador global de random
+        self._uniforme = rng.uniform if rng is not None else random.uniform
+        self._parar = False
+        self.name = f"TempReaderAsync-{self.id_sensor}"
+
+    async def ejecutar(self) -> None:
+        """Corrutina principal: lee, notifica y espera el intervalo hasta ser detenida."""
+        print(f"[{self.name}] Sensor iniciado. Lectura cada {self._intervalo}s.")
+        while not self._parar:
+            temperatura = round(self._uniforme(TEMP_MIN_LECTURA, TEMP_MAX_LECTURA), 1)
+            evento = EventoSensorAmbiental(TipoSensor.TEMPERATURA, temperatura, "°C", self.id_sensor)
+            await self.notificar_observers(evento)
+            await asyncio.sleep(self._intervalo)
+
+    def parar(self) -> None:
+        """Solicita la detención; la corrutina finaliza al terminar su espera actual."""
+        self._parar = True
+        print(f"[{self.name}] Sensor detenido correctamente.")
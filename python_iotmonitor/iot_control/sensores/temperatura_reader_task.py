@@ -1,8 +1,10 @@
 import threading
 import time
 import random
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
+import numpy as np
 from python_iotmonitor.patrones.observer.observable import Observable
+from python_iotmonitor.entidades.sensores.tipo_sensor import TipoSensor
 from python_iotmonitor.patrones.observer.eventos.evento_sensor_ambiental import EventoSensorAmbiental
 from python_iotmonitor.constantes import (
     INTERVALO_SENSOR_TEMPERATURA, TEMP_MIN_LECTURA, TEMP_MAX_LECTURA,
@@ -16,21 +18,24 @@ if TYPE_CHECKING:
 class TemperaturaReaderTask(Observable[EventoSensorAmbiental], threading.Thread):
     """Simula lecturas periódicas de temperatura ambiental (US-008, US-010)."""
 
-    def __init__(self, id_sensor: int):
+    def __init__(self, id_sensor: int, intervalo: float = INTERVALO_SENSOR_TEMPERATURA, rng: Optional[np.random.Generator] = None):
         Observable.__init__(self)
         threading.Thread.__init__(self)
         self.id_sensor: int = id_sensor
+        self._intervalo = intervalo
+        # Flujo propio (modo reproducible) o el generador global de random
+        self._uniforme = rng.uniform if rng is not None else random.uniform
         self._parar = threading.Event()
         self.name = f"TempReaderTask-{self.id_sensor}"
         self._observers: list["Observer[EventoSensorAmbiental]"] = []  # para que VS Code lo reconozca
 
     def run(self):
-        print(f"[{self.name}] Sensor iniciado. Lectura cada {INTERVALO_SENSOR_TEMPERATURA}s.")
+        print(f"[{self.name}] Sensor iniciado. Lectura cada {self._intervalo}s.")
         while not self._parar.is_set():
-            temperatura = round(random.uniform(TEMP_MIN_LECTURA, TEMP_MAX_LECTURA), 1)
-            evento = EventoSensorAmbiental("Temperatura", temperatura, "°C", self.id_sensor)
+            temperatura = round(self._uniforme(TEMP_MIN_LECTURA, TEMP_MAX_LECTURA), 1)
+            evento = EventoSensorAmbiental(TipoSensor.TEMPERATURA, temperatura, "°C", self.id_sensor)
             self.notificar_observers(evento)
-            self._parar.wait(INTERVALO_SENSOR_TEMPERATURA)
+            self._parar.wait(self._intervalo)
 
     def parar(self):
         self._parar.set()
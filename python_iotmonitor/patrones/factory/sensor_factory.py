@@ -1,9 +1,14 @@
-from typing import Union
+from typing import List, Optional, Union
+from python_iotmonitor.entidades.sensores.tipo_sensor import TipoSensor, NOMBRES_TIPO
 from python_iotmonitor.iot_control.sensores.temperatura_reader_task import TemperaturaReaderTask
 from python_iotmonitor.iot_control.sensores.humedad_reader_task import HumedadReaderTask
+from python_iotmonitor.iot_control.planificador.planificador_lecturas import PlanificadorLecturas
+from python_iotmonitor.iot_control.planificador.sensor_programado import SensorProgramado, CONFIGURACION_LECTURA
+from python_iotmonitor.iot_control.planificador.grupo_sensores_programados import GrupoSensoresProgramados
+from python_iotmonitor.simulacion.generador_simulacion import GeneradorSimulacion
 
 # Alias de tipo: puede expandirse con más sensores en el futuro
-TipoSensor = Union[TemperaturaReaderTask, HumedadReaderTask]
+SensorSimulado = Union[TemperaturaReaderTask, HumedadReaderTask, SensorProgramado]
 
 
 class SensorFactory:
@@ -14,19 +19,24 @@ class SensorFactory:
     Mejora la extensibilidad y evita condicionales repetitivos.
     """
 
-    _factories = {
-        "Temperatura": TemperaturaReaderTask,
-        "Humedad": HumedadReaderTask,
-    }
+    # Clase de sensor con hilo propio, indexada por código TipoSensor (None = sin clase)
+    _factories: List[Optional[type]] = [None] * len(NOMBRES_TIPO)
+    _factories[TipoSensor.TEMPERATURA] = TemperaturaReaderTask
+    _factories[TipoSensor.HUMEDAD] = HumedadReaderTask
 
     @staticmethod
-    def crear_sensor(tipo: str, id_sensor: int) -> TipoSensor:
+    def crear_sensor(tipo: Union[TipoSensor, str], id_sensor: int, planificador: Optional[PlanificadorLecturas] = None,
+                     generador: Optional[GeneradorSimulacion] = None) -> SensorSimulado:
         """
         Crea una instancia de sensor según su tipo.
 
         Args:
-            tipo: Tipo del sensor ("Temperatura", "Humedad", etc.)
+            tipo: Código TipoSensor (o su nombre: "Temperatura", "Humedad", etc.)
             id_sensor: Identificador único del sensor.
+            planificador: Si se indica, se crea un SensorProgramado que delega
+                sus lecturas al planificador en lugar de un hilo por sensor.
+            generador: Si se indica, el sensor usa su propio flujo aleatorio derivado
+                de la semilla de la corrida (lecturas reproducibles).
 
         Returns:
             Instancia del sensor correspondiente.
@@ -34,9 +44,41 @@ class SensorFactory:
         Raises:
             ValueError: Si el tipo no está registrado.
         """
-        tipo_normalizado = tipo.strip().capitalize()
-        if tipo_normalizado not in SensorFactory._factories:
+        codigo = tipo if isinstance(tipo, TipoSensor) else TipoSensor.desde_nombre(tipo)
+        rng = generador.flujo_sensor(id_sensor) if generador is not None else None
+        if planificador is not None:
+            if codigo not in CONFIGURACION_LECTURA:
+                raise ValueError(f"Tipo de sensor desconocido: {tipo}")
+            return SensorProgramado(codigo, id_sensor, planificador, rng)
+
+        clase_sensor = SensorFactory._factories[codigo]
+        if clase_sensor is None:
             raise ValueError(f"Tipo de sensor desconocido: {tipo}")
+        return clase_sensor(id_sensor, rng=rng)
+
+    @staticmethod
+    def crear_grupo_sensores(tipo: Union[TipoSensor, str], ids_sensores: List[int], planificador: PlanificadorLecturas,
+                             generador: Optional[GeneradorSimulacion] = None) -> GrupoSensoresProgramados:
+        """
+        Crea un grupo de sensores de un mismo tipo que emite sus lecturas en lotes.
+
+        Args:
+            tipo: Código TipoSensor de los sensores (o su nombre: "Temperatura", "Humedad", etc.)
+            ids_sensores: Identificadores únicos de los sensores del grupo.
+            planificador: Planificador que ejecutará las lecturas del grupo.
+            generador: Si se indica, el grupo usa un flujo aleatorio propio
+                (identificado por el primer id del grupo) para lecturas reproducibles.
 
-        clase_sensor = SensorFactory._factories[tipo_normalizado]
-        return clase_sensor(id_sensor)
+        Returns:
+            Instancia de GrupoSensoresProgramados.
+
+        Raises:
+            ValueError: Si el tipo no está registrado.
+        """
+        codigo = tipo if isinstance(tipo, TipoSensor) else TipoSensor.desde_nombre(tipo)
+        if codigo not in CONFIGURACION_LECTURA:
+            raise ValueError(f"Tipo de sensor desconocido: {tipo}")
+        rng = None
+        if generador is not None and ids_sensores:
+            rng = generador.flujo_grupo(ids_sensores[0])
+        return GrupoSensoresProgramados(codigo, ids_sensores, planificador, rng)
@@ -0,0 +1,69 @@
+import inspect
+from typing import TypeVar, Generic, List, Union, TYPE_CHECKING
+from python_iotmonitor.patrones.observer.observer_sync_adapter import ObserverSyncAdapter
+
+T = TypeVar("T")
+
+if TYPE_CHECKING:
+    from python_iotmonitor.patrones.observer.observer import Observer
+    from python_iotmonitor.patrones.observer.async_observer import AsyncObserver
+    from python_iotmonitor.patrones.observer.eventos.evento_lote import EventoLote
+
+
+class AsyncObservable(Generic[T]):
+    """
+    Variante asyncio de Observable (patrón Observer).
+
+    Pensada para sensores que corren como corrutinas dentro de un único
+    event loop: no usa locks porque todas las operaciones ocurren en el
+    hilo del loop. Acepta observadores asíncronos (`async def actualizar`)
+    y, mediante ObserverSyncAdapter, observadores sincrónicos.
+    """
+
+    def __init__(self):
+        self._observers: List["AsyncObserver[T]"] = []
+
+    # -----------------------------------------------------------------------
+    # Registro / eliminación de observadores
+    # -----------------------------------------------------------------------
+    def agregar_observer(self, observer: Union["AsyncObserver[T]", "Observer[T]"]) -> None:
+        """Agrega un observador (sincrónico o asíncrono) si aún no está registrado."""
+        if not inspect.iscoroutinefunction(observer.actualizar):
+            observer = ObserverSyncAdapter(observer)
+        if observer not in self._observers:
+            self._observers.append(observer)
+
+    def remover_observer(self, observer: Union["AsyncObserver[T]", "Observer[T]"]) -> None:
+        """Elimina un observador del registro (acepta el observador original o su adaptador)."""
+        for registrado in list(self._observers):
+            if registrado == observer:
+                self._observers.remove(registrado)
+
+    # -----------------------------------------------------------------------
+    # Notificación de eventos
+    # -----------------------------------------------------------------------
+    async def notificar_observers(self, evento: T) -> None:
+        """
+        Notifica a todos los observadores registrados con un evento específico.
+
+        Args:
+            evento: Instancia del evento generado (por ejemplo, EventoSensorAmbiental).
+        """
+        for observer in list(self._observers):
+            await observer.actualizar(evento)
+
+    async def notificar_lote(self, lote: "EventoLote") -> None:
+        """
+        Notifica un lote de eventos con una única llamada por observador.
+        Los observadores sin `actualizar_lote` reciben las lecturas de a una.
+
+        Args:
+            lote: EventoLote con las lecturas agrupadas.
+        """
+        for observer in list(self._observers):
+            actualizar_lote = getattr(observer, "actualizar_lote", None)
+            if actualizar_lote is not None:
+                await actualizar_lote(lote)
+            else:
+                for evento in lote:
+                    await observer.actualizar(evento)
@@ -0,0 +1,34 @@
+from typing import Protocol, TypeVar, Generic, TYPE_CHECKING
+
+T = TypeVar("T")
+
+if TYPE_CHECKING:
+    from python_iotmonitor.patrones.observer.eventos.evento_lote import EventoLote
+
+
+class AsyncObserver(Generic[T], Protocol):
+    """
+    Interfaz genérica del patrón Observer para el modo asyncio.
+    Los observadores implementan `actualizar` como corrutina y se ejecutan
+    dentro del mismo event loop que los sensores que los notifican.
+    """
+
+    async def actualizar(self, evento: T) -> None:
+        """
+        Corrutina llamada por el AsyncObservable para notificar un nuevo evento.
+
+        Args:
+            evento: Instancia del evento emitido (por ejemplo, EventoSensorAmbiental).
+        """
+        ...
+
+    async def actualizar_lote(self, lote: "EventoLote") -> None:
+        """
+        Corrutina opcional para recibir muchas lecturas en una sola llamada.
+        La implementación por defecto recorre el lote y delega en `actualizar`.
+
+        Args:
+            lote: EventoLote con las lecturas agrupadas.
+        """
+        for evento in lote:
+            await self.actualizar(evento)
@@ -0,0 +1,174 @@
+import threading
+from enum import Enum
+from typing import Any, Dict, Generic, Hashable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class PoliticaDesborde(Enum):
+    """Define qué hace el buffer cuando recibe un evento estando lleno."""
+    BLOQUEAR = "BLOQUEAR"                    # El productor espera a que haya lugar
+    DESCARTAR_ANTIGUO = "DESCARTAR_ANTIGUO"  # Se pierde el evento más viejo
+    DESCARTAR_NUEVO = "DESCARTAR_NUEVO"      # Se pierde el evento entrante
+    COALESCER = "COALESCER"                  # Se reemplaza el evento pendiente de la misma clave (sensor, tipo)
+
+
+class BufferCircular(Generic[T]):
+    """
+    Buffer circular acotado y thread-safe entre un productor (sensores)
+    y un consumidor (hilo de entrega del bus).
+
+    Con la política COALESCER, un evento cuya clave (sensor y tipo) ya tiene un
+    evento pendiente reemplaza al pendiente en su misma posición. Si el buffer
+    está lleno y la clave no tiene evento pendiente, se descarta el más antiguo.
+    """
+
+    def __init__(self, capacidad: int, politica: PoliticaDesborde):
+        """
+        Inicializa el buffer.
+
+        Args:
+            capacidad: Cantidad máxima de eventos en espera (> 0).
+            politica: Política aplicada cuando el buffer está lleno.
+
+        Raises:
+            ValueError: Si la capacidad no es positiva.
+        """
+        if capacidad <= 0:
+            raise ValueError(f"La capacidad del buffer debe ser positiva: {capacidad}")
+
+        self._capacidad = capacidad
+        self._politica = politica
+        self._slots: List[Any] = [None] * capacidad
+        self._claves: List[Optional[Hashable]] = [None] * capacidad
+        self._inicio = 0          # Posición absoluta del evento más antiguo
+        self._fin = 0             # Posición absoluta del próximo evento a escribir
+        self._pendientes: Dict[Hashable, int] = {}  # clave → posición absoluta (solo COALESCER)
+        self._cerrado = False
+        self._condicion = threading.Condition()
+
+        # Contadores
+        self._recibidos = 0
+        self._descartados = 0
+        self._coalescidos = 0
+
+    # -----------------------------------------------------------------------
+    # Productor
+    # -----------------------------------------------------------------------
+    def agregar(self, evento: T, clave: Optional[Hashable] = None, timeout: Optional[float] = None) -> bool:
+        """
+        Agrega un evento aplicando la política de desborde.
+
+        Args:
+            evento: Evento a encolar.
+            clave: Clave de coalescencia (por ejemplo, el par id de sensor y código de tipo).
+            timeout: Espera máxima con la política BLOQUEAR (None = sin límite).
+
+        Returns:
+            True si el evento quedó en el buffer; False si fue descartado.
+        """
+        with self._condicion:
+            self._recibidos += 1
+            if self._cerrado:
+                self._descartados += 1
+                return False
+
+            if self._politica is PoliticaDesborde.COALESCER and clave is not None:
+                posicion = self._pendientes.get(clave)
+                if posicion is not None:
+                    self._slots[posicion % self._capacidad] = evento
+                    self._coalescidos += 1
+                    return True
+
+            if self._fin - self._inicio >= self._capacidad:
+                if self._politica is PoliticaDesborde.DESCARTAR_NUEVO:
+                    self._descartados += 1
+                    return False
+                if self._politica is PoliticaDesborde.BLOQUEAR:
+                    hay_lugar = self._condicion.wait_for(
+                        lambda: self._cerrado or self._fin - self._inicio < self._capacidad, timeout
+                    )
+                    if not hay_lugar or self._cerrado:
+                        self._descartados += 1
+                        return False
+                else:
+                    self._extraer_antiguo()
+                    self._descartados += 1
+
+            indice = self._fin % self._capacidad
+            self._slots[indice] = evento
+            self._claves[indice] = clave
+            if self._politica is PoliticaDesborde.COALESCER and clave is not None:
+                self._pendientes[clave] = self._fin
+            self._fin += 1
+            self._condicion.notify_all()
+            return True
+
+    # -----------------------------------------------------------------------
+    # Consumidor
+    # -----------------------------------------------------------------------
+    def extraer_tanda(self, maximo: int, timeout: Optional[float] = None) -> List[T]:
+        """
+        Extrae hasta `maximo` eventos en orden de llegada, esperando si está vacío.
+
+        Args:
+            maximo: Cantidad máxima de eventos a extraer.
+            timeout: Espera máxima si el buffer está vacío (None = sin límite).
+
+        Returns:
+            Lista de eventos (vacía si venció el timeout o el buffer fue cerrado).
+        """
+        with self._condicion:
+            self._condicion.wait_for(lambda: self._cerrado or self._fin > self._inicio, timeout)
+            tanda = []
+            while self._fin > self._inicio and len(tanda) < maximo:
+                tanda.append(self._extraer_antiguo())
+            if tanda:
+                self._condicion.notify_all()
+            return tanda
+
+    def cerrar(self) -> None:
+        """Cierra el buffer y despierta a productores y consumidores en espera."""
+        with self._condicion:
+            self._cerrado = True
+            self._condicion.notify_all()
+
+    def abrir(self) -> None:
+        """Reabre un buffer cerrado para volver a aceptar eventos (conserva los contadores)."""
+        with self._condicion:
+            self._cerrado = False
+
+    def _extraer_antiguo(self) -> T:
+        """Quita y devuelve el evento más antiguo (requiere el lock tomado)."""
+        indice = self._inicio % self._capacidad
+        evento = self._slots[indice]
+        clave = self._claves[indice]
+        if clave is not None and self._pendientes.get(clave) == self._inicio:
+            del self._pendientes[clave]
+        self._slots[indice] = None
+        self._claves[indice] = None
+        self._inicio += 1
+        return evento
+
+    # -----------------------------------------------------------------------
+    # Métricas
+    # -----------------------------------------------------------------------
+    def __len__(self) -> int:
+        """Devuelve la cantidad de eventos en espera."""
+        with self._condicion:
+            return self._fin - self._inicio
+
+    def get_politica(self) -> PoliticaDesborde:
+        """Devuelve la política de desborde configurada."""
+        return self._politica
+
+    def get_estadisticas(self) -> dict:
+        """Devuelve los contadores del buffer."""
+        with self._condicion:
+            return {
+                "recibidos": self._recibidos,
+                "descartados": self._descartados,
+                "coalescidos": self._coalescidos,
+                "pendientes": self._fin - self._inicio,
+                "capacidad": self._capacidad,
+            }
@@ -0,0 +1,184 @@
+import threading
+from typing import Generic, List, Optional, TypeVar, TYPE_CHECKING
+from python_iotmonitor.patrones.observer.bus.buffer_circular import BufferCircular, PoliticaDesborde
+from python_iotmonitor.patrones.observer.eventos.evento_lote import EventoLote
+from python_iotmonitor.constantes import BUS_CAPACIDAD_BUFFER, BUS_TAMANO_TANDA_ENTREGA
+
+T = TypeVar("T")
+
+if TYPE_CHECKING:
+    from python_iotmonitor.patrones.observer.observer import Observer
+
+
+class SuscripcionBus(Generic[T]):
+    """
+    Suscripción de un observador al BusEventos.
+    Posee su propio BufferCircular y un hilo que entrega los eventos en tandas,
+    de modo que un observador lento no frena a los sensores ni a otros suscriptores.
+    """
+
+    def __init__(self, observer: "Observer[T]", capacidad: int, politica: PoliticaDesborde, tamano_tanda: int):
+        """
+        Args:
+            observer: Observador que recibirá los eventos.
+            capacidad: Capacidad del buffer de la suscripción.
+            politica: Política de desborde del buffer.
+            tamano_tanda: Cantidad máxima de eventos por entrega.
+        """
+        self._observer = observer
+        self._buffer: BufferCircular[T] = BufferCircular(capacidad, politica)
+        self._tamano_tanda = tamano_tanda
+        self._entregados = 0
+        self._errores = 0
+        self._hilo = self._crear_hilo()
+
+    def _crear_hilo(self) -> threading.Thread:
+        """Crea un hilo de entrega nuevo (un Thread solo puede iniciarse una vez)."""
+        return threading.Thread(
+            target=self._entregar, name=f"BusEventos-{type(self._observer).__name__}", daemon=True
+        )
+
+    def get_observer(self) -> "Observer[T]":
+        """Devuelve el observador suscripto."""
+        return self._observer
+
+    def publicar(self, evento: T) -> bool:
+        """
+        Encola un evento en el buffer de la suscripción.
+        La clave de coalescencia es (id de sensor, código de tipo): un sensor
+        multi-magnitud no pisa las lecturas de un tipo con las de otro.
+        """
+        id_sensor = getattr(evento, "id_sensor", None)
+        clave = None if id_sensor is None else (id_sensor, getattr(evento, "codigo_tipo", None))
+        return self._buffer.agregar(evento, clave)
+
+    def iniciar(self) -> None:
+        """Inicia el hilo de entrega; tras detener() reabre el buffer y crea un hilo nuevo."""
+        if self._hilo.is_alive():
+            return
+        if self._hilo.ident is not None:
+            self._buffer.abrir()
+            self._hilo = self._crear_hilo()
+        self._hilo.start()
+
+    def detener(self, timeout: Optional[float] = None) -> None:
+        """Cierra el buffer y espera al hilo de entrega."""
+        self._buffer.cerrar()
+        if self._hilo.is_alive():
+            self._hilo.join(timeout)
+
+    def get_estadisticas(self) -> dict:
+        """Devuelve los contadores de la suscripción (buffer + entregas)."""
+        estadisticas = self._buffer.get_estadisticas()
+        estadisticas["entregados"] = self._entregados
+        estadisticas["errores"] = self._errores
+        estadisticas["politica"] = self._buffer.get_politica().value
+        return estadisticas
+
+    def _entregar(self) -> None:
+        """Entrega los eventos pendientes al observador hasta que el buffer se cierre y vacíe."""
+        actualizar_lote = getattr(self._observer, "actualizar_lote", None)
+        while True:
+            tanda = self._buffer.extraer_tanda(self._tamano_tanda)
+            if not tanda:
+                return
+            try:
+                if actualizar_lote is not None:
+                    actualizar_lote(EventoLote(tanda))
+                else:
+                    for evento in tanda:
+                        self._observer.actualizar(evento)
+                self._entregados += len(tanda)
+            except Exception as e:
+                self._errores += 1
+                print(f"[{self._hilo.name}] Error al entregar eventos: {e}")
+
+
+class BusEventos(Generic[T]):
+    """
+    Bus de eventos entre sensores y observadores (patrón Observer desacoplado).
+
+    Se registra como observador de los sensores; cada evento recibido se copia
+    al buffer acotado de cada suscripción y retorna de inmediato. Así el hilo del
+    sensor nunca espera a ControlAmbientalTask ni a otros consumidores, salvo
+    que una suscripción use la política BLOQUEAR.
+    """
+
+    def __init__(self):
+        self._suscripciones: List[SuscripcionBus[T]] = []
+        self._lock = threading.Lock()
+        self._activo = False
+
+    # -----------------------------------------------------------------------
+    # Suscripciones
+    # -----------------------------------------------------------------------
+    def suscribir(self, observer: "Observer[T]", capacidad: int = BUS_CAPACIDAD_BUFFER,
+                  politica: PoliticaDesborde = PoliticaDesborde.DESCARTAR_ANTIGUO,
+                  tamano_tanda: int = BUS_TAMANO_TANDA_ENTREGA) -> SuscripcionBus[T]:
+        """
+        Suscribe un observador con su propio buffer acotado.
+
+        Args:
+            observer: Observador que recibirá los eventos.
+            capacidad: Eventos máximos en espera para este observador.
+            politica: Política de desborde (BLOQUEAR, DESCARTAR_ANTIGUO, DESCARTAR_NUEVO, COALESCER).
+            tamano_tanda: Eventos máximos por entrega.
+
+        Returns:
+            La SuscripcionBus creada.
+        """
+        suscripcion = SuscripcionBus(observer, capacidad, politica, tamano_tanda)
+        with self._lock:
+            self._suscripciones = self._suscripciones + [suscripcion]
+            if self._activo:
+                suscripcion.iniciar()
+        return suscripcion
+
+    def desuscribir(self, observer: "Observer[T]") -> None:
+        """Elimina la suscripción del observador y detiene su hilo de entrega."""
+        with self._lock:
+            removidas = [s for s in self._suscripciones if s.get_observer() is observer]
+            self._suscripciones = [s for s in self._suscripciones if s.get_observer() is not observer]
+        for suscripcion in removidas:
+            suscripcion.detener()
+
+    # -----------------------------------------------------------------------
+    # Ciclo de vida
+    # -----------------------------------------------------------------------
+    def iniciar(self) -> None:
+        """Inicia los hilos de entrega de todas las suscripciones."""
+        with self._lock:
+            self._activo = True
+            for suscripcion in self._suscripciones:
+                suscripcion.iniciar()
+        print(f"[BusEventos] Iniciado con {len(self._suscripciones)} suscripciones.")
+
+    def detener(self, timeout: Optional[float] = None) -> None:
+        """Cierra los buffers, entrega lo pendiente y detiene los hilos."""
+        with self._lock:
+            self._activo = False
+            suscripciones = list(self._suscripciones)
+        for suscripcion in suscripciones:
+            suscripcion.detener(timeout)
+        print("[BusEventos] Detenido correctamente.")
+
+    # -----------------------------------------------------------------------
+    # Observer: entrada de eventos desde los sensores
+    # -----------------------------------------------------------------------
+    def actualizar(self, evento: T) -> None:
+        """Recibe un evento de un sensor y lo publica en cada suscripción."""
+        for suscripcion in self._suscripciones:
+            suscripcion.publicar(evento)
+
+    def actualizar_lote(self, lote: EventoLote) -> None:
+        """Recibe un lote de eventos y publica cada lectura en cada suscripción."""
+        for suscripcion in self._suscripciones:
+            for evento in lote:
+                suscripcion.publicar(evento)
+
+    # -----------------------------------------------------------------------
+    # Métricas
+    # -----------------------------------------------------------------------
+    def get_estadisticas(self) -> List[dict]:
+        """Devuelve los contadores de cada suscripción."""
+        return [s.get_estadisticas() for s in self._suscripciones]
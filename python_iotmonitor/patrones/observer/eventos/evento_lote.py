@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import Iterator, List
+from python_iotmonitor.patrones.observer.eventos.evento_sensor_ambiental import EventoSensorAmbiental
+
+
+class EventoLote:
+    """
+    Agrupa muchas lecturas (EventoSensorAmbiental) en una única notificación.
+    Permite que un tick del planificador entregue todas sus lecturas con
+    una sola llamada por observador.
+    """
+
+    def __init__(self, eventos: List[EventoSensorAmbiental]):
+        """
+        Inicializa un lote de eventos.
+
+        Args:
+            eventos: Lecturas que componen el lote, en orden de generación.
+        """
+        self.timestamp = datetime.now()
+        self.eventos = eventos
+
+    def __len__(self) -> int:
+        """Devuelve la cantidad de lecturas del lote."""
+        return len(self.eventos)
+
+    def __iter__(self) -> Iterator[EventoSensorAmbiental]:
+        """Itera las lecturas del lote."""
+        return iter(self.eventos)
+
+    def __str__(self):
+        """Devuelve una representación legible del lote."""
+        return f"[Lote de {len(self.eventos)} lecturas @ {self.timestamp.strftime('%H:%M:%S')}]"
@@ -1,27 +1,111 @@
+import struct
+import sys
+import time
 from datetime import datetime
+from typing import Dict, Iterator, Optional, Union
+from python_iotmonitor.entidades.sensores.tipo_sensor import TipoSensor
+
+# Formato binario fijo: timestamp_ns, valor, id_sensor, id_zona (-1 = sin zona), código de tipo.
+# id_sensor ocupa 64 bits, igual que en DTYPE_LECTURA, para que los ids viajen igual en ambos formatos.
+FORMATO_BINARIO = struct.Struct("<qdqiB")
+TAMANO_BINARIO = FORMATO_BINARIO.size
+
+_cadenas_internadas: Dict[str, str] = {}
+
+
+def _internar(cadena: str) -> str:
+    """Devuelve la instancia compartida de `cadena` (tipos y unidades se repiten en cada lectura)."""
+    compartida = _cadenas_internadas.get(cadena)
+    if compartida is None:
+        compartida = _cadenas_internadas.setdefault(cadena, sys.intern(cadena))
+    return compartida
 
 
 class EventoSensorAmbiental:
     """
     Clase que encapsula la información emitida por un sensor ambiental.
     Representa un evento dentro del sistema IoTMonitor.
+
+    Es un objeto compacto (`__slots__`): guarda la marca de tiempo como entero
+    en nanosegundos y solo la convierte a datetime al mostrarla. El tipo viaja
+    como código TipoSensor; el nombre se obtiene solo al mostrarlo.
     """
 
-    def __init__(self, tipo: str, valor: float, unidad: str, id_sensor: int):
+    __slots__ = ("timestamp_ns", "codigo_tipo", "valor", "unidad", "id_sensor", "id_zona")
+
+    def __init__(self, tipo: Union[TipoSensor, str], valor: float, unidad: str, id_sensor: int,
+                 id_zona: Optional[int] = None, timestamp_ns: Optional[int] = None):
         """
         Inicializa un nuevo evento ambiental.
 
         Args:
-            tipo: Tipo de sensor (Temperatura, Humedad, CO₂, Luz, etc.).
+            tipo: Código TipoSensor (también se acepta el nombre, que se convierte una sola vez).
             valor: Valor leído por el sensor.
             unidad: Unidad de medida (°C, %, ppm, lux, etc.).
             id_sensor: Identificador único del sensor emisor.
+            id_zona: Zona del sensor emisor (None si el observador ya la conoce).
+            timestamp_ns: Marca de tiempo en ns desde epoch (por defecto, el instante actual).
         """
-        self.timestamp = datetime.now()
-        self.tipo_sensor = tipo
+        self.timestamp_ns = time.time_ns() if timestamp_ns is None else timestamp_ns
+        self.codigo_tipo = tipo if isinstance(tipo, TipoSensor) else TipoSensor.desde_nombre(tipo)
         self.valor = valor
-        self.unidad = unidad
+        self.unidad = _internar(unidad)
         self.id_sensor = id_sensor
+        self.id_zona = id_zona
+
+    @property
+    def timestamp(self) -> datetime:
+        """Devuelve la marca de tiempo del evento como datetime local."""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9)
+
+    @property
+    def tipo_sensor(self) -> str:
+        """Devuelve el nombre del tipo de sensor (solo para mostrar / exportar)."""
+        return self.codigo_tipo.nombre
+
+    # -----------------------------------------------------------------------
+    # Formato binario (transporte / almacenamiento)
+    # -----------------------------------------------------------------------
+    def empaquetar(self) -> bytes:
+        """
+        Empaqueta el evento en un registro binario de tamaño fijo (TAMANO_BINARIO bytes).
+
+        Raises:
+            ValueError: Si el tipo de sensor no tiene código asignado.
+        """
+        codigo = self.codigo_tipo
+        if codigo == 0:
+            raise ValueError(f"El tipo de sensor '{self.tipo_sensor}' no tiene código binario.")
+        id_zona = -1 if self.id_zona is None else self.id_zona
+        return FORMATO_BINARIO.pack(self.timestamp_ns, self.valor, self.id_sensor, id_zona, codigo)
+
+    @classmethod
+    def desempaquetar(cls, datos: bytes, desplazamiento: int = 0) -> "EventoSensorAmbiental":
+        """
+        Reconstruye un evento desde un registro binario.
+
+        Args:
+            datos: Buffer con uno o más registros.
+            desplazamiento: Posición del registro dentro del buffer.
+        """
+        campos = FORMATO_BINARIO.unpack_from(datos, desplazamiento)
+        return cls._desde_campos(campos)
+
+    @classmethod
+    def desempaquetar_todos(cls, datos: bytes) -> Iterator["EventoSensorAmbiental"]:
+        """Itera los eventos de un buffer formado por registros binarios consecutivos."""
+        for campos in FORMATO_BINARIO.iter_unpack(datos):
+            yield cls._desde_campos(campos)
+
+    @classmethod
+    def _desde_campos(cls, campos: tuple) -> "EventoSensorAmbiental":
+        """Construye un evento a partir de los campos desempaquetados (códigos desconocidos → DESCONOCIDO)."""
+        timestamp_ns, valor, id_sensor, id_zona, codigo = campos
+        tipo = TipoSensor.desde_nombre(codigo)
+        return cls(
+            tipo, valor, tipo.unidad, id_sensor,
+            None if id_zona < 0 else id_zona, timestamp_ns
+        )
 
     def __str__(self):
         """Devuelve una representación legible del evento."""
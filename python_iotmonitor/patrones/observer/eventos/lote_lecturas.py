@@ -0,0 +1,220 @@
+from typing import Dict, Iterable, List, Tuple, Union
+import numpy as np
+from python_iotmonitor.entidades.sensores.tipo_sensor import TipoSensor, NOMBRES_TIPO
+from python_iotmonitor.patrones.observer.eventos.evento_sensor_ambiental import EventoSensorAmbiental
+
+# Estructura columnar de una lectura (id_zona = -1 cuando la lectura no tiene zona)
+DTYPE_LECTURA = np.dtype([
+    ("id_sensor", "<i8"),
+    ("codigo_tipo", "u1"),
+    ("valor", "<f8"),
+    ("timestamp_ns", "<i8"),
+    ("id_zona", "<i4"),
+])
+
+
+class LoteLecturas:
+    """
+    Representación columnar de un flujo de lecturas sobre un arreglo estructurado de NumPy.
+
+    Reemplaza listas de EventoSensorAmbiental cuando se procesan grandes
+    volúmenes: controlador, persistencia y estadísticas operan sobre columnas
+    completas con operaciones vectorizadas en lugar de recorrer objetos.
+    Las operaciones de corte devuelven vistas (no copian los datos).
+    """
+
+    def __init__(self, datos: np.ndarray):
+        """
+        Inicializa el lote a partir de un arreglo estructurado.
+
+        Args:
+            datos: Arreglo unidimensional con dtype DTYPE_LECTURA.
+
+        Raises:
+            TypeError: Si el arreglo no tiene el dtype esperado.
+        """
+        if datos.dtype != DTYPE_LECTURA:
+            raise TypeError(f"El arreglo debe tener dtype {DTYPE_LECTURA}, no {datos.dtype}.")
+        self._datos = datos
+
+    # -----------------------------------------------------------------------
+    # Construcción
+    # -----------------------------------------------------------------------
+    @classmethod
+    def vacio(cls, cantidad: int = 0) -> "LoteLecturas":
+        """Crea un lote de `cantidad` lecturas sin inicializar."""
+        return cls(np.empty(cantidad, dtype=DTYPE_LECTURA))
+
+    @classmethod
+    def desde_columnas(cls, ids_sensores, codigos_tipo, valores, timestamps_ns,
+                       ids_zona=None) -> "LoteLecturas":
+        """
+        Crea un lote a partir de columnas (arreglos o escalares que se difunden).
+
+        Args:
+            ids_sensores: Identificadores de sensor.
+            codigos_tipo: Códigos de tipo (ver TipoSensor).
+            valores: Valores leídos.
+            timestamps_ns: Marcas de tiempo en ns desde epoch.
+            ids_zona: Zonas de las lecturas (None = sin zona).
+
+        Raises:
+            ValueError: Si las columnas no tienen la misma longitud (ni son escalares).
+        """
+        columnas = [np.asarray(c) for c in (ids_sensores, codigos_tipo, valores, timestamps_ns, ids_zona)
+                    if c is not None]
+        forma = np.broadcast(*columnas).shape
+        if len(forma) > 1:
+            raise ValueError(f"Las columnas deben ser unidimensionales, no de forma {forma}.")
+        datos = np.empty(forma[0] if forma else 1, dtype=DTYPE_LECTURA)
+        datos["id_sensor"] = ids_sensores
+        datos["codigo_tipo"] = codigos_tipo
+        datos["valor"] = valores
+        datos["timestamp_ns"] = timestamps_ns
+        datos["id_zona"] = -1 if ids_zona is None else ids_zona
+        return cls(datos)
+
+    @classmethod
+    def desde_eventos(cls, eventos: Iterable[EventoSensorAmbiental]) -> "LoteLecturas":
+        """Convierte una secuencia de EventoSensorAmbiental en un lote columnar."""
+        filas = [
+            (e.id_sensor, e.codigo_tipo, e.valor, e.timestamp_ns,
+             -1 if e.id_zona is None else e.id_zona)
+            for e in eventos
+        ]
+        return cls(np.array(filas, dtype=DTYPE_LECTURA))
+
+    @classmethod
+    def concatenar(cls, lotes: Iterable["LoteLecturas"]) -> "LoteLecturas":
+        """Une varios lotes en uno nuevo, conservando el orden."""
+        arreglos = [lote._datos for lote in lotes]
+        if not arreglos:
+            return cls.vacio()
+        return cls(np.concatenate(arreglos))
+
+    def a_eventos(self) -> List[EventoSensorAmbiental]:
+        """Convierte el lote en una lista de EventoSensorAmbiental (lecturas sin tipo conocido se omiten)."""
+        return [
+            self._crear_evento(*fila) for fila in self._datos.tolist()
+            if 0 < fila[1] < len(NOMBRES_TIPO)
+        ]
+
+    @staticmethod
+    def _crear_evento(id_sensor: int, codigo: int, valor: float, timestamp_ns: int,
+                      id_zona: int) -> EventoSensorAmbiental:
+        """Construye un EventoSensorAmbiental desde una fila del arreglo (códigos fuera de rango → DESCONOCIDO)."""
+        tipo = TipoSensor.desde_nombre(codigo)
+        return EventoSensorAmbiental(
+            tipo, valor, tipo.unidad, id_sensor,
+            None if id_zona < 0 else id_zona, timestamp_ns
+        )
+
+    # -----------------------------------------------------------------------
+    # Acceso
+    # -----------------------------------------------------------------------
+    def get_datos(self) -> np.ndarray:
+        """Devuelve el arreglo estructurado subyacente."""
+        return self._datos
+
+    @property
+    def ids_sensores(self) -> np.ndarray:
+        """Columna de identificadores de sensor (vista)."""
+        return self._datos["id_sensor"]
+
+    @property
+    def codigos_tipo(self) -> np.ndarray:
+        """Columna de códigos de tipo (vista)."""
+        return self._datos["codigo_tipo"]
+
+    @property
+    def valores(self) -> np.ndarray:
+        """Columna de valores leídos (vista)."""
+        return self._datos["valor"]
+
+    @property
+    def timestamps_ns(self) -> np.ndarray:
+        """Columna de marcas de tiempo en ns (vista)."""
+        return self._datos["timestamp_ns"]
+
+    @property
+    def ids_zona(self) -> np.ndarray:
+        """Columna de zonas (-1 = sin zona) (vista)."""
+        return self._datos["id_zona"]
+
+    def __len__(self) -> int:
+        """Devuelve la cantidad de lecturas del lote."""
+        return self._datos.shape[0]
+
+    def __getitem__(self, indice: Union[int, slice, np.ndarray]) -> Union[EventoSensorAmbiental, "LoteLecturas"]:
+        """
+        Con un entero devuelve la lectura como EventoSensorAmbiental;
+        con un slice (vista) o una máscara / arreglo de índices devuelve un LoteLecturas.
+        """
+        if isinstance(indice, (int, np.integer)):
+            return self._crear_evento(*self._datos[indice].tolist())
+        return LoteLecturas(self._datos[indice])
+
+    # -----------------------------------------------------------------------
+    # Operaciones vectorizadas
+    # -----------------------------------------------------------------------
+    def filtrar_tipo(self, tipo: Union[int, str]) -> "LoteLecturas":
+        """
+        Devuelve las lecturas de un tipo de sensor.
+
+        Args:
+            tipo: Código TipoSensor (también se acepta el nombre: "Temperatura", "CO2", ...).
+        """
+        codigo = TipoSensor.desde_nombre(tipo) if isinstance(tipo, str) else tipo
+        return LoteLecturas(self._datos[self._datos["codigo_tipo"] == codigo])
+
+    def filtrar_rango_tiempo(self, desde_ns: int, hasta_ns: int) -> "LoteLecturas":
+        """Devuelve las lecturas con timestamp en [desde_ns, hasta_ns)."""
+        ts = self._datos["timestamp_ns"]
+        return LoteLecturas(self._datos[(ts >= desde_ns) & (ts < hasta_ns)])
+
+    def ultimos_por_zona_y_tipo(self) -> Dict[Tuple[int, int], float]:
+        """
+        Devuelve el último valor (por orden de llegada) de cada par (zona, código de tipo).
+
+        Returns:
+            Diccionario (id_zona, codigo_tipo) → valor. id_zona = -1 para lecturas sin zona.
+        """
+        if len(self) == 0:
+            return {}
+        claves = self._datos["id_zona"].astype("<i8") * 256 + self._datos["codigo_tipo"]
+        # np.unique devuelve la primera aparición; se invierte para quedarse con la última
+        claves_unicas, posiciones = np.unique(claves[::-1], return_index=True)
+        ultimos = self._datos["valor"][::-1][posiciones]
+        return {
+            (int(clave // 256), int(clave % 256)): float(valor)
+            for clave, valor in zip(claves_unicas.tolist(), ultimos.tolist())
+        }
+
+    def estadisticas_por_tipo(self) -> Dict[str, dict]:
+        """
+        Calcula cantidad, promedio, mínimo y máximo por tipo de sensor.
+
+        Returns:
+            Diccionario nombre de tipo → {"cantidad", "promedio", "minimo", "maximo"}.
+        """
+        codigos = self._datos["codigo_tipo"]
+        valores = self._datos["valor"]
+        cantidades = np.bincount(codigos, minlength=256)
+        sumas = np.bincount(codigos, weights=valores, minlength=256)
+
+        resultado = {}
+        for codigo in np.nonzero(cantidades)[0].tolist():
+            # Los tipos presentes son pocos: una máscara por tipo es más rápida que ufunc.at
+            valores_tipo = valores[codigos == codigo]
+            nombre = NOMBRES_TIPO[codigo] if 0 < codigo < len(NOMBRES_TIPO) else f"Codigo-{codigo}"
+            resultado[nombre] = {
+                "cantidad": int(cantidades[codigo]),
+                "promedio": float(sumas[codigo] / cantidades[codigo]),
+                "minimo": float(valores_tipo.min()),
+                "maximo": float(valores_tipo.max()),
+            }
+        return resultado
+
+    def __str__(self):
+        """Devuelve una representación legible del lote."""
+        return f"[LoteLecturas de {len(self)} lecturas]"
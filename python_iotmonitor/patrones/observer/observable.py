@@ -5,6 +5,7 @@ T = TypeVar("T")
 
 if TYPE_CHECKING:
     from python_iotmonitor.patrones.observer.observer import Observer
+    from python_iotmonitor.patrones.observer.eventos.evento_lote import EventoLote
 
 
 class Observable(Generic[T]):
@@ -52,3 +53,19 @@ class Observable(Generic[T]):
         # Se notifica sin lock para evitar deadlocks si el observador hace tareas pesadas
         for observer in list(self._observers):
             observer.actualizar(evento)
+
+    def notificar_lote(self, lote: "EventoLote") -> None:
+        """
+        Notifica un lote de eventos con una única llamada por observador.
+        Los observadores sin `actualizar_lote` reciben las lecturas de a una.
+
+        Args:
+            lote: EventoLote con las lecturas agrupadas.
+        """
+        for observer in list(self._observers):
+            actualizar_lote = getattr(observer, "actualizar_lote", None)
+            if actualizar_lote is not None:
+                actualizar_lote(lote)
+            else:
+                for evento in lote:
+                    observer.actualizar(evento)
@@ -1,7 +1,10 @@
-from typing import Protocol, TypeVar, Generic
+from typing import Protocol, TypeVar, Generic, TYPE_CHECKING
 
 T = TypeVar("T")
 
+if TYPE_CHECKING:
+    from python_iotmonitor.patrones.observer.eventos.evento_lote import EventoLote
+
 class Observer(Generic[T], Protocol):
     """
     Interfaz genérica del patrón Observer.
@@ -21,3 +24,14 @@ class Observer(Generic[T], Protocol):
             evento: Instancia del evento emitido (por ejemplo, EventoSensorAmbiental).
         """
         ...
+
+    def actualizar_lote(self, lote: "EventoLote") -> None:
+        """
+        Método opcional para recibir muchas lecturas en una sola llamada.
+        La implementación por defecto recorre el lote y delega en `actualizar`.
+
+        Args:
+            lote: EventoLote con las lecturas agrupadas.
+        """
+        for evento in lote:
+            self.actualizar(evento)
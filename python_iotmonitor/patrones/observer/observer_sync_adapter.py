@@ -0,0 +1,48 @@
+from typing import Generic, TypeVar, TYPE_CHECKING
+
+T = TypeVar("T")
+
+if TYPE_CHECKING:
+    from python_iotmonitor.patrones.observer.observer import Observer
+    from python_iotmonitor.patrones.observer.eventos.evento_lote import EventoLote
+
+
+class ObserverSyncAdapter(Generic[T]):
+    """
+    Adaptador (patrón Adapter) que permite registrar un Observer sincrónico
+    en un AsyncObservable. La notificación se ejecuta en línea dentro del
+    event loop, por lo que el observador adaptado debe ser de respuesta rápida.
+    """
+
+    def __init__(self, observer: "Observer[T]"):
+        """
+        Args:
+            observer: Observador sincrónico a adaptar (por ejemplo, ControlAmbientalTask).
+        """
+        self._observer = observer
+
+    def get_observer(self) -> "Observer[T]":
+        """Devuelve el observador sincrónico adaptado."""
+        return self._observer
+
+    async def actualizar(self, evento: T) -> None:
+        """Reenvía el evento al observador sincrónico."""
+        self._observer.actualizar(evento)
+
+    async def actualizar_lote(self, lote: "EventoLote") -> None:
+        """Reenvía el lote al observador sincrónico (o sus lecturas de a una)."""
+        actualizar_lote = getattr(self._observer, "actualizar_lote", None)
+        if actualizar_lote is not None:
+            actualizar_lote(lote)
+        else:
+            for evento in lote:
+                self._observer.actualizar(evento)
+
+    def __eq__(self, otro) -> bool:
+        """Dos adaptadores son iguales si envuelven al mismo observador."""
+        if isinstance(otro, ObserverSyncAdapter):
+            return self._observer is otro._observer
+        return self._observer is otro
+
+    def __hash__(self) -> int:
+        return id(self._observer)
@@ -1,5 +1,6 @@
 from threading import Lock
-from typing import Dict
+from typing import Dict, Optional
+from python_iotmonitor.patrones.singleton.tabla_ultimos_valores import TablaUltimosValores
 
 
 class SensorRegistry:
@@ -9,6 +10,9 @@ class SensorRegistry:
 
     Permite registrar, obtener y listar sensores del sistema IoTMonitor.
     Garantiza que solo exista una única instancia de registro.
+
+    Si se configura una TablaUltimosValores, obtener_ultimo_valor() la consulta
+    (sin locks y compartida con otros procesos) y la compara con el sensor local.
     """
 
     _instance = None
@@ -18,6 +22,7 @@ class SensorRegistry:
         if hasattr(self, "_initialized") and self._initialized:
             return
         self._sensors: Dict[int, object] = {}
+        self._tabla_ultimos_valores: Optional[TablaUltimosValores] = None
         self._initialized = True
 
     # -------------------------------------------------------------------------
@@ -50,3 +55,35 @@ class SensorRegistry:
     def listar_sensores(self) -> Dict[int, object]:
         """Devuelve un diccionario con todos los sensores registrados."""
         return dict(self._sensors)
+
+    # -------------------------------------------------------------------------
+    # Últimos valores (ruta rápida en memoria compartida)
+    # -------------------------------------------------------------------------
+    def set_tabla_ultimos_valores(self, tabla: Optional[TablaUltimosValores]) -> None:
+        """Configura la tabla compartida de últimos valores (None para dejar de usarla)."""
+        self._tabla_ultimos_valores = tabla
+
+    def get_tabla_ultimos_valores(self) -> Optional[TablaUltimosValores]:
+        """Devuelve la tabla compartida de últimos valores, si está configurada."""
+        return self._tabla_ultimos_valores
+
+    def obtener_ultimo_valor(self, id_sensor: int) -> Optional[float]:
+        """
+        Devuelve el último valor del sensor: el más reciente entre la tabla compartida
+        y el sensor registrado en este proceso, comparando el timestamp de cada uno.
+        Si el sensor local no informa su timestamp, prevalece la tabla.
+        """
+        lectura = None
+        tabla = self._tabla_ultimos_valores
+        if tabla is not None and 0 <= id_sensor < tabla.get_capacidad():
+            lectura = tabla.leer(id_sensor)
+        sensor = self._sensors.get(id_sensor)
+        if lectura is not None:
+            timestamp_local = sensor.get_timestamp_valor() if hasattr(sensor, "get_timestamp_valor") else -1
+            if lectura.timestamp_ns >= timestamp_local:
+                return lectura.valor
+        if sensor is None:
+            return None
+        if hasattr(sensor, "get_valor_actual"):
+            return sensor.get_valor_actual()
+        return getattr(sensor, "valor_actual", None)
@@ -0,0 +1,306 @@
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import NamedTuple, Optional, Sequence, TYPE_CHECKING
+import numpy as np
+from python_iotmonitor.constantes import TABLA_ULTIMOS_VALORES_CAPACIDAD
+
+if TYPE_CHECKING:
+    from python_iotmonitor.patrones.observer.eventos.evento_lote import EventoLote
+    from python_iotmonitor.patrones.observer.eventos.evento_sensor_ambiental import EventoSensorAmbiental
+
+# Bits del campo `estado` de cada casillero
+ESTADO_CON_LECTURA = 1
+ESTADO_ACTIVO = 2
+ESTADO_CALIBRADO = 4
+
+# Encabezado del segmento: marca, versión del formato y cantidad de casilleros
+_MARCA = 0x54554C56  # "VLUT"
+_VERSION_FORMATO = 1
+DTYPE_ENCABEZADO = np.dtype([("marca", "<u4"), ("version", "<u4"), ("capacidad", "<u8")])
+TAMANO_ENCABEZADO = 64
+
+# Segmentos creados en este proceso (los hijos por fork heredan el conjunto)
+_SEGMENTOS_CREADOS = set()
+
+# Casillero de 32 bytes; `secuencia` es el contador del seqlock (impar = escritura en curso)
+DTYPE_CASILLERO = np.dtype([
+    ("secuencia", "<u8"),
+    ("valor", "<f8"),
+    ("timestamp_ns", "<i8"),
+    ("codigo_tipo", "u1"),
+    ("estado", "u1"),
+    ("_relleno", "V6"),
+])
+
+
+class LecturaTabla(NamedTuple):
+    """Instantánea consistente de un casillero de la tabla."""
+    valor: float
+    timestamp_ns: int
+    codigo_tipo: int
+    estado: int
+
+    def tiene_lectura(self) -> bool:
+        """Indica si el sensor publicó alguna lectura."""
+        return bool(self.estado & ESTADO_CON_LECTURA)
+
+
+class TablaUltimosValores:
+    """
+    Tabla del último valor de cada sensor en memoria compartida (multiprocessing.shared_memory).
+
+    Está indexada por ID de sensor: el casillero `id` guarda valor, timestamp,
+    código de tipo y estado. Otros procesos (tableros, exportadores, el control
+    ambiental) se adjuntan por nombre y leen sin locks ni serialización de objetos.
+    También es un Observer: registrada en los sensores, publica cada evento.
+
+    Concurrencia (seqlock por casillero): el escritor incrementa `secuencia` a un
+    valor impar, escribe los campos y la vuelve a incrementar; el lector repite la
+    lectura si la secuencia era impar o cambió mientras leía. Cada sensor debe
+    tener un único proceso escritor; los hilos de ese proceso se serializan con un
+    lock local. El orden de escrituras y lecturas se apoya en el modelo de memoria
+    de x86-64 (TSO): las operaciones de NumPy no emiten barreras de memoria.
+    """
+
+    def __init__(self, memoria: shared_memory.SharedMemory, creadora: bool):
+        """
+        Envuelve un segmento ya creado o adjuntado (usar crear() o adjuntar()).
+
+        Raises:
+            ValueError: Si el segmento no tiene el formato de una tabla de últimos valores.
+        """
+        encabezado = np.ndarray(1, dtype=DTYPE_ENCABEZADO, buffer=memoria.buf)[0]
+        if encabezado["marca"] != _MARCA or encabezado["version"] != _VERSION_FORMATO:
+            raise ValueError(f"El segmento '{memoria.name}' no es una tabla de últimos valores.")
+        self._memoria = memoria
+        self._creadora = creadora
+        self._capacidad = int(encabezado["capacidad"])
+        self._casilleros = np.ndarray(self._capacidad, dtype=DTYPE_CASILLERO,
+                                      buffer=memoria.buf, offset=TAMANO_ENCABEZADO)
+        self._secuencia = self._casilleros["secuencia"]
+        self._lock_escritura = threading.Lock()
+
+    @classmethod
+    def crear(cls, nombre: Optional[str] = None,
+              capacidad: int = TABLA_ULTIMOS_VALORES_CAPACIDAD) -> "TablaUltimosValores":
+        """
+        Crea el segmento compartido con todos los casilleros vacíos.
+
+        Args:
+            nombre: Nombre del segmento (None = nombre aleatorio, ver get_nombre()).
+            capacidad: Cantidad de casilleros (IDs de sensor válidos: 0..capacidad-1).
+        """
+        memoria = shared_memory.SharedMemory(
+            name=nombre, create=True, size=TAMANO_ENCABEZADO + capacidad * DTYPE_CASILLERO.itemsize
+        )
+        np.frombuffer(memoria.buf, dtype=np.uint8)[:] = 0
+        encabezado = np.ndarray(1, dtype=DTYPE_ENCABEZADO, buffer=memoria.buf)
+        encabezado[0] = (_MARCA, _VERSION_FORMATO, capacidad)
+        _SEGMENTOS_CREADOS.add(memoria.name)
+        return cls(memoria, creadora=True)
+
+    @classmethod
+    def adjuntar(cls, nombre: str, familia_creadora: Optional[bool] = None) -> "TablaUltimosValores":
+        """
+        Se adjunta a una tabla creada por otro proceso.
+
+        Args:
+            nombre: Nombre del segmento (get_nombre() del proceso creador).
+            familia_creadora: True si este proceso es el creador o uno de sus hijos de
+                multiprocessing (comparten el resource_tracker). None = deducirlo.
+        """
+        if sys.version_info >= (3, 13):
+            return cls(shared_memory.SharedMemory(name=nombre, track=False), creadora=False)
+
+        # Antes de 3.13 adjuntarse también registra el segmento en el resource_tracker.
+        # Un proceso ajeno a la familia del creador tiene su propio tracker, que borraría
+        # el segmento al terminar: en ese caso se deja de rastrearlo. El creador y sus
+        # hijos comparten el tracker y no deben quitarle el registro al creador.
+        memoria = shared_memory.SharedMemory(name=nombre)
+        if familia_creadora is None:
+            familia_creadora = memoria.name in _SEGMENTOS_CREADOS or multiprocessing.parent_process() is not None
+        if os.name == "posix" and not familia_creadora:
+            resource_tracker.unregister(f"/{memoria.name}", "shared_memory")
+        return cls(memoria, creadora=False)
+
+    def __reduce__(self):
+        """
+        Al enviarse a otro proceso (p. ej. a un ProcessPoolExecutor) se adjunta por nombre.
+        El destino es un hijo de multiprocessing, que comparte el resource_tracker.
+        """
+        return TablaUltimosValores.adjuntar, (self.get_nombre(), True)
+
+    # -----------------------------------------------------------------------
+    # Ciclo de vida
+    # -----------------------------------------------------------------------
+    def get_nombre(self) -> str:
+        """Devuelve el nombre del segmento compartido."""
+        return self._memoria.name
+
+    def get_capacidad(self) -> int:
+        """Devuelve la cantidad de casilleros."""
+        return self._capacidad
+
+    def cerrar(self) -> None:
+        """Libera la vista del proceso (el segmento sigue existiendo para los demás)."""
+        self._casilleros = self._secuencia = None
+        self._memoria.close()
+
+    def destruir(self) -> None:
+        """Cierra y elimina el segmento (solo el proceso creador)."""
+        self.cerrar()
+        if self._creadora:
+            self._memoria.unlink()
+            _SEGMENTOS_CREADOS.discard(self._memoria.name)
+
+    def __enter__(self) -> "TablaUltimosValores":
+        return self
+
+    def __exit__(self, *_) -> None:
+        if self._creadora:
+            self.destruir()
+        else:
+            self.cerrar()
+
+    # -----------------------------------------------------------------------
+    # Escritura (un único proceso escritor por sensor)
+    # -----------------------------------------------------------------------
+    def escribir(self, id_sensor: int, valor: float, codigo_tipo: int, estado: int = ESTADO_ACTIVO,
+                 timestamp_ns: Optional[int] = None) -> None:
+        """
+        Publica la última lectura de un sensor.
+
+        Args:
+            id_sensor: ID del sensor (casillero).
+            valor: Valor leído.
+            codigo_tipo: Código del tipo de sensor (ver TipoSensor).
+            estado: Combinación de ESTADO_ACTIVO / ESTADO_CALIBRADO (se agrega ESTADO_CON_LECTURA).
+            timestamp_ns: Momento de la lectura (None = ahora).
+
+        Raises:
+            IndexError: Si el ID no entra en la tabla.
+        """
+        if not 0 <= id_sensor < self._capacidad:
+            raise IndexError(f"ID de sensor {id_sensor} fuera de la tabla (capacidad {self._capacidad}).")
+        casillero = self._casilleros[id_sensor:id_sensor + 1]
+        with self._lock_escritura:
+            casillero["secuencia"] += 1
+            casillero["valor"] = valor
+            casillero["timestamp_ns"] = time.time_ns() if timestamp_ns is None else timestamp_ns
+            casillero["codigo_tipo"] = codigo_tipo
+            casillero["estado"] = estado | ESTADO_CON_LECTURA
+            casillero["secuencia"] += 1
+
+    def escribir_lote(self, ids_sensor: np.ndarray, valores: np.ndarray, codigos_tipo: np.ndarray,
+                      estados: Optional[np.ndarray] = None, timestamps_ns: Optional[np.ndarray] = None) -> None:
+        """
+        Publica muchas lecturas en una pasada vectorizada (mismo protocolo que escribir()).
+
+        Args:
+            ids_sensor: IDs de los sensores (sin repetidos).
+            valores: Valor de cada sensor.
+            codigos_tipo: Código de tipo de cada sensor.
+            estados: Estado de cada sensor (None = todos activos).
+            timestamps_ns: Momento de cada lectura (None = ahora, el mismo para todas).
+
+        Raises:
+            IndexError: Si algún ID no entra en la tabla.
+        """
+        ids_sensor = np.asarray(ids_sensor, dtype=np.intp)
+        if len(ids_sensor) and (ids_sensor.min() < 0 or ids_sensor.max() >= self._capacidad):
+            raise IndexError(f"Hay IDs de sensor fuera de la tabla (capacidad {self._capacidad}).")
+        estados = ESTADO_ACTIVO if estados is None else np.asarray(estados, dtype=np.uint8)
+        casilleros = self._casilleros
+        with self._lock_escritura:
+            self._secuencia[ids_sensor] += 1
+            casilleros["valor"][ids_sensor] = valores
+            casilleros["timestamp_ns"][ids_sensor] = time.time_ns() if timestamps_ns is None else timestamps_ns
+            casilleros["codigo_tipo"][ids_sensor] = codigos_tipo
+            casilleros["estado"][ids_sensor] = estados | ESTADO_CON_LECTURA
+            self._secuencia[ids_sensor] += 1
+
+    def publicar_desde_store(self, store, indices: np.ndarray, ids_sensor: Optional[np.ndarray] = None) -> None:
+        """
+        Publica el valor actual de filas del SensorStore (valor, tipo, activo y calibrado).
+
+        Args:
+            store: SensorStore de origen.
+            indices: Filas a publicar.
+            ids_sensor: Casilleros de destino (None = el ID de cada sensor).
+        """
+        estados = (np.where(store.columna("activo", indices), ESTADO_ACTIVO, 0)
+                   | np.where(store.columna("calibrado", indices), ESTADO_CALIBRADO, 0)).astype(np.uint8)
+        self.escribir_lote(
+            store.columna("id_sensor", indices) if ids_sensor is None else ids_sensor,
+            store.columna("valor", indices),
+            store.columna("codigo_tipo", indices),
+            estados,
+        )
+
+    def actualizar(self, evento: "EventoSensorAmbiental") -> None:
+        """Publica la lectura de un evento de sensor (Observer)."""
+        self.escribir(evento.id_sensor, evento.valor, evento.codigo_tipo, timestamp_ns=evento.timestamp_ns)
+
+    def actualizar_lote(self, lote: "EventoLote") -> None:
+        """Publica todas las lecturas de un lote en una sola escritura (Observer)."""
+        ultimos = {evento.id_sensor: evento for evento in lote}  # el último de cada sensor
+        eventos = list(ultimos.values())
+        self.escribir_lote(
+            np.fromiter((evento.id_sensor for evento in eventos), dtype=np.intp, count=len(eventos)),
+            np.fromiter((evento.valor for evento in eventos), dtype=np.float64, count=len(eventos)),
+            np.fromiter((evento.codigo_tipo for evento in eventos), dtype=np.uint8, count=len(eventos)),
+            timestamps_ns=np.fromiter((evento.timestamp_ns for evento in eventos), dtype=np.int64,
+                                      count=len(eventos)),
+        )
+
+    # -----------------------------------------------------------------------
+    # Lectura sin locks (cualquier proceso)
+    # -----------------------------------------------------------------------
+    def leer(self, id_sensor: int) -> Optional[LecturaTabla]:
+        """
+        Devuelve una instantánea consistente del casillero, o None si el sensor no publicó lecturas.
+
+        Raises:
+            IndexError: Si el ID no entra en la tabla.
+        """
+        if not 0 <= id_sensor < self._capacidad:
+            raise IndexError(f"ID de sensor {id_sensor} fuera de la tabla (capacidad {self._capacidad}).")
+        secuencia = self._secuencia
+        while True:
+            inicial = int(secuencia[id_sensor])
+            if inicial & 1:
+                time.sleep(0)  # escritura en curso: ceder el procesador y reintentar
+                continue
+            valor, timestamp_ns, codigo_tipo, estado = self._casilleros[
+                ["valor", "timestamp_ns", "codigo_tipo", "estado"]
+            ][id_sensor].item()
+            if int(secuencia[id_sensor]) == inicial:
+                break
+        if not estado & ESTADO_CON_LECTURA:
+            return None
+        return LecturaTabla(valor, timestamp_ns, codigo_tipo, estado)
+
+    def leer_lote(self, ids_sensor: Sequence[int]) -> np.ndarray:
+        """
+        Devuelve una copia consistente de muchos casilleros (arreglo estructurado con los
+        campos valor, timestamp_ns, codigo_tipo y estado). Solo se releen los casilleros
+        que cambiaron durante la copia.
+        """
+        ids_sensor = np.asarray(ids_sensor, dtype=np.intp)
+        copia = np.empty(len(ids_sensor), dtype=DTYPE_CASILLERO)
+        pendientes = np.arange(len(ids_sensor))
+        while len(pendientes):
+            ids_pendientes = ids_sensor[pendientes]
+            # La secuencia se lee aparte antes y después de copiar: la copia de registros
+            # completos no garantiza en qué orden se leen los campos.
+            inicial = self._secuencia[ids_pendientes]
+            copia[pendientes] = self._casilleros[ids_pendientes]
+            final = self._secuencia[ids_pendientes]
+            pendientes = pendientes[((inicial & 1) == 1) | (inicial != final)]
+            if len(pendientes):
+                time.sleep(0)  # escrituras en curso: ceder el procesador y reintentar
+        return copia[["valor", "timestamp_ns", "codigo_tipo", "estado"]]
@@ -1,4 +1,6 @@
 from enum import Enum
+from typing import Optional
+import numpy as np
 from python_iotmonitor.patrones.strategy.lectura_sensor_strategy import LecturaSensorStrategy
 
 
@@ -7,6 +9,13 @@ class TipoConstante(Enum):
     LUZ = "Luz"
 
 
+# Lecturas constantes por tipo de sensor
+_VALORES_CONSTANTES = {
+    TipoConstante.HUMEDAD: 50.0,   # Simula una humedad ambiente promedio (entre 45–55%)
+    TipoConstante.LUZ: 450.0,      # Simula una intensidad de luz promedio (entre 400–500 lux)
+}
+
+
 class LecturaConstanteStrategy(LecturaSensorStrategy):
     """
     Implementación del patrón Strategy:
@@ -16,16 +25,16 @@ class LecturaConstanteStrategy(LecturaSensorStrategy):
 
     def __init__(self, tipo: TipoConstante):
         self._tipo = tipo
+        self._valor = _VALORES_CONSTANTES.get(tipo, 0.0)
 
     def generar_valor(self) -> float:
         """
         Genera una lectura constante basada en el tipo de sensor.
         """
-        if self._tipo == TipoConstante.HUMEDAD:
-            # Simula una humedad ambiente promedio (entre 45–55%)
-            return 50.0
-        elif self._tipo == TipoConstante.LUZ:
-            # Simula una intensidad de luz promedio (entre 400–500 lux)
-            return 450.0
-        else:
-            return 0.0
+        return self._valor
+
+    def generar_lote(self, n: int, tiempos: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Genera `n` lecturas constantes en una sola operación.
+        """
+        return np.full(n, self._valor, dtype=np.float64)
@@ -1,4 +1,7 @@
+import time
 from datetime import datetime
+from typing import Optional
+import numpy as np
 from python_iotmonitor.patrones.strategy.lectura_sensor_strategy import LecturaSensorStrategy
 
 
@@ -24,3 +27,41 @@ class LecturaVariableStrategy(LecturaSensorStrategy):
         else:
             # Noche: valores más bajos y estables
             return round(10 + (hora_actual % 6) * 0.5, 1)  # Ej. entre 10°C y 13°C
+
+    def generar_lote(self, n: int, tiempos: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Genera `n` lecturas variables de forma vectorizada.
+        Sin `tiempos` consulta la hora una sola vez para todo el lote.
+
+        Args:
+            n: Cantidad de lecturas a generar.
+            tiempos: Marcas de tiempo (ns desde epoch o datetime64 en UTC) de longitud `n`.
+
+        Raises:
+            ValueError: Si `tiempos` no tiene longitud `n`.
+        """
+        if tiempos is None:
+            horas = np.full(n, datetime.now().hour, dtype=np.int64)
+        else:
+            horas = self._horas_locales(tiempos)
+            if horas.shape[0] != n:
+                raise ValueError(f"Se esperaban {n} marcas de tiempo y se recibieron {horas.shape[0]}.")
+
+        dia = (horas >= 6) & (horas < 18)
+        valores = np.where(dia, 20 + (horas - 6) * 0.8, 10 + (horas % 6) * 0.5)
+        return np.round(valores, 1)
+
+    @staticmethod
+    def _horas_locales(tiempos: np.ndarray) -> np.ndarray:
+        """
+        Convierte marcas de tiempo a horas locales (0–23).
+        El desfase horario se toma del primer instante del lote.
+        """
+        tiempos = np.asarray(tiempos)
+        if tiempos.dtype.kind == "M":
+            tiempos = tiempos.astype("datetime64[ns]").astype(np.int64)
+        segundos = tiempos.astype(np.int64) // 1_000_000_000
+        if segundos.shape[0] == 0:
+            return segundos
+        desfase = time.localtime(int(segundos[0])).tm_gmtoff
+        return ((segundos + desfase) // 3600) % 24
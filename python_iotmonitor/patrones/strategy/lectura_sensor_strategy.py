@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from typing import Optional
+import numpy as np
 
 class LecturaSensorStrategy(ABC):
     """
@@ -13,3 +15,19 @@ class LecturaSensorStrategy(ABC):
         dependiendo de su tipo (temperatura, humedad, CO₂, luz, etc.).
         """
         pass
+
+    def generar_lote(self, n: int, tiempos: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Genera `n` lecturas de una vez.
+        La implementación por defecto llama `n` veces a generar_valor; las
+        estrategias concretas la reemplazan por una versión vectorizada.
+
+        Args:
+            n: Cantidad de lecturas a generar.
+            tiempos: Marcas de tiempo de cada lectura (ns desde epoch o datetime64),
+                para estrategias que dependen del instante de lectura.
+
+        Returns:
+            Arreglo float64 de longitud `n`.
+        """
+        return np.fromiter((self.generar_valor() for _ in range(n)), dtype=np.float64, count=n)
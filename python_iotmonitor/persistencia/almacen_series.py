@@ -0,0 +1,450 @@
+import os
+import re
+import struct
+import threading
+import zlib
+from typing import List, Optional, Tuple, TYPE_CHECKING
+import numpy as np
+from python_iotmonitor.patrones.observer.eventos.evento_sensor_ambiental import EventoSensorAmbiental
+from python_iotmonitor.patrones.observer.eventos.lote_lecturas import LoteLecturas, DTYPE_LECTURA
+from python_iotmonitor.persistencia.compresion_gorilla import (
+    codificar_timestamps, codificar_valores, decodificar_timestamps, decodificar_valores,
+)
+from python_iotmonitor.persistencia.escritura_atomica import escribir_atomico
+from python_iotmonitor.persistencia.archivo_lecturas import ArchivoLecturas
+from python_iotmonitor.constantes import SERIES_PUNTOS_POR_SEGMENTO, SERIES_RESOLUCION_NS
+
+if TYPE_CHECKING:
+    from python_iotmonitor.patrones.observer.eventos.evento_lote import EventoLote
+
+# Formato del segmento: encabezado | flujo de timestamps | flujo de valores | índice | pie
+FIRMA_SEGMENTO = b"IOTSEG01"
+ENCABEZADO_SEGMENTO = struct.Struct("<8sq")  # firma, resolución de los timestamps en ns
+PIE_SEGMENTO = struct.Struct("<QQII8s")  # bytes de timestamps, bytes de valores, bloques, CRC32 del índice, firma
+
+# Una entrada del índice por bloque (serie de un sensor dentro del segmento)
+DTYPE_INDICE_SEGMENTO = np.dtype([
+    ("id_sensor", "<i8"),
+    ("codigo_tipo", "u1"),
+    ("id_zona", "<i4"),
+    ("cantidad", "<u4"),
+    ("ts_min", "<i8"),
+    ("ts_max", "<i8"),
+    ("bit_ts", "<u8"),
+    ("bit_valor", "<u8"),
+])
+
+_PATRON_SEGMENTO = re.compile(r"^segmento_(\d+)\.seg$")
+
+
+class SegmentoSeries:
+    """
+    Segmento inmutable de series de tiempo.
+
+    Contiene las lecturas de muchos sensores agrupadas en bloques (uno por
+    sensor, ordenado por tiempo): los timestamps comprimidos con
+    delta-of-delta y los valores con XOR (ver compresion_gorilla). El índice
+    del pie (id de sensor → posición del bloque, ts mínimo y máximo) permite
+    leer un sensor o un rango de tiempo sin decodificar el resto.
+    """
+
+    def __init__(self, ruta: str):
+        """
+        Abre un segmento y carga su índice.
+
+        Args:
+            ruta: Ruta del archivo del segmento.
+
+        Raises:
+            ValueError: Si el archivo no es un segmento válido.
+        """
+        self._ruta = ruta
+        with open(ruta, "rb") as f:
+            firma, self._resolucion_ns = ENCABEZADO_SEGMENTO.unpack(f.read(ENCABEZADO_SEGMENTO.size))
+            f.seek(-PIE_SEGMENTO.size, os.SEEK_END)
+            self._tamano = f.tell() + PIE_SEGMENTO.size
+            bytes_ts, bytes_valores, bloques, crc, firma_pie = PIE_SEGMENTO.unpack(f.read(PIE_SEGMENTO.size))
+            if firma != FIRMA_SEGMENTO or firma_pie != FIRMA_SEGMENTO:
+                raise ValueError(f"{ruta} no es un segmento de series de tiempo.")
+            self._inicio_ts = ENCABEZADO_SEGMENTO.size
+            self._inicio_valores = self._inicio_ts + bytes_ts
+            f.seek(self._inicio_valores + bytes_valores)
+            datos_indice = f.read(bloques * DTYPE_INDICE_SEGMENTO.itemsize)
+        if zlib.crc32(datos_indice) != crc:
+            raise ValueError(f"Índice dañado en el segmento {ruta}.")
+        self._indice = np.frombuffer(datos_indice, dtype=DTYPE_INDICE_SEGMENTO)
+        self._bits_ts = bytes_ts * 8
+        self._bits_valores = bytes_valores * 8
+
+    # -----------------------------------------------------------------------
+    # Escritura
+    # -----------------------------------------------------------------------
+    @classmethod
+    def escribir(cls, ruta: str, datos: np.ndarray, resolucion_ns: int = SERIES_RESOLUCION_NS) -> "SegmentoSeries":
+        """
+        Escribe un segmento nuevo de forma atómica.
+
+        Args:
+            ruta: Ruta del archivo a crear.
+            datos: Lecturas con dtype DTYPE_LECTURA (en cualquier orden).
+            resolucion_ns: Resolución de los timestamps guardados.
+
+        Returns:
+            El segmento escrito, abierto para lectura.
+        """
+        ts = datos["timestamp_ns"] // resolucion_ns
+        orden = np.lexsort((ts, datos["id_zona"], datos["codigo_tipo"], datos["id_sensor"]))
+        datos, ts = datos[orden], ts[orden]
+
+        # Un bloque por serie (sensor, tipo, zona)
+        inicios = np.ones(len(datos), dtype=bool)
+        inicios[1:] = ((datos["id_sensor"][1:] != datos["id_sensor"][:-1])
+                       | (datos["codigo_tipo"][1:] != datos["codigo_tipo"][:-1])
+                       | (datos["id_zona"][1:] != datos["id_zona"][:-1]))
+        flujo_ts, bit_ts = codificar_timestamps(ts, inicios)
+        flujo_valores, bit_valor = codificar_valores(datos["valor"], inicios)
+
+        primeros = np.flatnonzero(inicios)
+        ultimos = np.append(primeros[1:], len(datos)) - 1
+        indice = np.empty(len(primeros), dtype=DTYPE_INDICE_SEGMENTO)
+        for campo in ("id_sensor", "codigo_tipo", "id_zona"):
+            indice[campo] = datos[campo][primeros]
+        indice["cantidad"] = ultimos - primeros + 1
+        indice["ts_min"] = ts[primeros] * resolucion_ns
+        indice["ts_max"] = ts[ultimos] * resolucion_ns
+        indice["bit_ts"] = bit_ts
+        indice["bit_valor"] = bit_valor
+        datos_indice = indice.tobytes()
+
+        def escribir_contenido(f):
+            f.write(ENCABEZADO_SEGMENTO.pack(FIRMA_SEGMENTO, resolucion_ns))
+            f.write(flujo_ts)
+            f.write(flujo_valores)
+            f.write(datos_indice)
+            f.write(PIE_SEGMENTO.pack(len(flujo_ts), len(flujo_valores), len(indice),
+                                      zlib.crc32(datos_indice), FIRMA_SEGMENTO))
+
+        escribir_atomico(ruta, escribir_contenido)
+        return cls(ruta)
+
+    # -----------------------------------------------------------------------
+    # Lectura
+    # -----------------------------------------------------------------------
+    def get_ruta(self) -> str:
+        """Devuelve la ruta del archivo del segmento."""
+        return self._ruta
+
+    def get_indice(self) -> np.ndarray:
+        """Devuelve el índice de bloques (dtype DTYPE_INDICE_SEGMENTO)."""
+        return self._indice
+
+    def get_cantidad_puntos(self) -> int:
+        """Devuelve la cantidad de lecturas del segmento."""
+        return int(self._indice["cantidad"].sum())
+
+    def get_tamano(self) -> int:
+        """Devuelve el tamaño del archivo en bytes."""
+        return self._tamano
+
+    def buscar_bloques(self, id_sensor: Optional[int] = None, desde_ns: Optional[int] = None,
+                       hasta_ns: Optional[int] = None) -> np.ndarray:
+        """
+        Devuelve las posiciones de los bloques de un sensor que se solapan con [desde_ns, hasta_ns),
+        consultando solo el índice.
+        """
+        indice = self._indice
+        seleccion = np.ones(len(indice), dtype=bool)
+        if id_sensor is not None:
+            seleccion &= indice["id_sensor"] == id_sensor
+        if desde_ns is not None:
+            seleccion &= indice["ts_max"] >= desde_ns
+        if hasta_ns is not None:
+            seleccion &= indice["ts_min"] < hasta_ns
+        return np.flatnonzero(seleccion)
+
+    def leer(self, id_sensor: Optional[int] = None, desde_ns: Optional[int] = None,
+             hasta_ns: Optional[int] = None) -> np.ndarray:
+        """
+        Decodifica las lecturas de un sensor (o de todos) en [desde_ns, hasta_ns).
+
+        Returns:
+            Arreglo con dtype DTYPE_LECTURA, ordenado por bloque y tiempo.
+        """
+        partes = []
+        with open(self._ruta, "rb") as f:
+            for bloque in self.buscar_bloques(id_sensor, desde_ns, hasta_ns).tolist():
+                partes.append(self._leer_bloque(f, bloque))
+        if not partes:
+            return np.empty(0, dtype=DTYPE_LECTURA)
+        return _filtrar_rango(np.concatenate(partes), desde_ns, hasta_ns)
+
+    def _leer_bloque(self, archivo, bloque: int) -> np.ndarray:
+        """Lee y decodifica un bloque (solo los bytes de sus dos flujos)."""
+        entrada = self._indice[bloque]
+        cantidad = int(entrada["cantidad"])
+        siguiente = bloque + 1 < len(self._indice)
+        fin_ts = int(self._indice["bit_ts"][bloque + 1]) if siguiente else self._bits_ts
+        fin_valor = int(self._indice["bit_valor"][bloque + 1]) if siguiente else self._bits_valores
+        flujo_ts, bit_ts = self._leer_bits(archivo, self._inicio_ts, int(entrada["bit_ts"]), fin_ts)
+        flujo_valor, bit_valor = self._leer_bits(archivo, self._inicio_valores, int(entrada["bit_valor"]), fin_valor)
+
+        datos = np.empty(cantidad, dtype=DTYPE_LECTURA)
+        datos["id_sensor"] = entrada["id_sensor"]
+        datos["codigo_tipo"] = entrada["codigo_tipo"]
+        datos["id_zona"] = entrada["id_zona"]
+        datos["timestamp_ns"] = decodificar_timestamps(
+            flujo_ts, bit_ts, cantidad, int(entrada["ts_min"]) // self._resolucion_ns
+        ) * self._resolucion_ns
+        datos["valor"] = decodificar_valores(flujo_valor, bit_valor, cantidad)
+        return datos
+
+    @staticmethod
+    def _leer_bits(archivo, inicio: int, bit_desde: int, bit_hasta: int) -> Tuple[bytes, int]:
+        """Lee los bytes que contienen los bits [bit_desde, bit_hasta) de un flujo; devuelve (bytes, bit relativo)."""
+        byte_desde = bit_desde >> 3
+        archivo.seek(inicio + byte_desde)
+        return archivo.read(((bit_hasta + 7) >> 3) - byte_desde), bit_desde & 7
+
+
+class AlmacenSeries:
+    """
+    Almacén de series de tiempo de lecturas en segmentos inmutables comprimidos.
+
+    Es un Observer de EventoSensorAmbiental: las lecturas recibidas se
+    acumulan en memoria y, al llegar a `puntos_por_segmento` (o al llamar
+    `sellar`), se escriben juntas en un segmento nuevo con codificación
+    vectorizada. El sellado por tamaño corre en un hilo propio, así el hilo
+    que notifica la lectura no espera la compresión ni el fsync. Las
+    consultas combinan los segmentos (usando su índice) con las lecturas
+    aún no selladas (incluidas las que se están escribiendo en un segmento).
+    """
+
+    def __init__(self, directorio: str, puntos_por_segmento: int = SERIES_PUNTOS_POR_SEGMENTO,
+                 resolucion_ns: int = SERIES_RESOLUCION_NS):
+        """
+        Abre (o crea) el almacén en un directorio; los segmentos existentes se conservan.
+
+        Args:
+            directorio: Directorio de los segmentos.
+            puntos_por_segmento: Lecturas acumuladas que disparan el sellado de un segmento.
+            resolucion_ns: Resolución de los timestamps guardados (se truncan a este múltiplo).
+        """
+        os.makedirs(directorio, exist_ok=True)
+        self._directorio = directorio
+        self._puntos_por_segmento = puntos_por_segmento
+        self._resolucion_ns = resolucion_ns
+        self._lock = threading.Lock()  # protege las lecturas pendientes
+        self._lock_sellado = threading.Lock()
+        self._eventos: List[tuple] = []
+        self._lotes: List[np.ndarray] = []
+        self._pendientes_lotes = 0
+        # Lecturas retiradas por sellar() cuyo segmento todavía no se publicó (eventos, lotes)
+        self._sellando: Tuple[List[tuple], List[np.ndarray]] = ([], [])
+        self._hilo_sellado: Optional[threading.Thread] = None
+
+        self._segmentos: List[SegmentoSeries] = []
+        self._siguiente = 1
+        for nombre in sorted(os.listdir(directorio)):
+            coincidencia = _PATRON_SEGMENTO.match(nombre)
+            if not coincidencia:
+                continue
+            self._siguiente = max(self._siguiente, int(coincidencia.group(1)) + 1)
+            try:
+                self._segmentos.append(SegmentoSeries(os.path.join(directorio, nombre)))
+            except (OSError, ValueError, struct.error) as e:
+                print(f"[AlmacenSeries] Segmento {nombre} ignorado: {e}")
+
+    # -----------------------------------------------------------------------
+    # Ingesta (Observer)
+    # -----------------------------------------------------------------------
+    def actualizar(self, evento: EventoSensorAmbiental) -> None:
+        """Recibe una lectura (Observer) y la acumula hasta el próximo segmento."""
+        fila = (evento.id_sensor, evento.codigo_tipo, evento.valor, evento.timestamp_ns,
+                -1 if evento.id_zona is None else evento.id_zona)
+        with self._lock:
+            self._eventos.append(fila)
+            completo = len(self._eventos) + self._pendientes_lotes >= self._puntos_por_segmento
+        if completo:
+            self._solicitar_sellado()
+
+    def actualizar_lote(self, lote: "EventoLote") -> None:
+        """Recibe un lote de lecturas (Observer) y las acumula hasta el próximo segmento."""
+        filas = [
+            (e.id_sensor, e.codigo_tipo, e.valor, e.timestamp_ns, -1 if e.id_zona is None else e.id_zona)
+            for e in lote.eventos
+        ]
+        with self._lock:
+            self._eventos.extend(filas)
+            completo = len(self._eventos) + self._pendientes_lotes >= self._puntos_por_segmento
+        if completo:
+            self._solicitar_sellado()
+
+    def actualizar_lecturas(self, lote: LoteLecturas) -> None:
+        """Recibe un lote columnar de lecturas y lo acumula sin convertirlo en objetos."""
+        if not len(lote):
+            return
+        with self._lock:
+            self._lotes.append(lote.get_datos().copy())
+            self._pendientes_lotes += len(lote)
+            completo = len(self._eventos) + self._pendientes_lotes >= self._puntos_por_segmento
+        if completo:
+            self._solicitar_sellado()
+
+    # -----------------------------------------------------------------------
+    # Sellado
+    # -----------------------------------------------------------------------
+    def sellar(self) -> Optional[SegmentoSeries]:
+        """
+        Escribe las lecturas pendientes en un segmento nuevo.
+
+        Returns:
+            El segmento escrito, o None si no había lecturas pendientes.
+        """
+        with self._lock_sellado:
+            with self._lock:
+                eventos, lotes = self._eventos, self._lotes
+                self._eventos, self._lotes, self._pendientes_lotes = [], [], 0
+                # Las consultas siguen viendo estas lecturas mientras se escribe el segmento
+                self._sellando = (eventos, lotes)
+            datos = _a_columnas(eventos, lotes)
+            if not len(datos):
+                return None
+            ruta = os.path.join(self._directorio, f"segmento_{self._siguiente:08d}.seg")
+            try:
+                segmento = SegmentoSeries.escribir(ruta, datos, self._resolucion_ns)
+            except BaseException:
+                with self._lock:
+                    self._lotes.insert(0, datos)  # se reintentan en el próximo sellado
+                    self._pendientes_lotes += len(datos)
+                    self._sellando = ([], [])
+                raise
+            self._siguiente += 1
+            with self._lock:
+                # Publicar el segmento y retirar sus lecturas de _sellando en la misma sección crítica
+                self._segmentos = self._segmentos + [segmento]
+                self._sellando = ([], [])
+            return segmento
+
+    def cerrar(self) -> None:
+        """Espera el sellado en segundo plano (si hay uno en curso) y sella las lecturas pendientes."""
+        with self._lock:
+            hilo = self._hilo_sellado
+        if hilo is not None:
+            hilo.join()
+        self.sellar()
+
+    def _solicitar_sellado(self) -> None:
+        """Inicia el hilo de sellado si no hay uno en curso."""
+        with self._lock:
+            if self._hilo_sellado is not None:
+                return
+            self._hilo_sellado = threading.Thread(
+                target=self._sellar_en_segundo_plano, name="AlmacenSeries-Sellado", daemon=True
+            )
+            self._hilo_sellado.start()
+
+    def _sellar_en_segundo_plano(self) -> None:
+        """Sella segmentos mientras las lecturas pendientes alcancen el tamaño de un segmento."""
+        while True:
+            try:
+                self.sellar()
+            except Exception as e:
+                # Las lecturas quedan pendientes; se reintenta con la próxima lectura o al cerrar
+                print(f"[AlmacenSeries] Error al sellar un segmento: {e}")
+                with self._lock:
+                    self._hilo_sellado = None
+                return
+            with self._lock:
+                if len(self._eventos) + self._pendientes_lotes < self._puntos_por_segmento:
+                    self._hilo_sellado = None
+                    return
+
+    # -----------------------------------------------------------------------
+    # Consultas
+    # -----------------------------------------------------------------------
+    def consultar(self, id_sensor: int, desde_ns: Optional[int] = None,
+                  hasta_ns: Optional[int] = None) -> LoteLecturas:
+        """
+        Devuelve el historial de un sensor en [desde_ns, hasta_ns), ordenado por tiempo.
+        Las lecturas selladas tienen el timestamp truncado a la resolución del almacén.
+
+        Args:
+            id_sensor: Identificador del sensor.
+            desde_ns: Inicio del rango (None = sin límite).
+            hasta_ns: Fin del rango, exclusivo (None = sin límite).
+        """
+        segmentos, eventos, lotes = self._instantanea()
+        partes = [segmento.leer(id_sensor, desde_ns, hasta_ns) for segmento in segmentos]
+        pendientes = _a_columnas(eventos, lotes)
+        partes.append(_filtrar_rango(pendientes[pendientes["id_sensor"] == id_sensor], desde_ns, hasta_ns))
+
+        datos = np.concatenate(partes)
+        return LoteLecturas(datos[np.argsort(datos["timestamp_ns"], kind="stable")])
+
+    def exportar_archivo(self, ruta: str, desde_ns: Optional[int] = None,
+                         hasta_ns: Optional[int] = None) -> ArchivoLecturas:
+        """
+        Descomprime las lecturas de [desde_ns, hasta_ns) (selladas y pendientes) en un
+        ArchivoLecturas, que luego se consulta mapeado en memoria sin copiar.
+
+        Args:
+            ruta: Ruta del archivo a crear.
+            desde_ns: Inicio del rango (None = sin límite).
+            hasta_ns: Fin del rango, exclusivo (None = sin límite).
+        """
+        segmentos, eventos, lotes = self._instantanea()
+        partes = [segmento.leer(None, desde_ns, hasta_ns) for segmento in segmentos]
+        partes.append(_filtrar_rango(_a_columnas(eventos, lotes), desde_ns, hasta_ns))
+        return ArchivoLecturas.escribir(ruta, np.concatenate(partes))
+
+    def _instantanea(self) -> Tuple[List[SegmentoSeries], List[tuple], List[np.ndarray]]:
+        """
+        Toma, bajo el lock, los segmentos publicados y las lecturas no selladas
+        (las que se están sellando primero), de modo que cada lectura aparezca
+        exactamente una vez aunque un sellado termine durante la consulta.
+        """
+        with self._lock:
+            eventos_sellando, lotes_sellando = self._sellando
+            return (self._segmentos, eventos_sellando + self._eventos, lotes_sellando + self._lotes)
+
+    def get_segmentos(self) -> List[SegmentoSeries]:
+        """Devuelve los segmentos sellados, del más antiguo al más reciente."""
+        return list(self._segmentos)
+
+    def get_estadisticas(self) -> dict:
+        """Devuelve segmentos, lecturas selladas y pendientes, bytes en disco y bytes por lectura."""
+        with self._lock:
+            segmentos = self._segmentos
+            eventos_sellando, lotes_sellando = self._sellando
+            pendientes = (len(self._eventos) + self._pendientes_lotes
+                          + len(eventos_sellando) + sum(len(lote) for lote in lotes_sellando))
+        puntos = sum(segmento.get_cantidad_puntos() for segmento in segmentos)
+        tamano = sum(segmento.get_tamano() for segmento in segmentos)
+        return {
+            "segmentos": len(segmentos),
+            "puntos": puntos,
+            "pendientes": pendientes,
+            "bytes": tamano,
+            "bytes_por_punto": tamano / puntos if puntos else 0.0,
+        }
+
+
+def _a_columnas(eventos: List[tuple], lotes: List[np.ndarray]) -> np.ndarray:
+    """Une lotes columnares y filas de eventos en un único arreglo con dtype DTYPE_LECTURA."""
+    partes = list(lotes)
+    if eventos:
+        partes.append(np.array(eventos, dtype=DTYPE_LECTURA))
+    if not partes:
+        return np.empty(0, dtype=DTYPE_LECTURA)
+    return np.concatenate(partes)
+
+
+def _filtrar_rango(datos: np.ndarray, desde_ns: Optional[int], hasta_ns: Optional[int]) -> np.ndarray:
+    """Devuelve las lecturas con timestamp en [desde_ns, hasta_ns) (None = sin límite)."""
+    ts = datos["timestamp_ns"]
+    seleccion = np.ones(len(datos), dtype=bool)
+    if desde_ns is not None:
+        seleccion &= ts >= desde_ns
+    if hasta_ns is not None:
+        seleccion &= ts < hasta_ns
+    return datos[seleccion]
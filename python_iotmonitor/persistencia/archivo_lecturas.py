@@ -0,0 +1,207 @@
+import struct
+from typing import Dict, Optional, Union
+import numpy as np
+from python_iotmonitor.patrones.observer.eventos.lote_lecturas import LoteLecturas, DTYPE_LECTURA
+from python_iotmonitor.persistencia.escritura_atomica import escribir_atomico
+
+# Formato: encabezado (alineado a 64 bytes) | lecturas (DTYPE_LECTURA) | índice de series
+FIRMA_ARCHIVO_LECTURAS = b"IOTLEC01"
+ENCABEZADO_ARCHIVO_LECTURAS = struct.Struct("<8sQQQQ")  # firma, lecturas, series, inicio de lecturas, inicio del índice
+_ALINEACION = 64
+
+# Una entrada por serie (lecturas contiguas de un sensor en una zona, ordenadas por tiempo)
+DTYPE_INDICE_LECTURAS = np.dtype([
+    ("id_zona", "<i4"),
+    ("id_sensor", "<i8"),
+    ("inicio", "<u8"),
+    ("fin", "<u8"),
+    ("ts_min", "<i8"),
+    ("ts_max", "<i8"),
+])
+
+
+class ArchivoLecturas:
+    """
+    Archivo de lecturas sin comprimir, ordenado por (zona, sensor, tiempo),
+    que se lee mapeado en memoria (numpy.memmap) sin copiar los datos.
+
+    Las lecturas de una zona y las de un sensor son contiguas, por lo que las
+    consultas devuelven LoteLecturas que son vistas del archivo mapeado: el
+    sistema operativo carga solo las páginas que se recorren. Pensado para
+    análisis de historiales largos (ver AlmacenSeries.exportar_archivo).
+    """
+
+    def __init__(self, ruta: str):
+        """
+        Abre el archivo y mapea sus lecturas e índice (solo lectura).
+
+        Args:
+            ruta: Ruta del archivo.
+
+        Raises:
+            ValueError: Si el archivo no es un archivo de lecturas.
+        """
+        self._ruta = ruta
+        with open(ruta, "rb") as f:
+            encabezado = f.read(ENCABEZADO_ARCHIVO_LECTURAS.size)
+        firma, cantidad, series, inicio_lecturas, inicio_indice = ENCABEZADO_ARCHIVO_LECTURAS.unpack(encabezado)
+        if firma != FIRMA_ARCHIVO_LECTURAS:
+            raise ValueError(f"{ruta} no es un archivo de lecturas.")
+        self._datos = ArchivoLecturas._mapear(ruta, DTYPE_LECTURA, inicio_lecturas, cantidad)
+        self._indice = ArchivoLecturas._mapear(ruta, DTYPE_INDICE_LECTURAS, inicio_indice, series)
+
+    # -----------------------------------------------------------------------
+    # Escritura
+    # -----------------------------------------------------------------------
+    @classmethod
+    def escribir(cls, ruta: str, lecturas: Union[LoteLecturas, np.ndarray]) -> "ArchivoLecturas":
+        """
+        Ordena las lecturas por (zona, sensor, tiempo) y las escribe de forma atómica.
+
+        Args:
+            ruta: Ruta del archivo a crear.
+            lecturas: LoteLecturas o arreglo con dtype DTYPE_LECTURA.
+
+        Returns:
+            El archivo escrito, abierto y mapeado.
+        """
+        datos = lecturas.get_datos() if isinstance(lecturas, LoteLecturas) else lecturas
+        datos = datos[np.lexsort((datos["timestamp_ns"], datos["id_sensor"], datos["id_zona"]))]
+
+        inicios = np.ones(len(datos), dtype=bool)
+        inicios[1:] = ((datos["id_zona"][1:] != datos["id_zona"][:-1])
+                       | (datos["id_sensor"][1:] != datos["id_sensor"][:-1]))
+        primeros = np.flatnonzero(inicios)
+        fines = np.append(primeros[1:], len(datos))[:len(primeros)]
+        indice = np.empty(len(primeros), dtype=DTYPE_INDICE_LECTURAS)
+        indice["id_zona"] = datos["id_zona"][primeros]
+        indice["id_sensor"] = datos["id_sensor"][primeros]
+        indice["inicio"] = primeros
+        indice["fin"] = fines
+        indice["ts_min"] = datos["timestamp_ns"][primeros]
+        indice["ts_max"] = datos["timestamp_ns"][fines - 1]
+
+        inicio_lecturas = _ALINEACION
+        inicio_indice = _alinear(inicio_lecturas + datos.nbytes)
+
+        def escribir_contenido(f):
+            f.write(ENCABEZADO_ARCHIVO_LECTURAS.pack(
+                FIRMA_ARCHIVO_LECTURAS, len(datos), len(indice), inicio_lecturas, inicio_indice
+            ).ljust(inicio_lecturas, b"\0"))
+            datos.tofile(f)
+            f.write(b"\0" * (inicio_indice - inicio_lecturas - datos.nbytes))
+            indice.tofile(f)
+
+        escribir_atomico(ruta, escribir_contenido)
+        return cls(ruta)
+
+    # -----------------------------------------------------------------------
+    # Consultas (devuelven vistas del archivo mapeado)
+    # -----------------------------------------------------------------------
+    def get_ruta(self) -> str:
+        """Devuelve la ruta del archivo."""
+        return self._ruta
+
+    def get_lote(self) -> LoteLecturas:
+        """Devuelve todas las lecturas del archivo (vista)."""
+        return LoteLecturas(self._datos)
+
+    def get_indice(self) -> np.ndarray:
+        """Devuelve el índice de series (vista, dtype DTYPE_INDICE_LECTURAS)."""
+        return self._indice
+
+    def get_ids_zona(self) -> np.ndarray:
+        """Devuelve los ids de las zonas con lecturas en el archivo."""
+        return np.unique(self._indice["id_zona"])
+
+    def zona(self, id_zona: int) -> LoteLecturas:
+        """
+        Devuelve todas las lecturas de una zona, ordenadas por sensor y tiempo.
+
+        Returns:
+            LoteLecturas que es una vista del archivo (no copia).
+        """
+        desde, hasta = self._series_zona(id_zona)
+        if desde == hasta:
+            return LoteLecturas(self._datos[:0])
+        return LoteLecturas(self._datos[int(self._indice["inicio"][desde]):int(self._indice["fin"][hasta - 1])])
+
+    def sensor(self, id_sensor: int, desde_ns: Optional[int] = None, hasta_ns: Optional[int] = None,
+               id_zona: Optional[int] = None) -> LoteLecturas:
+        """
+        Devuelve las lecturas de un sensor con timestamp en [desde_ns, hasta_ns), ordenadas por tiempo.
+
+        Args:
+            id_sensor: Identificador del sensor.
+            desde_ns: Inicio del rango (None = sin límite).
+            hasta_ns: Fin del rango, exclusivo (None = sin límite).
+            id_zona: Zona del sensor (acelera la búsqueda; necesaria si el sensor cambió de zona).
+
+        Returns:
+            LoteLecturas que es una vista del archivo. Solo si el sensor tiene
+            lecturas en varias zonas y no se indica `id_zona`, el resultado es una copia.
+        """
+        if id_zona is not None:
+            desde, hasta = self._series_zona(id_zona)
+            series = desde + np.flatnonzero(self._indice["id_sensor"][desde:hasta] == id_sensor)
+        else:
+            series = np.flatnonzero(self._indice["id_sensor"] == id_sensor)
+        vistas = [self._vista_serie(serie, desde_ns, hasta_ns) for serie in series.tolist()]
+        if len(vistas) == 1:
+            return LoteLecturas(vistas[0])
+        if not vistas:
+            return LoteLecturas(self._datos[:0])
+        datos = np.concatenate(vistas)
+        return LoteLecturas(datos[np.argsort(datos["timestamp_ns"], kind="stable")])
+
+    def series_zona(self, id_zona: int, desde_ns: Optional[int] = None,
+                    hasta_ns: Optional[int] = None) -> Dict[int, LoteLecturas]:
+        """
+        Devuelve las lecturas de cada sensor de una zona en [desde_ns, hasta_ns).
+
+        Returns:
+            Diccionario id_sensor → LoteLecturas (vistas del archivo); se omiten los sensores sin lecturas en el rango.
+        """
+        desde, hasta = self._series_zona(id_zona)
+        resultado = {}
+        for serie in range(desde, hasta):
+            vista = self._vista_serie(serie, desde_ns, hasta_ns)
+            if len(vista):
+                resultado[int(self._indice["id_sensor"][serie])] = LoteLecturas(vista)
+        return resultado
+
+    def __len__(self) -> int:
+        """Devuelve la cantidad de lecturas del archivo."""
+        return len(self._datos)
+
+    # -----------------------------------------------------------------------
+    # Auxiliares
+    # -----------------------------------------------------------------------
+    def _series_zona(self, id_zona: int):
+        """Devuelve el rango [desde, hasta) de entradas del índice de una zona (búsqueda binaria)."""
+        zonas = self._indice["id_zona"]
+        return int(np.searchsorted(zonas, id_zona, "left")), int(np.searchsorted(zonas, id_zona, "right"))
+
+    def _vista_serie(self, serie: int, desde_ns: Optional[int], hasta_ns: Optional[int]) -> np.ndarray:
+        """Devuelve la vista de una serie recortada al rango de tiempo (búsqueda binaria sobre sus timestamps)."""
+        entrada = self._indice[serie]
+        inicio, fin = int(entrada["inicio"]), int(entrada["fin"])
+        if desde_ns is not None or hasta_ns is not None:
+            ts = self._datos["timestamp_ns"][inicio:fin]
+            if hasta_ns is not None:
+                fin = inicio + int(np.searchsorted(ts, hasta_ns, "left"))
+            if desde_ns is not None:
+                inicio += int(np.searchsorted(ts, desde_ns, "left"))
+        return self._datos[inicio:max(inicio, fin)]
+
+    @staticmethod
+    def _mapear(ruta: str, dtype: np.dtype, inicio: int, cantidad: int) -> np.ndarray:
+        """Mapea `cantidad` elementos del archivo a partir de `inicio` (solo lectura)."""
+        if cantidad == 0:
+            return np.empty(0, dtype=dtype)  # mmap no admite regiones vacías
+        return np.memmap(ruta, dtype=dtype, mode="r", offset=inicio, shape=(cantidad,))
+
+
+def _alinear(posicion: int) -> int:
+    """Redondea una posición hacia arriba al múltiplo de la alineación."""
+    return (posicion + _ALINEACION - 1) // _ALINEACION * _ALINEACION
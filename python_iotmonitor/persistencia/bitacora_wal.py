@@ -0,0 +1,194 @@
+import os
+import struct
+import threading
+import zlib
+from enum import IntEnum
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+# Encabezado del archivo: firma + generación del checkpoint al que sigue la bitácora
+FIRMA_WAL = b"IOTWAL01"
+ENCABEZADO_WAL = struct.Struct("<8sQ")
+
+# Encabezado de cada registro: CRC32 (de tipo + datos), largo de los datos, tipo
+ENCABEZADO_REGISTRO = struct.Struct("<IIB")
+
+
+class TipoRegistroWAL(IntEnum):
+    """Tipos de registro de la bitácora de la red de monitoreo."""
+    ALTA_ZONA = 1
+    BAJA_ZONA = 2
+    ALTA_SENSOR = 3
+    BAJA_SENSOR = 4
+    ESTADO_SENSOR = 5
+    USUARIOS_ZONA = 6
+    LECTURAS = 7          # flujo de lecturas del Observer (historial, no se reaplica)
+    VALORES_SENSORES = 8  # valores actuales de sensores de la red (se reaplican)
+
+
+class BitacoraWAL:
+    """
+    Bitácora de escritura anticipada (write-ahead log) de solo agregado.
+
+    Cada registro es un encabezado fijo (CRC32, largo, tipo) seguido de sus
+    datos. Las escrituras quedan en el buffer del archivo hasta `confirmar`,
+    que hace flush + fsync: el costo de guardar es proporcional a lo que
+    cambió, no al tamaño de la red. Al leer, un registro incompleto o con
+    CRC inválido marca el final de la bitácora (escritura cortada por una caída).
+    """
+
+    def __init__(self, ruta: str, generacion: int = 0):
+        """
+        Abre (o crea) la bitácora en modo agregado.
+
+        Si el archivo no existe o pertenece a otra generación, se crea vacío.
+        Si termina en un registro cortado, se trunca en el último registro válido.
+
+        Args:
+            ruta: Ruta del archivo de bitácora.
+            generacion: Generación del checkpoint al que sigue la bitácora.
+        """
+        self._ruta = ruta
+        self._lock = threading.Lock()
+        existente, fin_valido = BitacoraWAL._inspeccionar(ruta)
+        if existente != generacion:
+            self._archivo = BitacoraWAL._crear(ruta, generacion)
+        else:
+            self._archivo = open(ruta, "r+b")
+            self._archivo.truncate(fin_valido)
+            self._archivo.seek(fin_valido)
+        self._generacion = generacion
+        self._pendientes = 0
+
+    # -----------------------------------------------------------------------
+    # Escritura
+    # -----------------------------------------------------------------------
+    def agregar(self, tipo: TipoRegistroWAL, datos: bytes) -> None:
+        """
+        Agrega un registro al final de la bitácora (queda pendiente hasta `confirmar`).
+
+        Args:
+            tipo: Tipo de registro.
+            datos: Contenido del registro.
+        """
+        crc = zlib.crc32(datos, zlib.crc32(bytes((tipo,))))
+        encabezado = ENCABEZADO_REGISTRO.pack(crc, len(datos), tipo)
+        with self._lock:
+            self._archivo.write(encabezado)
+            self._archivo.write(datos)
+            self._pendientes += 1
+
+    def confirmar(self) -> int:
+        """
+        Hace durables los registros pendientes (flush + fsync).
+
+        Returns:
+            Cantidad de registros confirmados.
+        """
+        with self._lock:
+            confirmados, self._pendientes = self._pendientes, 0
+            if confirmados:
+                self._archivo.flush()
+                os.fsync(self._archivo.fileno())
+            return confirmados
+
+    def reiniciar(self, generacion: int) -> None:
+        """
+        Descarta el contenido y comienza una bitácora vacía para una nueva generación
+        (se llama después de escribir el checkpoint que la reemplaza).
+        """
+        with self._lock:
+            self._archivo.close()
+            self._archivo = BitacoraWAL._crear(self._ruta, generacion)
+            self._generacion = generacion
+            self._pendientes = 0
+
+    def cerrar(self) -> None:
+        """Confirma los registros pendientes y cierra el archivo."""
+        self.confirmar()
+        with self._lock:
+            self._archivo.close()
+
+    # -----------------------------------------------------------------------
+    # Consulta
+    # -----------------------------------------------------------------------
+    def get_generacion(self) -> int:
+        """Devuelve la generación del checkpoint al que sigue la bitácora."""
+        return self._generacion
+
+    def get_tamano(self) -> int:
+        """Devuelve el tamaño actual de la bitácora en bytes (incluye lo pendiente)."""
+        with self._lock:
+            return self._archivo.tell()
+
+    @staticmethod
+    def leer(ruta: str) -> Tuple[Optional[int], Iterator[Tuple[TipoRegistroWAL, bytes]]]:
+        """
+        Lee una bitácora del disco.
+
+        Args:
+            ruta: Ruta del archivo de bitácora.
+
+        Returns:
+            Tupla (generación, iterador de (tipo, datos)). La generación es None
+            si el archivo no existe o no es una bitácora válida.
+        """
+        try:
+            with open(ruta, "rb") as f:
+                contenido = f.read()
+        except FileNotFoundError:
+            return None, iter(())
+        if len(contenido) < ENCABEZADO_WAL.size:
+            return None, iter(())
+        firma, generacion = ENCABEZADO_WAL.unpack_from(contenido)
+        if firma != FIRMA_WAL:
+            return None, iter(())
+        return generacion, (
+            (TipoRegistroWAL(tipo), datos) for tipo, datos, _ in BitacoraWAL._registros(contenido)
+        )
+
+    # -----------------------------------------------------------------------
+    # Auxiliares
+    # -----------------------------------------------------------------------
+    @staticmethod
+    def _registros(contenido: bytes) -> Iterator[Tuple[int, bytes, int]]:
+        """Recorre los registros válidos; devuelve (tipo, datos, posición final del registro)."""
+        vista = memoryview(contenido)
+        posicion = ENCABEZADO_WAL.size
+        while posicion + ENCABEZADO_REGISTRO.size <= len(contenido):
+            crc, largo, tipo = ENCABEZADO_REGISTRO.unpack_from(contenido, posicion)
+            inicio = posicion + ENCABEZADO_REGISTRO.size
+            fin = inicio + largo
+            if fin > len(contenido):
+                return  # registro cortado
+            datos = bytes(vista[inicio:fin])
+            if zlib.crc32(datos, zlib.crc32(bytes((tipo,)))) != crc or tipo not in TipoRegistroWAL._value2member_map_:
+                return  # registro dañado: fin de la parte confiable
+            yield tipo, datos, fin
+            posicion = fin
+
+    @staticmethod
+    def _inspeccionar(ruta: str) -> Tuple[Optional[int], int]:
+        """Devuelve la generación de una bitácora existente y dónde termina su último registro válido."""
+        try:
+            with open(ruta, "rb") as f:
+                contenido = f.read()
+        except FileNotFoundError:
+            return None, 0
+        if len(contenido) < ENCABEZADO_WAL.size:
+            return None, 0
+        firma, generacion = ENCABEZADO_WAL.unpack_from(contenido)
+        if firma != FIRMA_WAL:
+            return None, 0
+        fin = ENCABEZADO_WAL.size
+        for _, _, fin in BitacoraWAL._registros(contenido):
+            pass
+        return generacion, fin
+
+    @staticmethod
+    def _crear(ruta: str, generacion: int) -> BinaryIO:
+        """Crea una bitácora vacía y deja durable su encabezado."""
+        archivo = open(ruta, "w+b")
+        archivo.write(ENCABEZADO_WAL.pack(FIRMA_WAL, generacion))
+        archivo.flush()
+        os.fsync(archivo.fileno())
+        return archivo
@@ -0,0 +1,943 @@
+import gc
+import io
+import pickle
+import struct
+import zlib
+from datetime import datetime, timedelta, timezone
+from contextlib import contextmanager
+from enum import IntEnum
+from functools import lru_cache
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from python_iotmonitor.entidades.sensores.sensor import Sensor, reservar_id_sensor
+from python_iotmonitor.entidades.sensores.sensor_store import SensorStore
+from python_iotmonitor.entidades.sensores.sensor_temperatura import SensorTemperatura
+from python_iotmonitor.entidades.sensores.sensor_humedad import SensorHumedad
+from python_iotmonitor.entidades.sensores.sensor_co2 import SensorCO2
+from python_iotmonitor.entidades.sensores.sensor_luz import SensorLuz
+from python_iotmonitor.entidades.sensores.tipo_sensor import TipoSensor
+from python_iotmonitor.entidades.usuarios.credencial_acceso import CredencialAcceso
+from python_iotmonitor.entidades.usuarios.dispositivo_asignado import DispositivoAsignado
+from python_iotmonitor.entidades.usuarios.tarea_usuario import TareaUsuario
+from python_iotmonitor.entidades.usuarios.usuario import Usuario
+from python_iotmonitor.entidades.zonas.red_monitoreo import RedMonitoreo
+from python_iotmonitor.entidades.zonas.registro_ambiental import RegistroAmbiental
+from python_iotmonitor.entidades.zonas.zona import Zona
+from python_iotmonitor.excepciones.persistencia_exception import ErrorFormatoBinario
+from python_iotmonitor.constantes import CODEC_ZONAS_POR_BLOQUE
+
+# Formato: encabezado | bloques (tabla de tipos, textos, filas) | bloque FIN.
+# Cada bloque lleva su clase, el código de tipo de sus filas, la cantidad de
+# filas, el largo y un CRC32 del contenido.
+FIRMA_CODEC = b"IOTENT01"
+VERSION_ESQUEMA = 1
+ENCABEZADO_CODEC = struct.Struct("<8sH")  # firma, versión del esquema
+BLOQUE_CODEC = struct.Struct("<BHIQI")  # clase de bloque, código de tipo, filas, bytes, CRC32
+_TEXTO_CORTO = struct.Struct("<H")
+_TIPO = struct.Struct("<HH")  # código, cantidad de campos
+
+SIN_TEXTO = 0xFFFFFFFF  # índice de texto que representa None
+SIN_FECHA = np.iinfo(np.int64).min
+_EPOCA = datetime(1970, 1, 1)
+_MICROSEGUNDO = timedelta(microseconds=1)
+
+# Formatos de campo → dtype de la columna (los textos son índices a la tabla de textos
+# y las fechas, microsegundos desde 1970 de la hora local sin zona horaria)
+_FORMATOS: Dict[str, str] = {
+    "i8": "<i8", "i4": "<i4", "u4": "<u4", "u1": "u1", "f8": "<f8", "bool": "?",
+    "texto": "<u4", "fecha": "<i8",
+}
+
+# Campo del esquema: (nombre, formato, valor por omisión si el archivo no lo trae)
+Campo = Tuple[str, str, object]
+
+
+class ClaseBloque(IntEnum):
+    """Clases de bloque del archivo."""
+
+    TIPOS = 1
+    TEXTOS = 2
+    FILAS = 3
+    FIN = 4
+
+
+# ---------------------------------------------------------------------------
+# Esquema (versión VERSION_ESQUEMA)
+# ---------------------------------------------------------------------------
+# Las relaciones se guardan como posiciones: "zona" es la posición de la zona en
+# el archivo y "usuario" la del usuario (un usuario compartido se guarda una vez).
+ESQUEMA_RED: Tuple[Campo, ...] = (
+    ("id_red", "i8", 0),
+    ("ubicacion", "texto", ""),
+    ("descripcion", "texto", ""),
+    ("total_sensores", "i8", 0),
+    ("total_zonas", "i8", 0),
+    ("zona_principal", "i4", -1),
+)
+ESQUEMA_ZONA: Tuple[Campo, ...] = (
+    ("id_zona", "i8", 0),
+    ("nombre", "texto", ""),
+    ("tipo", "texto", None),
+    ("alertas_activas", "i8", 0),
+    ("en_red", "bool", True),  # False: zona referenciada (principal o del registro) que no está en la red
+)
+ESQUEMA_USUARIO: Tuple[Campo, ...] = (
+    ("id_usuario", "i8", 0),
+    ("nombre", "texto", ""),
+    ("rol", "texto", ""),
+    ("credencial_activa", "bool", True),
+    ("credencial_emision", "fecha", None),
+    ("credencial_observaciones", "texto", ""),
+)
+ESQUEMA_TAREA: Tuple[Campo, ...] = (
+    ("usuario", "u4", 0),
+    ("id_tarea", "i8", 0),
+    ("descripcion", "texto", ""),
+    ("fecha_asignada", "fecha", None),
+    ("completada", "bool", False),
+    ("id_dispositivo", "i8", 0),
+    ("nombre_dispositivo", "texto", ""),
+    ("dispositivo_verificado", "bool", True),
+)
+ESQUEMA_ZONA_USUARIO: Tuple[Campo, ...] = (
+    ("zona", "u4", 0),
+    ("usuario", "u4", 0),
+)
+ESQUEMA_REGISTRO: Tuple[Campo, ...] = (
+    ("id_instalacion", "i8", 0),
+    ("zona", "i4", -1),
+    ("responsable", "texto", ""),
+    ("prioridad", "i8", 0),
+)
+# Campos comunes a todos los sensores (incluido su estado en el SensorStore)
+ESQUEMA_SENSOR: Tuple[Campo, ...] = (
+    ("zona", "u4", 0),
+    ("posicion", "u4", 0),  # orden de alta dentro de la zona
+    ("id_sensor", "i8", 0),
+    ("codigo_tipo", "u1", 0),
+    ("unidad", "texto", ""),
+    ("valor", "f8", float("nan")),
+    ("rango_min", "f8", float("nan")),
+    ("rango_max", "f8", float("nan")),
+    ("activo", "bool", True),
+    ("calibrado", "bool", False),
+    ("version", "i8", 0),
+)
+_COLUMNAS_STORE = ("valor", "rango_min", "rango_max", "activo", "calibrado", "version")
+
+_ESQUEMAS_ENTIDADES: Dict[str, Tuple[Campo, ...]] = {
+    "RedMonitoreo": ESQUEMA_RED,
+    "Zona": ESQUEMA_ZONA,
+    "Usuario": ESQUEMA_USUARIO,
+    "TareaUsuario": ESQUEMA_TAREA,
+    "ZonaUsuario": ESQUEMA_ZONA_USUARIO,
+    "RegistroAmbiental": ESQUEMA_REGISTRO,
+}
+
+# Clases de sensor por nombre estable (el archivo guarda el nombre, no el módulo:
+# mover una clase no invalida los archivos) y sus atributos propios
+ESQUEMAS_SENSORES: Dict[str, Tuple[type, Tuple[Campo, ...]]] = {}
+_NOMBRES_SENSORES: Dict[type, str] = {}
+
+
+def registrar_esquema_sensor(nombre: str, clase: type, campos: Sequence[Campo]) -> None:
+    """
+    Registra una clase de sensor en el codec.
+
+    Args:
+        nombre: Nombre estable con el que la clase figura en los archivos.
+        clase: Subclase concreta de Sensor.
+        campos: Atributos propios de la clase como (atributo, formato, valor por omisión).
+    """
+    for _, formato, _ in campos:
+        if formato not in _FORMATOS:
+            raise ValueError(f"Formato de campo desconocido: {formato}")
+    ESQUEMAS_SENSORES[nombre] = (clase, tuple(campos))
+    _NOMBRES_SENSORES[clase] = nombre
+
+
+def nombre_esquema_sensor(clase: type) -> str:
+    """
+    Devuelve el nombre estable con que una clase de sensor figura en los archivos.
+
+    Raises:
+        ValueError: Si la clase no está registrada en el codec.
+    """
+    nombre = _NOMBRES_SENSORES.get(clase)
+    if nombre is None:
+        raise ValueError(f"La clase de sensor {clase.__name__} no está registrada en el codec binario.")
+    return nombre
+
+
+registrar_esquema_sensor("SensorTemperatura", SensorTemperatura, (
+    ("_modelo", "texto", ""), ("_lecturas_acumuladas", "f8", 0.0), ("_cantidad_lecturas", "i8", 0),
+))
+registrar_esquema_sensor("SensorHumedad", SensorHumedad, (
+    ("_modelo", "texto", ""), ("_requiere_calibracion", "bool", True),
+))
+registrar_esquema_sensor("SensorCO2", SensorCO2, (
+    ("_modelo", "texto", ""), ("_nivel_alarma", "f8", 1200.0), ("_alertas_activadas", "i8", 0),
+))
+registrar_esquema_sensor("SensorLuz", SensorLuz, (
+    ("_es_interior", "bool", True), ("_requiere_calibracion", "bool", False),
+))
+
+
+def _dtype(campos: Iterable[Tuple[str, str]]) -> np.dtype:
+    """Devuelve el dtype (empaquetado, sin relleno) de las filas con los campos indicados."""
+    return np.dtype([(nombre, _FORMATOS[formato]) for nombre, formato in campos])
+
+
+def _a_microsegundos(fecha: Optional[datetime]) -> int:
+    """Convierte una fecha a microsegundos desde 1970 (las fechas con zona horaria se pasan a UTC)."""
+    if fecha is None:
+        return SIN_FECHA
+    if fecha.tzinfo is not None:
+        fecha = fecha.astimezone(timezone.utc).replace(tzinfo=None)
+    return (fecha - _EPOCA) // _MICROSEGUNDO
+
+
+def _desde_microsegundos(microsegundos: int) -> Optional[datetime]:
+    """Inversa de _a_microsegundos."""
+    return None if microsegundos == SIN_FECHA else _EPOCA + timedelta(microseconds=microsegundos)
+
+
+# ---------------------------------------------------------------------------
+# Codificación
+# ---------------------------------------------------------------------------
+class CodificadorRed:
+    """
+    Escribe una red de monitoreo (o un RegistroAmbiental con su red) en el
+    formato binario versionado del codec.
+
+    El archivo empieza con una tabla de tipos (nombre de cada entidad o clase
+    de sensor con sus campos y formatos) y sigue con bloques de filas de
+    ancho fijo (arreglos estructurados de NumPy) y bloques con los textos
+    nuevos que esas filas referencian. Las zonas se escriben en grupos de
+    `zonas_por_bloque`, cada uno con sus sensores (agrupados por clase) y
+    usuarios, por lo que ni la escritura ni la lectura necesitan tener todo el
+    archivo en memoria.
+    """
+
+    def __init__(self, archivo: BinaryIO, zonas_por_bloque: int = CODEC_ZONAS_POR_BLOQUE):
+        """
+        Args:
+            archivo: Archivo binario abierto para escritura.
+            zonas_por_bloque: Zonas por grupo de bloques.
+        """
+        self._archivo = archivo
+        self._zonas_por_bloque = max(1, zonas_por_bloque)
+        self._textos: Dict[str, int] = {}
+        self._textos_nuevos: List[str] = []
+        self._filas_pendientes: List[Tuple[int, np.ndarray]] = []
+        self._tipos: Dict[str, Tuple[int, np.dtype]] = {}
+        self._usuarios: Dict[int, int] = {}  # id(usuario) → posición en el archivo
+
+    def escribir(self, raiz: Union[RedMonitoreo, RegistroAmbiental]) -> None:
+        """
+        Escribe la red (o el registro y su red) completa.
+
+        Raises:
+            ValueError: Si la red contiene una clase de sensor no registrada en el codec.
+        """
+        registro = raiz if isinstance(raiz, RegistroAmbiental) else None
+        red = registro.get_red() if registro is not None else raiz
+        zonas = red.get_zonas()
+        en_red = len(zonas)
+        posiciones = {id(zona): posicion for posicion, zona in enumerate(zonas)}
+        for referenciada in (red.get_zona_principal(), registro.get_zona() if registro is not None else None):
+            if referenciada is not None and id(referenciada) not in posiciones:
+                posiciones[id(referenciada)] = len(zonas)
+                zonas.append(referenciada)
+
+        self._archivo.write(ENCABEZADO_CODEC.pack(FIRMA_CODEC, VERSION_ESQUEMA))
+        self._escribir_tabla_tipos()
+        principal = red.get_zona_principal()
+        self._agregar_filas("RedMonitoreo", 1, {
+            "id_red": [red.get_id()],
+            "ubicacion": self._columna_textos([red.get_ubicacion()]),
+            "descripcion": self._columna_textos([red.get_descripcion()]),
+            "total_sensores": [red.get_total_sensores()],
+            "total_zonas": [red.get_total_zonas()],
+            "zona_principal": [posiciones[id(principal)] if principal is not None else -1],
+        })
+        self._vaciar()
+        for inicio in range(0, len(zonas), self._zonas_por_bloque):
+            self._escribir_grupo(zonas[inicio:inicio + self._zonas_por_bloque], inicio, en_red)
+        if registro is not None:
+            zona = registro.get_zona()
+            self._agregar_filas("RegistroAmbiental", 1, {
+                "id_instalacion": [registro.get_id()],
+                "zona": [posiciones[id(zona)] if zona is not None else -1],
+                "responsable": self._columna_textos([registro.get_responsable()]),
+                "prioridad": [registro.get_prioridad()],
+            })
+            self._vaciar()
+        self._escribir_bloque(ClaseBloque.FIN, 0, 0, b"")
+
+    def escribir_zona(self, zona: Zona) -> None:
+        """
+        Escribe una zona sola, con sus sensores y usuarios pero sin la red: un
+        registro autocontenido que se lee con DecodificadorRed.leer_zona. La
+        tabla de tipos incluye solo los tipos que la zona usa.
+
+        Raises:
+            ValueError: Si la zona contiene una clase de sensor no registrada en el codec.
+        """
+        nombres = ["Zona"]
+        if zona.get_usuarios():
+            nombres += ["Usuario", "TareaUsuario", "ZonaUsuario"]
+        for clase in dict.fromkeys(type(sensor) for sensor in zona.get_sensores_internal()):
+            nombres.append(nombre_esquema_sensor(clase))
+        self._archivo.write(ENCABEZADO_CODEC.pack(FIRMA_CODEC, VERSION_ESQUEMA))
+        self._escribir_tabla_tipos(nombres)
+        self._escribir_grupo([zona], 0, 0)
+        self._escribir_bloque(ClaseBloque.FIN, 0, 0, b"")
+
+    # -----------------------------------------------------------------------
+    # Grupos de zonas
+    # -----------------------------------------------------------------------
+    def _escribir_grupo(self, zonas: List[Zona], inicio: int, en_red: int) -> None:
+        """Escribe un grupo de zonas: usuarios nuevos, zonas, sensores por clase y asignaciones de usuarios."""
+        self._agregar_usuarios(zonas)
+        self._agregar_filas("Zona", len(zonas), {
+            "id_zona": [zona.get_id_zona() for zona in zonas],
+            "nombre": self._columna_textos(zona.get_nombre() for zona in zonas),
+            "tipo": self._columna_textos(zona.get_tipo() for zona in zonas),
+            "alertas_activas": [zona.get_alertas_activas() for zona in zonas],
+            "en_red": np.arange(inicio, inicio + len(zonas)) < en_red,
+        })
+
+        por_clase: Dict[type, Tuple[List[int], List[int], List[Sensor]]] = {}
+        for posicion_zona, zona in enumerate(zonas, inicio):
+            for posicion, sensor in enumerate(zona.get_sensores_internal()):
+                grupo = por_clase.get(type(sensor))
+                if grupo is None:
+                    grupo = por_clase[type(sensor)] = ([], [], [])
+                grupo[0].append(posicion_zona)
+                grupo[1].append(posicion)
+                grupo[2].append(sensor)
+        for clase, (posiciones_zona, posiciones, sensores) in por_clase.items():
+            self._agregar_sensores(clase, posiciones_zona, posiciones, sensores)
+
+        asignaciones = [
+            (posicion_zona, self._usuarios[id(usuario)])
+            for posicion_zona, zona in enumerate(zonas, inicio)
+            for usuario in zona.get_usuarios()
+        ]
+        if asignaciones:
+            posiciones_zona, usuarios = zip(*asignaciones)
+            self._agregar_filas("ZonaUsuario", len(asignaciones), {"zona": posiciones_zona, "usuario": usuarios})
+        self._vaciar()
+
+    def _agregar_sensores(self, clase: type, posiciones_zona: List[int], posiciones: List[int],
+                          sensores: List[Sensor]) -> None:
+        """Agrega las filas de los sensores de una clase (el estado se lee del SensorStore por columnas)."""
+        nombre = nombre_esquema_sensor(clase)
+        filas_store = np.fromiter((sensor.get_indice_store() for sensor in sensores), dtype=np.intp,
+                                  count=len(sensores))
+        store = SensorStore.get_instance()
+        columnas = {
+            "zona": posiciones_zona,
+            "posicion": posiciones,
+            "id_sensor": [sensor.get_id() for sensor in sensores],
+            "codigo_tipo": [sensor.get_codigo_tipo() for sensor in sensores],
+            "unidad": self._columna_textos(sensor.get_unidad() for sensor in sensores),
+        }
+        for columna in _COLUMNAS_STORE:
+            columnas[columna] = store.columna(columna, filas_store)
+        for atributo, formato, omision in ESQUEMAS_SENSORES[nombre][1]:
+            columnas[atributo] = self._columna(formato, [sensor.__dict__.get(atributo, omision) for sensor in sensores])
+        self._agregar_filas(nombre, len(sensores), columnas)
+
+    def _agregar_usuarios(self, zonas: List[Zona]) -> None:
+        """Agrega los usuarios de las zonas que todavía no se escribieron, con sus tareas."""
+        nuevos: List[Usuario] = []
+        for zona in zonas:
+            for usuario in zona.get_usuarios():
+                if id(usuario) not in self._usuarios:
+                    self._usuarios[id(usuario)] = len(self._usuarios)
+                    nuevos.append(usuario)
+        if not nuevos:
+            return
+        credenciales = [usuario.get_credencial() for usuario in nuevos]
+        self._agregar_filas("Usuario", len(nuevos), {
+            "id_usuario": [usuario.get_id() for usuario in nuevos],
+            "nombre": self._columna_textos(usuario.get_nombre() for usuario in nuevos),
+            "rol": self._columna_textos(usuario.get_rol() for usuario in nuevos),
+            "credencial_activa": [credencial.esta_activa() for credencial in credenciales],
+            "credencial_emision": [_a_microsegundos(credencial.get_fecha_emision()) for credencial in credenciales],
+            "credencial_observaciones": self._columna_textos(c.get_observaciones() for c in credenciales),
+        })
+        tareas = [(self._usuarios[id(usuario)], tarea) for usuario in nuevos for tarea in usuario.get_tareas()]
+        if tareas:
+            dispositivos = [tarea.get_dispositivo() for _, tarea in tareas]
+            self._agregar_filas("TareaUsuario", len(tareas), {
+                "usuario": [posicion for posicion, _ in tareas],
+                "id_tarea": [tarea.get_id() for _, tarea in tareas],
+                "descripcion": self._columna_textos(tarea.get_descripcion() for _, tarea in tareas),
+                "fecha_asignada": [_a_microsegundos(tarea.get_fecha_asignada()) for _, tarea in tareas],
+                "completada": [tarea.esta_completada() for _, tarea in tareas],
+                "id_dispositivo": [dispositivo.get_id() for dispositivo in dispositivos],
+                "nombre_dispositivo": self._columna_textos(d.get_nombre() for d in dispositivos),
+                "dispositivo_verificado": [dispositivo.esta_verificado() for dispositivo in dispositivos],
+            })
+
+    # -----------------------------------------------------------------------
+    # Bloques
+    # -----------------------------------------------------------------------
+    def _escribir_tabla_tipos(self, nombres: Optional[Sequence[str]] = None) -> None:
+        """
+        Escribe la tabla de tipos: las entidades y todas las clases de sensor
+        registradas, o solo los tipos indicados en `nombres`.
+        """
+        esquemas = dict(_ESQUEMAS_ENTIDADES)
+        for nombre, (_, campos) in ESQUEMAS_SENSORES.items():
+            esquemas[nombre] = ESQUEMA_SENSOR + campos
+        if nombres is not None:
+            esquemas = {nombre: esquemas[nombre] for nombre in nombres}
+        partes = [struct.pack("<H", len(esquemas))]
+        for codigo, (nombre, campos) in enumerate(esquemas.items()):
+            self._tipos[nombre] = (codigo, _dtype((campo, formato) for campo, formato, _ in campos))
+            partes.append(_TIPO.pack(codigo, len(campos)))
+            partes.append(_texto_corto(nombre))
+            for campo, formato, _ in campos:
+                partes.append(_texto_corto(campo))
+                partes.append(_texto_corto(formato))
+        self._escribir_bloque(ClaseBloque.TIPOS, 0, len(esquemas), b"".join(partes))
+
+    def _agregar_filas(self, tipo: str, cantidad: int, columnas: Dict[str, object]) -> None:
+        """Arma las filas de un tipo a partir de sus columnas y las deja pendientes de escritura."""
+        codigo, dtype = self._tipos[tipo]
+        filas = np.empty(cantidad, dtype=dtype)
+        for campo in dtype.names:
+            filas[campo] = columnas[campo]
+        self._filas_pendientes.append((codigo, filas))
+
+    def _vaciar(self) -> None:
+        """Escribe los textos nuevos y luego las filas pendientes (que los referencian)."""
+        if self._textos_nuevos:
+            codificados = [texto.encode("utf-8") for texto in self._textos_nuevos]
+            largos = np.fromiter(map(len, codificados), dtype="<u4", count=len(codificados))
+            self._escribir_bloque(ClaseBloque.TEXTOS, 0, len(codificados), largos.tobytes() + b"".join(codificados))
+            self._textos_nuevos = []
+        for codigo, filas in self._filas_pendientes:
+            self._escribir_bloque(ClaseBloque.FILAS, codigo, len(filas), filas.tobytes())
+        self._filas_pendientes = []
+
+    def _escribir_bloque(self, clase: ClaseBloque, codigo: int, cantidad: int, datos: bytes) -> None:
+        """Escribe un bloque con su encabezado y CRC32."""
+        self._archivo.write(BLOQUE_CODEC.pack(clase, codigo, cantidad, len(datos), zlib.crc32(datos)))
+        self._archivo.write(datos)
+
+    # -----------------------------------------------------------------------
+    # Columnas
+    # -----------------------------------------------------------------------
+    def _columna(self, formato: str, valores: List[object]):
+        """Convierte los valores de un atributo al formato de su columna."""
+        if formato == "texto":
+            return self._columna_textos(valores)
+        if formato == "fecha":
+            return [_a_microsegundos(valor) for valor in valores]
+        return valores
+
+    def _columna_textos(self, textos: Iterable[Optional[str]]) -> np.ndarray:
+        """Devuelve los índices de los textos en la tabla, agregando los nuevos."""
+        return np.fromiter(map(self._indice_texto, textos), dtype="<u4")
+
+    def _indice_texto(self, texto: Optional[str]) -> int:
+        """Devuelve el índice de un texto en la tabla (SIN_TEXTO para None)."""
+        if texto is None:
+            return SIN_TEXTO
+        indice = self._textos.get(texto)
+        if indice is None:
+            indice = self._textos[texto] = len(self._textos)
+            self._textos_nuevos.append(texto)
+        return indice
+
+
+def _texto_corto(texto: str) -> bytes:
+    """Codifica un texto corto de la tabla de tipos (largo de 2 bytes + UTF-8)."""
+    datos = texto.encode("utf-8")
+    return _TEXTO_CORTO.pack(len(datos)) + datos
+
+
+# ---------------------------------------------------------------------------
+# Decodificación
+# ---------------------------------------------------------------------------
+class DecodificadorRed:
+    """
+    Lee un archivo escrito por CodificadorRed, bloque a bloque.
+
+    Los campos se buscan por nombre en la tabla de tipos del archivo: los que
+    el archivo no trae (versiones anteriores del esquema) toman su valor por
+    omisión y los que ya no existen se ignoran. Los sensores se reconstruyen
+    por clase con una reserva masiva de filas en el SensorStore, y cada grupo
+    de zonas se completa de una vez (índices y alertas con
+    Zona.cargar_sensores_zonas), sin pasar por __setstate__.
+    """
+
+    def __init__(self, archivo: BinaryIO, red: Optional[RedMonitoreo] = None):
+        """
+        Abre el archivo y valida el encabezado.
+
+        Args:
+            archivo: Archivo binario abierto para lectura.
+            red: Red a la que pertenecen las zonas de un registro escrito con
+                CodificadorRed.escribir_zona (esos registros no traen la red).
+
+        Raises:
+            ErrorFormatoBinario: Si el archivo no tiene el formato o su versión es posterior a la soportada.
+            EOFError: Si el archivo está cortado.
+        """
+        self._archivo = archivo
+        firma, version = ENCABEZADO_CODEC.unpack(self._leer_exacto(ENCABEZADO_CODEC.size))
+        if firma != FIRMA_CODEC:
+            raise ErrorFormatoBinario("El archivo no tiene el formato binario de la red de monitoreo.")
+        if version > VERSION_ESQUEMA:
+            raise ErrorFormatoBinario(f"Versión de esquema {version} no soportada (máxima: {VERSION_ESQUEMA}).")
+        self._version = version
+        self._tipos: Dict[int, Tuple[str, np.dtype]] = {}
+        self._textos: List[Optional[str]] = []
+        self._tabla_textos: Optional[np.ndarray] = None
+        self._red = red
+        self._zona_principal = -1
+        self._registro: Optional[RegistroAmbiental] = None
+        self._zonas: List[Zona] = []
+        self._en_red: List[bool] = []
+        self._usuarios: List[Usuario] = []
+        self._primera_pendiente = 0  # primera zona del grupo en curso
+        self._sensores_pendientes: List[Tuple[np.ndarray, np.ndarray, List[Sensor]]] = []
+        self._terminado = False
+
+    def get_version(self) -> int:
+        """Devuelve la versión del esquema con que se escribió el archivo."""
+        return self._version
+
+    def get_red(self) -> Optional[RedMonitoreo]:
+        """Devuelve la red leída hasta el momento (None antes de leer su bloque)."""
+        return self._red
+
+    def leer(self) -> Union[RedMonitoreo, RegistroAmbiental]:
+        """
+        Lee el archivo completo.
+
+        Returns:
+            La red, o el RegistroAmbiental si el archivo se escribió a partir de uno.
+        """
+        with _recolector_pausado():
+            for _ in self.iterar_zonas():
+                pass
+        return self._registro if self._registro is not None else self._red
+
+    def leer_zona(self) -> Zona:
+        """
+        Lee un registro escrito con CodificadorRed.escribir_zona. La zona queda
+        vinculada a la red del decodificador, pero no se agrega a ella.
+
+        Raises:
+            ErrorFormatoBinario: Si el registro no contiene exactamente una zona.
+        """
+        with _recolector_pausado():
+            zonas = list(self.iterar_zonas())
+        if len(zonas) != 1:
+            raise ErrorFormatoBinario(f"El registro contiene {len(zonas)} zonas (se esperaba una).")
+        return zonas[0]
+
+    def iterar_zonas(self) -> Iterator[Zona]:
+        """
+        Lee el archivo y devuelve cada zona a medida que queda completa (con sus
+        sensores, alertas y usuarios), sin esperar al resto del archivo.
+
+        Raises:
+            EOFError: Si el archivo está cortado.
+            ErrorFormatoBinario: Si un bloque está dañado o referencia datos inexistentes.
+        """
+        while not self._terminado:
+            with _recolector_pausado(), _errores_de_formato():
+                completas = self._procesar_bloque()
+            yield from completas
+
+    def _procesar_bloque(self) -> List[Zona]:
+        """Lee y aplica el siguiente bloque; devuelve las zonas que quedaron completas."""
+        clase, codigo, cantidad, datos = self._leer_bloque()
+        if clase == ClaseBloque.TIPOS:
+            self._leer_tipos(cantidad, datos)
+        elif clase == ClaseBloque.TEXTOS:
+            self._leer_textos(cantidad, datos)
+        elif clase == ClaseBloque.FILAS:
+            tipo, dtype = self._tipo(codigo)
+            filas = np.frombuffer(datos, dtype=dtype, count=cantidad)
+            if tipo == "Zona":
+                completas = self._completar_grupo()
+                self._cargar_zonas(filas)
+                return completas
+            if tipo in ESQUEMAS_SENSORES:
+                self._cargar_sensores(tipo, filas)
+            else:
+                self._cargadores[tipo](self, filas)
+        elif clase == ClaseBloque.FIN:
+            completas = self._completar_grupo()
+            self._terminar()
+            return completas
+        else:
+            raise ErrorFormatoBinario(f"Clase de bloque desconocida: {clase}")
+        return []
+
+    # -----------------------------------------------------------------------
+    # Entidades
+    # -----------------------------------------------------------------------
+    def _cargar_red(self, filas: np.ndarray) -> None:
+        """Crea la red (sus zonas se agregan a medida que se leen)."""
+        fila = _Filas(self, filas)
+        red = RedMonitoreo(int(fila.numeros("id_red", 0)[0]), fila.textos("ubicacion", "")[0],
+                           fila.textos("descripcion", "")[0])
+        red._total_sensores = int(fila.numeros("total_sensores", 0)[0])
+        red._total_zonas = int(fila.numeros("total_zonas", 0)[0])
+        self._zona_principal = int(fila.numeros("zona_principal", -1)[0])
+        self._red = red
+
+    def _cargar_zonas(self, filas: np.ndarray) -> None:
+        """Crea las zonas de un grupo; se completan al terminar el grupo."""
+        if self._red is None:
+            raise ErrorFormatoBinario("Zonas sin red en el archivo.")
+        columnas = _Filas(self, filas)
+        for id_zona, nombre, tipo, alertas, en_red in zip(
+                columnas.numeros("id_zona", 0).tolist(), columnas.textos("nombre", ""), columnas.textos("tipo", None),
+                columnas.numeros("alertas_activas", 0).tolist(), columnas.numeros("en_red", True).tolist()):
+            zona = Zona(id_zona, nombre, self._red, tipo)
+            zona._alertas_activas = alertas
+            self._zonas.append(zona)
+            self._en_red.append(en_red)
+
+    def _cargar_sensores(self, tipo: str, filas: np.ndarray) -> None:
+        """Crea los sensores de una clase: reserva sus filas del SensorStore de una vez y arma los objetos."""
+        clase, campos = ESQUEMAS_SENSORES[tipo]
+        columnas = _Filas(self, filas)
+        posiciones_zona = columnas.numeros("zona", 0).astype(np.intp)
+        if len(filas) and (posiciones_zona.min() < self._primera_pendiente or posiciones_zona.max() >= len(self._zonas)):
+            raise ErrorFormatoBinario("Sensores que referencian zonas fuera del grupo en curso.")
+        sensores = crear_sensores(
+            clase, columnas.numeros("id_sensor", 0), columnas.numeros("codigo_tipo", 0), columnas.textos("unidad", ""),
+            {columna: columnas.numeros(columna, omision)
+             for columna, _, omision in ESQUEMA_SENSOR if columna in _COLUMNAS_STORE},
+            {atributo: columnas.columna(atributo, formato, omision) for atributo, formato, omision in campos},
+        )
+        self._sensores_pendientes.append((posiciones_zona, columnas.numeros("posicion", 0), sensores))
+
+    def _cargar_usuarios(self, filas: np.ndarray) -> None:
+        """Crea los usuarios (sus tareas llegan en el bloque siguiente)."""
+        columnas = _Filas(self, filas)
+        for id_usuario, nombre, rol, activa, emision, observaciones in zip(
+                columnas.numeros("id_usuario", 0).tolist(), columnas.textos("nombre", ""),
+                columnas.textos("rol", ""), columnas.numeros("credencial_activa", True).tolist(),
+                columnas.columna("credencial_emision", "fecha", None),
+                columnas.textos("credencial_observaciones", "")):
+            usuario = Usuario.__new__(Usuario)
+            usuario._id_usuario, usuario._nombre, usuario._rol = id_usuario, nombre, rol
+            usuario._credencial = CredencialAcceso(activa, emision, observaciones)
+            usuario._tareas = []
+            self._usuarios.append(usuario)
+
+    def _cargar_tareas(self, filas: np.ndarray) -> None:
+        """Crea las tareas y las agrega a sus usuarios."""
+        columnas = _Filas(self, filas)
+        for posicion, id_tarea, descripcion, fecha, completada, id_dispositivo, nombre, verificado in zip(
+                columnas.numeros("usuario", 0).tolist(), columnas.numeros("id_tarea", 0).tolist(),
+                columnas.textos("descripcion", ""), columnas.columna("fecha_asignada", "fecha", None),
+                columnas.numeros("completada", False).tolist(), columnas.numeros("id_dispositivo", 0).tolist(),
+                columnas.textos("nombre_dispositivo", ""),
+                columnas.numeros("dispositivo_verificado", True).tolist()):
+            dispositivo = DispositivoAsignado.__new__(DispositivoAsignado)  # ya se verificó al crearlo
+            dispositivo._id, dispositivo._nombre, dispositivo._verificado = id_dispositivo, nombre, verificado
+            tarea = TareaUsuario(id_tarea, descripcion, fecha, dispositivo)
+            tarea.set_completada(completada)
+            self._usuario(posicion).agregar_tarea(tarea)
+
+    def _cargar_asignaciones(self, filas: np.ndarray) -> None:
+        """Asigna los usuarios a sus zonas (en el orden guardado)."""
+        columnas = _Filas(self, filas)
+        por_zona: Dict[int, List[Usuario]] = {}
+        for zona, usuario in zip(columnas.numeros("zona", 0).tolist(), columnas.numeros("usuario", 0).tolist()):
+            por_zona.setdefault(zona, []).append(self._usuario(usuario))
+        for posicion, usuarios in por_zona.items():
+            zona = self._zona(posicion)
+            zona.set_usuarios(zona.get_usuarios() + usuarios)
+
+    def _cargar_registro(self, filas: np.ndarray) -> None:
+        """Crea el RegistroAmbiental que envuelve la red."""
+        columnas = _Filas(self, filas)
+        posicion = int(columnas.numeros("zona", -1)[0])
+        self._registro = RegistroAmbiental(
+            int(columnas.numeros("id_instalacion", 0)[0]), self._red,
+            self._zona(posicion) if posicion >= 0 else None,
+            columnas.textos("responsable", "")[0], int(columnas.numeros("prioridad", 0)[0]),
+        )
+
+    _cargadores = {
+        "RedMonitoreo": _cargar_red,
+        "Usuario": _cargar_usuarios,
+        "TareaUsuario": _cargar_tareas,
+        "ZonaUsuario": _cargar_asignaciones,
+        "RegistroAmbiental": _cargar_registro,
+    }
+
+    def _completar_grupo(self) -> List[Zona]:
+        """Completa las zonas del grupo en curso con sus sensores (en orden de alta) y las devuelve."""
+        zonas = self._zonas[self._primera_pendiente:]
+        if not zonas:
+            return zonas
+        if self._sensores_pendientes:
+            posiciones_zona = np.concatenate([pendiente[0] for pendiente in self._sensores_pendientes])
+            posiciones = np.concatenate([pendiente[1] for pendiente in self._sensores_pendientes])
+            sensores = [sensor for pendiente in self._sensores_pendientes for sensor in pendiente[2]]
+            orden = np.lexsort((posiciones, posiciones_zona))
+            ordenados = [sensores[i] for i in orden.tolist()]
+            cortes = np.searchsorted(posiciones_zona[orden],
+                                     np.arange(self._primera_pendiente, len(self._zonas) + 1)).tolist()
+            sensores_por_zona = [ordenados[desde:hasta] for desde, hasta in zip(cortes, cortes[1:])]
+        else:
+            sensores_por_zona = [[] for _ in zonas]
+        Zona.cargar_sensores_zonas(zonas, sensores_por_zona)
+
+        for zona, en_red in zip(zonas, self._en_red[self._primera_pendiente:]):
+            if en_red:
+                self._red._zonas[zona.get_id_zona()] = zona
+        self._primera_pendiente = len(self._zonas)
+        self._sensores_pendientes = []
+        return zonas
+
+    def _terminar(self) -> None:
+        """Vincula la zona principal de la red al terminar el archivo."""
+        if self._red is None:
+            raise ErrorFormatoBinario("El archivo no contiene la red.")
+        if self._zona_principal >= 0:
+            self._red._zona_principal = self._zona(self._zona_principal)
+        self._terminado = True
+
+    # -----------------------------------------------------------------------
+    # Bloques
+    # -----------------------------------------------------------------------
+    def _leer_bloque(self) -> Tuple[int, int, int, bytes]:
+        """Lee el siguiente bloque y verifica su CRC32."""
+        clase, codigo, cantidad, largo, crc = BLOQUE_CODEC.unpack(self._leer_exacto(BLOQUE_CODEC.size))
+        datos = self._leer_exacto(largo)
+        if zlib.crc32(datos) != crc:
+            raise ErrorFormatoBinario("Bloque dañado (CRC32 inválido).")
+        return clase, codigo, cantidad, datos
+
+    def _leer_exacto(self, cantidad: int) -> bytes:
+        """Lee exactamente `cantidad` bytes."""
+        datos = self._archivo.read(cantidad)
+        if len(datos) != cantidad:
+            raise EOFError("Archivo binario de la red cortado.")
+        return datos
+
+    def _leer_tipos(self, cantidad: int, datos: bytes) -> None:
+        """Lee la tabla de tipos (nombre y campos de cada tipo de fila)."""
+        self._tipos.update(_parsear_tipos(cantidad, datos))
+
+    def _leer_textos(self, cantidad: int, datos: bytes) -> None:
+        """Agrega a la tabla los textos de un bloque."""
+        largos = np.frombuffer(datos, dtype="<u4", count=cantidad)
+        finales = np.cumsum(largos, dtype=np.int64) + 4 * cantidad
+        inicios = finales - largos
+        self._textos.extend(datos[inicio:final].decode("utf-8")
+                            for inicio, final in zip(inicios.tolist(), finales.tolist()))
+        self._tabla_textos = None
+
+    def _tipo(self, codigo: int) -> Tuple[str, np.dtype]:
+        """Devuelve (nombre, dtype) de un código de la tabla de tipos."""
+        tipo = self._tipos.get(codigo)
+        if tipo is None:
+            raise ErrorFormatoBinario(f"Código de tipo sin definir en el archivo: {codigo}")
+        if tipo[0] not in self._cargadores and tipo[0] not in ESQUEMAS_SENSORES and tipo[0] != "Zona":
+            raise ErrorFormatoBinario(f"Tipo desconocido en el archivo: {tipo[0]}")
+        return tipo
+
+    def _zona(self, posicion: int) -> Zona:
+        """Devuelve la zona en una posición del archivo."""
+        if not 0 <= posicion < len(self._zonas):
+            raise ErrorFormatoBinario(f"Referencia a una zona inexistente: {posicion}")
+        return self._zonas[posicion]
+
+    def _usuario(self, posicion: int) -> Usuario:
+        """Devuelve el usuario en una posición del archivo."""
+        if not 0 <= posicion < len(self._usuarios):
+            raise ErrorFormatoBinario(f"Referencia a un usuario inexistente: {posicion}")
+        return self._usuarios[posicion]
+
+    def textos(self, indices: np.ndarray) -> List[Optional[str]]:
+        """Convierte índices de la tabla de textos en textos (SIN_TEXTO → None)."""
+        if self._tabla_textos is None:
+            self._tabla_textos = np.array(self._textos + [None], dtype=object)
+        if not np.all((indices < len(self._textos)) | (indices == SIN_TEXTO)):
+            raise ErrorFormatoBinario("Referencia a un texto inexistente.")
+        return self._tabla_textos[np.where(indices == SIN_TEXTO, len(self._textos), indices)].tolist()
+
+
+class _Filas:
+    """Acceso por nombre a las columnas de un bloque de filas, con valor por omisión si el archivo no trae el campo."""
+
+    __slots__ = ("_decodificador", "_filas")
+
+    def __init__(self, decodificador: DecodificadorRed, filas: np.ndarray):
+        self._decodificador = decodificador
+        self._filas = filas
+
+    def numeros(self, campo: str, omision) -> np.ndarray:
+        """Devuelve una columna numérica o booleana."""
+        if campo in self._filas.dtype.names:
+            return self._filas[campo]
+        return np.full(len(self._filas), omision)
+
+    def textos(self, campo: str, omision: Optional[str]) -> List[Optional[str]]:
+        """Devuelve una columna de textos."""
+        if campo in self._filas.dtype.names:
+            return self._decodificador.textos(self._filas[campo])
+        return [omision] * len(self._filas)
+
+    def columna(self, campo: str, formato: str, omision) -> List[object]:
+        """Devuelve una columna como lista de valores de Python según su formato."""
+        if formato == "texto":
+            return self.textos(campo, omision)
+        if formato == "fecha":
+            if campo not in self._filas.dtype.names:
+                return [omision] * len(self._filas)
+            return [_desde_microsegundos(valor) for valor in self._filas[campo].tolist()]
+        return self.numeros(campo, omision).tolist()
+
+
+def crear_sensores(clase: type, ids: np.ndarray, codigos: np.ndarray, unidades: List[str],
+                   columnas_store: Dict[str, np.ndarray], atributos: Dict[str, List[object]]) -> List[Sensor]:
+    """
+    Crea sensores de una clase de una vez, sin pasar por __init__: reserva sus
+    filas del SensorStore con una sola asignación masiva y arma cada objeto
+    con Sensor._restaurar (como __setstate__). Los sensores quedan sin zona.
+
+    Args:
+        clase: Clase de sensor.
+        ids: ID de cada sensor.
+        codigos: Código de tipo de cada sensor.
+        unidades: Unidad de cada sensor.
+        columnas_store: Estado inicial en el SensorStore (columna → valor por sensor).
+        atributos: Atributos propios de la clase (atributo → valor por sensor).
+    """
+    store = SensorStore.get_instance()
+    indices = store.asignar_lote(ids, codigos, clase._LIMITA_RANGO, columnas_store)
+    if len(ids):
+        reservar_id_sensor(int(ids.max()))
+
+    tipos = {codigo: TipoSensor.desde_nombre(codigo) for codigo in np.unique(codigos).tolist()}
+    nombres = list(atributos)
+    nuevo, restaurar = object.__new__, clase._restaurar
+    sensores = []
+    for id_sensor, codigo, unidad, indice, *propios in zip(
+            np.asarray(ids).tolist(), np.asarray(codigos).tolist(), unidades, indices.tolist(), *atributos.values()):
+        sensor = nuevo(clase)
+        restaurar(sensor, id_sensor, tipos[codigo], unidad, dict(zip(nombres, propios)), store, indice)
+        sensores.append(sensor)
+    return sensores
+
+
+@contextmanager
+def _errores_de_formato() -> Iterator[None]:
+    """Convierte los errores al interpretar bytes dañados (struct, NumPy, UTF-8, índices) en ErrorFormatoBinario."""
+    try:
+        yield
+    except ErrorFormatoBinario:
+        raise
+    except (struct.error, ValueError, IndexError, KeyError) as e:
+        raise ErrorFormatoBinario(f"Contenido dañado en el archivo binario: {e}") from e
+
+
+@contextmanager
+def _recolector_pausado() -> Iterator[None]:
+    """
+    Pausa el recolector de ciclos mientras se crean muchos objetos de una vez:
+    de lo contrario cada tanda de asignaciones dispara recorridos completos del
+    heap, que con millones de sensores dominan el tiempo de carga.
+    """
+    activo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if activo:
+            gc.enable()
+
+
+@lru_cache(maxsize=64)
+def _parsear_tipos(cantidad: int, datos: bytes) -> Tuple[Tuple[int, Tuple[str, np.dtype]], ...]:
+    """
+    Interpreta un bloque de tabla de tipos. Se cachea por contenido: los
+    registros de zona repiten unas pocas tablas y así no se rearman sus dtypes
+    en cada lectura.
+    """
+    lector = memoryview(datos)
+    posicion = _TEXTO_CORTO.size
+    tipos = []
+    for _ in range(cantidad):
+        codigo, cantidad_campos = _TIPO.unpack_from(lector, posicion)
+        posicion += _TIPO.size
+        nombre, posicion = _leer_texto_corto(lector, posicion)
+        campos = []
+        for _ in range(cantidad_campos):
+            campo, posicion = _leer_texto_corto(lector, posicion)
+            formato, posicion = _leer_texto_corto(lector, posicion)
+            if formato not in _FORMATOS:
+                raise ErrorFormatoBinario(f"Formato de campo desconocido: {formato}")
+            campos.append((campo, formato))
+        tipos.append((codigo, (nombre, _dtype(campos))))
+    return tuple(tipos)
+
+
+def _leer_texto_corto(datos: memoryview, posicion: int) -> Tuple[str, int]:
+    """Lee un texto corto de la tabla de tipos; devuelve el texto y la posición siguiente."""
+    (largo,) = _TEXTO_CORTO.unpack_from(datos, posicion)
+    inicio = posicion + _TEXTO_CORTO.size
+    return bytes(datos[inicio:inicio + largo]).decode("utf-8"), inicio + largo
+
+
+# ---------------------------------------------------------------------------
+# Funciones de conveniencia
+# ---------------------------------------------------------------------------
+def codificar_red(raiz: Union[RedMonitoreo, RegistroAmbiental], archivo: BinaryIO,
+                  zonas_por_bloque: int = CODEC_ZONAS_POR_BLOQUE) -> None:
+    """Escribe una red (o un RegistroAmbiental con su red) en el formato binario."""
+    CodificadorRed(archivo, zonas_por_bloque).escribir(raiz)
+
+
+def decodificar_red(archivo: BinaryIO) -> Union[RedMonitoreo, RegistroAmbiental]:
+    """Lee una red (o un RegistroAmbiental) escrita con codificar_red."""
+    return DecodificadorRed(archivo).leer()
+
+
+def codificar_zona(zona: Zona) -> bytes:
+    """Codifica una zona (con sus sensores y usuarios, sin la red) como registro autocontenido."""
+    archivo = io.BytesIO()
+    CodificadorRed(archivo).escribir_zona(zona)
+    return archivo.getvalue()
+
+
+def decodificar_zona(datos: bytes, red: RedMonitoreo) -> Zona:
+    """Lee un registro escrito con codificar_zona; la zona queda vinculada a `red` (sin agregarse a ella)."""
+    return DecodificadorRed(io.BytesIO(datos), red).leer_zona()
+
+
+def es_formato_binario(archivo: BinaryIO) -> bool:
+    """Indica si un archivo abierto (con posición al inicio) tiene el formato binario; no mueve la posición."""
+    posicion = archivo.tell()
+    firma = archivo.read(len(FIRMA_CODEC))
+    archivo.seek(posicion)
+    return firma == FIRMA_CODEC
+
+
+def cargar_entidades(archivo: BinaryIO):
+    """
+    Lee un archivo de la red o de un registro en el formato binario o, si no
+    tiene su firma, como pickle (archivos anteriores al codec).
+    """
+    if es_formato_binario(archivo):
+        return decodificar_red(archivo)
+    return pickle.load(archivo)
@@ -0,0 +1,235 @@
+from typing import Tuple
+import numpy as np
+
+# Clases del delta-of-delta de timestamps: (prefijo, bits del prefijo, bits del valor).
+# Un delta-of-delta igual a 0 (muestreo regular) ocupa un solo bit '0'.
+_CLASES_DOD = (
+    (0b10, 2, 7),
+    (0b110, 3, 9),
+    (0b1110, 4, 12),
+    (0b11110, 5, 32),
+    (0b11111, 5, 64),
+)
+_PREFIJOS_DOD = np.array([0] + [c[0] for c in _CLASES_DOD], dtype=np.uint64)
+_BITS_PREFIJO_DOD = np.array([1] + [c[1] for c in _CLASES_DOD], dtype=np.int64)
+_BITS_VALOR_DOD = np.array([0] + [c[2] for c in _CLASES_DOD], dtype=np.int64)
+_MASCARAS_DOD = np.array([(1 << bits) - 1 for bits in _BITS_VALOR_DOD.tolist()], dtype=np.uint64)
+
+# Valores: '0' si el XOR con el anterior es 0; si no, '1' + ceros iniciales (5 bits)
+# + largo significativo - 1 (6 bits) y los bits significativos del XOR
+_BITS_CONTROL_XOR = 12
+_MAX_CEROS_INICIALES = 31
+
+
+# ---------------------------------------------------------------------------
+# Codificación (vectorizada sobre todo el segmento)
+# ---------------------------------------------------------------------------
+def codificar_timestamps(ts: np.ndarray, inicios: np.ndarray) -> Tuple[bytes, np.ndarray]:
+    """
+    Codifica timestamps con delta-of-delta (Gorilla), bloque a bloque.
+
+    El primer punto de cada bloque no ocupa bits (se guarda en el índice del
+    segmento); para el resto se codifica delta_k - delta_(k-1), con delta_0 = 0.
+
+    Args:
+        ts: Timestamps enteros (ya en la resolución del segmento), ordenados dentro de cada bloque.
+        inicios: Máscara de los puntos que inician un bloque.
+
+    Returns:
+        Tupla (bytes del flujo, bit de inicio de cada bloque).
+    """
+    ts = ts.astype(np.int64, copy=False)
+    deltas = np.diff(ts, prepend=ts[:1])
+    deltas[inicios] = 0
+    anteriores = np.concatenate(([0], deltas[:-1]))
+    anteriores[inicios] = 0
+    dod = deltas - anteriores
+
+    clase = np.select(
+        [dod == 0, (dod >= -64) & (dod < 64), (dod >= -256) & (dod < 256),
+         (dod >= -2048) & (dod < 2048), (dod >= -(1 << 31)) & (dod < (1 << 31))],
+        [0, 1, 2, 3, 4], default=5,
+    )
+    bits_prefijo = np.where(inicios, 0, _BITS_PREFIJO_DOD[clase])
+    bits_valor = np.where(inicios, 0, _BITS_VALOR_DOD[clase])
+    campos = np.stack([_PREFIJOS_DOD[clase], dod.astype(np.uint64) & _MASCARAS_DOD[clase]], axis=1)
+    largos = np.stack([bits_prefijo, bits_valor], axis=1)
+    return _empaquetar_puntos(campos, largos, inicios)
+
+
+def codificar_valores(valores: np.ndarray, inicios: np.ndarray) -> Tuple[bytes, np.ndarray]:
+    """
+    Codifica valores float64 con compresión XOR (estilo Gorilla), bloque a bloque.
+
+    El primer valor de cada bloque se guarda completo (64 bits). Cada valor
+    siguiente guarda el XOR con el anterior: un bit '0' si no cambió, o bien
+    los ceros iniciales, el largo y solo los bits significativos del XOR.
+    A diferencia de Gorilla no se reutiliza la ventana del valor anterior,
+    lo que permite codificar todos los puntos con operaciones vectorizadas.
+
+    Args:
+        valores: Valores de los puntos, en el mismo orden que los timestamps.
+        inicios: Máscara de los puntos que inician un bloque.
+
+    Returns:
+        Tupla (bytes del flujo, bit de inicio de cada bloque).
+    """
+    bits = np.ascontiguousarray(valores, dtype=np.float64).view(np.uint64)
+    xor = bits ^ np.concatenate((bits[:1], bits[:-1]))
+    xor[inicios] = bits[inicios]
+
+    largo_bits = _largo_en_bits(xor)
+    ceros_finales = _largo_en_bits(xor & (~xor + np.uint64(1))) - 1
+    ceros_iniciales = np.minimum(64 - largo_bits, _MAX_CEROS_INICIALES)
+    significativos = np.clip(64 - ceros_iniciales - ceros_finales, 1, 64)
+    es_cero = xor == 0
+
+    control = np.where(
+        es_cero, 0,
+        (1 << (_BITS_CONTROL_XOR - 1)) | (ceros_iniciales << 6) | (significativos - 1),
+    ).astype(np.uint64)
+    largo_control = np.where(es_cero, 1, _BITS_CONTROL_XOR)
+    carga = xor >> np.clip(ceros_finales, 0, 63).astype(np.uint64)
+    largo_carga = np.where(es_cero, 0, significativos)
+
+    # El primer valor de cada bloque va completo en un único campo de 64 bits
+    control[inicios] = bits[inicios]
+    largo_control[inicios] = 64
+    largo_carga[inicios] = 0
+
+    campos = np.stack([control, carga], axis=1)
+    largos = np.stack([largo_control, largo_carga], axis=1)
+    return _empaquetar_puntos(campos, largos, inicios)
+
+
+def _empaquetar_puntos(campos: np.ndarray, largos: np.ndarray, inicios: np.ndarray) -> Tuple[bytes, np.ndarray]:
+    """Empaqueta los campos de cada punto (en orden) y devuelve también el bit de inicio de cada bloque."""
+    bits_por_punto = largos.sum(axis=1)
+    inicio_punto = np.cumsum(bits_por_punto) - bits_por_punto
+    largos = largos.ravel()
+    usados = largos > 0
+    return empaquetar_bits(campos.ravel()[usados], largos[usados]), inicio_punto[inicios]
+
+
+def empaquetar_bits(campos: np.ndarray, largos: np.ndarray) -> bytes:
+    """
+    Concatena campos de bits (el más significativo primero) en un flujo de bytes.
+
+    Cada campo ocupa a lo sumo dos palabras de 64 bits: se calculan las dos
+    partes de todos los campos a la vez y se combinan con un OR por palabra.
+
+    Args:
+        campos: Valores de los campos (uint64, cada uno cabe en su largo).
+        largos: Largo en bits de cada campo (1 a 64).
+    """
+    if len(largos) == 0:
+        return b""
+    largos = largos.astype(np.int64, copy=False)
+    fin = np.cumsum(largos)
+    inicio = fin - largos
+    total = int(fin[-1])
+    palabra = inicio >> 6
+    exceso = (inicio & 63) + largos - 64  # > 0: el campo sigue en la palabra siguiente
+
+    parte = np.where(
+        exceso > 0,
+        campos >> np.clip(exceso, 0, 63).astype(np.uint64),
+        campos << np.clip(-exceso, 0, 63).astype(np.uint64),
+    )
+    palabras = np.zeros((total + 63) // 64, dtype=np.uint64)
+    np.bitwise_or.at(palabras, palabra, parte)
+    partido = exceso > 0
+    np.bitwise_or.at(palabras, palabra[partido] + 1,
+                     campos[partido] << (64 - exceso[partido]).astype(np.uint64))
+    return palabras.astype(">u8").tobytes()[:(total + 7) // 8]
+
+
+def _largo_en_bits(x: np.ndarray) -> np.ndarray:
+    """Cantidad de bits significativos de cada uint64 (0 para 0), por búsqueda binaria vectorizada."""
+    largo = np.zeros(x.shape, dtype=np.int64)
+    resto = x.copy()
+    for paso in (32, 16, 8, 4, 2, 1):
+        mayor = (resto >> np.uint64(paso)) != 0
+        largo[mayor] += paso
+        resto[mayor] >>= np.uint64(paso)
+    return largo + (resto != 0)
+
+
+# ---------------------------------------------------------------------------
+# Decodificación (secuencial por bloque)
+# ---------------------------------------------------------------------------
+class LectorBits:
+    """Lee campos de bits (el más significativo primero) de un flujo de bytes."""
+
+    __slots__ = ("_datos", "_posicion")
+
+    def __init__(self, datos, posicion_bit: int = 0):
+        """
+        Args:
+            datos: Flujo de bytes (bytes, bytearray o memoryview).
+            posicion_bit: Bit desde el que se empieza a leer.
+        """
+        self._datos = datos
+        self._posicion = posicion_bit
+
+    def leer(self, largo: int) -> int:
+        """Lee un campo de `largo` bits (1 a 64) y avanza."""
+        posicion = self._posicion
+        byte = posicion >> 3
+        ventana = bytes(self._datos[byte:byte + 9]).ljust(9, b"\0")
+        self._posicion = posicion + largo
+        return (int.from_bytes(ventana, "big") >> (72 - (posicion & 7) - largo)) & ((1 << largo) - 1)
+
+
+def decodificar_timestamps(datos, posicion_bit: int, cantidad: int, primero: int) -> np.ndarray:
+    """
+    Decodifica los timestamps de un bloque escrito con `codificar_timestamps`.
+
+    Args:
+        datos: Flujo de bytes de timestamps del segmento.
+        posicion_bit: Bit de inicio del bloque.
+        cantidad: Cantidad de puntos del bloque.
+        primero: Timestamp del primer punto (guardado en el índice).
+    """
+    lector = LectorBits(datos, posicion_bit)
+    leer = lector.leer
+    salida = [primero]
+    ts, delta = primero, 0
+    for _ in range(cantidad - 1):
+        clase = 0
+        while clase < len(_CLASES_DOD) and leer(1):
+            clase += 1
+        if clase:
+            bits = _CLASES_DOD[clase - 1][2]
+            dod = leer(bits)
+            if dod >> (bits - 1):
+                dod -= 1 << bits  # complemento a dos
+            delta += dod
+        ts += delta
+        salida.append(ts)
+    return np.array(salida, dtype=np.int64)
+
+
+def decodificar_valores(datos, posicion_bit: int, cantidad: int) -> np.ndarray:
+    """
+    Decodifica los valores de un bloque escrito con `codificar_valores`.
+
+    Args:
+        datos: Flujo de bytes de valores del segmento.
+        posicion_bit: Bit de inicio del bloque.
+        cantidad: Cantidad de puntos del bloque.
+    """
+    if cantidad == 0:
+        return np.empty(0, dtype=np.float64)
+    lector = LectorBits(datos, posicion_bit)
+    leer = lector.leer
+    actual = leer(64)
+    salida = [actual]
+    for _ in range(cantidad - 1):
+        if leer(1):
+            control = leer(_BITS_CONTROL_XOR - 1)
+            ceros_iniciales = control >> 6
+            significativos = (control & 0x3F) + 1
+            actual ^= leer(significativos) << (64 - ceros_iniciales - significativos)
+        salida.append(actual)
+    return np.array(salida, dtype=np.uint64).view(np.float64)
@@ -0,0 +1,313 @@
+import io
+import os
+import struct
+import threading
+import zlib
+from enum import IntEnum
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+from python_iotmonitor.entidades.zonas.registro_ambiental import RegistroAmbiental
+from python_iotmonitor.persistencia.codec_binario import codificar_red, cargar_entidades
+from python_iotmonitor.persistencia.escritura_atomica import escribir_atomico
+
+# Archivo de datos: encabezado (firma + generación) | registros (encabezado fijo + contenido)
+FIRMA_CONTENEDOR = b"IOTREG01"
+ENCABEZADO_CONTENEDOR = struct.Struct("<8sQ")
+# Encabezado de cada registro: estado, id de la instalación, largo del contenido, CRC32 (id + contenido).
+# El estado queda fuera del CRC: es el byte que se reescribe en el lugar al borrar.
+ENCABEZADO_REGISTRO = struct.Struct("<BqII")
+_ID = struct.Struct("<q")
+
+# Índice (<ruta>.idx): firma, generación del archivo de datos, bytes del archivo que cubre, entradas, CRC32
+FIRMA_INDICE_REGISTROS = b"IOTRIX01"
+ENCABEZADO_INDICE_REGISTROS = struct.Struct("<8sQQQI")
+DTYPE_INDICE_REGISTROS = np.dtype([
+    ("id_instalacion", "<i8"),
+    ("desplazamiento", "<u8"),
+    ("largo", "<u4"),
+])
+
+
+class EstadoRegistro(IntEnum):
+    """Estado de un registro del contenedor."""
+    VIGENTE = 1
+    BORRADO = 2  # lápida: reemplazado o eliminado, se descarta al compactar
+
+
+class ContenedorRegistros:
+    """
+    Archivo con muchos RegistroAmbiental (cada uno con su red, en el codec
+    binario) y un índice de desplazamientos por `id_instalacion`.
+
+    Los registros se agregan al final (de a uno o en lote, con un único
+    fsync); guardar un id existente agrega la versión nueva y marca la
+    anterior como borrada reescribiendo en el lugar el byte de estado de su
+    encabezado (lápida). La lectura de un registro es una búsqueda en el
+    índice en memoria más una lectura del archivo. `compactar` reescribe el
+    archivo con solo los registros vigentes.
+
+    El índice (`<ruta>.idx`) se reemplaza de forma atómica después de cada
+    operación y registra cuántos bytes del archivo de datos cubre: al abrir,
+    los registros agregados después (una caída antes de escribir el índice)
+    se recuperan recorriendo solo ese final, y un registro cortado se
+    descarta truncando el archivo. Si el índice falta o no corresponde al
+    archivo, se reconstruye recorriendo todos los registros.
+    """
+
+    def __init__(self, ruta: str):
+        """
+        Abre (o crea) el contenedor.
+
+        Args:
+            ruta: Ruta del archivo de datos (el índice va en `<ruta>.idx`).
+
+        Raises:
+            ValueError: Si el archivo existe y no es un contenedor de registros.
+        """
+        self._ruta = ruta
+        self._ruta_indice = ruta + ".idx"
+        self._lock = threading.Lock()
+        self._indice: Dict[int, Tuple[int, int]] = {}  # id_instalacion → (desplazamiento, largo)
+        nuevo = not os.path.exists(ruta)
+        if nuevo:
+            escribir_atomico(ruta, lambda f: f.write(ENCABEZADO_CONTENEDOR.pack(FIRMA_CONTENEDOR, 1)))
+        self._archivo = open(ruta, "r+b")
+        encabezado = self._archivo.read(ENCABEZADO_CONTENEDOR.size)
+        if len(encabezado) < ENCABEZADO_CONTENEDOR.size or encabezado[:8] != FIRMA_CONTENEDOR:
+            self._archivo.close()
+            raise ValueError(f"{ruta} no es un contenedor de registros ambientales.")
+        self._generacion = ENCABEZADO_CONTENEDOR.unpack(encabezado)[1]
+        if nuevo:
+            self._escribir_indice()
+        else:
+            self._abrir_indice()
+
+    # -----------------------------------------------------------------------
+    # Escritura
+    # -----------------------------------------------------------------------
+    def agregar(self, registro: RegistroAmbiental) -> None:
+        """Guarda un registro (si su id ya existe, reemplaza a la versión anterior)."""
+        self.agregar_lote([registro])
+
+    def agregar_lote(self, registros: Iterable[RegistroAmbiental]) -> int:
+        """
+        Agrega muchos registros con una única escritura y un único fsync.
+
+        Returns:
+            Cantidad de registros agregados.
+
+        Raises:
+            ValueError: Si un registro contiene una clase de sensor no registrada en el codec.
+        """
+        bloques: List[Tuple[int, bytes]] = []
+        for registro in registros:
+            buffer = io.BytesIO()
+            codificar_red(registro, buffer)
+            bloques.append((registro.get_id(), buffer.getvalue()))
+        if not bloques:
+            return 0
+        with self._lock:
+            self._archivo.seek(0, os.SEEK_END)
+            desplazamiento = self._archivo.tell()
+            nuevos = []
+            for id_instalacion, datos in bloques:
+                crc = zlib.crc32(datos, zlib.crc32(_ID.pack(id_instalacion)))
+                self._archivo.write(ENCABEZADO_REGISTRO.pack(EstadoRegistro.VIGENTE, id_instalacion, len(datos), crc))
+                self._archivo.write(datos)
+                nuevos.append((id_instalacion, desplazamiento, len(datos)))
+                desplazamiento += ENCABEZADO_REGISTRO.size + len(datos)
+            self._archivo.flush()
+            os.fsync(self._archivo.fileno())
+
+            reemplazados = []
+            for id_instalacion, desplazamiento, largo in nuevos:
+                anterior = self._indice.get(id_instalacion)
+                if anterior is not None:
+                    reemplazados.append(anterior[0])
+                self._indice[id_instalacion] = (desplazamiento, largo)
+            # Primero el índice (que ya no los referencia) y después las lápidas en el lugar
+            self._escribir_indice()
+            self._marcar_borrados(reemplazados)
+        return len(bloques)
+
+    def eliminar(self, id_instalacion: int) -> bool:
+        """
+        Elimina un registro marcándolo como borrado en el lugar.
+
+        Returns:
+            True si el registro existía.
+        """
+        with self._lock:
+            entrada = self._indice.pop(id_instalacion, None)
+            if entrada is None:
+                return False
+            self._escribir_indice()
+            self._marcar_borrados([entrada[0]])
+            return True
+
+    def compactar(self) -> int:
+        """
+        Reescribe el archivo de datos (de forma atómica, en una generación
+        nueva) con solo los registros vigentes, en su orden actual.
+
+        Returns:
+            Bytes recuperados.
+        """
+        with self._lock:
+            tamano = self._archivo.seek(0, os.SEEK_END)
+            generacion = self._generacion + 1
+            compactado: Dict[int, Tuple[int, int]] = {}
+
+            def escribir(archivo: BinaryIO) -> None:
+                archivo.write(ENCABEZADO_CONTENEDOR.pack(FIRMA_CONTENEDOR, generacion))
+                for id_instalacion, (desplazamiento, largo) in sorted(self._indice.items(), key=lambda e: e[1][0]):
+                    self._archivo.seek(desplazamiento)
+                    compactado[id_instalacion] = (archivo.tell(), largo)
+                    archivo.write(self._archivo.read(ENCABEZADO_REGISTRO.size + largo))
+
+            escribir_atomico(self._ruta, escribir)
+            self._archivo.close()
+            self._archivo = open(self._ruta, "r+b")
+            self._generacion, self._indice = generacion, compactado
+            self._escribir_indice()
+            recuperados = tamano - self._archivo.seek(0, os.SEEK_END)
+            print(f"[ContenedorRegistros] Compactado {self._ruta}: {len(compactado)} registros, "
+                  f"{recuperados} bytes recuperados.")
+            return recuperados
+
+    def cerrar(self) -> None:
+        """Cierra el archivo de datos."""
+        with self._lock:
+            self._archivo.close()
+
+    # -----------------------------------------------------------------------
+    # Lectura
+    # -----------------------------------------------------------------------
+    def leer(self, id_instalacion: int) -> RegistroAmbiental:
+        """
+        Lee un registro por su id.
+
+        Raises:
+            KeyError: Si el contenedor no tiene un registro vigente con ese id.
+            ValueError: Si el registro está dañado.
+        """
+        with self._lock:
+            entrada = self._indice.get(id_instalacion)
+            if entrada is None:
+                raise KeyError(id_instalacion)
+            desplazamiento, largo = entrada
+            self._archivo.seek(desplazamiento)
+            bloque = self._archivo.read(ENCABEZADO_REGISTRO.size + largo)
+        estado, id_guardado, largo_guardado, crc = ENCABEZADO_REGISTRO.unpack_from(bloque)
+        datos = memoryview(bloque)[ENCABEZADO_REGISTRO.size:]
+        if (estado != EstadoRegistro.VIGENTE or id_guardado != id_instalacion or largo_guardado != largo
+                or len(datos) != largo or zlib.crc32(datos, zlib.crc32(_ID.pack(id_instalacion))) != crc):
+            raise ValueError(f"Registro {id_instalacion} dañado en {self._ruta}.")
+        return cargar_entidades(io.BytesIO(datos))
+
+    def iterar_registros(self) -> Iterator[RegistroAmbiental]:
+        """Recorre los registros vigentes en el orden del archivo."""
+        with self._lock:
+            ids = [id_instalacion for id_instalacion, _ in sorted(self._indice.items(), key=lambda e: e[1][0])]
+        for id_instalacion in ids:
+            try:
+                yield self.leer(id_instalacion)
+            except KeyError:
+                continue  # eliminado durante el recorrido
+
+    def get_ids(self) -> List[int]:
+        """Devuelve los ids de los registros vigentes."""
+        with self._lock:
+            return list(self._indice)
+
+    def get_bytes_obsoletos(self) -> int:
+        """Devuelve los bytes que ocupan registros borrados (los que recupera `compactar`)."""
+        with self._lock:
+            vigentes = sum(ENCABEZADO_REGISTRO.size + largo for _, largo in self._indice.values())
+            return self._archivo.seek(0, os.SEEK_END) - ENCABEZADO_CONTENEDOR.size - vigentes
+
+    def __contains__(self, id_instalacion) -> bool:
+        return id_instalacion in self._indice
+
+    def __len__(self) -> int:
+        return len(self._indice)
+
+    # -----------------------------------------------------------------------
+    # Índice y recuperación
+    # -----------------------------------------------------------------------
+    def _abrir_indice(self) -> None:
+        """Carga el índice; recupera los registros que no cubre (o lo reconstruye) y trunca un final cortado."""
+        tamano = self._archivo.seek(0, os.SEEK_END)
+        leido = self._leer_indice(tamano)
+        if leido is None:
+            self._indice, inicio = {}, ENCABEZADO_CONTENEDOR.size
+            print(f"[ContenedorRegistros] Índice ausente o desactualizado: se reconstruye {self._ruta}.")
+        else:
+            self._indice, inicio = leido
+        if inicio == tamano and leido is not None:
+            return
+        fin_valido = self._recorrer(inicio, tamano)
+        if fin_valido < tamano:
+            print(f"[ContenedorRegistros] Registro cortado al final de {self._ruta}: se descartan "
+                  f"{tamano - fin_valido} bytes.")
+            self._archivo.truncate(fin_valido)
+            self._archivo.flush()
+            os.fsync(self._archivo.fileno())
+        self._escribir_indice()
+
+    def _recorrer(self, inicio: int, tamano: int) -> int:
+        """
+        Recorre los registros desde `inicio` y los agrega al índice (una versión
+        posterior de un id reemplaza a la anterior). Devuelve dónde termina el
+        último registro completo y válido.
+        """
+        posicion = inicio
+        while posicion + ENCABEZADO_REGISTRO.size <= tamano:
+            self._archivo.seek(posicion)
+            estado, id_instalacion, largo, crc = ENCABEZADO_REGISTRO.unpack(
+                self._archivo.read(ENCABEZADO_REGISTRO.size))
+            datos = self._archivo.read(largo)
+            if len(datos) != largo or zlib.crc32(datos, zlib.crc32(_ID.pack(id_instalacion))) != crc:
+                break
+            if estado == EstadoRegistro.VIGENTE:
+                self._indice[id_instalacion] = (posicion, largo)
+            posicion += ENCABEZADO_REGISTRO.size + largo
+        return posicion
+
+    def _leer_indice(self, tamano: int) -> Optional[Tuple[Dict[int, Tuple[int, int]], int]]:
+        """Lee el índice si corresponde a este archivo; devuelve (entradas, bytes cubiertos) o None."""
+        try:
+            with open(self._ruta_indice, "rb") as f:
+                contenido = f.read()
+            firma, generacion, cubiertos, cantidad, crc = ENCABEZADO_INDICE_REGISTROS.unpack_from(contenido)
+            filas = np.frombuffer(contenido, dtype=DTYPE_INDICE_REGISTROS, count=cantidad,
+                                  offset=ENCABEZADO_INDICE_REGISTROS.size)
+        except (OSError, ValueError, struct.error):
+            return None
+        if (firma != FIRMA_INDICE_REGISTROS or generacion != self._generacion or cubiertos > tamano
+                or zlib.crc32(filas.tobytes()) != crc):
+            return None
+        indice = dict(zip(filas["id_instalacion"].tolist(),
+                          zip(filas["desplazamiento"].tolist(), filas["largo"].tolist())))
+        return indice, cubiertos
+
+    def _escribir_indice(self) -> None:
+        """Reemplaza el índice de forma atómica con las entradas vigentes."""
+        filas = np.array([(id_instalacion, desplazamiento, largo)
+                          for id_instalacion, (desplazamiento, largo) in self._indice.items()],
+                         dtype=DTYPE_INDICE_REGISTROS)
+        cubiertos = self._archivo.seek(0, os.SEEK_END)
+        escribir_atomico(self._ruta_indice, lambda f: f.write(ENCABEZADO_INDICE_REGISTROS.pack(
+            FIRMA_INDICE_REGISTROS, self._generacion, cubiertos, len(filas), zlib.crc32(filas.tobytes()))
+            + filas.tobytes()))
+
+    def _marcar_borrados(self, desplazamientos: List[int]) -> None:
+        """Reescribe en el lugar el byte de estado de los registros indicados (lápidas)."""
+        if not desplazamientos:
+            return
+        borrado = bytes((EstadoRegistro.BORRADO,))
+        for desplazamiento in desplazamientos:
+            self._archivo.seek(desplazamiento)
+            self._archivo.write(borrado)
+        self._archivo.flush()
+        os.fsync(self._archivo.fileno())
@@ -0,0 +1,118 @@
+import os
+import pickle
+import shutil
+import threading
+from typing import BinaryIO, Callable, List, TypeVar
+from python_iotmonitor.excepciones.persistencia_exception import ErrorFormatoBinario
+
+T = TypeVar("T")
+
+# Errores que indican un archivo ilegible (cortado o dañado) al deserializar
+ERRORES_LECTURA = (OSError, EOFError, pickle.UnpicklingError, ErrorFormatoBinario)
+
+
+def escribir_atomico(ruta: str, escribir: Callable[[BinaryIO], None], generaciones: int = 1) -> None:
+    """
+    Escribe un archivo de forma atómica: el contenido va a un temporal, se hace
+    fsync y recién entonces reemplaza al archivo anterior con un rename. Una
+    escritura interrumpida deja intacta la última versión completa.
+
+    Con `generaciones` > 1 se conservan las versiones anteriores como
+    `<ruta>.1` (la más reciente) … `<ruta>.<generaciones - 1>`.
+
+    El temporal lleva el pid y el hilo en el nombre, así dos escrituras
+    simultáneas de la misma ruta no se pisan el temporal (gana el último rename).
+
+    Args:
+        ruta: Ruta del archivo de destino.
+        escribir: Función que escribe el contenido en el archivo abierto.
+        generaciones: Cantidad de versiones a conservar (incluida la nueva).
+    """
+    temporal = f"{ruta}.{os.getpid()}-{threading.get_ident()}.tmp"
+    try:
+        with open(temporal, "wb") as f:
+            escribir(f)
+            f.flush()
+            os.fsync(f.fileno())
+        _rotar_generaciones(ruta, generaciones)
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+    fsync_directorio(os.path.dirname(ruta))
+
+
+def leer_con_respaldo(ruta: str, leer: Callable[[BinaryIO], T]) -> T:
+    """
+    Lee la versión más reciente de un archivo escrito con `escribir_atomico`.
+    Si está dañada, prueba con las generaciones anteriores.
+
+    Args:
+        ruta: Ruta del archivo.
+        leer: Función que deserializa el contenido del archivo abierto.
+
+    Returns:
+        Lo devuelto por `leer` para la versión más reciente que se pudo leer.
+
+    Raises:
+        FileNotFoundError: Si no existe ninguna versión del archivo.
+        Exception: El error de la versión más reciente, si ninguna se pudo leer.
+    """
+    rutas = rutas_generaciones(ruta)
+    if not rutas:
+        raise FileNotFoundError(f"No existe el archivo {ruta}")
+    primer_error = None
+    for candidata in rutas:
+        try:
+            with open(candidata, "rb") as f:
+                resultado = leer(f)
+        except ERRORES_LECTURA as e:
+            print(f"[Persistencia] No se pudo leer {candidata} ({e.__class__.__name__}); "
+                  f"se intenta con la generación anterior.")
+            primer_error = primer_error or e
+            continue
+        return resultado
+    raise primer_error
+
+
+def rutas_generaciones(ruta: str) -> List[str]:
+    """Devuelve las versiones existentes de un archivo, de la más reciente a la más antigua."""
+    rutas = [ruta] if os.path.exists(ruta) else []
+    numero = 1
+    while os.path.exists(f"{ruta}.{numero}"):
+        rutas.append(f"{ruta}.{numero}")
+        numero += 1
+    return rutas
+
+
+def fsync_directorio(directorio: str) -> None:
+    """Hace durables las altas, bajas y renombres de archivos de un directorio."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return  # Windows no permite abrir directorios
+    fd = os.open(directorio or ".", os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _rotar_generaciones(ruta: str, generaciones: int) -> None:
+    """
+    Desplaza las versiones anteriores (<ruta>.1 → <ruta>.2 …) y deja la actual
+    como <ruta>.1. La versión actual se enlaza en lugar de moverse, así `ruta`
+    existe completa en todo momento.
+    """
+    if generaciones <= 1 or not os.path.exists(ruta):
+        return
+    for numero in range(generaciones - 1, 1, -1):
+        anterior = f"{ruta}.{numero - 1}"
+        if os.path.exists(anterior):
+            os.replace(anterior, f"{ruta}.{numero}")
+    respaldo = f"{ruta}.1"
+    if os.path.exists(respaldo):
+        os.remove(respaldo)
+    try:
+        os.link(ruta, respaldo)
+    except OSError:
+        shutil.copyfile(ruta, respaldo)  # sistemas de archivos sin enlaces duros
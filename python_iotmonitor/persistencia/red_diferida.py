@@ -0,0 +1,488 @@
+import os
+import re
+import struct
+import threading
+import weakref
+import zlib
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union, TYPE_CHECKING
+import numpy as np
+from python_iotmonitor.entidades.zonas.red_monitoreo import RedMonitoreo
+from python_iotmonitor.entidades.zonas.zona import Zona
+from python_iotmonitor.patrones.observer.eventos.evento_sensor_ambiental import EventoSensorAmbiental
+from python_iotmonitor.patrones.observer.eventos.lote_lecturas import LoteLecturas
+from python_iotmonitor.persistencia.codec_binario import codificar_zona, decodificar_zona
+from python_iotmonitor.persistencia.escritura_atomica import escribir_atomico, fsync_directorio
+from python_iotmonitor.constantes import RED_DIFERIDA_ZONAS_EN_MEMORIA
+
+if TYPE_CHECKING:
+    from python_iotmonitor.patrones.observer.eventos.evento_lote import EventoLote
+
+# Archivos del directorio: "indice" (encabezado de la red + una entrada por zona) y
+# "zonas.<generacion>.dat" (registros de zona del codec binario, uno tras otro)
+FIRMA_INDICE_ZONAS = b"IOTZIX01"
+# firma, id de la red, total de sensores, total de zonas, entradas, posición de la zona principal,
+# generación del archivo de zonas, bytes de la ubicación, bytes de la descripción, CRC32 del resto
+ENCABEZADO_INDICE_ZONAS = struct.Struct("<8sqqqqiIIII")
+DTYPE_INDICE_ZONAS = np.dtype([
+    ("id_zona", "<i8"),
+    ("desplazamiento", "<u8"),
+    ("largo", "<u4"),
+    ("crc32", "<u4"),
+    ("sensores", "<u4"),
+    ("en_red", "?"),  # False: zona principal que no pertenece a la red
+])
+_NOMBRE_INDICE = "indice"
+_PATRON_DATOS = re.compile(r"^zonas\.(\d+)\.dat$")
+
+# Ubicación de un registro en el archivo de zonas: (desplazamiento, largo, CRC32, sensores)
+Entrada = Tuple[int, int, int, int]
+
+
+class _ZonasDiferidas(MutableMapping):
+    """
+    Zonas de una RedDiferida por id (en orden de alta). Las que están en el
+    archivo se leen en el primer acceso; las `capacidad` usadas más
+    recientemente quedan en memoria (LRU) y las demás se liberan. Las zonas
+    agregadas o marcadas como modificadas quedan fijas hasta que se guardan.
+    """
+
+    def __init__(self, red: "RedDiferida", ids: List[int], capacidad: int):
+        self._red = red
+        self._ids: Dict[int, None] = dict.fromkeys(ids)  # conjunto ordenado
+        self._capacidad = max(1, capacidad)
+        self._recientes: "OrderedDict[int, Zona]" = OrderedDict()
+        self._fijadas: Dict[int, Zona] = {}
+        # Zonas desalojadas que alguien más sigue usando: se devuelven las mismas
+        # en lugar de leer una copia desconectada
+        self._liberadas: "weakref.WeakValueDictionary[int, Zona]" = weakref.WeakValueDictionary()
+
+    def __getitem__(self, id_zona: int) -> Zona:
+        with self._red._lock:
+            if id_zona not in self._ids:
+                raise KeyError(id_zona)
+            zona = self._fijadas.get(id_zona)
+            if zona is not None:
+                return zona
+            zona = self._recientes.get(id_zona)
+            if zona is not None:
+                self._recientes.move_to_end(id_zona)
+                return zona
+            zona = self._liberadas.pop(id_zona, None)
+            if zona is None:
+                zona = self._red._leer_zona(id_zona)
+            self._recientes[id_zona] = zona
+            self._desalojar()
+            return zona
+
+    def __setitem__(self, id_zona: int, zona: Zona) -> None:
+        with self._red._lock:
+            self._olvidar(id_zona)
+            self._ids[id_zona] = None
+            self._fijadas[id_zona] = zona
+
+    def __delitem__(self, id_zona: int) -> None:
+        with self._red._lock:
+            if id_zona not in self._ids:
+                raise KeyError(id_zona)
+            del self._ids[id_zona]
+            self._olvidar(id_zona)
+            self._red._entradas.pop(id_zona, None)
+
+    def __contains__(self, id_zona) -> bool:
+        return id_zona in self._ids
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(list(self._ids))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    # -----------------------------------------------------------------------
+    # Zonas en memoria
+    # -----------------------------------------------------------------------
+    def fijar(self, id_zona: int) -> None:
+        """Fija en memoria una zona ya leída (modificada: no se puede desalojar sin guardarla)."""
+        with self._red._lock:
+            zona = self._recientes.pop(id_zona, None) or self._liberadas.pop(id_zona, None)
+            if zona is not None:
+                self._fijadas[id_zona] = zona
+
+    def get_fijadas(self) -> Dict[int, Zona]:
+        """Devuelve las zonas fijas (agregadas o modificadas desde el último guardado)."""
+        with self._red._lock:
+            return dict(self._fijadas)
+
+    def soltar(self, ids: List[int]) -> None:
+        """Devuelve al LRU las zonas fijas indicadas (ya guardadas)."""
+        with self._red._lock:
+            for id_zona in ids:
+                zona = self._fijadas.pop(id_zona, None)
+                if zona is not None:
+                    self._recientes[id_zona] = zona
+            self._desalojar()
+
+    def get_cantidad_en_memoria(self) -> int:
+        """Devuelve la cantidad de zonas retenidas (LRU y fijas)."""
+        with self._red._lock:
+            return len(self._recientes) + len(self._fijadas)
+
+    def _desalojar(self) -> None:
+        """Libera las zonas menos usadas que exceden la capacidad del LRU."""
+        while len(self._recientes) > self._capacidad:
+            id_zona, zona = self._recientes.popitem(last=False)
+            self._liberadas[id_zona] = zona
+
+    def _olvidar(self, id_zona: int) -> None:
+        """Quita una zona de todas las estructuras en memoria."""
+        self._fijadas.pop(id_zona, None)
+        self._recientes.pop(id_zona, None)
+        self._liberadas.pop(id_zona, None)
+
+
+class RedDiferida(RedMonitoreo):
+    """
+    Red de monitoreo cuyas zonas se cargan bajo demanda desde un directorio
+    con un registro por zona (codec binario) y un índice pequeño.
+
+    Abrir la red lee solo el índice: los datos generales y los totales están
+    disponibles de inmediato, y cada Zona (con sus sensores y usuarios) se
+    materializa recién cuando se accede a ella (`get_zona`, `get_zonas`,
+    `iterar_zonas`). Un LRU de `capacidad` zonas permite que las zonas frías
+    se liberen de memoria (y sus filas del SensorStore); si se vuelven a
+    pedir, se leen otra vez del archivo.
+
+    Las zonas agregadas y las marcadas con `marcar_modificada` (también como
+    Observer de EventoSensorAmbiental) quedan fijas en memoria hasta `guardar`,
+    que agrega sus registros al final del archivo de zonas y reemplaza el
+    índice de forma atómica. `compactar` reescribe el archivo sin los
+    registros reemplazados. Los cambios a una zona sin marcar se pierden al
+    desalojarla.
+
+    Los usuarios se guardan con cada zona: un usuario asignado a varias zonas
+    se materializa como un objeto distinto en cada una.
+    """
+
+    def __init__(self, directorio: str, capacidad: int = RED_DIFERIDA_ZONAS_EN_MEMORIA):
+        """
+        Abre la red de un directorio escrito con RedDiferida.escribir (lee solo el índice).
+
+        Args:
+            directorio: Directorio de la red.
+            capacidad: Zonas leídas que se retienen en memoria (LRU).
+
+        Raises:
+            FileNotFoundError: Si el directorio no contiene una red.
+            ValueError: Si el índice está dañado.
+        """
+        self._directorio = directorio
+        self._lock = threading.RLock()
+        encabezado, ubicacion, descripcion, entradas = RedDiferida._leer_indice(
+            os.path.join(directorio, _NOMBRE_INDICE))
+        _, id_red, total_sensores, total_zonas, _, principal, generacion, _, _, _ = encabezado
+        self._id_red = id_red
+        self._ubicacion = ubicacion
+        self._descripcion = descripcion
+        self._total_sensores = total_sensores
+        self._total_zonas = total_zonas
+        self._generacion = generacion
+        self._datos = open(self._ruta_datos(generacion), "rb")
+
+        self._entradas: Dict[int, Entrada] = {}
+        ids: List[int] = []
+        externa: Optional[Entrada] = None
+        for posicion, (id_zona, desplazamiento, largo, crc, sensores, en_red) in enumerate(entradas.tolist()):
+            entrada = (desplazamiento, largo, crc, sensores)
+            if en_red:
+                self._entradas[id_zona] = entrada
+                ids.append(id_zona)
+            elif posicion == principal:
+                externa = entrada
+        self._zonas = _ZonasDiferidas(self, ids, capacidad)
+
+        # La zona principal se guarda por id si pertenece a la red; si no (externa), se lee ahora
+        self._id_principal: Optional[int] = None
+        self._zona_principal: Optional[Zona] = None
+        self._entrada_externa = externa
+        self._externa_modificada = False
+        if 0 <= principal < len(entradas):
+            if entradas["en_red"][principal]:
+                self._id_principal = int(entradas["id_zona"][principal])
+            elif externa is not None:
+                self._zona_principal = self._decodificar(externa)
+
+    # -----------------------------------------------------------------------
+    # Escritura completa
+    # -----------------------------------------------------------------------
+    @classmethod
+    def escribir(cls, red: RedMonitoreo, directorio: str,
+                 capacidad: int = RED_DIFERIDA_ZONAS_EN_MEMORIA) -> "RedDiferida":
+        """
+        Escribe una red completa en el directorio (un registro por zona y el
+        índice) y la abre de forma diferida. Reemplaza la red que hubiera en el
+        directorio.
+
+        Raises:
+            ValueError: Si la red contiene una clase de sensor no registrada en el codec.
+        """
+        os.makedirs(directorio, exist_ok=True)
+        generacion = max((g for g, _ in cls._archivos_datos(directorio)), default=0) + 1
+        zonas = red.get_zonas()
+        en_red = len(zonas)
+        principal = red.get_zona_principal()
+        posicion_principal = -1
+        if principal is not None:
+            posicion_principal = next((i for i, zona in enumerate(zonas) if zona is principal), len(zonas))
+            if posicion_principal == len(zonas):
+                zonas.append(principal)
+
+        ruta_datos = os.path.join(directorio, f"zonas.{generacion:06d}.dat")
+        filas = []
+        with open(ruta_datos, "wb") as f:
+            for posicion, zona in enumerate(zonas):
+                filas.append(cls._agregar_registro(f, zona, posicion < en_red))
+            f.flush()
+            os.fsync(f.fileno())
+        fsync_directorio(directorio)
+        escribir_atomico(os.path.join(directorio, _NOMBRE_INDICE), lambda f: cls._escribir_indice(
+            f, red, generacion, posicion_principal, np.array(filas, dtype=DTYPE_INDICE_ZONAS)))
+        cls._depurar(directorio, generacion)
+        print(f"[RedDiferida] Red escrita en {directorio} ({len(zonas)} zonas).")
+        return cls(directorio, capacidad)
+
+    # -----------------------------------------------------------------------
+    # Zonas
+    # -----------------------------------------------------------------------
+    def get_zona_principal(self) -> Optional[Zona]:
+        """Devuelve la zona principal de esta red (la lee si todavía no está en memoria)."""
+        if self._id_principal is not None:
+            return self._zonas.get(self._id_principal)
+        return self._zona_principal
+
+    def set_zona_principal(self, zona: Zona) -> None:
+        """Asigna una zona principal a la red."""
+        with self._lock:
+            id_zona = zona.get_id_zona()
+            if id_zona in self._zonas and self._zonas[id_zona] is zona:
+                self._id_principal, self._zona_principal = id_zona, None
+            else:
+                self._id_principal, self._zona_principal = None, zona
+                self._externa_modificada = True
+
+    def remover_zona(self, id_zona: int) -> Optional[Zona]:
+        """Quita una zona de la red (si existe) y la devuelve."""
+        with self._lock:
+            zona = super().remover_zona(id_zona)
+            if zona is not None and id_zona == self._id_principal:
+                self._id_principal = None
+            return zona
+
+    def iterar_zonas(self) -> Iterator[Zona]:
+        """
+        Recorre las zonas de la red en orden de alta, leyéndolas de a una: a
+        diferencia de `get_zonas`, no necesita todas las zonas en memoria a la vez.
+        """
+        for id_zona in self._zonas:
+            zona = self._zonas.get(id_zona)
+            if zona is not None:
+                yield zona
+
+    def get_ids_zonas(self) -> List[int]:
+        """Devuelve los ids de las zonas de la red en orden de alta (sin leerlas)."""
+        return list(self._zonas)
+
+    def get_zonas_en_memoria(self) -> int:
+        """Devuelve la cantidad de zonas retenidas en memoria."""
+        return self._zonas.get_cantidad_en_memoria()
+
+    # -----------------------------------------------------------------------
+    # Zonas modificadas (también como Observer)
+    # -----------------------------------------------------------------------
+    def marcar_modificada(self, zona: Union[Zona, int]) -> None:
+        """Marca una zona (o su id) como modificada: queda en memoria hasta el próximo `guardar`."""
+        id_zona = zona.get_id_zona() if isinstance(zona, Zona) else zona
+        with self._lock:
+            if self._zona_principal is not None and self._zona_principal.get_id_zona() == id_zona:
+                self._externa_modificada = True
+            self._zonas.fijar(id_zona)
+
+    def actualizar(self, evento: EventoSensorAmbiental) -> None:
+        """Recibe una lectura (Observer) y marca su zona como modificada."""
+        if evento.id_zona is not None:
+            self.marcar_modificada(evento.id_zona)
+
+    def actualizar_lote(self, lote: "EventoLote") -> None:
+        """Recibe un lote de lecturas (Observer) y marca sus zonas como modificadas."""
+        for id_zona in {e.id_zona for e in lote.eventos if e.id_zona is not None}:
+            self.marcar_modificada(id_zona)
+
+    def actualizar_lecturas(self, lote: LoteLecturas) -> None:
+        """Recibe un lote columnar de lecturas y marca sus zonas como modificadas."""
+        ids = np.unique(lote.ids_zona)
+        for id_zona in ids[ids >= 0].tolist():
+            self.marcar_modificada(id_zona)
+
+    # -----------------------------------------------------------------------
+    # Guardado
+    # -----------------------------------------------------------------------
+    def guardar(self) -> int:
+        """
+        Agrega al archivo de zonas los registros de las zonas agregadas o
+        modificadas y reemplaza el índice de forma atómica (una caída a mitad
+        de camino deja vigente el índice anterior). Las zonas guardadas vuelven
+        al LRU.
+
+        Returns:
+            Cantidad de zonas escritas.
+        """
+        with self._lock:
+            fijadas = self._zonas.get_fijadas()
+            externa = self._zona_principal if self._id_principal is None else None
+            with open(self._ruta_datos(self._generacion), "ab") as f:
+                for id_zona, zona in fijadas.items():
+                    _, desplazamiento, largo, crc, sensores, _ = RedDiferida._agregar_registro(f, zona, True)
+                    self._entradas[id_zona] = (desplazamiento, largo, crc, sensores)
+                if externa is not None and (self._externa_modificada or self._entrada_externa is None):
+                    self._entrada_externa = RedDiferida._agregar_registro(f, externa, False)[1:5]
+                f.flush()
+                os.fsync(f.fileno())
+            self._externa_modificada = False
+            self._escribir_indice_actual()
+            self._zonas.soltar(list(fijadas))
+            print(f"[RedDiferida] {len(fijadas)} zonas guardadas en {self._directorio}.")
+            return len(fijadas)
+
+    def compactar(self) -> None:
+        """
+        Guarda las zonas pendientes y reescribe el archivo de zonas con solo
+        los registros vigentes (en orden de alta), en una generación nueva.
+        """
+        with self._lock:
+            self.guardar()
+            generacion = self._generacion + 1
+            entradas: Dict[int, Entrada] = {}
+            with open(self._ruta_datos(generacion), "wb") as f:
+                for id_zona in self._zonas:
+                    entradas[id_zona] = self._copiar_registro(f, self._entradas[id_zona])
+                if self._zona_principal is not None:
+                    self._entrada_externa = self._copiar_registro(f, self._entrada_externa)
+                f.flush()
+                os.fsync(f.fileno())
+            fsync_directorio(self._directorio)
+            anterior = self._datos
+            self._generacion, self._entradas = generacion, entradas
+            self._datos = open(self._ruta_datos(generacion), "rb")
+            self._escribir_indice_actual()
+            anterior.close()
+            RedDiferida._depurar(self._directorio, generacion)
+            print(f"[RedDiferida] Archivo de zonas compactado (generación {generacion}).")
+
+    def cerrar(self) -> None:
+        """Cierra el archivo de zonas (las zonas que no estén en memoria ya no se pueden leer)."""
+        with self._lock:
+            self._datos.close()
+
+    def get_directorio(self) -> str:
+        """Devuelve el directorio de la red."""
+        return self._directorio
+
+    # -----------------------------------------------------------------------
+    # Auxiliares
+    # -----------------------------------------------------------------------
+    def _leer_zona(self, id_zona: int) -> Zona:
+        """Lee del archivo la zona con el id indicado (llamado por _ZonasDiferidas con el lock tomado)."""
+        return self._decodificar(self._entradas[id_zona])
+
+    def _decodificar(self, entrada: Entrada) -> Zona:
+        """Lee un registro de zona y verifica su CRC32."""
+        desplazamiento, largo, crc, _ = entrada
+        self._datos.seek(desplazamiento)
+        datos = self._datos.read(largo)
+        if len(datos) != largo:
+            raise EOFError("Archivo de zonas cortado.")
+        if zlib.crc32(datos) != crc:
+            raise ValueError("Registro de zona dañado (CRC32 inválido).")
+        return decodificar_zona(datos, self)
+
+    def _copiar_registro(self, archivo: BinaryIO, entrada: Entrada) -> Entrada:
+        """Copia un registro vigente (sin decodificarlo) al final de otro archivo de zonas."""
+        desplazamiento, largo, crc, sensores = entrada
+        self._datos.seek(desplazamiento)
+        nuevo = archivo.tell()
+        archivo.write(self._datos.read(largo))
+        return nuevo, largo, crc, sensores
+
+    def _escribir_indice_actual(self) -> None:
+        """Reemplaza el índice con las entradas vigentes (zonas de la red y, al final, la principal externa)."""
+        filas = [(id_zona, *self._entradas[id_zona], True) for id_zona in self._zonas]
+        principal = -1
+        if self._id_principal is not None:
+            principal = list(self._zonas).index(self._id_principal)
+        elif self._zona_principal is not None:
+            principal = len(filas)
+            filas.append((self._zona_principal.get_id_zona(), *self._entrada_externa, False))
+        escribir_atomico(os.path.join(self._directorio, _NOMBRE_INDICE), lambda f: RedDiferida._escribir_indice(
+            f, self, self._generacion, principal, np.array(filas, dtype=DTYPE_INDICE_ZONAS)))
+
+    def _ruta_datos(self, generacion: int) -> str:
+        """Devuelve la ruta del archivo de zonas de una generación."""
+        return os.path.join(self._directorio, f"zonas.{generacion:06d}.dat")
+
+    @staticmethod
+    def _agregar_registro(archivo: BinaryIO, zona: Zona, en_red: bool) -> tuple:
+        """Escribe el registro de una zona al final del archivo; devuelve su fila del índice."""
+        datos = codificar_zona(zona)
+        desplazamiento = archivo.tell()
+        archivo.write(datos)
+        return zona.get_id_zona(), desplazamiento, len(datos), zlib.crc32(datos), zona.get_cantidad_sensores(), en_red
+
+    @staticmethod
+    def _escribir_indice(archivo: BinaryIO, red: RedMonitoreo, generacion: int, principal: int,
+                         filas: np.ndarray) -> None:
+        """Escribe el índice: encabezado con los datos de la red, sus textos y las entradas de zona."""
+        ubicacion = red.get_ubicacion().encode("utf-8")
+        descripcion = red.get_descripcion().encode("utf-8")
+        cuerpo = ubicacion + descripcion + filas.tobytes()
+        archivo.write(ENCABEZADO_INDICE_ZONAS.pack(
+            FIRMA_INDICE_ZONAS, red.get_id(), red.get_total_sensores(), red.get_total_zonas(), len(filas),
+            principal, generacion, len(ubicacion), len(descripcion), zlib.crc32(cuerpo)))
+        archivo.write(cuerpo)
+
+    @staticmethod
+    def _leer_indice(ruta: str) -> Tuple[tuple, str, str, np.ndarray]:
+        """Lee y verifica el índice; devuelve el encabezado, la ubicación, la descripción y las entradas."""
+        with open(ruta, "rb") as f:
+            datos = f.read()
+        if len(datos) < ENCABEZADO_INDICE_ZONAS.size:
+            raise EOFError(f"Índice de zonas cortado: {ruta}")
+        encabezado = ENCABEZADO_INDICE_ZONAS.unpack_from(datos)
+        firma, _, _, _, cantidad, _, _, largo_ubicacion, largo_descripcion, crc = encabezado
+        if firma != FIRMA_INDICE_ZONAS:
+            raise ValueError(f"{ruta} no es un índice de zonas.")
+        cuerpo = memoryview(datos)[ENCABEZADO_INDICE_ZONAS.size:]
+        if len(cuerpo) != largo_ubicacion + largo_descripcion + cantidad * DTYPE_INDICE_ZONAS.itemsize:
+            raise EOFError(f"Índice de zonas cortado: {ruta}")
+        if zlib.crc32(cuerpo) != crc:
+            raise ValueError(f"Índice de zonas dañado (CRC32 inválido): {ruta}")
+        ubicacion = bytes(cuerpo[:largo_ubicacion]).decode("utf-8")
+        fin_textos = largo_ubicacion + largo_descripcion
+        descripcion = bytes(cuerpo[largo_ubicacion:fin_textos]).decode("utf-8")
+        return encabezado, ubicacion, descripcion, np.frombuffer(cuerpo[fin_textos:], dtype=DTYPE_INDICE_ZONAS)
+
+    @staticmethod
+    def _archivos_datos(directorio: str) -> List[Tuple[int, str]]:
+        """Devuelve (generación, nombre) de los archivos de zonas del directorio."""
+        encontrados = []
+        for nombre in os.listdir(directorio):
+            coincidencia = _PATRON_DATOS.match(nombre)
+            if coincidencia:
+                encontrados.append((int(coincidencia.group(1)), nombre))
+        return encontrados
+
+    @staticmethod
+    def _depurar(directorio: str, generacion: int) -> None:
+        """Borra los archivos de zonas de otras generaciones (el índice vigente ya no los referencia)."""
+        for otra, nombre in RedDiferida._archivos_datos(directorio):
+            if otra != generacion:
+                os.remove(os.path.join(directorio, nombre))
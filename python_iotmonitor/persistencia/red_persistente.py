@@ -0,0 +1,373 @@
+import pickle
+import struct
+import threading
+import time
+from typing import List, Optional, Sequence, TYPE_CHECKING
+import numpy as np
+from python_iotmonitor.entidades.zonas.red_monitoreo import RedMonitoreo
+from python_iotmonitor.entidades.zonas.zona import Zona
+from python_iotmonitor.entidades.sensores.sensor import Sensor
+from python_iotmonitor.entidades.sensores.sensor_store import SensorStore
+from python_iotmonitor.patrones.observer.eventos.evento_sensor_ambiental import EventoSensorAmbiental
+from python_iotmonitor.patrones.observer.eventos.lote_lecturas import LoteLecturas, DTYPE_LECTURA
+from python_iotmonitor.persistencia.bitacora_wal import BitacoraWAL, TipoRegistroWAL
+from python_iotmonitor.persistencia.escritura_atomica import escribir_atomico
+from python_iotmonitor.persistencia.serializacion_red import serializar_entidad, deserializar_entidad
+from python_iotmonitor.constantes import WAL_CHECKPOINT_BYTES
+
+if TYPE_CHECKING:
+    from python_iotmonitor.entidades.usuarios.usuario import Usuario
+    from python_iotmonitor.patrones.observer.eventos.evento_lote import EventoLote
+
+# Formatos de los registros de la bitácora
+_ID_ZONA = struct.Struct("<q")
+_ID_ZONA_SENSOR = struct.Struct("<qq")
+_ESTADO_SENSOR = struct.Struct("<qq??")
+
+
+class RedPersistente:
+    """
+    Red de monitoreo persistida con bitácora de escritura anticipada (WAL).
+
+    Las mutaciones de entidades (altas y bajas de zonas y sensores, estado de
+    sensores, usuarios) y las lecturas se agregan a la bitácora como registros
+    compactos; `confirmar` los hace durables con un único fsync, por lo que el
+    costo de guardar es proporcional a lo que cambió. Periódicamente se escribe
+    un checkpoint con la red completa y la bitácora vuelve a empezar.
+
+    La recuperación carga el último checkpoint y reaplica la bitácora que le sigue.
+    Los valores de sensores registrados con `registrar_valores` se reaplican; el
+    flujo de lecturas (`registrar_lecturas` y el rol de Observer de
+    EventoSensorAmbiental) queda en la bitácora como historial, acumulado y
+    escrito como un único registro columnar en cada `confirmar`.
+
+    Archivos: `<ruta_base>.ckpt` (checkpoint) y `<ruta_base>.wal` (bitácora).
+    """
+
+    def __init__(self, red: RedMonitoreo, ruta_base: str, generacion: int,
+                 checkpoint_bytes: int = WAL_CHECKPOINT_BYTES):
+        """
+        Usar RedPersistente.crear o RedPersistente.recuperar.
+
+        Args:
+            red: Red de monitoreo en memoria.
+            ruta_base: Ruta de los archivos sin extensión.
+            generacion: Generación del último checkpoint escrito.
+            checkpoint_bytes: Tamaño de bitácora que dispara un checkpoint en `confirmar`.
+        """
+        self._red = red
+        self._ruta_base = ruta_base
+        self._checkpoint_bytes = checkpoint_bytes
+        self._lock = threading.RLock()
+        self._bitacora = BitacoraWAL(ruta_base + ".wal", generacion)
+        self._eventos: List[tuple] = []  # lecturas del Observer pendientes de escribir
+        self._lock_eventos = threading.Lock()
+
+    # -----------------------------------------------------------------------
+    # Creación y recuperación
+    # -----------------------------------------------------------------------
+    @classmethod
+    def crear(cls, red: RedMonitoreo, ruta_base: str,
+              checkpoint_bytes: int = WAL_CHECKPOINT_BYTES) -> "RedPersistente":
+        """
+        Comienza a persistir una red: escribe su checkpoint inicial y una bitácora vacía.
+        Reemplaza los archivos existentes en `ruta_base`: la generación nueva sigue a
+        la de la bitácora existente, así su contenido nunca se reaplica sobre este checkpoint
+        (ni si el proceso cae antes de reiniciarla).
+        """
+        generacion_anterior, _ = BitacoraWAL.leer(ruta_base + ".wal")
+        generacion = (generacion_anterior or 0) + 1
+        RedPersistente._escribir_checkpoint(ruta_base, generacion, red)
+        return cls(red, ruta_base, generacion, checkpoint_bytes)
+
+    @classmethod
+    def recuperar(cls, ruta_base: str, checkpoint_bytes: int = WAL_CHECKPOINT_BYTES) -> "RedPersistente":
+        """
+        Recupera la red: carga el último checkpoint y reaplica la bitácora que le sigue.
+        Una bitácora de una generación anterior (caída entre el checkpoint y el
+        reinicio de la bitácora) ya está incluida en el checkpoint y se descarta.
+
+        Raises:
+            FileNotFoundError: Si no existe el checkpoint.
+        """
+        with open(ruta_base + ".ckpt", "rb") as f:
+            generacion, red = pickle.load(f)
+
+        generacion_wal, registros = BitacoraWAL.leer(ruta_base + ".wal")
+        aplicados = 0
+        if generacion_wal == generacion:
+            lecturas: List[np.ndarray] = []
+            for tipo, datos in registros:
+                if tipo is TipoRegistroWAL.VALORES_SENSORES:
+                    lecturas.append(np.frombuffer(datos, dtype=DTYPE_LECTURA))
+                elif tipo is not TipoRegistroWAL.LECTURAS:
+                    RedPersistente._aplicar_lecturas(red, lecturas)
+                    lecturas = []
+                    RedPersistente._aplicar(red, tipo, datos)
+                aplicados += 1
+            RedPersistente._aplicar_lecturas(red, lecturas)
+        print(f"[RedPersistente] Red recuperada (checkpoint {generacion}, {aplicados} registros de bitácora).")
+        return cls(red, ruta_base, generacion, checkpoint_bytes)
+
+    # -----------------------------------------------------------------------
+    # Acceso
+    # -----------------------------------------------------------------------
+    def get_red(self) -> RedMonitoreo:
+        """Devuelve la red de monitoreo persistida."""
+        return self._red
+
+    def get_generacion(self) -> int:
+        """Devuelve la generación del último checkpoint."""
+        return self._bitacora.get_generacion()
+
+    def get_tamano_bitacora(self) -> int:
+        """Devuelve el tamaño actual de la bitácora en bytes."""
+        return self._bitacora.get_tamano()
+
+    # -----------------------------------------------------------------------
+    # Mutaciones de entidades (se aplican a la red y se registran)
+    # -----------------------------------------------------------------------
+    def agregar_zona(self, zona: Zona) -> None:
+        """Agrega una zona (con sus sensores y usuarios) a la red."""
+        with self._lock:
+            self._red.agregar_zona(zona)
+            self._registrar(TipoRegistroWAL.ALTA_ZONA, self._serializar(zona))
+
+    def remover_zona(self, id_zona: int) -> Optional[Zona]:
+        """Quita una zona de la red y la devuelve (None si no existía)."""
+        with self._lock:
+            zona = self._red.remover_zona(id_zona)
+            if zona is not None:
+                self._registrar(TipoRegistroWAL.BAJA_ZONA, _ID_ZONA.pack(id_zona))
+            return zona
+
+    def agregar_sensor(self, zona: Zona, sensor: Sensor) -> None:
+        """
+        Agrega un sensor a una zona de la red.
+
+        Raises:
+            ValueError: Si la zona no pertenece a la red o el sensor ya pertenece a otra zona.
+        """
+        with self._lock:
+            self._validar_zona(zona)
+            zona.agregar_sensor(sensor)
+            self._red.incrementar_sensores(1)
+            self._registrar(TipoRegistroWAL.ALTA_SENSOR,
+                            _ID_ZONA.pack(zona.get_id_zona()) + self._serializar(sensor))
+
+    def remover_sensor(self, zona: Zona, sensor: Sensor) -> None:
+        """
+        Quita un sensor de una zona de la red.
+
+        Raises:
+            ValueError: Si la zona no pertenece a la red.
+        """
+        with self._lock:
+            self._validar_zona(zona)
+            if zona.get_sensor(sensor.get_id()) is not sensor:
+                return
+            zona.remover_sensor(sensor)
+            self._red.decrementar_sensores(1)
+            self._registrar(TipoRegistroWAL.BAJA_SENSOR,
+                            _ID_ZONA_SENSOR.pack(zona.get_id_zona(), sensor.get_id()))
+
+    def registrar_estado_sensor(self, zona: Zona, sensor: Sensor) -> None:
+        """Registra el estado actual (activo / calibrado) de un sensor de la zona."""
+        with self._lock:
+            self._validar_zona(zona)
+            self._registrar(TipoRegistroWAL.ESTADO_SENSOR, _ESTADO_SENSOR.pack(
+                zona.get_id_zona(), sensor.get_id(), sensor.esta_activo(), sensor.esta_calibrado()
+            ))
+
+    def set_usuarios(self, zona: Zona, usuarios: List["Usuario"]) -> None:
+        """Reemplaza los usuarios asignados a una zona de la red."""
+        with self._lock:
+            self._validar_zona(zona)
+            zona.set_usuarios(usuarios)
+            self._registrar(TipoRegistroWAL.USUARIOS_ZONA,
+                            _ID_ZONA.pack(zona.get_id_zona()) + self._serializar(zona.get_usuarios()))
+
+    # -----------------------------------------------------------------------
+    # Lecturas
+    # -----------------------------------------------------------------------
+    def registrar_lecturas(self, lote: LoteLecturas) -> None:
+        """Registra un lote columnar de lecturas en el historial de la bitácora."""
+        if len(lote):
+            with self._lock:
+                self._registrar(TipoRegistroWAL.LECTURAS, lote.get_datos().tobytes())
+
+    def registrar_valores(self, zonas: Sequence[Zona]) -> int:
+        """
+        Registra el valor actual de todos los sensores de las zonas indicadas
+        (p. ej. después de ZonaService.simular_lecturas_zonas). Al recuperar,
+        cada sensor vuelve al último valor registrado.
+
+        Returns:
+            Cantidad de lecturas registradas (los sensores sin lectura se omiten).
+        """
+        zonas = [zona for zona in zonas if zona.get_cantidad_sensores()]
+        if not zonas:
+            return 0
+        indices_por_zona = [zona.get_indices_store() for zona in zonas]
+        indices = np.concatenate(indices_por_zona)
+        ids_zona = np.repeat([zona.get_id_zona() for zona in zonas], [len(i) for i in indices_por_zona])
+        store = SensorStore.get_instance()
+        valores = store.columna("valor", indices)
+        con_lectura = ~np.isnan(valores)
+        lote = LoteLecturas.desde_columnas(
+            store.columna("id_sensor", indices)[con_lectura],
+            store.columna("codigo_tipo", indices)[con_lectura],
+            valores[con_lectura], time.time_ns(), ids_zona[con_lectura],
+        )
+        if len(lote):
+            with self._lock:
+                self._registrar(TipoRegistroWAL.VALORES_SENSORES, lote.get_datos().tobytes())
+        return len(lote)
+
+    def actualizar(self, evento: EventoSensorAmbiental) -> None:
+        """Recibe una lectura (Observer) y la deja pendiente hasta el próximo `confirmar`."""
+        with self._lock_eventos:
+            self._eventos.append((
+                evento.id_sensor, evento.codigo_tipo, evento.valor, evento.timestamp_ns,
+                -1 if evento.id_zona is None else evento.id_zona,
+            ))
+
+    def actualizar_lote(self, lote: "EventoLote") -> None:
+        """Recibe un lote de lecturas (Observer) y las deja pendientes hasta el próximo `confirmar`."""
+        filas = [(e.id_sensor, e.codigo_tipo, e.valor, e.timestamp_ns, -1 if e.id_zona is None else e.id_zona)
+                 for e in lote.eventos]
+        with self._lock_eventos:
+            self._eventos.extend(filas)
+
+    def actualizar_lecturas(self, lote: LoteLecturas) -> None:
+        """Recibe un lote columnar de lecturas y lo registra directamente."""
+        self.registrar_lecturas(lote)
+
+    # -----------------------------------------------------------------------
+    # Durabilidad
+    # -----------------------------------------------------------------------
+    def confirmar(self) -> int:
+        """
+        Hace durable todo lo registrado (un único fsync). Pensado para llamarse
+        una vez por ciclo de control. Si la bitácora superó `checkpoint_bytes`,
+        escribe además un checkpoint.
+
+        Returns:
+            Cantidad de registros confirmados.
+        """
+        with self._lock:
+            self._volcar_eventos()
+            confirmados = self._bitacora.confirmar()
+            if self._bitacora.get_tamano() >= self._checkpoint_bytes:
+                self.checkpoint()
+            return confirmados
+
+    def checkpoint(self) -> int:
+        """
+        Escribe la red completa como nuevo checkpoint y reinicia la bitácora.
+
+        Returns:
+            Generación del checkpoint escrito.
+        """
+        with self._lock:
+            self._volcar_eventos()
+            generacion = self._bitacora.get_generacion() + 1
+            RedPersistente._escribir_checkpoint(self._ruta_base, generacion, self._red)
+            self._bitacora.reiniciar(generacion)
+            print(f"[RedPersistente] Checkpoint {generacion} escrito en {self._ruta_base}.ckpt")
+            return generacion
+
+    def cerrar(self) -> None:
+        """Confirma lo pendiente y cierra la bitácora."""
+        with self._lock:
+            self._volcar_eventos()
+            self._bitacora.cerrar()
+
+    # -----------------------------------------------------------------------
+    # Auxiliares
+    # -----------------------------------------------------------------------
+    def _registrar(self, tipo: TipoRegistroWAL, datos: bytes) -> None:
+        """Agrega un registro después de las lecturas pendientes del Observer (conserva el orden)."""
+        self._volcar_eventos()
+        self._bitacora.agregar(tipo, datos)
+
+    def _volcar_eventos(self) -> None:
+        """Escribe las lecturas recibidas como Observer en un único registro columnar."""
+        with self._lock_eventos:
+            eventos, self._eventos = self._eventos, []
+        if eventos:
+            self._bitacora.agregar(TipoRegistroWAL.LECTURAS, np.array(eventos, dtype=DTYPE_LECTURA).tobytes())
+
+    def _validar_zona(self, zona: Zona) -> None:
+        """Verifica que la zona pertenezca a la red persistida."""
+        if self._red.get_zona(zona.get_id_zona()) is not zona:
+            raise ValueError(f"La zona {zona.get_id_zona()} no pertenece a la red persistida.")
+
+    def _serializar(self, entidad) -> bytes:
+        """Serializa una entidad guardando la red como referencia."""
+        return serializar_entidad(entidad, self._red)
+
+    @staticmethod
+    def _escribir_checkpoint(ruta_base: str, generacion: int, red: RedMonitoreo) -> None:
+        """Escribe el checkpoint en un archivo temporal y lo reemplaza de forma atómica."""
+        escribir_atomico(ruta_base + ".ckpt",
+                         lambda f: pickle.dump((generacion, red), f, protocol=pickle.HIGHEST_PROTOCOL))
+
+    @staticmethod
+    def _aplicar(red: RedMonitoreo, tipo: TipoRegistroWAL, datos: bytes) -> None:
+        """Reaplica un registro de entidad sobre la red en recuperación."""
+        if tipo is TipoRegistroWAL.ALTA_ZONA:
+            red.agregar_zona(deserializar_entidad(datos, red))
+            return
+        if tipo is TipoRegistroWAL.BAJA_ZONA:
+            red.remover_zona(_ID_ZONA.unpack(datos)[0])
+            return
+
+        id_zona = _ID_ZONA.unpack_from(datos)[0]
+        zona = red.get_zona(id_zona)
+        if zona is None:
+            return  # zona quitada más adelante en la misma bitácora
+        if tipo is TipoRegistroWAL.ALTA_SENSOR:
+            zona.agregar_sensor(deserializar_entidad(datos[_ID_ZONA.size:], red))
+            red.incrementar_sensores(1)
+        elif tipo is TipoRegistroWAL.BAJA_SENSOR:
+            sensor = zona.get_sensor(_ID_ZONA_SENSOR.unpack(datos)[1])
+            if sensor is not None:
+                zona.remover_sensor(sensor)
+                red.decrementar_sensores(1)
+        elif tipo is TipoRegistroWAL.ESTADO_SENSOR:
+            _, id_sensor, activo, calibrado = _ESTADO_SENSOR.unpack(datos)
+            sensor = zona.get_sensor(id_sensor)
+            if sensor is not None:
+                sensor._activo = activo
+                sensor._calibrado = calibrado
+                zona.actualizar_estado_sensor(sensor)
+        elif tipo is TipoRegistroWAL.USUARIOS_ZONA:
+            zona.set_usuarios(deserializar_entidad(datos[_ID_ZONA.size:], red))
+
+    @staticmethod
+    def _aplicar_lecturas(red: RedMonitoreo, bloques: List[np.ndarray]) -> None:
+        """Aplica el último valor de cada sensor de las lecturas con zona y recalcula las alertas."""
+        if not bloques:
+            return
+        datos = np.concatenate(bloques)
+        datos = datos[datos["id_zona"] >= 0]
+        # np.unique devuelve la primera aparición; se invierte para quedarse con la última
+        claves = np.stack([datos["id_zona"].astype(np.int64), datos["id_sensor"]], axis=1)
+        _, posiciones = np.unique(claves[::-1], axis=0, return_index=True)
+        ultimas = datos[::-1][posiciones]
+
+        indices: List[int] = []
+        valores: List[float] = []
+        zonas = {}
+        for id_zona, id_sensor, valor in zip(ultimas["id_zona"].tolist(), ultimas["id_sensor"].tolist(),
+                                             ultimas["valor"].tolist()):
+            zona = red.get_zona(id_zona)
+            sensor = zona.get_sensor(id_sensor) if zona is not None else None
+            if sensor is not None:
+                indices.append(sensor.get_indice_store())
+                valores.append(valor)
+                zonas[id_zona] = zona
+        if indices:
+            SensorStore.get_instance().escribir_lote(np.asarray(indices, dtype=np.intp), np.asarray(valores))
+            Zona.recalcular_alertas_zonas(list(zonas.values()))
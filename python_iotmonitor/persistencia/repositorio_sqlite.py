@@ -0,0 +1,517 @@
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+import numpy as np
+from python_iotmonitor.entidades.sensores.sensor import Sensor
+from python_iotmonitor.entidades.sensores.sensor_store import SensorStore
+from python_iotmonitor.entidades.usuarios.credencial_acceso import CredencialAcceso
+from python_iotmonitor.entidades.usuarios.dispositivo_asignado import DispositivoAsignado
+from python_iotmonitor.entidades.usuarios.tarea_usuario import TareaUsuario
+from python_iotmonitor.entidades.usuarios.usuario import Usuario
+from python_iotmonitor.entidades.zonas.red_monitoreo import RedMonitoreo
+from python_iotmonitor.entidades.zonas.zona import Zona
+from python_iotmonitor.patrones.observer.eventos.evento_sensor_ambiental import EventoSensorAmbiental
+from python_iotmonitor.patrones.observer.eventos.lote_lecturas import LoteLecturas, DTYPE_LECTURA
+from python_iotmonitor.persistencia.codec_binario import ESQUEMAS_SENSORES, crear_sensores, nombre_esquema_sensor
+from python_iotmonitor.constantes import SQLITE_SINCRONIZACION
+
+if TYPE_CHECKING:
+    from python_iotmonitor.patrones.observer.eventos.evento_lote import EventoLote
+
+# Las relaciones dentro de una red se guardan por posición (como en el codec binario):
+# "zona" es la posición de la zona, "sensor" el número del sensor y "usuario" la posición del
+# usuario (un sensor o un usuario compartido por varias zonas se guarda una vez)
+ESQUEMA_SQLITE = """
+CREATE TABLE IF NOT EXISTS redes (
+    id_red INTEGER PRIMARY KEY,
+    ubicacion TEXT NOT NULL,
+    descripcion TEXT NOT NULL,
+    total_sensores INTEGER NOT NULL,
+    total_zonas INTEGER NOT NULL,
+    zona_principal INTEGER
+);
+CREATE TABLE IF NOT EXISTS zonas (
+    id_red INTEGER NOT NULL,
+    posicion INTEGER NOT NULL,
+    id_zona INTEGER NOT NULL,
+    nombre TEXT NOT NULL,
+    tipo TEXT,
+    alertas_activas INTEGER NOT NULL,
+    en_red INTEGER NOT NULL,
+    PRIMARY KEY (id_red, posicion)
+);
+CREATE TABLE IF NOT EXISTS sensores (
+    id_red INTEGER NOT NULL,
+    numero INTEGER NOT NULL,
+    id_sensor INTEGER NOT NULL,
+    clase TEXT NOT NULL,
+    codigo_tipo INTEGER NOT NULL,
+    unidad TEXT NOT NULL,
+    valor REAL,
+    rango_min REAL,
+    rango_max REAL,
+    activo INTEGER NOT NULL,
+    calibrado INTEGER NOT NULL,
+    version INTEGER NOT NULL,
+    atributos TEXT NOT NULL,
+    PRIMARY KEY (id_red, numero)
+);
+CREATE TABLE IF NOT EXISTS zona_sensor (
+    id_red INTEGER NOT NULL,
+    zona INTEGER NOT NULL,
+    posicion INTEGER NOT NULL,
+    sensor INTEGER NOT NULL,
+    PRIMARY KEY (id_red, zona, posicion)
+);
+CREATE TABLE IF NOT EXISTS usuarios (
+    id_red INTEGER NOT NULL,
+    posicion INTEGER NOT NULL,
+    id_usuario INTEGER NOT NULL,
+    nombre TEXT NOT NULL,
+    rol TEXT NOT NULL,
+    credencial_activa INTEGER NOT NULL,
+    credencial_emision TEXT,
+    credencial_observaciones TEXT,
+    PRIMARY KEY (id_red, posicion)
+);
+CREATE TABLE IF NOT EXISTS tareas (
+    id_red INTEGER NOT NULL,
+    usuario INTEGER NOT NULL,
+    id_tarea INTEGER NOT NULL,
+    descripcion TEXT NOT NULL,
+    fecha_asignada TEXT,
+    completada INTEGER NOT NULL,
+    id_dispositivo INTEGER NOT NULL,
+    nombre_dispositivo TEXT NOT NULL,
+    dispositivo_verificado INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS zona_usuario (
+    id_red INTEGER NOT NULL,
+    zona INTEGER NOT NULL,
+    usuario INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lecturas (
+    id_sensor INTEGER NOT NULL,
+    codigo_tipo INTEGER NOT NULL,
+    valor REAL,
+    ts INTEGER NOT NULL,
+    id_zona INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_lecturas_sensor_ts ON lecturas (id_sensor, ts);
+CREATE INDEX IF NOT EXISTS idx_sensores_id ON sensores (id_red, id_sensor);
+CREATE INDEX IF NOT EXISTS idx_tareas_red ON tareas (id_red);
+CREATE INDEX IF NOT EXISTS idx_zona_usuario_red ON zona_usuario (id_red);
+"""
+_TABLAS_RED = ("zonas", "sensores", "zona_sensor", "usuarios", "tareas", "zona_usuario")
+_COLUMNAS_STORE = ("valor", "rango_min", "rango_max", "activo", "calibrado", "version")
+_INSERTAR_LECTURAS = "INSERT INTO lecturas (id_sensor, codigo_tipo, valor, ts, id_zona) VALUES (?, ?, ?, ?, ?)"
+
+
+class RepositorioSQLite:
+    """
+    Persistencia de redes de monitoreo y del historial de lecturas en SQLite
+    (módulo sqlite3 de la biblioteca estándar), alternativa a los servicios
+    basados en pickle.
+
+    La base trabaja en modo WAL: las lecturas no bloquean a las escrituras y
+    cada confirmación agrega páginas a la bitácora en lugar de reescribir la
+    base. Las redes se guardan completas en una transacción (filas armadas
+    por columnas e insertadas con `executemany`). Las lecturas que llegan como
+    Observer o con `registrar_lecturas` se acumulan y `confirmar` (una vez
+    por ciclo de control) las inserta en lote y hace un único commit. El
+    índice (id_sensor, ts) hace baratas las consultas del historial de un
+    sensor; `consultar` permite consultas SQL arbitrarias.
+    """
+
+    def __init__(self, ruta: str, sincronizacion: str = SQLITE_SINCRONIZACION):
+        """
+        Abre (o crea) la base y su esquema.
+
+        Args:
+            ruta: Ruta del archivo de la base.
+            sincronizacion: Valor de PRAGMA synchronous (en modo WAL, NORMAL no
+                corrompe la base ante una caída; FULL además hace durable cada commit).
+        """
+        self._ruta = ruta
+        self._lock = threading.RLock()
+        self._conexion = sqlite3.connect(ruta, isolation_level=None, check_same_thread=False)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute(f"PRAGMA synchronous={sincronizacion}")
+        self._conexion.executescript(ESQUEMA_SQLITE)
+        self._lotes: List[np.ndarray] = []  # lecturas pendientes hasta el próximo `confirmar`
+        self._eventos: List[tuple] = []  # lecturas del Observer pendientes
+        self._valores: List[tuple] = []  # valores de sensores pendientes (registrar_valores)
+        self._lock_eventos = threading.Lock()
+
+    # -----------------------------------------------------------------------
+    # Redes
+    # -----------------------------------------------------------------------
+    def guardar_red(self, red: RedMonitoreo) -> None:
+        """
+        Guarda la red completa (zonas, sensores, usuarios y tareas) en una
+        transacción, reemplazando la versión anterior con el mismo id.
+
+        Raises:
+            ValueError: Si la red contiene una clase de sensor no registrada en el codec.
+        """
+        zonas = red.get_zonas()
+        en_red = len(zonas)
+        principal = red.get_zona_principal()
+        posicion_principal = None
+        if principal is not None:
+            posicion_principal = next((i for i, zona in enumerate(zonas) if zona is principal), len(zonas))
+            if posicion_principal == len(zonas):
+                zonas.append(principal)
+        id_red = red.get_id()
+        filas_sensores, filas_pertenencias = RepositorioSQLite._filas_sensores(id_red, zonas)
+        filas_usuarios, filas_tareas, filas_asignaciones = RepositorioSQLite._filas_usuarios(id_red, zonas)
+
+        with self._lock:
+            self._conexion.execute("BEGIN")
+            try:
+                for tabla in _TABLAS_RED:
+                    self._conexion.execute(f"DELETE FROM {tabla} WHERE id_red = ?", (id_red,))
+                self._conexion.execute(
+                    "INSERT OR REPLACE INTO redes VALUES (?, ?, ?, ?, ?, ?)",
+                    (id_red, red.get_ubicacion(), red.get_descripcion(), red.get_total_sensores(),
+                     red.get_total_zonas(), posicion_principal))
+                self._conexion.executemany(
+                    "INSERT INTO zonas VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(id_red, posicion, zona.get_id_zona(), zona.get_nombre(), zona.get_tipo(),
+                      zona.get_alertas_activas(), posicion < en_red) for posicion, zona in enumerate(zonas)])
+                self._conexion.executemany(
+                    "INSERT INTO sensores VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", filas_sensores)
+                self._conexion.executemany("INSERT INTO zona_sensor VALUES (?, ?, ?, ?)", filas_pertenencias)
+                self._conexion.executemany("INSERT INTO usuarios VALUES (?, ?, ?, ?, ?, ?, ?, ?)", filas_usuarios)
+                self._conexion.executemany("INSERT INTO tareas VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", filas_tareas)
+                self._conexion.executemany("INSERT INTO zona_usuario VALUES (?, ?, ?)", filas_asignaciones)
+                self._conexion.execute("COMMIT")
+            except BaseException:
+                self._conexion.execute("ROLLBACK")
+                raise
+        print(f"[RepositorioSQLite] Red {id_red} guardada ({len(zonas)} zonas, {len(filas_sensores)} sensores).")
+
+    def cargar_red(self, id_red: int) -> RedMonitoreo:
+        """
+        Carga una red guardada con `guardar_red`.
+
+        Raises:
+            KeyError: Si la base no contiene la red.
+            ValueError: Si un sensor es de una clase no registrada en el codec.
+        """
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT ubicacion, descripcion, total_sensores, total_zonas, zona_principal "
+                "FROM redes WHERE id_red = ?", (id_red,)).fetchone()
+            if fila is None:
+                raise KeyError(id_red)
+            filas_zonas = self._conexion.execute(
+                "SELECT id_zona, nombre, tipo, alertas_activas, en_red FROM zonas "
+                "WHERE id_red = ? ORDER BY posicion", (id_red,)).fetchall()
+            filas_sensores = self._conexion.execute(
+                "SELECT clase, id_sensor, codigo_tipo, unidad, valor, rango_min, rango_max, activo, "
+                "calibrado, version, atributos FROM sensores WHERE id_red = ? ORDER BY numero",
+                (id_red,)).fetchall()
+            filas_pertenencias = self._conexion.execute(
+                "SELECT zona, sensor FROM zona_sensor WHERE id_red = ? ORDER BY zona, posicion", (id_red,)).fetchall()
+            filas_usuarios = self._conexion.execute(
+                "SELECT id_usuario, nombre, rol, credencial_activa, credencial_emision, credencial_observaciones "
+                "FROM usuarios WHERE id_red = ? ORDER BY posicion", (id_red,)).fetchall()
+            filas_tareas = self._conexion.execute(
+                "SELECT usuario, id_tarea, descripcion, fecha_asignada, completada, id_dispositivo, "
+                "nombre_dispositivo, dispositivo_verificado FROM tareas WHERE id_red = ? ORDER BY rowid",
+                (id_red,)).fetchall()
+            filas_asignaciones = self._conexion.execute(
+                "SELECT zona, usuario FROM zona_usuario WHERE id_red = ? ORDER BY rowid", (id_red,)).fetchall()
+
+        ubicacion, descripcion, total_sensores, total_zonas, principal = fila
+        red = RedMonitoreo(id_red, ubicacion, descripcion)
+        red._total_sensores, red._total_zonas = total_sensores, total_zonas
+        zonas = []
+        for id_zona, nombre, tipo, alertas, _ in filas_zonas:
+            zona = Zona(id_zona, nombre, red, tipo)
+            zona._alertas_activas = alertas
+            zonas.append(zona)
+        sensores = RepositorioSQLite._crear_sensores(filas_sensores)
+        sensores_por_zona: List[List[Sensor]] = [[] for _ in zonas]
+        for posicion_zona, numero in filas_pertenencias:
+            sensores_por_zona[posicion_zona].append(sensores[numero])
+        Zona.cargar_sensores_zonas(zonas, sensores_por_zona)
+
+        usuarios = RepositorioSQLite._crear_usuarios(filas_usuarios, filas_tareas)
+        por_zona: Dict[int, List[Usuario]] = {}
+        for posicion_zona, posicion_usuario in filas_asignaciones:
+            por_zona.setdefault(posicion_zona, []).append(usuarios[posicion_usuario])
+        for posicion_zona, asignados in por_zona.items():
+            zonas[posicion_zona].set_usuarios(asignados)
+
+        for zona, (_, _, _, _, en_red) in zip(zonas, filas_zonas):
+            if en_red:
+                red._zonas[zona.get_id_zona()] = zona
+        if principal is not None:
+            red._zona_principal = zonas[principal]
+        return red
+
+    def get_ids_redes(self) -> List[int]:
+        """Devuelve los ids de las redes guardadas."""
+        with self._lock:
+            return [fila[0] for fila in self._conexion.execute("SELECT id_red FROM redes ORDER BY id_red")]
+
+    # -----------------------------------------------------------------------
+    # Lecturas (también como Observer)
+    # -----------------------------------------------------------------------
+    def registrar_lecturas(self, lote: LoteLecturas) -> None:
+        """Deja un lote columnar de lecturas pendiente hasta el próximo `confirmar`."""
+        if len(lote):
+            with self._lock_eventos:
+                self._lotes.append(lote.get_datos().copy())
+
+    def registrar_valores(self, zonas: Sequence[Zona]) -> int:
+        """
+        Registra el valor actual de todos los sensores de las zonas indicadas
+        (p. ej. después de ZonaService.simular_lecturas_zonas): se agregan al
+        historial y actualizan la tabla de sensores en el próximo `confirmar`.
+
+        Returns:
+            Cantidad de lecturas registradas (los sensores sin lectura se omiten).
+            Las lecturas de zonas sin red van al historial, pero no actualizan la tabla de sensores.
+        """
+        zonas = [zona for zona in zonas if zona.get_cantidad_sensores()]
+        if not zonas:
+            return 0
+        redes = [zona.get_red() for zona in zonas]
+        for zona, red in zip(zonas, redes):
+            if red is None:
+                print(f"[RepositorioSQLite] Zona '{zona.get_nombre()}' sin red: sus valores solo se agregan al historial.")
+        indices_por_zona = [zona.get_indices_store() for zona in zonas]
+        indices = np.concatenate(indices_por_zona)
+        cantidades = [len(i) for i in indices_por_zona]
+        ids_zona = np.repeat([zona.get_id_zona() for zona in zonas], cantidades)
+        ids_red = np.repeat([0 if red is None else red.get_id() for red in redes], cantidades)
+        con_red = np.repeat([red is not None for red in redes], cantidades)
+        store = SensorStore.get_instance()
+        valores = store.columna("valor", indices)
+        con_lectura = ~np.isnan(valores)
+        ids_sensor = store.columna("id_sensor", indices)[con_lectura]
+        lote = LoteLecturas.desde_columnas(
+            ids_sensor, store.columna("codigo_tipo", indices)[con_lectura],
+            valores[con_lectura], time.time_ns(), ids_zona[con_lectura],
+        )
+        en_tabla = con_lectura & con_red
+        filas = list(zip(valores[en_tabla].tolist(), store.columna("version", indices)[en_tabla].tolist(),
+                         ids_red[en_tabla].tolist(), store.columna("id_sensor", indices)[en_tabla].tolist()))
+        self.registrar_lecturas(lote)
+        with self._lock_eventos:
+            self._valores.extend(filas)
+        return len(lote)
+
+    def actualizar(self, evento: EventoSensorAmbiental) -> None:
+        """Recibe una lectura (Observer) y la deja pendiente hasta el próximo `confirmar`."""
+        with self._lock_eventos:
+            self._eventos.append((
+                evento.id_sensor, evento.codigo_tipo, evento.valor, evento.timestamp_ns,
+                -1 if evento.id_zona is None else evento.id_zona,
+            ))
+
+    def actualizar_lote(self, lote: "EventoLote") -> None:
+        """Recibe un lote de lecturas (Observer) y las deja pendientes hasta el próximo `confirmar`."""
+        filas = [(e.id_sensor, e.codigo_tipo, e.valor, e.timestamp_ns, -1 if e.id_zona is None else e.id_zona)
+                 for e in lote.eventos]
+        with self._lock_eventos:
+            self._eventos.extend(filas)
+
+    def actualizar_lecturas(self, lote: LoteLecturas) -> None:
+        """Recibe un lote columnar de lecturas y lo deja pendiente hasta el próximo `confirmar`."""
+        self.registrar_lecturas(lote)
+
+    def confirmar(self) -> int:
+        """
+        Inserta las lecturas y valores pendientes con `executemany` y hace un
+        único commit. Pensado para llamarse una vez por ciclo de control.
+
+        Si la transacción falla (p. ej. la base está bloqueada), lo pendiente
+        se conserva para el próximo `confirmar` y se propaga el error.
+
+        Returns:
+            Cantidad de lecturas insertadas.
+
+        Raises:
+            sqlite3.Error: Si no se pudo confirmar la transacción.
+        """
+        with self._lock_eventos:
+            lotes, self._lotes = self._lotes, []
+            eventos, self._eventos = self._eventos, []
+            valores, self._valores = self._valores, []
+        if eventos:
+            lotes.append(np.array(eventos, dtype=DTYPE_LECTURA))
+        if not lotes and not valores:
+            return 0
+        # El orden de DTYPE_LECTURA coincide con el de las columnas del INSERT
+        filas = np.concatenate(lotes).tolist() if lotes else []
+        with self._lock:
+            try:
+                self._conexion.execute("BEGIN")
+                self._conexion.executemany(_INSERTAR_LECTURAS, filas)
+                self._conexion.executemany(
+                    "UPDATE sensores SET valor = ?, version = ? WHERE id_red = ? AND id_sensor = ?", valores)
+                self._conexion.execute("COMMIT")
+            except BaseException:
+                if self._conexion.in_transaction:
+                    self._conexion.execute("ROLLBACK")
+                # Vuelven a quedar pendientes, antes de lo que llegó mientras tanto
+                with self._lock_eventos:
+                    self._lotes[:0] = lotes
+                    self._valores[:0] = valores
+                raise
+        return len(filas)
+
+    def consultar_lecturas(self, id_sensor: int, desde_ns: Optional[int] = None,
+                           hasta_ns: Optional[int] = None) -> LoteLecturas:
+        """
+        Devuelve las lecturas confirmadas de un sensor en [desde_ns, hasta_ns],
+        ordenadas por tiempo (usa el índice (id_sensor, ts)).
+        """
+        desde = np.iinfo(np.int64).min if desde_ns is None else desde_ns
+        hasta = np.iinfo(np.int64).max if hasta_ns is None else hasta_ns
+        with self._lock:
+            filas = self._conexion.execute(
+                "SELECT id_sensor, codigo_tipo, valor, ts, id_zona FROM lecturas "
+                "WHERE id_sensor = ? AND ts BETWEEN ? AND ? ORDER BY ts", (id_sensor, desde, hasta)).fetchall()
+        # SQLite guarda NaN como NULL
+        return LoteLecturas(np.array([fila if fila[2] is not None else (*fila[:2], np.nan, *fila[3:])
+                                      for fila in filas], dtype=DTYPE_LECTURA))
+
+    def consultar(self, sql: str, parametros: Sequence = ()) -> List[tuple]:
+        """Ejecuta una consulta SQL arbitraria sobre la base y devuelve sus filas."""
+        with self._lock:
+            return self._conexion.execute(sql, parametros).fetchall()
+
+    def cerrar(self) -> None:
+        """Confirma lo pendiente y cierra la base."""
+        self.confirmar()
+        with self._lock:
+            self._conexion.close()
+
+    def get_ruta(self) -> str:
+        """Devuelve la ruta de la base."""
+        return self._ruta
+
+    # -----------------------------------------------------------------------
+    # Conversión de entidades
+    # -----------------------------------------------------------------------
+    @staticmethod
+    def _filas_sensores(id_red: int, zonas: List[Zona]) -> Tuple[List[tuple], List[tuple]]:
+        """
+        Arma las filas de los sensores (una por objeto; el estado se lee del
+        SensorStore por columnas) y las de su pertenencia a cada zona.
+        """
+        numeros: Dict[int, int] = {}  # id(sensor) → número
+        sensores: List[Sensor] = []
+        pertenencias: List[tuple] = []
+        for posicion_zona, zona in enumerate(zonas):
+            for posicion, sensor in enumerate(zona.get_sensores_internal()):
+                numero = numeros.get(id(sensor))
+                if numero is None:
+                    numero = numeros[id(sensor)] = len(sensores)
+                    sensores.append(sensor)
+                pertenencias.append((id_red, posicion_zona, posicion, numero))
+        if not sensores:
+            return [], []
+        store = SensorStore.get_instance()
+        indices = np.fromiter((sensor.get_indice_store() for sensor in sensores), dtype=np.intp, count=len(sensores))
+        columnas = [store.columna(columna, indices) for columna in _COLUMNAS_STORE]
+        # SQLite no distingue NaN de NULL: los valores sin lectura quedan en NULL
+        columnas[:3] = [np.where(np.isnan(columna), None, columna).tolist() for columna in columnas[:3]]
+        columnas[3:] = [columna.tolist() for columna in columnas[3:]]
+        nombres = {clase: nombre_esquema_sensor(clase) for clase in {type(sensor) for sensor in sensores}}
+        atributos = [
+            json.dumps({atributo: sensor.__dict__.get(atributo, omision)
+                        for atributo, _, omision in ESQUEMAS_SENSORES[nombres[type(sensor)]][1]})
+            for sensor in sensores
+        ]
+        filas = [
+            (id_red, numero, sensor.get_id(), nombres[type(sensor)], int(sensor.get_codigo_tipo()),
+             sensor.get_unidad(), *estado, atributos_sensor)
+            for numero, (sensor, atributos_sensor, *estado) in enumerate(zip(sensores, atributos, *columnas))
+        ]
+        return filas, pertenencias
+
+    @staticmethod
+    def _filas_usuarios(id_red: int, zonas: List[Zona]) -> Tuple[List[tuple], List[tuple], List[tuple]]:
+        """Arma las filas de usuarios (uno por objeto), tareas y asignaciones a zonas."""
+        posiciones: Dict[int, int] = {}  # id(usuario) → posición
+        usuarios, tareas, asignaciones = [], [], []
+        for posicion_zona, zona in enumerate(zonas):
+            for usuario in zona.get_usuarios():
+                posicion = posiciones.get(id(usuario))
+                if posicion is None:
+                    posicion = posiciones[id(usuario)] = len(usuarios)
+                    credencial = usuario.get_credencial()
+                    usuarios.append((id_red, posicion, usuario.get_id(), usuario.get_nombre(), usuario.get_rol(),
+                                     credencial.esta_activa(), _fecha_a_texto(credencial.get_fecha_emision()),
+                                     credencial.get_observaciones()))
+                    for tarea in usuario.get_tareas():
+                        dispositivo = tarea.get_dispositivo()
+                        tareas.append((id_red, posicion, tarea.get_id(), tarea.get_descripcion(),
+                                       _fecha_a_texto(tarea.get_fecha_asignada()), tarea.esta_completada(),
+                                       dispositivo.get_id(), dispositivo.get_nombre(), dispositivo.esta_verificado()))
+                asignaciones.append((id_red, posicion_zona, posicion))
+        return usuarios, tareas, asignaciones
+
+    @staticmethod
+    def _crear_sensores(filas: List[tuple]) -> List[Sensor]:
+        """Crea los sensores por clase (reserva masiva en el SensorStore) y los devuelve en orden de número."""
+        por_clase: Dict[str, List[int]] = {}
+        for numero, fila in enumerate(filas):
+            por_clase.setdefault(fila[0], []).append(numero)
+        sensores: List[Optional[Sensor]] = [None] * len(filas)
+        for nombre, numeros in por_clase.items():
+            if nombre not in ESQUEMAS_SENSORES:
+                raise ValueError(f"Clase de sensor desconocida en la base: {nombre}")
+            clase, campos = ESQUEMAS_SENSORES[nombre]
+            filas_clase = [filas[numero] for numero in numeros]
+            _, ids, codigos, unidades, valores, minimos, maximos, activos, calibrados, versiones, atributos = zip(
+                *filas_clase)
+            atributos = [json.loads(texto) for texto in atributos]
+            creados = crear_sensores(
+                clase, np.array(ids, dtype="<i8"), np.array(codigos, dtype="u1"), list(unidades),
+                {"valor": np.array(valores, dtype="<f8"), "rango_min": np.array(minimos, dtype="<f8"),
+                 "rango_max": np.array(maximos, dtype="<f8"), "activo": np.array(activos, dtype=bool),
+                 "calibrado": np.array(calibrados, dtype=bool), "version": np.array(versiones, dtype="<i8")},
+                {atributo: [valores_sensor.get(atributo, omision) for valores_sensor in atributos]
+                 for atributo, _, omision in campos},
+            )
+            for numero, sensor in zip(numeros, creados):
+                sensores[numero] = sensor
+        return sensores
+
+    @staticmethod
+    def _crear_usuarios(filas_usuarios: List[tuple], filas_tareas: List[tuple]) -> List[Usuario]:
+        """Crea los usuarios (en orden de posición) con sus credenciales y tareas."""
+        usuarios = []
+        for id_usuario, nombre, rol, activa, emision, observaciones in filas_usuarios:
+            usuario = Usuario.__new__(Usuario)
+            usuario._id_usuario, usuario._nombre, usuario._rol = id_usuario, nombre, rol
+            usuario._credencial = CredencialAcceso(bool(activa), _texto_a_fecha(emision), observaciones)
+            usuario._tareas = []
+            usuarios.append(usuario)
+        for posicion, id_tarea, descripcion, fecha, completada, id_dispositivo, nombre, verificado in filas_tareas:
+            dispositivo = DispositivoAsignado.__new__(DispositivoAsignado)  # ya se verificó al crearlo
+            dispositivo._id, dispositivo._nombre, dispositivo._verificado = id_dispositivo, nombre, bool(verificado)
+            tarea = TareaUsuario(id_tarea, descripcion, _texto_a_fecha(fecha), dispositivo)
+            tarea.set_completada(bool(completada))
+            usuarios[posicion].agregar_tarea(tarea)
+        return usuarios
+
+
+def _fecha_a_texto(fecha: Optional[datetime]) -> Optional[str]:
+    """Convierte una fecha a texto ISO 8601 (legible en consultas SQL)."""
+    return None if fecha is None else fecha.isoformat()
+
+
+def _texto_a_fecha(texto: Optional[str]) -> Optional[datetime]:
+    """Inversa de _fecha_a_texto."""
+    return None if texto is None else datetime.fromisoformat(texto)
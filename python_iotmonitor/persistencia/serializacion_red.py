@@ -0,0 +1,54 @@
+import io
+import pickle
+from python_iotmonitor.entidades.zonas.red_monitoreo import RedMonitoreo
+
+# Marca con la que se reemplaza la referencia a la red dentro de zonas y sensores serializados
+_REFERENCIA_RED = "red"
+
+
+class _PicklerRed(pickle.Pickler):
+    """Pickler que guarda la red como referencia (la entidad serializada no arrastra toda la red)."""
+
+    def __init__(self, archivo, red: RedMonitoreo):
+        super().__init__(archivo, protocol=pickle.HIGHEST_PROTOCOL)
+        self._red = red
+
+    def persistent_id(self, obj):
+        return _REFERENCIA_RED if obj is self._red else None
+
+
+class _UnpicklerRed(pickle.Unpickler):
+    """Unpickler que resuelve la referencia a la red con la red en recuperación."""
+
+    def __init__(self, archivo, red: RedMonitoreo):
+        super().__init__(archivo)
+        self._red = red
+
+    def persistent_load(self, pid):
+        if pid != _REFERENCIA_RED:
+            raise pickle.UnpicklingError(f"Referencia persistente desconocida: {pid!r}")
+        return self._red
+
+
+def serializar_entidad(entidad, red: RedMonitoreo) -> bytes:
+    """
+    Serializa una entidad de la red (zona, sensor, usuarios) guardando la red como referencia.
+
+    Args:
+        entidad: Entidad a serializar.
+        red: Red a la que pertenece la entidad.
+    """
+    buffer = io.BytesIO()
+    _PicklerRed(buffer, red).dump(entidad)
+    return buffer.getvalue()
+
+
+def deserializar_entidad(datos: bytes, red: RedMonitoreo):
+    """
+    Deserializa una entidad escrita con `serializar_entidad`, vinculándola a `red`.
+
+    Args:
+        datos: Bytes de la entidad serializada.
+        red: Red que reemplaza la referencia guardada.
+    """
+    return _UnpicklerRed(io.BytesIO(datos), red).load()
@@ -0,0 +1,257 @@
+import os
+import pickle
+import re
+import threading
+from typing import BinaryIO, Dict, List, Set, Tuple, Union, TYPE_CHECKING
+import numpy as np
+from python_iotmonitor.entidades.zonas.red_monitoreo import RedMonitoreo
+from python_iotmonitor.entidades.zonas.zona import Zona
+from python_iotmonitor.patrones.observer.eventos.evento_sensor_ambiental import EventoSensorAmbiental
+from python_iotmonitor.patrones.observer.eventos.lote_lecturas import LoteLecturas
+from python_iotmonitor.persistencia.escritura_atomica import escribir_atomico, fsync_directorio, ERRORES_LECTURA
+from python_iotmonitor.persistencia.serializacion_red import serializar_entidad, deserializar_entidad
+from python_iotmonitor.constantes import SNAPSHOT_GENERACIONES
+
+if TYPE_CHECKING:
+    from python_iotmonitor.patrones.observer.eventos.evento_lote import EventoLote
+
+# Nombres de archivo dentro del directorio del snapshot
+_PATRON_MANIFIESTO = re.compile(r"^manifiesto\.(\d+)$")
+_PREFIJO_ZONA = "zona_"
+
+
+class _PicklerManifiesto(pickle.Pickler):
+    """Pickler de la red que guarda sus zonas como referencias (cada zona tiene su propio archivo)."""
+
+    def __init__(self, archivo):
+        super().__init__(archivo, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def persistent_id(self, obj):
+        return ("zona", obj.get_id_zona()) if isinstance(obj, Zona) else None
+
+
+class _UnpicklerManifiesto(pickle.Unpickler):
+    """Unpickler de la red: las referencias a zonas se reemplazan al cargar los archivos de zona."""
+
+    def persistent_load(self, pid):
+        return pid
+
+
+class SnapshotIncrementalRed:
+    """
+    Snapshots de la red de monitoreo que solo reescriben las zonas modificadas.
+
+    Cada zona se guarda en su propio archivo y un manifiesto por generación
+    (`manifiesto.<generacion>`) indica qué archivo corresponde a cada zona.
+    Un snapshot escribe archivos nuevos solo para las zonas marcadas como
+    modificadas (o agregadas) desde el anterior y reutiliza el resto; el
+    manifiesto se escribe al final de forma atómica, por lo que una caída a
+    mitad de camino deja vigente el snapshot anterior. Se conservan las
+    últimas `generaciones` versiones.
+
+    También es un Observer de EventoSensorAmbiental: cada lectura con zona
+    marca esa zona como modificada.
+    """
+
+    def __init__(self, red: RedMonitoreo, directorio: str, generaciones: int = SNAPSHOT_GENERACIONES):
+        """
+        Inicializa el escritor de snapshots. El primer snapshot escribe todas las zonas.
+
+        Args:
+            red: Red de monitoreo a guardar.
+            directorio: Directorio de los snapshots (se crea si no existe).
+            generaciones: Cantidad de snapshots completos que se conservan.
+        """
+        os.makedirs(directorio, exist_ok=True)
+        self._red = red
+        self._directorio = directorio
+        self._generaciones = max(1, generaciones)
+        self._lock = threading.Lock()  # protege el conjunto de zonas modificadas
+        self._lock_escritura = threading.Lock()
+        self._modificadas: Set[int] = set()
+        self._archivos: Dict[int, str] = {}  # archivo vigente de cada zona (último snapshot)
+        manifiestos = SnapshotIncrementalRed._manifiestos(directorio)
+        self._generacion = manifiestos[0][0] if manifiestos else 0
+
+    # -----------------------------------------------------------------------
+    # Carga
+    # -----------------------------------------------------------------------
+    @classmethod
+    def cargar(cls, directorio: str, generaciones: int = SNAPSHOT_GENERACIONES) -> "SnapshotIncrementalRed":
+        """
+        Carga la red del snapshot más reciente que se pueda leer completo
+        (si el último está dañado, se usa el anterior).
+
+        Returns:
+            Escritor de snapshots sobre la red cargada, listo para continuar incrementalmente.
+
+        Raises:
+            FileNotFoundError: Si el directorio no contiene snapshots.
+            Exception: El error del snapshot más reciente, si ninguno se pudo leer.
+        """
+        manifiestos = cls._manifiestos(directorio)
+        if not manifiestos:
+            raise FileNotFoundError(f"No hay snapshots de la red en {directorio}")
+        primer_error = None
+        for generacion, ruta in manifiestos:
+            try:
+                red, archivos = cls._leer(directorio, ruta)
+            except ERRORES_LECTURA as e:
+                print(f"[SnapshotIncrementalRed] Snapshot {generacion} ilegible ({e.__class__.__name__}); "
+                      f"se intenta con el anterior.")
+                primer_error = primer_error or e
+                continue
+            snapshot = cls(red, directorio, generaciones)
+            snapshot._archivos = archivos
+            print(f"[SnapshotIncrementalRed] Red cargada desde el snapshot {generacion} ({len(archivos)} zonas).")
+            return snapshot
+        raise primer_error
+
+    # -----------------------------------------------------------------------
+    # Zonas modificadas
+    # -----------------------------------------------------------------------
+    def marcar_modificada(self, zona: Union[Zona, int]) -> None:
+        """Marca una zona (o su id) para reescribirla en el próximo snapshot."""
+        id_zona = zona.get_id_zona() if isinstance(zona, Zona) else zona
+        with self._lock:
+            self._modificadas.add(id_zona)
+
+    def marcar_todas(self) -> None:
+        """Marca todas las zonas de la red para reescribirlas en el próximo snapshot."""
+        ids = [zona.get_id_zona() for zona in self._red.get_zonas()]
+        with self._lock:
+            self._modificadas.update(ids)
+
+    def get_modificadas(self) -> Set[int]:
+        """Devuelve los ids de las zonas marcadas como modificadas."""
+        with self._lock:
+            return set(self._modificadas)
+
+    def actualizar(self, evento: EventoSensorAmbiental) -> None:
+        """Recibe una lectura (Observer) y marca su zona como modificada."""
+        if evento.id_zona is not None:
+            self.marcar_modificada(evento.id_zona)
+
+    def actualizar_lote(self, lote: "EventoLote") -> None:
+        """Recibe un lote de lecturas (Observer) y marca sus zonas como modificadas."""
+        ids = {e.id_zona for e in lote.eventos if e.id_zona is not None}
+        with self._lock:
+            self._modificadas.update(ids)
+
+    def actualizar_lecturas(self, lote: LoteLecturas) -> None:
+        """Recibe un lote columnar de lecturas y marca sus zonas como modificadas."""
+        ids = np.unique(lote.ids_zona)
+        with self._lock:
+            self._modificadas.update(ids[ids >= 0].tolist())
+
+    # -----------------------------------------------------------------------
+    # Escritura
+    # -----------------------------------------------------------------------
+    def escribir(self) -> int:
+        """
+        Escribe un snapshot nuevo: las zonas modificadas o nuevas van a archivos
+        nuevos, las demás se reutilizan y el manifiesto se reemplaza al final.
+
+        Returns:
+            Cantidad de zonas escritas.
+        """
+        with self._lock_escritura:
+            with self._lock:
+                modificadas, self._modificadas = self._modificadas, set()
+            generacion = self._generacion + 1
+            try:
+                archivos: Dict[int, str] = {}
+                for zona in self._red.get_zonas():
+                    id_zona = zona.get_id_zona()
+                    archivo = self._archivos.get(id_zona)
+                    if archivo is None or id_zona in modificadas:
+                        archivo = f"{_PREFIJO_ZONA}{id_zona}.{generacion:06d}.snap"
+                        self._escribir_zona(archivo, serializar_entidad(zona, self._red))
+                    archivos[id_zona] = archivo
+                fsync_directorio(self._directorio)
+                escribir_atomico(self._ruta_manifiesto(generacion),
+                                 lambda f: self._escribir_manifiesto(f, generacion, archivos))
+            except BaseException:
+                with self._lock:
+                    self._modificadas |= modificadas  # se reintentan en el próximo snapshot
+                raise
+
+            escritas = sum(1 for archivo in archivos.values() if archivo not in self._archivos.values())
+            self._generacion = generacion
+            self._archivos = archivos
+            self._depurar()
+            print(f"[SnapshotIncrementalRed] Snapshot {generacion}: {escritas} de {len(archivos)} zonas escritas.")
+            return escritas
+
+    def get_red(self) -> RedMonitoreo:
+        """Devuelve la red de monitoreo."""
+        return self._red
+
+    def get_generacion(self) -> int:
+        """Devuelve la generación del último snapshot escrito o cargado."""
+        return self._generacion
+
+    # -----------------------------------------------------------------------
+    # Auxiliares
+    # -----------------------------------------------------------------------
+    def _escribir_zona(self, archivo: str, datos: bytes) -> None:
+        """Escribe el archivo de una zona (nombre nuevo: no reemplaza ningún archivo vigente)."""
+        with open(os.path.join(self._directorio, archivo), "wb") as f:
+            f.write(datos)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _escribir_manifiesto(self, archivo: BinaryIO, generacion: int, archivos: Dict[int, str]) -> None:
+        """Escribe el encabezado (generación, archivos, zona principal) y luego la red sin sus zonas."""
+        principal = self._red.get_zona_principal()
+        pickle.dump((generacion, archivos, principal.get_id_zona() if principal is not None else None),
+                    archivo, protocol=pickle.HIGHEST_PROTOCOL)
+        _PicklerManifiesto(archivo).dump(self._red)
+
+    def _ruta_manifiesto(self, generacion: int) -> str:
+        """Devuelve la ruta del manifiesto de una generación."""
+        return os.path.join(self._directorio, f"manifiesto.{generacion:06d}")
+
+    def _depurar(self) -> None:
+        """Borra los manifiestos que exceden las generaciones y los archivos de zona que ya nadie usa."""
+        manifiestos = SnapshotIncrementalRed._manifiestos(self._directorio)
+        for _, ruta in manifiestos[self._generaciones:]:
+            os.remove(ruta)
+
+        en_uso = set(self._archivos.values())
+        for _, ruta in manifiestos[1:self._generaciones]:
+            try:
+                with open(ruta, "rb") as f:
+                    en_uso.update(pickle.load(f)[1].values())
+            except ERRORES_LECTURA:
+                continue
+        for nombre in os.listdir(self._directorio):
+            if (nombre.startswith(_PREFIJO_ZONA) and nombre not in en_uso) or nombre.endswith(".tmp"):
+                os.remove(os.path.join(self._directorio, nombre))
+
+    @staticmethod
+    def _manifiestos(directorio: str) -> List[Tuple[int, str]]:
+        """Devuelve (generación, ruta) de los manifiestos del directorio, del más reciente al más antiguo."""
+        if not os.path.isdir(directorio):
+            return []
+        encontrados = []
+        for nombre in os.listdir(directorio):
+            coincidencia = _PATRON_MANIFIESTO.match(nombre)
+            if coincidencia:
+                encontrados.append((int(coincidencia.group(1)), os.path.join(directorio, nombre)))
+        return sorted(encontrados, reverse=True)
+
+    @staticmethod
+    def _leer(directorio: str, ruta: str) -> Tuple[RedMonitoreo, Dict[int, str]]:
+        """Lee un manifiesto y las zonas que referencia; devuelve la red reconstruida y sus archivos."""
+        with open(ruta, "rb") as f:
+            _, archivos, id_principal = pickle.load(f)
+            red = _UnpicklerManifiesto(f).load()
+
+        zonas: Dict[int, Zona] = {}
+        for id_zona, archivo in archivos.items():
+            with open(os.path.join(directorio, archivo), "rb") as f:
+                zonas[id_zona] = deserializar_entidad(f.read(), red)
+        red._zonas = zonas
+        red._zona_principal = zonas.get(id_principal) if id_principal is not None else None
+        return red, archivos
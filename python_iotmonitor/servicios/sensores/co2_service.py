@@ -1,7 +1,9 @@
 from typing import TYPE_CHECKING
 import random
 from python_iotmonitor.servicios.sensores.sensor_service import SensorService
+from python_iotmonitor.iot_control.control.motor_reglas import MotorReglas, REGLAS_SERVICIO_CO2
 from python_iotmonitor.entidades.sensores.sensor import Sensor
+from python_iotmonitor.entidades.sensores.tipo_sensor import TipoSensor
 
 if TYPE_CHECKING:
     from python_iotmonitor.entidades.sensores.sensor import Sensor
@@ -10,23 +12,20 @@ if TYPE_CHECKING:
 class CO2Service(SensorService):
     """Servicio con lógica específica para sensores de CO₂."""
 
+    MOTOR_POR_DEFECTO = MotorReglas(REGLAS_SERVICIO_CO2)
+
     def procesar_lectura(self, sensor: "Sensor") -> None:
         """
         Procesa la lectura actual de CO₂ y simula la activación
         de mecanismos de ventilación o alertas (US-008, US-010).
         """
-        if sensor.get_tipo().lower() not in ["co2", "dioxido de carbono"]:
+        if sensor.get_codigo_tipo() != TipoSensor.CO2:
             raise TypeError("CO2Service solo puede operar con sensores de tipo 'CO₂'.")
 
         valor_actual = sensor.get_valor_actual()
 
-        # --- Lógica de reacción ante niveles de CO₂ ---
-        if valor_actual > 1000:
-            accion = " Nivel crítico — activando ventilación forzada"
-        elif valor_actual > 700:
-            accion = " Nivel alto — aumentando ventilación"
-        else:
-            accion = " Nivel normal de CO₂"
+        # --- Acción según los umbrales propios del servicio ---
+        accion = self.describir_lectura(sensor, "Nivel normal de CO₂")
 
         print(f"[CO2Service] Sensor {sensor.get_tipo()} #{sensor.get_id()} → {valor_actual:.1f} ppm ({accion})")
 
@@ -1,6 +1,8 @@
 from typing import TYPE_CHECKING
 from python_iotmonitor.servicios.sensores.sensor_service import SensorService
+from python_iotmonitor.iot_control.control.motor_reglas import MotorReglas, REGLAS_SERVICIO_LUZ
 from python_iotmonitor.entidades.sensores.sensor import Sensor
+from python_iotmonitor.entidades.sensores.tipo_sensor import TipoSensor
 
 if TYPE_CHECKING:
     from python_iotmonitor.entidades.sensores.sensor import Sensor
@@ -9,22 +11,19 @@ if TYPE_CHECKING:
 class LuzService(SensorService):
     """Servicio con lógica específica para sensores de luz."""
 
+    MOTOR_POR_DEFECTO = MotorReglas(REGLAS_SERVICIO_LUZ)
+
     def procesar_lectura(self, sensor: "Sensor") -> None:
         """
         Procesa la lectura actual de luz y aplica decisiones automáticas
         sobre iluminación ambiental (US-008, US-010).
         """
-        if sensor.get_tipo().lower() not in ["luz", "luminosidad"]:
+        if sensor.get_codigo_tipo() != TipoSensor.LUZ:
             raise TypeError("LuzService solo puede operar con sensores de tipo 'Luz'.")
 
         valor_actual = sensor.get_valor_actual()
 
-        # --- Lógica específica de control lumínico ---
-        if valor_actual < 200:
-            accion = " Intensificando iluminación (ambiente oscuro)"
-        elif valor_actual < 500:
-            accion = " Iluminación adecuada"
-        else:
-            accion = " Ambiente sobreiluminado — reduciendo luz artificial"
+        # --- Acción según los umbrales propios del servicio ---
+        accion = self.describir_lectura(sensor, "Ambiente sobreiluminado — reduciendo luz artificial")
 
         print(f"[LuzService] Sensor {sensor.get_tipo()} #{sensor.get_id()} → {valor_actual:.1f} lux ({accion})")
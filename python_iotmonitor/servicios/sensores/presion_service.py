@@ -1,6 +1,8 @@
 from typing import TYPE_CHECKING
 from python_iotmonitor.servicios.sensores.sensor_service import SensorService
+from python_iotmonitor.iot_control.control.motor_reglas import MotorReglas, REGLAS_ESTADO_PRESION
 from python_iotmonitor.entidades.sensores.sensor import Sensor
+from python_iotmonitor.entidades.sensores.tipo_sensor import TipoSensor
 
 if TYPE_CHECKING:
     from python_iotmonitor.entidades.sensores.sensor import Sensor
@@ -9,23 +11,20 @@ if TYPE_CHECKING:
 class PresionService(SensorService):
     """Servicio con lógica específica para sensores de presión atmosférica."""
 
+    MOTOR_POR_DEFECTO = MotorReglas(REGLAS_ESTADO_PRESION)
+
     def procesar_lectura(self, sensor: "Sensor") -> None:
         """
         Procesa la lectura actual del sensor de presión y aplica
         ajustes o alertas según los valores registrados (US-008).
         """
-        if sensor.get_tipo().lower() not in ["presion", "presión"]:
+        if sensor.get_codigo_tipo() != TipoSensor.PRESION:
             raise TypeError("PresionService solo puede operar con sensores de tipo 'Presión'.")
 
         valor_actual = sensor.get_valor_actual()
 
-        # --- Lógica específica: fluctuaciones de presión ---
-        if valor_actual < 950:
-            estado = " Presión baja — posible tormenta"
-        elif valor_actual > 1030:
-            estado = " Presión alta — clima estable"
-        else:
-            estado = " Presión normal"
+        # --- Estado según los umbrales propios del servicio ---
+        estado = self.describir_lectura(sensor, "Presión normal")
 
         print(f"[PresionService] Sensor {sensor.get_tipo()} #{sensor.get_id()} → {valor_actual:.1f} hPa ({estado})")
 
@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import Optional, Sequence, TYPE_CHECKING
+import numpy as np
 from python_iotmonitor.patrones.strategy.lectura_sensor_strategy import LecturaSensorStrategy
+from python_iotmonitor.iot_control.control.motor_reglas import MotorReglas
 
 if TYPE_CHECKING:
     from python_iotmonitor.entidades.sensores.sensor import Sensor
@@ -13,8 +15,18 @@ class SensorService(ABC):
     utilizado para calcular lecturas y calibraciones.
     """
 
-    def __init__(self, lectura_strategy: LecturaSensorStrategy):
+    # Motor con las reglas propias del servicio (cada subclase define el suyo)
+    MOTOR_POR_DEFECTO: Optional[MotorReglas] = None
+
+    def __init__(self, lectura_strategy: LecturaSensorStrategy, motor_reglas: Optional[MotorReglas] = None):
+        """
+        Args:
+            lectura_strategy: Estrategia de generación de lecturas.
+            motor_reglas: Motor con los umbrales que clasifican cada lectura (por
+                defecto, MOTOR_POR_DEFECTO con las reglas propias del servicio).
+        """
         self._lectura_strategy = lectura_strategy
+        self._motor_reglas = motor_reglas if motor_reglas is not None else self.MOTOR_POR_DEFECTO
 
     # -----------------------------------------------------------------------
     # Lógica específica de cada sensor
@@ -24,6 +36,23 @@ class SensorService(ABC):
         """Lógica específica de procesamiento o transformación de lectura."""
         pass
 
+    def describir_lectura(self, sensor: "Sensor", sin_accion: str) -> str:
+        """
+        Describe la acción (o el estado) que corresponde a la lectura actual del
+        sensor según la primera regla del motor que dispara.
+
+        Args:
+            sensor: Sensor leído.
+            sin_accion: Texto para una lectura que no dispara ninguna regla.
+        """
+        if self._motor_reglas is None:
+            return sin_accion
+        indice = self._motor_reglas.clasificar_lectura(sensor.get_codigo_tipo(), sensor.get_valor_actual())
+        if indice < 0:
+            return sin_accion
+        regla = self._motor_reglas.get_reglas()[indice]
+        return regla.accion.get_mensaje().strip() if regla.accion else regla.nombre
+
     # -----------------------------------------------------------------------
     # Estrategia de lectura común (Strategy)
     # -----------------------------------------------------------------------
@@ -36,6 +65,29 @@ class SensorService(ABC):
         sensor.set_valor_actual(valor_leido)
         return valor_leido
 
+    def aplicar_lectura_lote(self, sensores: Sequence["Sensor"], tiempos: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Versión masiva de aplicar_lectura: genera todas las lecturas con una
+        única llamada vectorizada a la estrategia, las escribe de una vez en el
+        SensorStore y recalcula una sola vez las alertas de cada zona afectada.
+
+        Args:
+            sensores: Sensores a actualizar.
+            tiempos: Marcas de tiempo de cada lectura (opcional, ver generar_lote).
+
+        Returns:
+            Arreglo con los valores generados, en el orden de `sensores`.
+        """
+        valores = self._lectura_strategy.generar_lote(len(sensores), tiempos)
+        if not len(sensores):
+            return valores
+        indices = np.fromiter((sensor.get_indice_store() for sensor in sensores), dtype=np.intp, count=len(sensores))
+        sensores[0].get_store().escribir_lote(indices, valores)
+        zonas = {id(zona): zona for zona in (sensor.get_zona() for sensor in sensores) if zona is not None}
+        for zona in zonas.values():
+            zona.recalcular_alertas()
+        return valores
+
     # -----------------------------------------------------------------------
     # Calibración genérica
     # -----------------------------------------------------------------------
@@ -1,4 +1,5 @@
-from typing import Dict
+from typing import List, Optional, Union
+from python_iotmonitor.entidades.sensores.tipo_sensor import TipoSensor, NOMBRES_TIPO
 from python_iotmonitor.patrones.strategy.impl.lectura_variable_strategy import LecturaVariableStrategy
 from python_iotmonitor.patrones.strategy.impl.lectura_constante_strategy import LecturaConstanteStrategy, TipoConstante
 from python_iotmonitor.servicios.sensores.sensor_service import SensorService
@@ -12,9 +13,10 @@ class SensorServiceRegistry:
     """
     Patrón Registry implementado como Singleton (US-TECH-005).
     Mapea el tipo de sensor a su Service correspondiente con la Strategy inyectada.
+    El registro es una lista indexada por código TipoSensor.
     """
     _instance: "SensorServiceRegistry" = None
-    _registry: Dict[str, SensorService] = {}
+    _registry: List[Optional[SensorService]] = [None] * len(NOMBRES_TIPO)
 
     def __new__(cls):
         """Implementa Singleton simple (sin locks, suficiente en Python)."""
@@ -31,30 +33,31 @@ class SensorServiceRegistry:
 
         # Strategy Variable para sensores dinámicos (temperatura, CO₂)
         variable_strategy = LecturaVariableStrategy()
-        self._registry["Temperatura"] = TemperaturaService(lectura_strategy=variable_strategy)
-        self._registry["CO2"] = CO2Service(lectura_strategy=variable_strategy)
+        self._registry[TipoSensor.TEMPERATURA] = TemperaturaService(lectura_strategy=variable_strategy)
+        self._registry[TipoSensor.CO2] = CO2Service(lectura_strategy=variable_strategy)
 
         # Strategy Constante para sensores estables (humedad, luz)
         constante_humedad = LecturaConstanteStrategy(TipoConstante.HUMEDAD)
         constante_luz = LecturaConstanteStrategy(TipoConstante.LUZ)
-        self._registry["Humedad"] = HumedadService(lectura_strategy=constante_humedad)
-        self._registry["Luz"] = LuzService(lectura_strategy=constante_luz)
+        self._registry[TipoSensor.HUMEDAD] = HumedadService(lectura_strategy=constante_humedad)
+        self._registry[TipoSensor.LUZ] = LuzService(lectura_strategy=constante_luz)
 
     # -----------------------------------------------------------------------
     # Acceso público
     # -----------------------------------------------------------------------
-    def get_service(self, tipo_sensor: str) -> SensorService:
+    def get_service(self, tipo_sensor: Union[TipoSensor, str]) -> SensorService:
         """
         Obtiene el servicio de sensor según su tipo.
         
         Args:
-            tipo_sensor: Tipo textual del sensor (Temperatura, CO2, etc.).
+            tipo_sensor: Código TipoSensor (p. ej. sensor.get_codigo_tipo()); también se
+                acepta el nombre textual (Temperatura, CO2, etc.) en los bordes de entrada.
 
         Raises:
             ValueError: Si no existe un servicio para ese tipo de sensor.
         """
-        tipo_normalizado = tipo_sensor.strip().capitalize()
-        service = self._registry.get(tipo_normalizado)
+        codigo = tipo_sensor if isinstance(tipo_sensor, TipoSensor) else TipoSensor.desde_nombre(tipo_sensor)
+        service = self._registry[codigo]
 
         if service is None:
             raise ValueError(f"Servicio no encontrado para el tipo de sensor: {tipo_sensor}")
@@ -1,6 +1,8 @@
 from typing import TYPE_CHECKING
 from python_iotmonitor.servicios.sensores.sensor_service import SensorService
+from python_iotmonitor.iot_control.control.motor_reglas import MotorReglas, REGLAS_SERVICIO_TEMPERATURA
 from python_iotmonitor.entidades.sensores.sensor import Sensor
+from python_iotmonitor.entidades.sensores.tipo_sensor import TipoSensor
 
 if TYPE_CHECKING:
     from python_iotmonitor.entidades.sensores.sensor import Sensor
@@ -12,22 +14,19 @@ class TemperaturaService(SensorService):
     Implementa la lógica de procesamiento y control térmico básico (US-008, US-010).
     """
 
+    MOTOR_POR_DEFECTO = MotorReglas(REGLAS_SERVICIO_TEMPERATURA)
+
     def procesar_lectura(self, sensor: "Sensor") -> None:
         """
         Lógica de procesamiento para lecturas de temperatura.
-        Aplica ajustes de tendencia térmica según el rango medido.
+        Informa la acción térmica que corresponde según los umbrales del servicio.
         """
-        if sensor.get_tipo().lower() != "temperatura":
+        if sensor.get_codigo_tipo() != TipoSensor.TEMPERATURA:
             raise TypeError("TemperaturaService solo puede operar con sensores de tipo 'Temperatura'.")
 
         valor_actual = sensor.get_valor_actual()
 
-        # Simula un ajuste basado en tendencias térmicas
-        if valor_actual < 10:
-            accion = "Activando calefacción"
-        elif valor_actual > 30:
-            accion = "Activando ventilación"
-        else:
-            accion = "Temperatura estable"
+        # Acción según los umbrales propios del servicio
+        accion = self.describir_lectura(sensor, "Temperatura estable")
 
         print(f"[TemperaturaService] {sensor.get_tipo()} #{sensor.get_id()} → {valor_actual:.2f}°C ({accion})")
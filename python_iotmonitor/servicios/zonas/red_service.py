@@ -1,8 +1,16 @@
 import os
 import pickle
 from python_iotmonitor.entidades.zonas.red_monitoreo import RedMonitoreo
-from python_iotmonitor.constantes import RUTA_PERSISTENCIA
-from python_iotmonitor.excepciones.persistencia_exception import PersistenciaException
+from python_iotmonitor.persistencia.red_persistente import RedPersistente
+from python_iotmonitor.persistencia.escritura_atomica import escribir_atomico, leer_con_respaldo
+from python_iotmonitor.persistencia.snapshot_incremental import SnapshotIncrementalRed
+from python_iotmonitor.persistencia.almacen_series import AlmacenSeries
+from python_iotmonitor.persistencia.codec_binario import codificar_red, cargar_entidades
+from python_iotmonitor.persistencia.red_diferida import RedDiferida
+from python_iotmonitor.persistencia.repositorio_sqlite import RepositorioSQLite
+from python_iotmonitor.constantes import RUTA_PERSISTENCIA, SNAPSHOT_GENERACIONES, RED_DIFERIDA_ZONAS_EN_MEMORIA
+from python_iotmonitor.excepciones.persistencia_exception import PersistenciaException, TipoOperacion
+from python_iotmonitor.excepciones.mensajes_exception import MensajesException
 
 
 class RedMonitoreoService:
@@ -64,29 +72,263 @@ class RedMonitoreoService:
     # -----------------------------------------------------------------------
     # Persistencia (equivalente a RegistroForestalService)
     # -----------------------------------------------------------------------
-    def guardar_red(self, red: RedMonitoreo, nombre_archivo: str = "red_monitoreo.dat") -> None:
+    def guardar_red(self, red: RedMonitoreo, nombre_archivo: str = "red_monitoreo.dat",
+                    generaciones: int = SNAPSHOT_GENERACIONES) -> None:
         """
-        Serializa y guarda la red de monitoreo en /data.
+        Serializa y guarda la red de monitoreo en /data de forma atómica
+        (temporal + fsync + rename), conservando las versiones anteriores.
+
+        Args:
+            red: Red de monitoreo a guardar.
+            nombre_archivo: Nombre del archivo de destino.
+            generaciones: Versiones a conservar (la nueva y `generaciones - 1` respaldos).
+
+        Raises:
+            PersistenciaException: Si no se pudo escribir el archivo.
         """
         ruta = os.path.join(RUTA_PERSISTENCIA, nombre_archivo)
         try:
-            with open(ruta, "wb") as f:
-                pickle.dump(red, f)
+            escribir_atomico(ruta, lambda f: pickle.dump(red, f), generaciones)
             print(f"[OK] Red de monitoreo guardada en: {ruta}")
         except Exception as e:
-            raise PersistenciaException(f"Error al guardar la red: {e}")
+            raise PersistenciaException.from_io_exception(TipoOperacion.ESCRITURA, ruta, e)
+
+    def guardar_red_binaria(self, red: RedMonitoreo, nombre_archivo: str = "red_monitoreo.bin",
+                            generaciones: int = SNAPSHOT_GENERACIONES) -> None:
+        """
+        Guarda la red en /data con el codec binario versionado (ver persistencia/codec_binario.py),
+        de forma atómica y conservando las versiones anteriores. Se carga con `cargar_red`.
+
+        Args:
+            red: Red de monitoreo a guardar.
+            nombre_archivo: Nombre del archivo de destino.
+            generaciones: Versiones a conservar (la nueva y `generaciones - 1` respaldos).
+
+        Raises:
+            PersistenciaException: Si no se pudo escribir el archivo o la red tiene sensores sin esquema.
+        """
+        ruta = os.path.join(RUTA_PERSISTENCIA, nombre_archivo)
+        try:
+            escribir_atomico(ruta, lambda f: codificar_red(red, f), generaciones)
+            print(f"[OK] Red de monitoreo guardada (formato binario) en: {ruta}")
+        except Exception as e:
+            raise PersistenciaException.from_io_exception(TipoOperacion.ESCRITURA, ruta, e)
 
     def cargar_red(self, nombre_archivo: str = "red_monitoreo.dat") -> RedMonitoreo:
         """
-        Carga la red de monitoreo desde un archivo en /data.
+        Carga la red de monitoreo desde un archivo en /data, en formato pickle o
+        binario (se reconoce por su firma). Si la última versión está dañada,
+        se usa la generación anterior.
+
+        Raises:
+            PersistenciaException: Si el archivo no existe o ninguna versión se pudo leer.
         """
         ruta = os.path.join(RUTA_PERSISTENCIA, nombre_archivo)
         try:
-            with open(ruta, "rb") as f:
-                red = pickle.load(f)
+            red = leer_con_respaldo(ruta, cargar_entidades)
             print(f"[OK] Red de monitoreo cargada desde: {ruta}")
             return red
-        except FileNotFoundError:
-            raise PersistenciaException("Archivo de red no encontrado.")
+        except FileNotFoundError as e:
+            raise PersistenciaException.from_io_exception(TipoOperacion.LECTURA, ruta, e)
+        except Exception as e:
+            raise PersistenciaException.from_class_not_found(TipoOperacion.LECTURA, ruta, e)
+
+    # -----------------------------------------------------------------------
+    # Carga diferida (un registro por zona)
+    # -----------------------------------------------------------------------
+    def guardar_red_diferida(self, red: RedMonitoreo, nombre_directorio: str = "red_monitoreo_zonas") -> None:
+        """
+        Guarda la red en /data con un registro por zona y un índice, para
+        abrirla luego con `cargar_red_diferida`.
+
+        Raises:
+            PersistenciaException: Si no se pudo escribir o la red tiene sensores sin esquema.
+        """
+        directorio = os.path.join(RUTA_PERSISTENCIA, nombre_directorio)
+        try:
+            RedDiferida.escribir(red, directorio).cerrar()
+        except Exception as e:
+            raise PersistenciaException.from_io_exception(TipoOperacion.ESCRITURA, directorio, e)
+
+    def cargar_red_diferida(self, nombre_directorio: str = "red_monitoreo_zonas",
+                            capacidad: int = RED_DIFERIDA_ZONAS_EN_MEMORIA) -> RedDiferida:
+        """
+        Abre la red guardada con `guardar_red_diferida` leyendo solo su índice:
+        cada zona se carga en el primer acceso y se retienen en memoria las
+        `capacidad` usadas más recientemente.
+
+        Raises:
+            PersistenciaException: Si no existe la red o su índice está dañado.
+        """
+        directorio = os.path.join(RUTA_PERSISTENCIA, nombre_directorio)
+        try:
+            red = RedDiferida(directorio, capacidad)
+            print(f"[OK] Red de monitoreo abierta (carga diferida) desde: {directorio}")
+            return red
+        except FileNotFoundError as e:
+            raise PersistenciaException.from_io_exception(TipoOperacion.LECTURA, directorio, e)
+        except Exception as e:
+            raise PersistenciaException.from_class_not_found(TipoOperacion.LECTURA, directorio, e)
+
+    # -----------------------------------------------------------------------
+    # Backend SQLite (redes e historial de lecturas consultable)
+    # -----------------------------------------------------------------------
+    def abrir_repositorio_sqlite(self, nombre_archivo: str = "red_monitoreo.sqlite") -> RepositorioSQLite:
+        """
+        Abre (o crea) la base SQLite de /data. Las lecturas se registran con
+        `registrar_lecturas` (o registrándolo como Observer) y se confirman con
+        `confirmar` una vez por ciclo de control.
+
+        Raises:
+            PersistenciaException: Si no se pudo abrir la base.
+        """
+        ruta = os.path.join(RUTA_PERSISTENCIA, nombre_archivo)
+        try:
+            return RepositorioSQLite(ruta)
+        except Exception as e:
+            raise PersistenciaException.from_io_exception(TipoOperacion.ESCRITURA, ruta, e)
+
+    def guardar_red_sqlite(self, red: RedMonitoreo, nombre_archivo: str = "red_monitoreo.sqlite") -> None:
+        """
+        Guarda la red completa en la base SQLite de /data (reemplaza la versión
+        anterior de la misma red). Se carga con `cargar_red_sqlite`.
+
+        Raises:
+            PersistenciaException: Si no se pudo escribir o la red tiene sensores sin esquema.
+        """
+        ruta = os.path.join(RUTA_PERSISTENCIA, nombre_archivo)
+        try:
+            repositorio = RepositorioSQLite(ruta)
+            try:
+                repositorio.guardar_red(red)
+            finally:
+                repositorio.cerrar()
+        except Exception as e:
+            raise PersistenciaException.from_io_exception(TipoOperacion.ESCRITURA, ruta, e)
+
+    def cargar_red_sqlite(self, id_red: int, nombre_archivo: str = "red_monitoreo.sqlite") -> RedMonitoreo:
+        """
+        Carga una red de la base SQLite de /data.
+
+        Raises:
+            PersistenciaException: Si la base no existe, no contiene la red o no se pudo leer.
+        """
+        ruta = os.path.join(RUTA_PERSISTENCIA, nombre_archivo)
+        if not os.path.exists(ruta):
+            raise PersistenciaException.from_io_exception(
+                TipoOperacion.LECTURA, ruta, FileNotFoundError(f"No existe la base {ruta}"))
+        try:
+            repositorio = RepositorioSQLite(ruta)
+            try:
+                red = repositorio.cargar_red(id_red)
+            finally:
+                repositorio.cerrar()
+            print(f"[OK] Red de monitoreo {id_red} cargada desde: {ruta}")
+            return red
+        except KeyError:
+            raise PersistenciaException(
+                TipoOperacion.LECTURA,
+                ruta,
+                KeyError(f"No hay una red con id {id_red}."),
+                error_code=MensajesException.E_05_PERSISTENCIA
+            )
+        except Exception as e:
+            raise PersistenciaException.from_class_not_found(TipoOperacion.LECTURA, ruta, e)
+
+    # -----------------------------------------------------------------------
+    # Snapshots incrementales (solo zonas modificadas)
+    # -----------------------------------------------------------------------
+    def abrir_snapshots_red(self, red: RedMonitoreo, nombre_directorio: str = "red_monitoreo_snapshots",
+                            generaciones: int = SNAPSHOT_GENERACIONES) -> SnapshotIncrementalRed:
+        """
+        Crea el escritor de snapshots incrementales de la red en /data. Las zonas
+        se marcan con `marcar_modificada` (o registrándolo como Observer) y cada
+        `escribir` reescribe solo esas zonas.
+
+        Args:
+            red: Red de monitoreo a guardar.
+            nombre_directorio: Directorio de los snapshots dentro de /data.
+            generaciones: Snapshots completos que se conservan.
+        """
+        return SnapshotIncrementalRed(red, os.path.join(RUTA_PERSISTENCIA, nombre_directorio), generaciones)
+
+    def cargar_snapshots_red(self, nombre_directorio: str = "red_monitoreo_snapshots",
+                             generaciones: int = SNAPSHOT_GENERACIONES) -> SnapshotIncrementalRed:
+        """
+        Carga la red del último snapshot incremental legible de /data.
+
+        Raises:
+            PersistenciaException: Si no hay snapshots o ninguno se pudo leer.
+        """
+        directorio = os.path.join(RUTA_PERSISTENCIA, nombre_directorio)
+        try:
+            return SnapshotIncrementalRed.cargar(directorio, generaciones)
+        except FileNotFoundError as e:
+            raise PersistenciaException.from_io_exception(TipoOperacion.LECTURA, directorio, e)
+        except Exception as e:
+            raise PersistenciaException.from_class_not_found(TipoOperacion.LECTURA, directorio, e)
+
+    # -----------------------------------------------------------------------
+    # Persistencia incremental (checkpoint + bitácora WAL)
+    # -----------------------------------------------------------------------
+    def abrir_red_persistente(self, red: RedMonitoreo, nombre_base: str = "red_monitoreo") -> RedPersistente:
+        """
+        Comienza a persistir la red de forma incremental en /data: escribe un
+        checkpoint inicial y a partir de ahí registra cada cambio en la bitácora.
+
+        Args:
+            red: Red de monitoreo a persistir.
+            nombre_base: Nombre de los archivos (sin extensión: .ckpt y .wal).
+
+        Raises:
+            PersistenciaException: Si no se pudo escribir el checkpoint.
+        """
+        ruta = os.path.join(RUTA_PERSISTENCIA, nombre_base)
+        try:
+            persistente = RedPersistente.crear(red, ruta)
+        except OSError as e:
+            raise PersistenciaException.from_io_exception(TipoOperacion.ESCRITURA, ruta + ".ckpt", e)
+        print(f"[OK] Red de monitoreo persistida con bitácora en: {ruta}.wal")
+        return persistente
+
+    def existe_red_persistente(self, nombre_base: str = "red_monitoreo") -> bool:
+        """Indica si hay un checkpoint de la red en /data (para recuperarla en lugar de crearla)."""
+        return os.path.exists(os.path.join(RUTA_PERSISTENCIA, nombre_base + ".ckpt"))
+
+    def recuperar_red(self, nombre_base: str = "red_monitoreo") -> RedPersistente:
+        """
+        Recupera la red desde el último checkpoint y reaplica la bitácora que le sigue.
+
+        Args:
+            nombre_base: Nombre de los archivos (sin extensión: .ckpt y .wal).
+
+        Raises:
+            PersistenciaException: Si no existe el checkpoint o no se pudo leer.
+        """
+        ruta = os.path.join(RUTA_PERSISTENCIA, nombre_base)
+        try:
+            return RedPersistente.recuperar(ruta)
+        except OSError as e:
+            raise PersistenciaException.from_io_exception(TipoOperacion.LECTURA, ruta + ".ckpt", e)
         except Exception as e:
-            raise PersistenciaException(f"Error al leer la red: {e}")
+            raise PersistenciaException.from_class_not_found(TipoOperacion.LECTURA, ruta + ".ckpt", e)
+
+    # -----------------------------------------------------------------------
+    # Historial de lecturas (series de tiempo)
+    # -----------------------------------------------------------------------
+    def abrir_almacen_series(self, nombre_directorio: str = "series") -> AlmacenSeries:
+        """
+        Abre el almacén de series de tiempo de /data. Registrado como Observer
+        de los sensores, guarda el historial de lecturas en segmentos comprimidos.
+
+        Args:
+            nombre_directorio: Directorio de los segmentos dentro de /data.
+
+        Raises:
+            PersistenciaException: Si no se pudo crear o leer el directorio.
+        """
+        directorio = os.path.join(RUTA_PERSISTENCIA, nombre_directorio)
+        try:
+            return AlmacenSeries(directorio)
+        except OSError as e:
+            raise PersistenciaException.from_io_exception(TipoOperacion.LECTURA, directorio, e)
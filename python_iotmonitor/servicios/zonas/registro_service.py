@@ -1,6 +1,12 @@
 import pickle
+from typing import Iterable
 from python_iotmonitor.entidades.zonas.registro_ambiental import RegistroAmbiental
 from python_iotmonitor.excepciones.persistencia_exception import PersistenciaException, TipoOperacion
+from python_iotmonitor.excepciones.mensajes_exception import MensajesException
+from python_iotmonitor.persistencia.escritura_atomica import escribir_atomico, leer_con_respaldo
+from python_iotmonitor.persistencia.codec_binario import codificar_red, cargar_entidades
+from python_iotmonitor.persistencia.contenedor_registros import ContenedorRegistros
+from python_iotmonitor.constantes import SNAPSHOT_GENERACIONES
 
 
 class RegistroAmbientalService:
@@ -8,26 +14,49 @@ class RegistroAmbientalService:
     Servicio para manejar el Registro Ambiental, incluyendo operaciones de persistencia (US-012).
     """
 
-    def guardar_registro(self, registro: RegistroAmbiental, ruta_archivo: str) -> None:
+    def guardar_registro(self, registro: RegistroAmbiental, ruta_archivo: str,
+                         generaciones: int = SNAPSHOT_GENERACIONES) -> None:
         """
-        Serializa y guarda el objeto RegistroAmbiental en disco.
+        Serializa y guarda el objeto RegistroAmbiental en disco de forma atómica
+        (temporal + fsync + rename), conservando las versiones anteriores.
 
         Args:
             registro: Objeto del tipo RegistroAmbiental a guardar.
             ruta_archivo: Ruta completa del archivo de destino.
+            generaciones: Versiones a conservar (la nueva y `generaciones - 1` respaldos).
         """
         try:
-            with open(ruta_archivo, "wb") as f:
-                pickle.dump(registro, f)
+            escribir_atomico(ruta_archivo, lambda f: pickle.dump(registro, f), generaciones)
             print(f"[RegistroAmbientalService] Registro guardado en {ruta_archivo}")
         except Exception as e:
             raise PersistenciaException.from_io_exception(
                 TipoOperacion.ESCRITURA, ruta_archivo, e
             )
 
+    def guardar_registro_binario(self, registro: RegistroAmbiental, ruta_archivo: str,
+                                 generaciones: int = SNAPSHOT_GENERACIONES) -> None:
+        """
+        Guarda el RegistroAmbiental (con su red) con el codec binario versionado,
+        de forma atómica y conservando las versiones anteriores. Se lee con `leer_registro`.
+
+        Args:
+            registro: Objeto del tipo RegistroAmbiental a guardar.
+            ruta_archivo: Ruta completa del archivo de destino.
+            generaciones: Versiones a conservar (la nueva y `generaciones - 1` respaldos).
+        """
+        try:
+            escribir_atomico(ruta_archivo, lambda f: codificar_red(registro, f), generaciones)
+            print(f"[RegistroAmbientalService] Registro guardado (formato binario) en {ruta_archivo}")
+        except Exception as e:
+            raise PersistenciaException.from_io_exception(
+                TipoOperacion.ESCRITURA, ruta_archivo, e
+            )
+
     def leer_registro(self, ruta_archivo: str) -> RegistroAmbiental:
         """
-        Deserializa y carga un objeto RegistroAmbiental desde un archivo.
+        Deserializa y carga un objeto RegistroAmbiental desde un archivo, en
+        formato pickle o binario (se reconoce por su firma).
+        Si la última versión está dañada, se usa la generación anterior.
 
         Args:
             ruta_archivo: Ruta del archivo .dat que contiene el registro.
@@ -36,16 +65,15 @@ class RegistroAmbientalService:
             Instancia de RegistroAmbiental.
         """
         try:
-            with open(ruta_archivo, "rb") as f:
-                registro = pickle.load(f)
-                print(f"[RegistroAmbientalService] Registro cargado correctamente desde {ruta_archivo}")
-                return registro
+            registro = leer_con_respaldo(ruta_archivo, cargar_entidades)
+            print(f"[RegistroAmbientalService] Registro cargado correctamente desde {ruta_archivo}")
+            return registro
         except FileNotFoundError:
             raise PersistenciaException(
                 TipoOperacion.LECTURA,
                 ruta_archivo,
                 FileNotFoundError("Archivo de registro ambiental no encontrado."),
-                error_code="E_05_PERSISTENCIA"
+                error_code=MensajesException.E_05_PERSISTENCIA
             )
         except Exception as e:
             # Captura errores de deserialización o clases inexistentes
@@ -53,6 +81,70 @@ class RegistroAmbientalService:
                 TipoOperacion.LECTURA, ruta_archivo, e
             )
 
+    def abrir_contenedor(self, ruta_archivo: str) -> ContenedorRegistros:
+        """
+        Abre (o crea) un contenedor de muchos registros con índice por
+        `id_instalacion` (lectura directa de un registro, agregado en lote,
+        borrado con lápidas y compactación).
+
+        Args:
+            ruta_archivo: Ruta del archivo de datos del contenedor.
+        """
+        try:
+            return ContenedorRegistros(ruta_archivo)
+        except Exception as e:
+            raise PersistenciaException.from_io_exception(TipoOperacion.LECTURA, ruta_archivo, e)
+
+    def guardar_registros(self, registros: Iterable[RegistroAmbiental], ruta_archivo: str) -> int:
+        """
+        Agrega muchos registros a un contenedor con una única escritura; los que
+        ya existían (mismo `id_instalacion`) se reemplazan.
+
+        Args:
+            registros: Registros a guardar.
+            ruta_archivo: Ruta del archivo de datos del contenedor.
+
+        Returns:
+            Cantidad de registros guardados.
+        """
+        contenedor = self.abrir_contenedor(ruta_archivo)
+        try:
+            cantidad = contenedor.agregar_lote(registros)
+            print(f"[RegistroAmbientalService] {cantidad} registros guardados en {ruta_archivo}")
+            return cantidad
+        except Exception as e:
+            raise PersistenciaException.from_io_exception(TipoOperacion.ESCRITURA, ruta_archivo, e)
+        finally:
+            contenedor.cerrar()
+
+    def leer_registro_contenedor(self, ruta_archivo: str, id_instalacion: int) -> RegistroAmbiental:
+        """
+        Lee un registro de un contenedor por su `id_instalacion`.
+
+        Args:
+            ruta_archivo: Ruta del archivo de datos del contenedor.
+            id_instalacion: ID del registro.
+
+        Returns:
+            Instancia de RegistroAmbiental.
+        """
+        contenedor = self.abrir_contenedor(ruta_archivo)
+        try:
+            return contenedor.leer(id_instalacion)
+        except KeyError:
+            raise PersistenciaException(
+                TipoOperacion.LECTURA,
+                ruta_archivo,
+                KeyError(f"No hay un registro ambiental con id {id_instalacion}."),
+                error_code=MensajesException.E_05_PERSISTENCIA
+            )
+        except Exception as e:
+            raise PersistenciaException.from_class_not_found(
+                TipoOperacion.LECTURA, ruta_archivo, e
+            )
+        finally:
+            contenedor.cerrar()
+
     def actualizar_prioridad_registro(self, registro: RegistroAmbiental, nueva_prioridad: int) -> None:
         """
         Actualiza el nivel de prioridad ambiental en el registro.
@@ -1,9 +1,12 @@
-from typing import List, Optional, Type, TypeVar, Generic
-import random
-from python_iotmonitor.entidades.zonas.zona import Zona
+from typing import Dict, List, Optional, Sequence, Type, TypeVar, Generic, Union
+import numpy as np
+from python_iotmonitor.entidades.zonas.zona import Zona, ALERTAS_ZONA
 from python_iotmonitor.entidades.sensores.sensor import Sensor
+from python_iotmonitor.entidades.sensores.sensor_store import SensorStore
 from python_iotmonitor.excepciones.zona_exception import ZonaNoEncontradaException
-from python_iotmonitor.excepciones.sensor_exception import SensorFueraDeRangoException
+from python_iotmonitor.patrones.observer.eventos.lote_lecturas import LoteLecturas
+from python_iotmonitor.persistencia.archivo_lecturas import ArchivoLecturas
+from python_iotmonitor.simulacion.generador_simulacion import GeneradorSimulacion
 
 # --- Clase genérica de empaquetado ---
 T = TypeVar('T')  # Tipo genérico
@@ -50,6 +53,7 @@ class ZonaService:
 
     def __init__(self):
         self._contador_id_lectura = 0
+        self._flujo = np.random.default_rng()  # lecturas sin semilla de corrida
 
     # -----------------------------------------------------------------------
     # Registrar sensores
@@ -64,6 +68,7 @@ class ZonaService:
 
         Raises:
             ZonaNoEncontradaException: Si la zona es nula o no existe.
+            ValueError: Si el sensor ya pertenece a otra zona.
         """
         if not zona:
             raise ZonaNoEncontradaException("Desconocida", 0)
@@ -74,53 +79,150 @@ class ZonaService:
     # -----------------------------------------------------------------------
     # Simular lecturas
     # -----------------------------------------------------------------------
-    def simular_lecturas_zona(self, zona: Zona) -> None:
+    def simular_lecturas_zona(self, zona: Zona, generador: Optional[GeneradorSimulacion] = None,
+                              detalle: bool = True) -> None:
         """
         Simula un ciclo completo de lecturas ambientales para todos los sensores (US-008, US-010).
+        Sortea todas las lecturas con una llamada vectorizada, las escribe de una vez en el
+        SensorStore y recalcula las alertas de la zona una sola vez.
 
         Args:
             zona: Zona a simular.
+            generador: Si se indica, las lecturas se sortean con el flujo de la zona
+                derivado de la semilla de la corrida (reproducibles).
+            detalle: Si es True, informa la lectura de cada sensor por consola.
         """
-        sensores = zona.get_sensores_internal()
-        if not sensores:
+        indices = zona.get_indices_store()
+        if not len(indices):
             raise ZonaNoEncontradaException(zona.get_nombre(), 0)
 
         print(f"\n[ZonaService] Iniciando simulación de lecturas para zona '{zona.get_nombre()}'.")
-        for sensor in sensores:
-            valor_simulado = random.uniform(*sensor.get_rango())
-            try:
-                sensor.set_valor_actual(valor_simulado)
-                print(f"  - {sensor.get_tipo()}: {valor_simulado:.2f} {sensor.get_unidad()}")
-            except SensorFueraDeRangoException as e:
-                print(f"[ALERTA] {e.get_full_message()}")
+        store = SensorStore.get_instance()
+        flujo = generador.flujo_zona(zona.get_id_zona()) if generador is not None else self._flujo
+        valores = GeneradorSimulacion.uniforme_lote(
+            flujo, store.columna("rango_min", indices), store.columna("rango_max", indices)
+        )
+        guardados = store.escribir_lote(indices, valores)
+        zona.recalcular_alertas()
+
+        if detalle:
+            for sensor, valor in zip(zona.get_sensores_internal(), guardados.tolist()):
+                print(f"  - {sensor.get_tipo()}: {valor:.2f} {sensor.get_unidad()}")
 
         estado = zona.evaluar_condiciones()
         print(f"[ZonaService] Estado ambiental general: {estado}")
 
+    def simular_lecturas_zonas(self, zonas: Sequence[Zona], generador: Optional[GeneradorSimulacion] = None,
+                               detalle: bool = False) -> np.ndarray:
+        """
+        Simula un ciclo de lecturas para muchas zonas a la vez (despliegues grandes).
+        Hace un sorteo vectorizado por tipo de sensor, una única escritura en el
+        SensorStore y un único recálculo de alertas para todas las zonas.
+
+        Args:
+            zonas: Zonas a simular (las zonas sin sensores se ignoran).
+            generador: Si se indica, cada tipo de sensor usa su flujo derivado de la
+                semilla de la corrida: con las mismas zonas, en el mismo orden, las
+                lecturas se repiten exactamente.
+            detalle: Si es True, informa el estado de cada zona, la lectura de cada sensor y un resumen.
+
+        Returns:
+            Matriz (zonas × ALERTAS_ZONA) con la cantidad de sensores en cada alerta,
+            en el orden de `zonas`.
+        """
+        zonas = [zona for zona in zonas if zona.get_cantidad_sensores()]
+        if not zonas:
+            return np.zeros((0, len(ALERTAS_ZONA)), dtype=np.int64)
+
+        indices = np.concatenate([zona.get_indices_store() for zona in zonas])
+        store = SensorStore.get_instance()
+        codigos = store.columna("codigo_tipo", indices)
+        minimos = store.columna("rango_min", indices)
+        maximos = store.columna("rango_max", indices)
+
+        # Un sorteo por tipo, en orden de código, para que la corrida sea reproducible
+        valores = np.empty(len(indices), dtype=np.float64)
+        for codigo in np.unique(codigos).tolist():
+            filas = np.flatnonzero(codigos == codigo)
+            flujo = generador.flujo_tipo(codigo) if generador is not None else self._flujo
+            valores[filas] = GeneradorSimulacion.uniforme_lote(flujo, minimos[filas], maximos[filas])
+
+        guardados = store.escribir_lote(indices, valores)
+        conteos = Zona.recalcular_alertas_zonas(zonas)
+
+        if detalle:
+            inicio = 0
+            for zona in zonas:
+                sensores = zona.get_sensores_internal()
+                print(f"[ZonaService] Zona '{zona.get_nombre()}': {zona.evaluar_condiciones()}")
+                for sensor, valor in zip(sensores, guardados[inicio:inicio + len(sensores)].tolist()):
+                    print(f"  - {sensor.get_tipo()}: {valor:.2f} {sensor.get_unidad()}")
+                inicio += len(sensores)
+
+            zonas_con_alerta = (conteos > 0).sum(axis=0).tolist()
+            resumen = ", ".join(f"{mensaje}: {cantidad}" for mensaje, cantidad in zip(ALERTAS_ZONA, zonas_con_alerta))
+            print(f"[ZonaService] {len(zonas)} zonas simuladas ({len(indices)} sensores). Zonas con alerta → {resumen}")
+        return conteos
+
     # -----------------------------------------------------------------------
     # Exportar lecturas
     # -----------------------------------------------------------------------
-    def exportar_datos_zona(self, zona: Zona, tipo_sensor: Type[S]) -> PaqueteLecturas[S]:
+    def exportar_datos_zona(self, zona: Zona, tipo_sensor: Type[S], historial: Optional[ArchivoLecturas] = None,
+                            desde_ns: Optional[int] = None,
+                            hasta_ns: Optional[int] = None) -> PaqueteLecturas[Union[S, LoteLecturas]]:
         """
         Exporta las lecturas de un tipo de sensor específico (US-012).
 
         Args:
             zona: La zona desde la que se exportarán los datos.
             tipo_sensor: Tipo de sensor (clase concreta).
+            historial: Si se indica, se exporta el historial de cada sensor en lugar del sensor.
+            desde_ns: Inicio del rango del historial (None = sin límite).
+            hasta_ns: Fin del rango del historial, exclusivo (None = sin límite).
 
         Returns:
-            Un paquete genérico con los sensores exportados.
+            Un paquete genérico con los sensores exportados o, con `historial`, un
+            LoteLecturas por sensor que es una vista del archivo mapeado (sin copias).
         """
-        sensores = [s for s in zona.get_sensores() if isinstance(s, tipo_sensor)]
+        sensores = zona.get_sensores_por_clase(tipo_sensor)
         nombre_sensor = tipo_sensor.__name__
 
         if not sensores:
             print(f"[AVISO] No hay sensores del tipo {nombre_sensor} registrados en la zona.")
             return PaqueteLecturas(nombre_sensor, [])
 
+        if historial is not None:
+            series = historial.series_zona(zona.get_id_zona(), desde_ns, hasta_ns)
+            lotes = [series[sensor.get_id()] for sensor in sensores if sensor.get_id() in series]
+            print(f"[ZonaService] Exportando historial de {len(lotes)} sensores de tipo '{nombre_sensor}' "
+                  f"({sum(len(lote) for lote in lotes)} lecturas).")
+            return PaqueteLecturas(nombre_sensor, lotes)
+
         print(f"[ZonaService] Exportando datos de {len(sensores)} sensores de tipo '{nombre_sensor}'.")
         return PaqueteLecturas(nombre_sensor, sensores)
 
+    def estadisticas_historial_zona(self, zona: Zona, historial: ArchivoLecturas, desde_ns: Optional[int] = None,
+                                    hasta_ns: Optional[int] = None) -> Dict[str, dict]:
+        """
+        Calcula cantidad, promedio, mínimo y máximo por tipo de sensor del historial de una zona.
+
+        Sin rango de tiempo se recorre directamente la vista de la zona en el
+        archivo mapeado; con rango se combinan solo las porciones de cada sensor.
+
+        Args:
+            zona: Zona a analizar.
+            historial: Archivo de lecturas mapeado en memoria.
+            desde_ns: Inicio del rango (None = sin límite).
+            hasta_ns: Fin del rango, exclusivo (None = sin límite).
+
+        Returns:
+            Diccionario nombre de tipo → {"cantidad", "promedio", "minimo", "maximo"}.
+        """
+        if desde_ns is None and hasta_ns is None:
+            return historial.zona(zona.get_id_zona()).estadisticas_por_tipo()
+        series = historial.series_zona(zona.get_id_zona(), desde_ns, hasta_ns)
+        return LoteLecturas.concatenar(series.values()).estadisticas_por_tipo()
+
     # -----------------------------------------------------------------------
     # Mantenimiento de sensores
     # -----------------------------------------------------------------------
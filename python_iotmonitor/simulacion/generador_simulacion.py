@@ -0,0 +1,122 @@
+import threading
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+# Dominios de flujos independientes derivados de la semilla de la corrida
+DOMINIO_SENSOR = 0
+DOMINIO_ZONA = 1
+DOMINIO_GRUPO = 2
+DOMINIO_TIPO = 3
+DOMINIO_FRAGMENTO = 4  # reservado para dividir(): no se acepta en flujo()
+
+
+class GeneradorSimulacion:
+    """
+    Capa de números aleatorios reproducible para la simulación.
+
+    A partir de una única semilla de corrida deriva flujos independientes
+    (numpy.random.Generator) por sensor, por zona o por fragmento, usando
+    SeedSequence. Cada flujo depende solo de la semilla y de su clave, no del
+    orden de creación ni del entrelazado de hilos: dos corridas con la misma
+    semilla producen exactamente las mismas lecturas. Además, al no compartir
+    estado, los hilos no compiten por el generador global de `random`.
+    """
+
+    def __init__(self, semilla: Optional[int] = None, _secuencia: Optional[np.random.SeedSequence] = None):
+        """
+        Inicializa el generador de la corrida.
+
+        Args:
+            semilla: Semilla de la corrida (None = entropía del sistema, no reproducible).
+        """
+        self._secuencia = _secuencia if _secuencia is not None else np.random.SeedSequence(semilla)
+        self._flujos: Dict[Tuple[int, int], np.random.Generator] = {}
+        self._lock = threading.Lock()
+
+    def get_semilla(self) -> int:
+        """Devuelve la semilla efectiva de la corrida (permite repetirla)."""
+        return self._secuencia.entropy
+
+    # -----------------------------------------------------------------------
+    # Flujos independientes
+    # -----------------------------------------------------------------------
+    def flujo(self, dominio: int, clave: int) -> np.random.Generator:
+        """
+        Devuelve el flujo asociado a (dominio, clave), creándolo la primera vez.
+        Equivale a un hijo de SeedSequence.spawn con spawn_key fijo, de modo que
+        no depende del orden en que se piden los flujos.
+
+        Args:
+            dominio: DOMINIO_SENSOR, DOMINIO_ZONA, DOMINIO_GRUPO o DOMINIO_TIPO.
+            clave: Identificador dentro del dominio (id de sensor, zona, etc.).
+
+        Raises:
+            ValueError: Si el dominio no es uno de los anteriores o la clave es negativa.
+        """
+        if dominio not in (DOMINIO_SENSOR, DOMINIO_ZONA, DOMINIO_GRUPO, DOMINIO_TIPO):
+            raise ValueError(f"Dominio de flujo inválido: {dominio}")
+        if clave < 0:
+            raise ValueError(f"La clave del flujo no puede ser negativa: {clave}")
+        clave_flujo = (dominio, clave)
+        with self._lock:
+            generador = self._flujos.get(clave_flujo)
+            if generador is None:
+                secuencia = np.random.SeedSequence(
+                    self._secuencia.entropy,
+                    spawn_key=self._secuencia.spawn_key + clave_flujo,
+                )
+                generador = np.random.Generator(np.random.PCG64(secuencia))
+                self._flujos[clave_flujo] = generador
+            return generador
+
+    def flujo_sensor(self, id_sensor: int) -> np.random.Generator:
+        """Devuelve el flujo propio de un sensor."""
+        return self.flujo(DOMINIO_SENSOR, id_sensor)
+
+    def flujo_zona(self, id_zona: int) -> np.random.Generator:
+        """Devuelve el flujo usado para las lecturas masivas de una zona."""
+        return self.flujo(DOMINIO_ZONA, id_zona)
+
+    def flujo_grupo(self, id_grupo: int) -> np.random.Generator:
+        """Devuelve el flujo de un grupo de sensores que se leen juntos."""
+        return self.flujo(DOMINIO_GRUPO, id_grupo)
+
+    def flujo_tipo(self, codigo_tipo: int) -> np.random.Generator:
+        """Devuelve el flujo de las lecturas masivas de un tipo de sensor (varias zonas a la vez)."""
+        return self.flujo(DOMINIO_TIPO, codigo_tipo)
+
+    def dividir(self, cantidad: int) -> List["GeneradorSimulacion"]:
+        """
+        Divide la corrida en `cantidad` fragmentos independientes, por ejemplo uno
+        por proceso o por grupo de zonas.
+
+        Cada fragmento agrega (DOMINIO_FRAGMENTO, índice) al spawn_key, sin consumir
+        estado: llamadas repetidas producen los mismos fragmentos, y sus flujos (o
+        los de fragmentos de fragmentos) no coinciden con ningún flujo de la corrida.
+
+        Raises:
+            ValueError: Si la cantidad es negativa.
+        """
+        if cantidad < 0:
+            raise ValueError(f"La cantidad de fragmentos no puede ser negativa: {cantidad}")
+        return [
+            GeneradorSimulacion(_secuencia=np.random.SeedSequence(
+                self._secuencia.entropy, spawn_key=self._secuencia.spawn_key + (DOMINIO_FRAGMENTO, indice)
+            ))
+            for indice in range(cantidad)
+        ]
+
+    # -----------------------------------------------------------------------
+    # Sorteos masivos
+    # -----------------------------------------------------------------------
+    @staticmethod
+    def uniforme_lote(flujo: np.random.Generator, minimos: np.ndarray, maximos: np.ndarray) -> np.ndarray:
+        """
+        Sortea un valor uniforme por elemento con una sola llamada vectorizada.
+
+        Args:
+            flujo: Generador a utilizar.
+            minimos: Límite inferior de cada elemento.
+            maximos: Límite superior de cada elemento.
+        """
+        return flujo.uniform(minimos, maximos)
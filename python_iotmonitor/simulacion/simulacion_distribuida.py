@@ -0,0 +1,245 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+import numpy as np
+from python_iotmonitor.entidades.zonas.zona import Zona, ALERTAS_ZONA
+from python_iotmonitor.entidades.sensores.sensor import Sensor
+from python_iotmonitor.entidades.sensores.sensor_store import SensorStore
+from python_iotmonitor.entidades.sensores.sensor_temperatura import SensorTemperatura
+from python_iotmonitor.entidades.sensores.sensor_humedad import SensorHumedad
+from python_iotmonitor.entidades.sensores.sensor_co2 import SensorCO2
+from python_iotmonitor.entidades.sensores.sensor_luz import SensorLuz
+from python_iotmonitor.entidades.sensores.tipo_sensor import TipoSensor, NOMBRES_TIPO
+from python_iotmonitor.iot_control.control.accion_control import AccionControl
+from python_iotmonitor.iot_control.control.motor_reglas import MotorReglas, VARIABLES_CONTROL
+from python_iotmonitor.patrones.singleton.tabla_ultimos_valores import TablaUltimosValores
+from python_iotmonitor.servicios.zonas.zona_service import ZonaService
+from python_iotmonitor.simulacion.generador_simulacion import GeneradorSimulacion
+
+# Tipos de sensor de cada zona simulada, en el orden en que se reparten
+TIPOS_SIMULADOS = (TipoSensor.TEMPERATURA, TipoSensor.HUMEDAD, TipoSensor.CO2, TipoSensor.LUZ)
+
+# Acciones informadas en las métricas (una bandera por bit de AccionControl)
+ACCIONES_MEDIDAS = tuple(accion for accion in AccionControl if accion)
+
+
+class ResultadoFragmento(NamedTuple):
+    """Métricas y últimos valores que un proceso devuelve al coordinador."""
+    indice: int
+    ids_zona: np.ndarray          # zonas simuladas por el fragmento
+    ultimos_valores: np.ndarray   # matriz (zonas × sensores por zona) con el último valor
+    conteo_alertas: np.ndarray    # matriz (zonas × ALERTAS_ZONA) del último tick
+    acciones: np.ndarray          # veces que se disparó cada acción de ACCIONES_MEDIDAS
+    lecturas: int
+    segundos: float               # tiempo de los ticks (sin contar la creación de sensores)
+
+
+class ResumenSimulacion(NamedTuple):
+    """Resultado agregado de una simulación distribuida."""
+    procesos: int
+    ticks: int
+    lecturas: int
+    segundos: float               # tiempo total de pared, incluida la creación de sensores
+    segundos_ticks: float         # tiempo de ticks del fragmento más lento
+    ultimos_valores: np.ndarray   # matriz (zonas × sensores por zona), fila i = zona i + 1
+    zonas_con_alerta: Dict[str, int]
+    acciones: Dict[str, int]
+
+    def get_lecturas_por_segundo(self) -> float:
+        """Devuelve el rendimiento de la simulación (lecturas por segundo de ticks)."""
+        return self.lecturas / self.segundos_ticks if self.segundos_ticks else 0.0
+
+
+# ---------------------------------------------------------------------------
+# Trabajo de cada proceso
+# ---------------------------------------------------------------------------
+# Constructor de sensor por código TipoSensor (sin hilo propio: lo lee el ciclo del fragmento)
+_CREAR_SENSOR: List[Optional[Callable[[], Sensor]]] = [None] * len(NOMBRES_TIPO)
+_CREAR_SENSOR[TipoSensor.TEMPERATURA] = lambda: SensorTemperatura("Simulado")
+_CREAR_SENSOR[TipoSensor.HUMEDAD] = lambda: SensorHumedad("Simulado")
+_CREAR_SENSOR[TipoSensor.CO2] = lambda: SensorCO2("Simulado")
+_CREAR_SENSOR[TipoSensor.LUZ] = SensorLuz
+
+
+def crear_zonas(ids_zona: Sequence[int], sensores_por_zona: int) -> List[Zona]:
+    """
+    Crea las zonas de un fragmento, con los tipos de TIPOS_SIMULADOS repartidos en partes iguales.
+
+    Args:
+        ids_zona: Identificadores de las zonas a crear.
+        sensores_por_zona: Cantidad de sensores de cada zona.
+    """
+    zonas = []
+    for id_zona in ids_zona:
+        zona = Zona(id_zona, f"Zona {id_zona}", None, "Interior")
+        for posicion in range(sensores_por_zona):
+            zona.agregar_sensor(_CREAR_SENSOR[TIPOS_SIMULADOS[posicion % len(TIPOS_SIMULADOS)]]())
+        zonas.append(zona)
+    return zonas
+
+
+def _promedios_por_zona(posiciones: np.ndarray, columnas: np.ndarray, valores: np.ndarray,
+                        cantidad_zonas: int) -> np.ndarray:
+    """Promedia los valores por (zona, variable de control); NaN si la zona no tiene esa variable."""
+    validas = columnas >= 0
+    claves = posiciones[validas] * len(VARIABLES_CONTROL) + columnas[validas]
+    largo = cantidad_zonas * len(VARIABLES_CONTROL)
+    sumas = np.bincount(claves, weights=valores[validas], minlength=largo)
+    cantidades = np.bincount(claves, minlength=largo)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (sumas / cantidades).reshape(cantidad_zonas, len(VARIABLES_CONTROL))
+
+
+def ejecutar_fragmento(indice: int, ids_zona: Sequence[int], sensores_por_zona: int, ticks: int,
+                       semilla: Optional[int], fragmentos: int,
+                       tabla: Optional[TablaUltimosValores] = None) -> ResultadoFragmento:
+    """
+    Ejecuta un fragmento de la simulación dentro de un proceso: crea sus zonas y,
+    en cada tick, simula las lecturas (modo masivo) y corre el control ambiental.
+
+    Args:
+        indice: Número de fragmento.
+        ids_zona: Zonas asignadas al fragmento.
+        sensores_por_zona: Sensores de cada zona.
+        ticks: Ciclos de lectura + control a ejecutar.
+        semilla: Semilla de la corrida (cada fragmento usa su propio flujo derivado).
+        fragmentos: Cantidad total de fragmentos de la corrida.
+        tabla: Tabla compartida donde se publican los últimos valores en cada tick
+            (casillero = número global de sensor, ver SimulacionDistribuida).
+    """
+    zonas = crear_zonas(ids_zona, sensores_por_zona)
+    generador = GeneradorSimulacion(semilla).dividir(fragmentos)[indice] if semilla is not None else None
+    servicio = ZonaService()
+    motor = MotorReglas()
+    store = SensorStore.get_instance()
+
+    # Las zonas no cambian durante la corrida: filas, tipos y posiciones se calculan una vez
+    indices = np.concatenate([zona.get_indices_store() for zona in zonas])
+    columna_por_codigo = np.full(256, -1, dtype=np.intp)
+    columna_por_codigo[list(VARIABLES_CONTROL)] = np.arange(len(VARIABLES_CONTROL))
+    columnas = columna_por_codigo[store.columna("codigo_tipo", indices)]
+    posiciones = np.repeat(np.arange(len(zonas)), sensores_por_zona)
+    ids = np.asarray(ids_zona, dtype=np.int64)
+    numeros_sensor = ((ids[:, None] - 1) * sensores_por_zona + np.arange(1, sensores_por_zona + 1)).ravel()
+
+    acciones = np.zeros(len(ACCIONES_MEDIDAS), dtype=np.int64)
+    conteos = np.zeros((len(zonas), len(ALERTAS_ZONA)), dtype=np.int64)
+    inicio = time.perf_counter()
+    for _ in range(ticks):
+        conteos = servicio.simular_lecturas_zonas(zonas, generador)
+        if tabla is not None:
+            tabla.publicar_desde_store(store, indices, numeros_sensor)
+        valores = store.columna("valor", indices)
+        codigos_accion = motor.evaluar(_promedios_por_zona(posiciones, columnas, valores, len(zonas)), ids)
+        bits = np.unpackbits(codigos_accion.astype(np.uint8)[:, None], axis=1, bitorder="little")
+        acciones += bits.sum(axis=0, dtype=np.int64)[:len(ACCIONES_MEDIDAS)]
+    segundos = time.perf_counter() - inicio
+    if tabla is not None:
+        tabla.cerrar()
+
+    return ResultadoFragmento(
+        indice=indice,
+        ids_zona=ids,
+        ultimos_valores=store.columna("valor", indices).reshape(len(zonas), sensores_por_zona),
+        conteo_alertas=conteos,
+        acciones=acciones,
+        lecturas=len(indices) * ticks,
+        segundos=segundos,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Coordinador
+# ---------------------------------------------------------------------------
+class SimulacionDistribuida:
+    """
+    Simulación repartida en varios procesos para aprovechar todos los núcleos.
+
+    Las zonas (con sus sensores) se dividen en fragmentos contiguos; cada
+    proceso crea sus propios sensores, ejecuta lecturas y control ambiental
+    sin compartir estado con los demás, y al terminar devuelve por el canal
+    del ProcessPoolExecutor solo métricas y últimos valores en arreglos de
+    NumPy (nunca objetos Zona). El coordinador agrega los resultados.
+
+    Si se indica una TablaUltimosValores, cada proceso publica en ella los
+    últimos valores en cada tick, y el coordinador u otros procesos pueden
+    leerlos mientras la simulación corre. El casillero de cada sensor es su
+    número global en el despliegue: (id_zona - 1) * sensores_por_zona + posición + 1.
+
+    Con la misma semilla y la misma cantidad de procesos la corrida se repite
+    exactamente (cada fragmento usa GeneradorSimulacion.dividir).
+    """
+
+    def __init__(self, cantidad_zonas: int, sensores_por_zona: int,
+                 procesos: Optional[int] = None, semilla: Optional[int] = None,
+                 tabla: Optional[TablaUltimosValores] = None):
+        """
+        Inicializa la simulación.
+
+        Args:
+            cantidad_zonas: Zonas del despliegue (ids 1..cantidad_zonas).
+            sensores_por_zona: Sensores de cada zona.
+            procesos: Procesos a utilizar (None = uno por núcleo).
+            semilla: Semilla de la corrida (None = no reproducible).
+            tabla: Tabla compartida de últimos valores (opcional).
+
+        Raises:
+            ValueError: Si alguna cantidad no es positiva o la tabla no alcanza para todos los sensores.
+        """
+        if cantidad_zonas <= 0 or sensores_por_zona <= 0:
+            raise ValueError("La cantidad de zonas y de sensores por zona debe ser positiva.")
+        if tabla is not None and tabla.get_capacidad() <= cantidad_zonas * sensores_por_zona:
+            raise ValueError("La tabla de últimos valores no tiene casilleros para todos los sensores.")
+        self._cantidad_zonas = cantidad_zonas
+        self._sensores_por_zona = sensores_por_zona
+        self._procesos = max(1, min(procesos or os.cpu_count() or 1, cantidad_zonas))
+        self._semilla = semilla
+        self._tabla = tabla
+
+    def get_procesos(self) -> int:
+        """Devuelve la cantidad de procesos (fragmentos) de la corrida."""
+        return self._procesos
+
+    def particionar(self) -> List[np.ndarray]:
+        """Divide los ids de zona en un bloque contiguo por proceso, de tamaños parejos."""
+        return np.array_split(np.arange(1, self._cantidad_zonas + 1), self._procesos)
+
+    def ejecutar(self, ticks: int) -> ResumenSimulacion:
+        """
+        Ejecuta `ticks` ciclos de lectura + control en todos los fragmentos y agrega los resultados.
+
+        Args:
+            ticks: Ciclos a ejecutar en cada fragmento.
+        """
+        inicio = time.perf_counter()
+        particiones = self.particionar()
+        with ProcessPoolExecutor(max_workers=self._procesos) as pool:
+            futuros = [
+                pool.submit(ejecutar_fragmento, indice, ids.tolist(), self._sensores_por_zona,
+                            ticks, self._semilla, self._procesos, self._tabla)
+                for indice, ids in enumerate(particiones)
+            ]
+            resultados = [futuro.result() for futuro in futuros]
+        segundos = time.perf_counter() - inicio
+
+        print(f"[SimulacionDistribuida] {self._procesos} procesos, {self._cantidad_zonas} zonas, "
+              f"{ticks} ticks en {segundos:.2f}s.")
+        return self._agregar(resultados, ticks, segundos)
+
+    def _agregar(self, resultados: List[ResultadoFragmento], ticks: int, segundos: float) -> ResumenSimulacion:
+        """Combina los resultados de los fragmentos en un único resumen."""
+        resultados = sorted(resultados, key=lambda resultado: resultado.indice)
+        ultimos = np.concatenate([resultado.ultimos_valores for resultado in resultados])
+        conteos = np.concatenate([resultado.conteo_alertas for resultado in resultados])
+        acciones = np.sum([resultado.acciones for resultado in resultados], axis=0)
+        return ResumenSimulacion(
+            procesos=self._procesos,
+            ticks=ticks,
+            lecturas=sum(resultado.lecturas for resultado in resultados),
+            segundos=segundos,
+            segundos_ticks=max(resultado.segundos for resultado in resultados),
+            ultimos_valores=ultimos,
+            zonas_con_alerta=dict(zip(ALERTAS_ZONA, (conteos > 0).sum(axis=0).tolist())),
+            acciones={accion.name: cantidad for accion, cantidad in zip(ACCIONES_MEDIDAS, acciones.tolist())},
+        )